@@ -1,7 +1,15 @@
 import os
+import re
 import sqlite3
 from datetime import datetime
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Iterable, Tuple
+
+from db import bulk_insert_companies
+import db_apollo
+from db_apollo import COMPANY_CONTACT_INDEXES
+from db_connection import connect
+from name_normalizer import normalize_company_name, with_normalized_name, add_normalized_name_column
+from query_cache import invalidates
 
 # Always use the project root database
 DB_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'database.db'))
@@ -47,7 +55,7 @@ def get_all_available_countries() -> List[str]:
     return sorted(list(file_countries))
 
 def init_db():
-    conn = sqlite3.connect(DB_PATH)
+    conn = connect(DB_PATH)
     c = conn.cursor()
     # Create a single hs_codes table for all countries
     c.execute('''
@@ -61,11 +69,14 @@ def init_db():
             UNIQUE(hs_code, country)
         )
     ''')
+    c.execute('CREATE INDEX IF NOT EXISTS idx_hs_codes_country_created ON hs_codes (country, created_at)')
+    c.execute('CREATE INDEX IF NOT EXISTS idx_hs_codes_created ON hs_codes (created_at)')
     conn.commit()
     conn.close()
 
+@invalidates('hs_codes')
 def save_hs_code(hs_code: str, description: str, country: str, source: str = 'Manual') -> bool:
-    conn = sqlite3.connect(DB_PATH)
+    conn = connect(DB_PATH)
     c = conn.cursor()
     try:
         c.execute('INSERT INTO hs_codes (hs_code, description, country, source) VALUES (?, ?, ?, ?)', (hs_code, description, country, source))
@@ -76,8 +87,9 @@ def save_hs_code(hs_code: str, description: str, country: str, source: str = 'Ma
     conn.close()
     return success
 
+@invalidates('hs_codes')
 def update_hs_code(hs_code_id: int, new_hs_code: str, new_description: str, new_country: str) -> bool:
-    conn = sqlite3.connect(DB_PATH)
+    conn = connect(DB_PATH)
     c = conn.cursor()
     c.execute('UPDATE hs_codes SET hs_code = ?, description = ?, country = ? WHERE id = ?', (new_hs_code, new_description, new_country, hs_code_id))
     conn.commit()
@@ -85,8 +97,9 @@ def update_hs_code(hs_code_id: int, new_hs_code: str, new_description: str, new_
     conn.close()
     return updated
 
+@invalidates('hs_codes')
 def delete_hs_code(hs_code_id: int) -> bool:
-    conn = sqlite3.connect(DB_PATH)
+    conn = connect(DB_PATH)
     c = conn.cursor()
     c.execute('DELETE FROM hs_codes WHERE id = ?', (hs_code_id,))
     conn.commit()
@@ -95,7 +108,7 @@ def delete_hs_code(hs_code_id: int) -> bool:
     return deleted
 
 def get_all_hs_codes() -> List[Dict]:
-    conn = sqlite3.connect(DB_PATH)
+    conn = connect(DB_PATH)
     c = conn.cursor()
     c.execute('SELECT id, hs_code, description, country, source, created_at FROM hs_codes ORDER BY created_at DESC')
     rows = c.fetchall()
@@ -104,7 +117,7 @@ def get_all_hs_codes() -> List[Dict]:
     return [dict(zip(columns, row)) for row in rows]
 
 def get_hs_codes_by_country(country: str) -> List[Dict]:
-    conn = sqlite3.connect(DB_PATH)
+    conn = connect(DB_PATH)
     c = conn.cursor()
     c.execute('SELECT id, hs_code, description, country, source, created_at FROM hs_codes WHERE country = ? ORDER BY created_at DESC', (country,))
     rows = c.fetchall()
@@ -113,7 +126,7 @@ def get_hs_codes_by_country(country: str) -> List[Dict]:
     return [dict(zip(columns, row)) for row in rows]
 
 def get_hs_code_by_id(hs_code_id: int) -> Optional[Dict]:
-    conn = sqlite3.connect(DB_PATH)
+    conn = connect(DB_PATH)
     c = conn.cursor()
     c.execute('SELECT id, hs_code, description, country, source, created_at FROM hs_codes WHERE id = ?', (hs_code_id,))
     row = c.fetchone()
@@ -126,7 +139,7 @@ def get_hs_code_by_id(hs_code_id: int) -> Optional[Dict]:
 # Potential Buyer database functions
 def init_apollo_db():
     """Initialize Potential Buyer database tables"""
-    conn = sqlite3.connect(DB_PATH)
+    conn = connect(DB_PATH)
     c = conn.cursor()
     # Companies table
     c.execute('''
@@ -156,13 +169,19 @@ def init_apollo_db():
             FOREIGN KEY(company_id) REFERENCES companies(id)
         )
     ''')
+    for statement in COMPANY_CONTACT_INDEXES:
+        c.execute(statement)
+    add_normalized_name_column(conn, 'companies', index_columns=('country',))
+    add_normalized_name_column(conn, 'contacts')
+    c.execute(db_apollo.EXTRACTION_JOBS_TABLE)
     conn.commit()
     conn.close()
 
+@invalidates('companies')
 def insert_company(company_name, country, domain, industry, employee_count, source="Apollo"):
     """Insert a company into database"""
     from datetime import datetime
-    conn = sqlite3.connect(DB_PATH)
+    conn = connect(DB_PATH)
     c = conn.cursor()
     created_at = datetime.utcnow().isoformat()
     # Check for existing by domain or (name+country)
@@ -172,17 +191,21 @@ def insert_company(company_name, country, domain, industry, employee_count, sour
         conn.close()
         return row[0], False  # Return existing company id, not new
     c.execute('''
-        INSERT INTO companies (company_name, country, domain, industry, employee_count, source, created_at)
-        VALUES (?, ?, ?, ?, ?, ?, ?)
-    ''', (company_name, country, domain, industry, employee_count, source, created_at))
+        INSERT INTO companies (company_name, country, domain, industry, employee_count, source, created_at, normalized_name)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    ''', (company_name, country, domain, industry, employee_count, source, created_at, normalize_company_name(company_name)))
     company_id = c.lastrowid
     conn.commit()
     conn.close()
     return company_id, True  # Return new company id, is new
 
+def insert_companies(companies, source="Apollo"):
+    """Bulk insert a page of companies into database.db (see db_apollo.insert_companies). Returns the number of new companies."""
+    return db_apollo.insert_companies(companies, source=source, db_path=DB_PATH)
+
 def get_all_companies():
     """Get all companies from database"""
-    conn = sqlite3.connect(DB_PATH)
+    conn = connect(DB_PATH)
     c = conn.cursor()
     c.execute('SELECT * FROM companies')
     rows = c.fetchall()
@@ -193,23 +216,24 @@ def get_all_companies():
 
 def count_companies():
     """Count total companies in database"""
-    conn = sqlite3.connect(DB_PATH)
+    conn = connect(DB_PATH)
     c = conn.cursor()
     c.execute('SELECT COUNT(*) FROM companies')
     count = c.fetchone()[0]
     conn.close()
     return count
 
+@invalidates('contacts')
 def insert_contact(company_id, company_name, name, title, email, linkedin, source="Apollo", created_at=None):
     """Insert a contact (buyer/decision maker) for a company"""
     if created_at is None:
         created_at = datetime.utcnow().isoformat()
-    conn = sqlite3.connect(DB_PATH)
+    conn = connect(DB_PATH)
     c = conn.cursor()
     c.execute('''
-        INSERT INTO contacts (company_id, company_name, name, title, email, linkedin, source, created_at)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-    ''', (company_id, company_name, name, title, email, linkedin, source, created_at))
+        INSERT INTO contacts (company_id, company_name, name, title, email, linkedin, source, created_at, normalized_name)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ''', (company_id, company_name, name, title, email, linkedin, source, created_at, normalize_company_name(company_name)))
     contact_id = c.lastrowid
     conn.commit()
     conn.close()
@@ -217,7 +241,7 @@ def insert_contact(company_id, company_name, name, title, email, linkedin, sourc
 
 def get_contacts_by_company(company_id):
     """Get all contacts for a given company_id"""
-    conn = sqlite3.connect(DB_PATH)
+    conn = connect(DB_PATH)
     c = conn.cursor()
     c.execute('SELECT * FROM contacts WHERE company_id = ?', (company_id,))
     rows = c.fetchall()
@@ -227,7 +251,7 @@ def get_contacts_by_company(company_id):
 
 def get_available_countries():
     """Return sorted list of all countries present in the companies table"""
-    conn = sqlite3.connect(DB_PATH)
+    conn = connect(DB_PATH)
     c = conn.cursor()
     c.execute('SELECT DISTINCT country FROM companies WHERE country IS NOT NULL AND country != ""')
     countries = [row[0].strip() for row in c.fetchall() if row[0]]
@@ -236,7 +260,7 @@ def get_available_countries():
 
 def get_all_contacts():
     """Return all contacts (potential buyers) as a list of dicts"""
-    conn = sqlite3.connect(DB_PATH)
+    conn = connect(DB_PATH)
     c = conn.cursor()
     c.execute('SELECT * FROM contacts')
     rows = c.fetchall()
@@ -244,9 +268,12 @@ def get_all_contacts():
     conn.close()
     return [dict(zip(columns, row)) for row in rows] 
 
+_deepseek_table_ready = False
+_fts_available = False
+
 def init_deepseek_results_table():
     """Initialize the deepseek_buyer_search_results table"""
-    conn = sqlite3.connect(DB_PATH)
+    conn = connect(DB_PATH)
     c = conn.cursor()
     c.execute('''
         CREATE TABLE IF NOT EXISTS deepseek_buyer_search_results (
@@ -263,50 +290,93 @@ def init_deepseek_results_table():
             UNIQUE(hs_code, keyword, country, company_name)
         )
     ''')
+    # The UNIQUE index serves hs_code-first filters; these cover keyword/country-only
+    # filters and the newest-first listing
+    c.execute('CREATE INDEX IF NOT EXISTS idx_deepseek_results_created ON deepseek_buyer_search_results (created_at)')
+    c.execute('CREATE INDEX IF NOT EXISTS idx_deepseek_results_country ON deepseek_buyer_search_results (country, created_at)')
+    c.execute('CREATE INDEX IF NOT EXISTS idx_deepseek_results_keyword ON deepseek_buyer_search_results (keyword, created_at)')
+    c.execute('CREATE INDEX IF NOT EXISTS idx_deepseek_results_company_country ON deepseek_buyer_search_results (company_country)')
+    # Sort indexes for the paged view, (column) for all countries and (company_country, column)
+    # for one; the rowid is the implicit last column of an index, so they match ORDER BY column, id
+    for column in sorted(DEEPSEEK_SORT_COLUMNS - {'id', 'company_country'}):
+        if column != 'created_at':  # idx_deepseek_results_created
+            c.execute(f'CREATE INDEX IF NOT EXISTS idx_deepseek_results_sort_{column} ON deepseek_buyer_search_results ({column})')
+        c.execute(f'CREATE INDEX IF NOT EXISTS idx_deepseek_results_country_sort_{column} '
+                  f'ON deepseek_buyer_search_results (company_country, {column})')
+    add_normalized_name_column(conn, 'deepseek_buyer_search_results', index_columns=('company_country',))
+    global _deepseek_table_ready, _fts_available
+    _fts_available = _init_deepseek_results_fts(c)
     conn.commit()
     conn.close()
+    _deepseek_table_ready = True
+
+def _init_deepseek_results_fts(c) -> bool:
+    """
+    Create the FTS5 index over deepseek_buyer_search_results (an external-content table,
+    so the text is not stored twice) and the triggers that keep it in sync.
+    A newly created index is filled from the existing rows. Returns False if this SQLite
+    build has no FTS5, in which case searches fall back to LIKE.
+    """
+    c.execute("SELECT 1 FROM sqlite_master WHERE name = 'deepseek_results_fts'")
+    exists = c.fetchone() is not None
+    try:
+        c.execute('''
+            CREATE VIRTUAL TABLE IF NOT EXISTS deepseek_results_fts USING fts5(
+                company_name, description, hs_code, keyword,
+                content='deepseek_buyer_search_results', content_rowid='id',
+                tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+            )
+        ''')
+    except sqlite3.OperationalError as e:
+        print(f"Full-text search unavailable, using LIKE search: {e}")
+        return False
+    c.execute('''
+        CREATE TRIGGER IF NOT EXISTS deepseek_results_fts_ai AFTER INSERT ON deepseek_buyer_search_results BEGIN
+            INSERT INTO deepseek_results_fts (rowid, company_name, description, hs_code, keyword)
+            VALUES (new.id, new.company_name, new.description, new.hs_code, new.keyword);
+        END
+    ''')
+    c.execute('''
+        CREATE TRIGGER IF NOT EXISTS deepseek_results_fts_ad AFTER DELETE ON deepseek_buyer_search_results BEGIN
+            INSERT INTO deepseek_results_fts (deepseek_results_fts, rowid, company_name, description, hs_code, keyword)
+            VALUES ('delete', old.id, old.company_name, old.description, old.hs_code, old.keyword);
+        END
+    ''')
+    c.execute('''
+        CREATE TRIGGER IF NOT EXISTS deepseek_results_fts_au AFTER UPDATE ON deepseek_buyer_search_results BEGIN
+            INSERT INTO deepseek_results_fts (deepseek_results_fts, rowid, company_name, description, hs_code, keyword)
+            VALUES ('delete', old.id, old.company_name, old.description, old.hs_code, old.keyword);
+            INSERT INTO deepseek_results_fts (rowid, company_name, description, hs_code, keyword)
+            VALUES (new.id, new.company_name, new.description, new.hs_code, new.keyword);
+        END
+    ''')
+    if not exists:
+        c.execute("INSERT INTO deepseek_results_fts (deepseek_results_fts) VALUES ('rebuild')")
+    return True
+
+def _ensure_deepseek_results_table():
+    # The CREATE TABLE only needs to run once per process
+    if not _deepseek_table_ready:
+        init_deepseek_results_table()
 
-def insert_deepseek_results(hs_code: str, keyword: str, country: str, companies: List[Dict]):
+def insert_deepseek_results(hs_code: str, keyword: str, country: str, companies: Iterable[Dict]) -> int:
     """
     Insert DeepSeek buyer search results into the database.
     Each company dict should have: company_name, company_country, company_website_link, description
+    Returns the number of new rows saved (duplicates are skipped).
     """
-    init_deepseek_results_table()
-    conn = sqlite3.connect(DB_PATH)
-    c = conn.cursor()
-    
-    saved_count = 0
-    for company in companies:
-        try:
-            c.execute('''
-                INSERT OR IGNORE INTO deepseek_buyer_search_results
-                (hs_code, keyword, country, company_name, company_country, company_website_link, description, source)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                hs_code,
-                keyword,
-                country,
-                company.get('company_name', ''),
-                company.get('company_country', ''),
-                company.get('company_website_link', ''),
-                company.get('description', ''),
-                'DeepSeek'
-            ))
-            if c.rowcount > 0:
-                saved_count += 1
-        except Exception as e:
-            print(f"Error inserting company {company.get('company_name', '')}: {e}")
-    
-    conn.commit()
-    conn.close()
-    return saved_count
+    _ensure_deepseek_results_table()
+    counts = bulk_insert_companies('deepseek_buyer_search_results', companies,
+                                   {'hs_code': hs_code, 'keyword': keyword, 'country': country},
+                                   source='DeepSeek', db_path=DB_PATH)
+    return counts['inserted']
 
 def get_deepseek_results(hs_code: Optional[str] = None, keyword: Optional[str] = None, country: Optional[str] = None) -> List[Dict]:
     """
     Get DeepSeek buyer search results with optional filters
     """
-    init_deepseek_results_table()
-    conn = sqlite3.connect(DB_PATH)
+    _ensure_deepseek_results_table()
+    conn = connect(DB_PATH)
     c = conn.cursor()
     
     query = 'SELECT * FROM deepseek_buyer_search_results WHERE 1=1'
@@ -337,8 +407,8 @@ def get_all_deepseek_results() -> List[Dict]:
 
 def get_deepseek_result_by_id(record_id: int) -> Optional[Dict]:
     """Get a specific DeepSeek result by ID"""
-    init_deepseek_results_table()
-    conn = sqlite3.connect(DB_PATH)
+    _ensure_deepseek_results_table()
+    conn = connect(DB_PATH)
     c = conn.cursor()
     c.execute('SELECT * FROM deepseek_buyer_search_results WHERE id = ?', (record_id,))
     row = c.fetchone()
@@ -348,20 +418,22 @@ def get_deepseek_result_by_id(record_id: int) -> Optional[Dict]:
         return dict(zip(columns, row))
     return None
 
+@invalidates('deepseek_buyer_search_results')
 def update_deepseek_result(record_id: int, updated_fields: dict) -> bool:
     """
     Update a DeepSeek result by its ID. updated_fields is a dict of column:value pairs to update.
     Returns True if a record was updated, False otherwise.
     """
     allowed_fields = {'hs_code', 'keyword', 'country', 'company_name', 'company_country', 'company_website_link', 'description', 'source'}
-    set_clause = ', '.join([f"{k} = ?" for k in updated_fields if k in allowed_fields])
-    values = [updated_fields[k] for k in updated_fields if k in allowed_fields]
+    updated_fields = with_normalized_name({k: v for k, v in updated_fields.items() if k in allowed_fields})
+    set_clause = ', '.join([f"{k} = ?" for k in updated_fields])
+    values = list(updated_fields.values())
     if not set_clause:
         return False
     values.append(record_id)
     
-    init_deepseek_results_table()
-    conn = sqlite3.connect(DB_PATH)
+    _ensure_deepseek_results_table()
+    conn = connect(DB_PATH)
     c = conn.cursor()
     c.execute(f'UPDATE deepseek_buyer_search_results SET {set_clause} WHERE id = ?', values)
     conn.commit()
@@ -369,10 +441,11 @@ def update_deepseek_result(record_id: int, updated_fields: dict) -> bool:
     conn.close()
     return updated
 
+@invalidates('deepseek_buyer_search_results')
 def delete_deepseek_result(record_id: int) -> bool:
     """Delete a DeepSeek result by its ID. Returns True if deleted, False otherwise."""
-    init_deepseek_results_table()
-    conn = sqlite3.connect(DB_PATH)
+    _ensure_deepseek_results_table()
+    conn = connect(DB_PATH)
     c = conn.cursor()
     c.execute('DELETE FROM deepseek_buyer_search_results WHERE id = ?', (record_id,))
     conn.commit()
@@ -384,8 +457,8 @@ def get_deepseek_results_by_search(search_term: Optional[str] = None) -> List[Di
     """
     Get DeepSeek results filtered by search term (searches in company_name, description, hs_code, keyword)
     """
-    init_deepseek_results_table()
-    conn = sqlite3.connect(DB_PATH)
+    _ensure_deepseek_results_table()
+    conn = connect(DB_PATH)
     c = conn.cursor()
     
     if search_term:
@@ -402,13 +475,212 @@ def get_deepseek_results_by_search(search_term: Optional[str] = None) -> List[Di
     conn.close()
     
     columns = ['id', 'hs_code', 'keyword', 'country', 'company_name', 'company_country', 'company_website_link', 'description', 'source', 'created_at']
-    return [dict(zip(columns, row)) for row in rows] 
+    return [dict(zip(columns, row)) for row in rows]
+
+# bm25 column weights for (company_name, description, hs_code, keyword): name matches rank first
+FTS_WEIGHTS = (10.0, 1.0, 5.0, 5.0)
+# Columns search_deepseek_results returns
+DEEPSEEK_RESULT_COLUMNS = ['id', 'hs_code', 'keyword', 'country', 'company_name', 'company_country',
+                           'company_website_link', 'description', 'source', 'created_at']
+
+def build_fts_query(search_term: str) -> str:
+    """
+    Turn free text into an FTS5 query: every word must match as a prefix
+    ('nitr glov' -> '"nitr"* AND "glov"*'). Returns '' if the text has no searchable words.
+    """
+    tokens = re.findall(r'\w+', search_term)
+    return ' AND '.join(f'"{token}"*' for token in tokens)
+
+def search_deepseek_results(search_term: str, limit: Optional[int] = None, offset: int = 0,
+                            company_country: Optional[str] = None) -> List[Dict]:
+    """
+    Full-text search over company_name, description, hs_code and keyword, best matches
+    first (bm25). Words match as prefixes, so results update sensibly while typing.
+    limit/offset page through the ranked matches; company_country narrows them.
+    Falls back to get_deepseek_results_by_search (LIKE) if FTS5 is unavailable.
+    """
+    _ensure_deepseek_results_table()
+    fts_query = build_fts_query(search_term or '')
+    if not _fts_available or not fts_query:
+        results = get_deepseek_results_by_search(search_term)
+        if company_country:
+            results = [r for r in results if r.get('company_country') == company_country]
+        return results[offset:offset + limit] if limit else results[offset:]
+    conn = connect(DB_PATH)
+    c = conn.cursor()
+    sql = f'''
+        SELECT {', '.join('r.' + column for column in DEEPSEEK_RESULT_COLUMNS)} FROM deepseek_results_fts
+        JOIN deepseek_buyer_search_results r ON r.id = deepseek_results_fts.rowid
+        WHERE deepseek_results_fts MATCH ?
+    '''
+    params = [fts_query]
+    if company_country:
+        sql += ' AND r.company_country = ?'
+        params.append(company_country)
+    sql += f" ORDER BY bm25(deepseek_results_fts, {', '.join(str(w) for w in FTS_WEIGHTS)})"
+    if limit:
+        sql += ' LIMIT ? OFFSET ?'
+        params.extend([limit, offset])
+    c.execute(sql, params)
+    rows = c.fetchall()
+    conn.close()
+    return [dict(zip(DEEPSEEK_RESULT_COLUMNS, row)) for row in rows]
+
+# Columns the paged views may sort on (each has a sort index); anything else falls back to id
+DEEPSEEK_SORT_COLUMNS = {'id', 'hs_code', 'keyword', 'country', 'company_name', 'company_country', 'company_website_link', 'created_at'}
+DEEPSEEK_NOT_NULL_COLUMNS = {'id', 'hs_code', 'keyword', 'country', 'company_name'}
+CONTACT_SORT_COLUMNS = {'id', 'name', 'title', 'email', 'linkedin', 'company_name', 'source', 'created_at'}
+
+def keyset_page_queries(table: str, where: List[str], params: List, sort_column: str, descending: bool,
+                        after: Optional[tuple], nullable: bool = True) -> List[Tuple[str, List]]:
+    """
+    (sql, params) of the queries that read the rows following `after` (the (sort value, id)
+    of the last row already shown) in ORDER BY sort_column, id, without the LIMIT value.
+    The sort column is compared bare so its (sort_column) / (company_country, sort_column)
+    index serves both the seek and the order. NULLs sort first ascending and last
+    descending, so a page can span the NULL and non-NULL runs: each run is its own query,
+    read in order until the page is full. nullable=False (a NOT NULL column) skips the NULL run.
+    """
+    op = '<' if descending else '>'
+    direction = 'DESC' if descending else 'ASC'
+    if after is None:
+        runs = [([], [])]
+    elif sort_column == 'id':
+        runs = [([f'id {op} ?'], [after[1]])]
+    elif after[0] is None:
+        runs = [([f'{sort_column} IS NULL', f'id {op} ?'], [after[1]])]
+        if not descending:
+            runs.append(([f'{sort_column} IS NOT NULL'], []))
+    else:
+        runs = [([f'({sort_column}, id) {op} (?, ?)'], list(after))]
+        if descending and nullable:
+            runs.append(([f'{sort_column} IS NULL'], []))
+    queries = []
+    for conditions, run_params in runs:
+        sql = f'SELECT * FROM {table}'
+        if where or conditions:
+            sql += ' WHERE ' + ' AND '.join(list(where) + conditions)
+        # Within the NULL run only id orders the rows
+        if sort_column == 'id' or f'{sort_column} IS NULL' in conditions:
+            order = f'id {direction}'
+        else:
+            order = f'{sort_column} {direction}, id {direction}'
+        queries.append((f'{sql} ORDER BY {order} LIMIT ?', list(params) + run_params))
+    return queries
+
+def _keyset_page(table: str, where: List[str], params: List, sort_column: str, descending: bool,
+                 after: Optional[tuple], limit: int, nullable: bool = True) -> List[Dict]:
+    """
+    One page of `table` ordered by (sort_column, id) using keyset pagination: the queries
+    seek straight to the row after `after` instead of counting through an OFFSET.
+    """
+    conn = connect(DB_PATH)
+    c = conn.cursor()
+    rows = []
+    for sql, query_params in keyset_page_queries(table, where, params, sort_column, descending, after, nullable):
+        c.execute(sql, query_params + [limit - len(rows)])
+        columns = [desc[0] for desc in c.description]
+        rows += [dict(zip(columns, row)) for row in c.fetchall()]
+        if len(rows) >= limit:
+            break
+    conn.close()
+    return rows
+
+def _count_rows(table: str, where: List[str], params: List) -> int:
+    conn = connect(DB_PATH)
+    c = conn.cursor()
+    sql = f'SELECT COUNT(*) FROM {table}'
+    if where:
+        sql += ' WHERE ' + ' AND '.join(where)
+    c.execute(sql, params)
+    count = c.fetchone()[0]
+    conn.close()
+    return count
+
+def _deepseek_filters(company_country: Optional[str]):
+    if company_country:
+        return ['company_country = ?'], [company_country]
+    return [], []
+
+def get_deepseek_results_page(company_country: Optional[str] = None, sort_column: str = 'id', descending: bool = False,
+                              after: Optional[tuple] = None, limit: int = 50) -> List[Dict]:
+    """
+    One page of DeepSeek results (optionally for one company country), sorted in SQL.
+    Pass the (sort value, id) of the previous page's last row as `after` to get the next page.
+    """
+    _ensure_deepseek_results_table()
+    if sort_column not in DEEPSEEK_SORT_COLUMNS:
+        sort_column = 'id'
+    where, params = _deepseek_filters(company_country)
+    return _keyset_page('deepseek_buyer_search_results', where, params, sort_column, descending, after, limit,
+                        nullable=sort_column not in DEEPSEEK_NOT_NULL_COLUMNS)
+
+def count_deepseek_results(company_country: Optional[str] = None) -> int:
+    _ensure_deepseek_results_table()
+    where, params = _deepseek_filters(company_country)
+    return _count_rows('deepseek_buyer_search_results', where, params)
+
+def get_deepseek_result_countries() -> List[str]:
+    """Distinct company countries that have DeepSeek results."""
+    _ensure_deepseek_results_table()
+    conn = connect(DB_PATH)
+    c = conn.cursor()
+    c.execute("SELECT DISTINCT company_country FROM deepseek_buyer_search_results WHERE company_country IS NOT NULL AND company_country != '' ORDER BY company_country")
+    countries = [row[0] for row in c.fetchall()]
+    conn.close()
+    return countries
+
+def _contact_filters(search_term: Optional[str], company_name: Optional[str]):
+    where, params = [], []
+    if company_name:
+        where.append('company_name = ?')
+        params.append(company_name)
+    if search_term:
+        pattern = f'%{search_term}%'
+        where.append('(name LIKE ? OR company_name LIKE ? OR email LIKE ?)')
+        params.extend([pattern, pattern, pattern])
+    return where, params
+
+def get_contacts_page(search_term: Optional[str] = None, company_name: Optional[str] = None, sort_column: str = 'id',
+                      descending: bool = False, after: Optional[tuple] = None, limit: int = 50) -> List[Dict]:
+    """
+    One page of contacts filtered by company and a name/company/email search, sorted in SQL.
+    Pass the (sort value, id) of the previous page's last row as `after` to get the next page.
+    """
+    if sort_column not in CONTACT_SORT_COLUMNS:
+        sort_column = 'id'
+    where, params = _contact_filters(search_term, company_name)
+    return _keyset_page('contacts', where, params, sort_column, descending, after, limit)
+
+def count_contacts(search_term: Optional[str] = None, company_name: Optional[str] = None) -> int:
+    where, params = _contact_filters(search_term, company_name)
+    return _count_rows('contacts', where, params)
+
+def get_contact_by_id(contact_id: int) -> Optional[Dict]:
+    conn = connect(DB_PATH)
+    c = conn.cursor()
+    c.execute('SELECT * FROM contacts WHERE id = ?', (contact_id,))
+    row = c.fetchone()
+    columns = [desc[0] for desc in c.description]
+    conn.close()
+    return dict(zip(columns, row)) if row else None
+
+def get_contact_company_names() -> List[str]:
+    """Distinct company names that have contacts."""
+    conn = connect(DB_PATH)
+    c = conn.cursor()
+    c.execute("SELECT DISTINCT company_name FROM contacts WHERE company_name IS NOT NULL AND company_name != '' ORDER BY company_name")
+    names = [row[0] for row in c.fetchall()]
+    conn.close()
+    return names
 
+@invalidates('contacts')
 def update_contact(contact_id, updated_fields):
     """Update a contact by id. updated_fields is a dict of column:value."""
     allowed_fields = {'name', 'title', 'email', 'linkedin', 'company_name'}
-    set_clause = ', '.join([f"{k} = ?" for k in updated_fields if k in allowed_fields])
-    values = [updated_fields[k] for k in updated_fields if k in allowed_fields]
+    updated_fields = with_normalized_name({k: v for k, v in updated_fields.items() if k in allowed_fields})
+    set_clause = ', '.join([f"{k} = ?" for k in updated_fields])
+    values = list(updated_fields.values())
     if not set_clause:
         print(f"[DEBUG] No valid fields to update for contact_id={contact_id}.")
         return False
@@ -416,7 +688,7 @@ def update_contact(contact_id, updated_fields):
     sql = f'UPDATE contacts SET {set_clause} WHERE id = ?'
     print(f"[DEBUG] Executing SQL: {sql}")
     print(f"[DEBUG] With values: {values}")
-    conn = sqlite3.connect(DB_PATH)
+    conn = connect(DB_PATH)
     c = conn.cursor()
     try:
         c.execute(sql, values)
@@ -429,12 +701,13 @@ def update_contact(contact_id, updated_fields):
     conn.close()
     return updated
 
+@invalidates('contacts')
 def delete_contact(contact_id):
     """Delete a contact by id."""
     sql = 'DELETE FROM contacts WHERE id = ?'
     print(f"[DEBUG] Executing SQL: {sql}")
     print(f"[DEBUG] With contact_id: {contact_id}")
-    conn = sqlite3.connect(DB_PATH)
+    conn = connect(DB_PATH)
     c = conn.cursor()
     try:
         c.execute(sql, (contact_id,))
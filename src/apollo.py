@@ -1,8 +1,14 @@
 import re
+import sys
+import json
+import threading
 from typing import Optional, List, Dict
 import os
 import requests
 from dotenv import load_dotenv
+from rate_limiter import call_with_retry, SingleFlight, RETRYABLE_STATUSES
+from response_cache import ResponseCache, make_cache_key
+from db_apollo import LOCKED_EMAIL, get_revealed_emails, save_revealed_emails
 
 dotenv_path = os.path.join(os.path.dirname(__file__), '..', 'config', '.env')
 load_dotenv(dotenv_path)
@@ -11,7 +17,7 @@ APOLLO_API_KEY = os.getenv("APOLLO_API_KEY")
 if APOLLO_API_KEY:
     pass
 
-APOLLO_BASE_URL = "https://api.apollo.io/v1"
+APOLLO_BASE_URL = os.getenv("APOLLO_BASE_URL", "https://api.apollo.io/api/v1")
 
 ROLE_KEYWORDS = [
     "procurement", "import", "supply chain", "purchasing",
@@ -25,10 +31,87 @@ LEGAL_SUFFIXES = [
     r"sp z o\.o\.", r"spolka z ograniczona odpowiedzialnoscia"
 ]
 
+# people/bulk_match enriches at most 10 people per request
+BULK_MATCH_SIZE = 10
+
+# Endpoints that spend reveal credits: apollo_post only retries them after a 429
+CREDIT_PATHS = {"people/match", "people/bulk_match"}
+
+# Identical requests already in flight (same endpoint and body) share one HTTP call, so
+# concurrent lookups of the same company or email reveal cost one request and one credit
+_inflight = SingleFlight()
+
+_people_cache = None
+_domain_cache = None
+_cache_lock = threading.Lock()
+
+def get_people_cache() -> Optional[ResponseCache]:
+    """
+    Return the on-disk cache of decision-maker searches, or None if disabled with
+    APOLLO_CACHE_ENABLED=false. TTL comes from APOLLO_CACHE_TTL (seconds, default 7 days).
+    """
+    global _people_cache
+    if os.getenv('APOLLO_CACHE_ENABLED', 'true').lower() in ('0', 'false', 'no'):
+        return None
+    if _people_cache is None:
+        with _cache_lock:
+            if _people_cache is None:
+                _people_cache = ResponseCache(table='apollo_people_cache',
+                                              ttl=float(os.getenv('APOLLO_CACHE_TTL', str(7 * 24 * 3600))))
+    return _people_cache
+
+def get_domain_cache() -> Optional[ResponseCache]:
+    """
+    Return the cache of domains resolved by the company-search fallback ('' when none was
+    found), or None if Apollo caching is disabled. TTL comes from APOLLO_DOMAIN_CACHE_TTL
+    (seconds, default 90 days).
+    """
+    global _domain_cache
+    if os.getenv('APOLLO_CACHE_ENABLED', 'true').lower() in ('0', 'false', 'no'):
+        return None
+    if _domain_cache is None:
+        with _cache_lock:
+            if _domain_cache is None:
+                _domain_cache = ResponseCache(table='apollo_resolved_domains',
+                                              ttl=float(os.getenv('APOLLO_DOMAIN_CACHE_TTL', str(90 * 24 * 3600))))
+    return _domain_cache
+
+def apollo_headers() -> Dict:
+    return {
+        "accept": "application/json",
+        "Cache-Control": "no-cache",
+        "Content-Type": "application/json",
+        "x-api-key": APOLLO_API_KEY
+    }
+
+def apollo_post(path: str, body: Dict, timeout: Optional[float] = 20, retry: Optional[bool] = None) -> requests.Response:
+    """
+    POST to an Apollo endpoint (e.g. 'mixed_people/search') under the shared 'apollo' rate limiter.
+    429/5xx responses and connection errors are retried with jittered backoff (honoring Retry-After);
+    the final response is returned so callers can check the status. Concurrent calls with the
+    same path and body share a single request.
+    With retry=False (the default for CREDIT_PATHS) only 429s are retried: after a 5xx or a
+    timeout Apollo may already have charged for the request.
+    """
+    path = path.lstrip('/')
+    if retry is None:
+        retry = path not in CREDIT_PATHS
+    url = f"{APOLLO_BASE_URL}/{path}"
+    return _inflight.do((url, json.dumps(body, sort_keys=True)), lambda: call_with_retry(
+        'apollo',
+        lambda: requests.post(url, headers=apollo_headers(), json=body, timeout=timeout),
+        retry_exceptions=(requests.ConnectionError, requests.Timeout) if retry else (),
+        retry_statuses=RETRYABLE_STATUSES if retry else {429}
+    ))
+
+# Compiled once; clean_company_name runs for every company searched
+_LEGAL_SUFFIX_RE = re.compile(r"\b(?:" + "|".join(LEGAL_SUFFIXES) + r")\b", re.IGNORECASE)
+_SPACE_RE = re.compile(r"\s+")
+
 def clean_company_name(company_name: str) -> str:
-    pattern = re.compile(r"\b(?:" + "|".join(LEGAL_SUFFIXES) + r")\b", re.IGNORECASE)
-    cleaned = pattern.sub("", company_name)
-    return re.sub(r"\s+", " ", cleaned).strip()
+    """Company name with legal suffixes removed, case kept (used as the Apollo search term)."""
+    cleaned = _LEGAL_SUFFIX_RE.sub("", company_name)
+    return _SPACE_RE.sub(" ", cleaned).strip()
 
 def is_valid_domain(domain: str) -> bool:
     if not domain:
@@ -56,49 +139,111 @@ def get_linkedin_url(person: Dict) -> str:
                 return link
     return ""
 
+def _person_email(person: Dict) -> str:
+    # Try to get the most accurate email field
+    email = person.get("email") or person.get("personal_email") or person.get("work_email")
+    return "" if not email or email == LOCKED_EMAIL else email
+
 def reveal_email_apollo(person_id: str) -> str:
-    """Reveal the email for a person using Apollo enrichment API (consumes credits)."""
+    """Reveal the email for a person using Apollo enrichment API (consumes credits unless cached)."""
+    cached = get_revealed_emails([person_id])
+    if person_id in cached:
+        return cached[person_id]
     if not APOLLO_API_KEY:
-        print("[red]Apollo.io API key not found in environment! Cannot reveal email.[/red]")
+        print("[red]Apollo.io API key not found in environment! Cannot reveal email.[/red]", file=sys.stderr)
         return ""
-    url = f"https://api.apollo.io/v1/people/match"
-    headers = {
-        "accept": "application/json",
-        "Cache-Control": "no-cache",
-        "Content-Type": "application/json",
-        "x-api-key": APOLLO_API_KEY
-    }
     body = {
         "person_id": person_id,
         "reveal_personal_emails": True
     }
     try:
-        resp = requests.post(url, headers=headers, json=body, timeout=20)
+        resp = apollo_post("people/match", body)
         resp.raise_for_status()
         data = resp.json()
-        # Try to get the most accurate email field
-        person = data.get("person", {})
-        email = person.get("email") or person.get("personal_email") or person.get("work_email")
-        return email or ""
+        person = data.get("person") or {}
+        email = _person_email(person)
+        if person:
+            save_revealed_emails({person_id: email})
+        return email
     except Exception as e:
-        print(f"[red]Error revealing email for person_id {person_id}: {e}[/red]")
+        print(f"[red]Error revealing email for person_id {person_id}: {e}[/red]", file=sys.stderr)
         return ""
 
-def find_decision_makers_apollo(company_name: str, country: str, website: Optional[str] = None) -> List[Dict]:
+def reveal_emails_apollo(person_ids: List[str]) -> Dict[str, str]:
+    """
+    Reveal emails for many people with people/bulk_match, BULK_MATCH_SIZE per request.
+    Reveals already paid for come from the email_reveals cache; new ones are added to it.
+    Returns {person_id: email} ('' if Apollo has no email); ids that could not be
+    revealed (no match or a failed request) are absent.
+    """
+    person_ids = list(dict.fromkeys(pid for pid in person_ids if pid))
+    emails = get_revealed_emails(person_ids)
+    missing = [pid for pid in person_ids if pid not in emails]
+    if missing and not APOLLO_API_KEY:
+        print("[red]Apollo.io API key not found in environment! Cannot reveal emails.[/red]", file=sys.stderr)
+        return emails
+    for start in range(0, len(missing), BULK_MATCH_SIZE):
+        chunk = missing[start:start + BULK_MATCH_SIZE]
+        body = {
+            "details": [{"id": pid} for pid in chunk],
+            "reveal_personal_emails": True
+        }
+        try:
+            resp = apollo_post("people/bulk_match", body)
+            resp.raise_for_status()
+            matches = resp.json().get("matches") or []
+        except Exception as e:
+            print(f"[red]Error revealing emails for {len(chunk)} people: {e}[/red]", file=sys.stderr)
+            continue
+        revealed = {}
+        for person in matches:
+            if person and person.get("id") in chunk:
+                revealed[person["id"]] = _person_email(person)
+        save_revealed_emails(revealed)
+        emails.update(revealed)
+    return emails
+
+def _search_people(body: Dict) -> List[Dict]:
+    resp = apollo_post("mixed_people/search", body)
+    resp.raise_for_status()
+    return filter_people_by_role(resp.json().get("people", []))
+
+def _resolve_domain(cleaned_name: str, country: str) -> str:
+    """Domain of the best company-search match ('' if it has no valid one)."""
+    company_body = {
+        "q_organization_name": cleaned_name,
+        "organization_locations": country,
+        "page": 1,
+        "per_page": 1
+    }
+    c_resp = apollo_post("mixed_companies/search", company_body)
+    c_resp.raise_for_status()
+    companies = c_resp.json().get("organizations", [])
+    if companies and companies[0].get("website_url"):
+        domain = companies[0]["website_url"].replace("https://", "").replace("http://", "").split("/")[0]
+        if is_valid_domain(domain):
+            return domain
+    return ""
+
+def find_decision_makers_apollo(company_name: str, country: str, website: Optional[str] = None,
+                                reveal: bool = True, force_refresh: bool = False) -> List[Dict]:
+    """
+    Decision makers at a company as [{'name', 'title', 'email', 'linkedin'}]. Locked emails
+    are revealed in one bulk request; with reveal=False they are left locked and the contact
+    gets a 'person_id' so the caller can batch reveals across companies (reveal_emails_apollo).
+
+    The people found are cached per (cleaned name, country, domain, titles), and a domain
+    resolved by the company-search fallback is remembered so later searches for the company
+    go straight to the domain-filtered query. force_refresh=True ignores both caches (and
+    replaces the cached entries with the fresh results).
+    """
     if not APOLLO_API_KEY:
-        print("[red]Apollo.io API key not found in environment![/red]")
+        print("[red]Apollo.io API key not found in environment![/red]", file=sys.stderr)
         return []
 
     cleaned_name = clean_company_name(company_name)
     valid_website = website if is_valid_domain(website or "") else None
 
-    headers = {
-        "accept": "application/json",
-        "Cache-Control": "no-cache",
-        "Content-Type": "application/json",
-        "x-api-key": APOLLO_API_KEY
-    }
-
     body = {
         "q_organization_name": cleaned_name,
         "organization_locations": country,
@@ -107,56 +252,63 @@ def find_decision_makers_apollo(company_name: str, country: str, website: Option
         "per_page": 10
     }
 
+    domain = None
     if valid_website:
         domain = valid_website.replace("https://", "").replace("http://", "").split("/")[0]
         body["organization_domains"] = domain
 
+    people_cache = get_people_cache()
+    domain_cache = get_domain_cache()
+    people_key = make_cache_key("mixed_people/search", cleaned_name.lower(), (country or "").strip().lower(),
+                                (domain or "").lower(), sorted(ROLE_KEYWORDS))
+    domain_key = make_cache_key("resolved_domain", cleaned_name.lower(), (country or "").strip().lower())
+
     try:
-        resp = requests.post("https://api.apollo.io/api/v1/mixed_people/search", headers=headers, json=body, timeout=20)
-        resp.raise_for_status()
-        data = resp.json()
-        people = data.get("people", [])
-        filtered = filter_people_by_role(people)
-
-        if not filtered and not valid_website:
-            # Fallback: try to get domain from /mixed_companies/search
-            company_body = {
-                "q_organization_name": cleaned_name,
-                "organization_locations": country,
-                "page": 1,
-                "per_page": 1
-            }
-            c_resp = requests.post("https://api.apollo.io/api/v1/mixed_companies/search", headers=headers, json=company_body, timeout=20)
-            c_resp.raise_for_status()
-            c_data = c_resp.json()
-            companies = c_data.get("organizations", [])
-            if companies and companies[0].get("website_url"):
-                domain = companies[0]["website_url"].replace("https://", "").replace("http://", "").split("/")[0]
-                if is_valid_domain(domain):
-                    body["organization_domains"] = domain
-                    resp2 = requests.post("https://api.apollo.io/api/v1/mixed_people/search", headers=headers, json=body, timeout=20)
-                    resp2.raise_for_status()
-                    data2 = resp2.json()
-                    people = data2.get("people", [])
-                    filtered = filter_people_by_role(people)
+        cached = people_cache.get(people_key) if people_cache and not force_refresh else None
+        if cached is not None:
+            filtered = json.loads(cached)
+        else:
+            resolved = None
+            if not domain and domain_cache and not force_refresh:
+                resolved = domain_cache.get(domain_key)
+            if resolved:
+                # Domain found by an earlier fallback: go straight to the domain-filtered query
+                body["organization_domains"] = resolved
+                filtered = _search_people(body)
+            else:
+                filtered = _search_people(body)
+                if not filtered and not domain and resolved is None:
+                    # Fallback: try to get domain from /mixed_companies/search
+                    resolved = _resolve_domain(cleaned_name, country)
+                    if domain_cache:
+                        domain_cache.set(domain_key, resolved)
+                    if resolved:
+                        body["organization_domains"] = resolved
+                        filtered = _search_people(body)
+            if people_cache:
+                people_cache.set(people_key, json.dumps(filtered))
+
+        # Locked emails (with an id to reveal them by) are revealed together
+        locked = [person["id"] for person in filtered if person.get("email") == LOCKED_EMAIL and person.get("id")]
+        revealed = reveal_emails_apollo(locked) if reveal and locked else {}
 
         # Format results
         results = []
         for person in filtered:
             email = person.get("email", "")
-            # Try to reveal email if not unlocked and id is present
-            if email == "email_not_unlocked@domain.com" and person.get("id"):
-                revealed_email = reveal_email_apollo(person["id"])
-                if revealed_email:
-                    email = revealed_email
-            results.append({
+            contact = {
                 "name": f"{person.get('first_name', '')} {person.get('last_name', '')}",
                 "title": person.get("title", ""),
-                "email": email,
+                "email": revealed.get(person.get("id")) or email,
                 "linkedin": get_linkedin_url(person)
-            })
+            }
+            if not reveal and email == LOCKED_EMAIL and person.get("id"):
+                contact["person_id"] = person["id"]
+            results.append(contact)
         return results
 
     except Exception as e:
-        print(f"[red]Error contacting Apollo.io: {e}[/red]")
-        return []
+        # Surface the failure (after retries) instead of returning an empty list,
+        # so callers can tell "no decision makers" apart from "request failed".
+        print(f"[red]Error contacting Apollo.io: {e}[/red]", file=sys.stderr)
+        raise
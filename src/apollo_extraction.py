@@ -2,19 +2,20 @@ import typer
 from rich.console import Console
 import sys
 import os
-import requests
 from rich.prompt import Prompt
 from rich.table import Table
-from rich.progress import Progress, SpinnerColumn, TextColumn
+from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, MofNCompleteColumn, TimeElapsedColumn
 import sqlite3
 from datetime import datetime
 import json
 
 # Add parent directory to path for imports
 sys.path.append("..")
-from db_apollo import init_apollo_db, insert_company
-from db_apollo import count_companies
+from db_apollo import init_apollo_db, insert_companies, insert_contacts
+from db_apollo import count_companies, get_resumable_extraction_jobs, get_companies_by_country, get_company_ids_with_contacts
 from apollo import APOLLO_API_KEY
+from apollo_pipeline import start_extraction_job, run_extraction_job, describe_job
+from apollo_pipeline import extract_decision_makers, company_key, DEFAULT_CONCURRENCY
 
 app = typer.Typer()
 console = Console()
@@ -113,77 +114,107 @@ def apollo_company_extraction():
     if not api_key:
         console.print("[red]APOLLO_API_KEY environment variable not set![/red]")
         return
-    headers = {"Cache-Control": "no-cache", "Content-Type": "application/json", "x-api-key": api_key}
     initial_count = count_companies()
     console.print(f"[yellow]Initial companies in database: {initial_count}[/yellow]")
-    total_saved = 0
-    for page in range(1, max_pages + 1):
-        body = {
-            "page": page,
-            "per_page": 100,
-            "industry_tags": [
-                "Pharmaceuticals",
-                "Medical Devices",
-                "Healthcare",
-                "Manufacturing",
-                "Medical Supplies"
-            ],
-            "q_organization_keyword_tags": [
-                "latex gloves",
-                "nitrile gloves",
-                "medical gloves",
-                "surgical gloves",
-                "exam gloves",
-                "biohazard protection"
-            ]
-        }
-        if country:
-            body["organization_locations"] = [country]
-        try:
-            with Progress(SpinnerColumn(), TextColumn(f"[progress.description]{ICON_LOADING} Fetching companies from Apollo (page {page})..."), transient=True) as progress:
-                task = progress.add_task(f"[yellow]{ICON_LOADING} Fetching companies from Apollo (page {page})...", start=False)
-                progress.start_task(task)
-                resp = requests.post(
-                    "https://api.apollo.io/v1/mixed_companies/search",
-                    headers=headers,
-                    json=body
-                )
-            if resp.status_code != 200:
-                console.print(f"[red]Apollo API error (status {resp.status_code}): {resp.text}[/red]")
-                break
-            data = resp.json()
-            companies = data.get("organizations", [])
-            if not companies:
-                console.print(f"[yellow]No companies found on page {page}.")
-                break
-            for comp in companies:
-                company_name = comp.get("name", "")
-                country_val = comp.get("location_country") or comp.get("country") or country
-                domain = comp.get("primary_domain")
-                industry = comp.get("industry", "")
-                employee_count = comp.get("estimated_num_employees")
-                # Optionally store Apollo's keyword tags
-                keyword_tags = comp.get("keyword_tags", [])
-                if not company_name or not domain:
-                    continue  # skip incomplete
-                # Optionally, you can extend insert_company to store keyword_tags if desired
-                cid, is_new = insert_company(company_name, country_val, domain, industry, employee_count)
-                if is_new:
-                    total_saved += 1
-                else:
-                    pass # Company already exists, skipping count
-            console.print(f"[green]{ICON_DONE} Page {page}: Processed {len(companies)} companies, saved {total_saved} new glove companies for {country or 'Global'}.")
-        except Exception as e:
-            console.print(f"[red]Error on page {page}: {e}[/red]")
-            break
+
+    # Pages are fetched several at a time and written by a separate DB stage; progress is
+    # checkpointed so an interrupted run can be resumed from the menu
+    summary = _run_company_job(lambda on_page: start_extraction_job(country, max_pages, insert_companies, on_page=on_page), country)
+    total_saved = summary['total_saved']
     final_count = count_companies()
     console.print(f"[bold green]{ICON_DONE} Extraction complete. New companies added: {total_saved} for {country or 'Global'}[/bold green]")
     console.print(f"[bold green]{ICON_DONE} Total companies in database: {final_count} (was {initial_count})[/bold green]")
 
+def _run_company_job(run, country):
+    """Run an extraction job with per-page output and report how it ended."""
+    def on_page(event):
+        console.print(f"[green]{ICON_DONE} Page {event['page']}: Processed {event['companies']} companies, saved {event['saved']} new glove companies for {country or 'Global'}.")
+
+    with Progress(SpinnerColumn(), TextColumn(f"[progress.description]{ICON_LOADING} Fetching companies from Apollo..."), transient=True) as progress:
+        progress.add_task(f"[yellow]{ICON_LOADING} Fetching companies from Apollo...")
+        try:
+            summary = run(on_page)
+        except KeyboardInterrupt:
+            console.print(f"[yellow]{ICON_WARN} Interrupted. Use 'Resume Company Extraction' to continue from the last saved page.[/yellow]")
+            raise
+    if summary['exhausted']:
+        console.print(f"[yellow]No more companies found after page {summary['last_page']}.")
+    if summary['error']:
+        console.print(f"[red]{summary['error']}[/red]")
+        console.print(f"[yellow]Job #{summary['job_id']} checkpointed at page {summary['last_page']}. Use 'Resume Company Extraction' to continue.[/yellow]")
+    return summary
+
+def resume_company_extraction():
+    """Continue an interrupted or failed company extraction from its last saved page."""
+    init_apollo_db()
+    jobs = get_resumable_extraction_jobs()
+    if not jobs:
+        console.print(f"[green]{ICON_DONE} No unfinished company extractions to resume.[/green]")
+        return
+    console.rule(f"[bold blue]{ICON_COMPANY} Resume Company Extraction")
+    for idx, job in enumerate(jobs, 1):
+        console.print(f"[cyan]{idx}.[/cyan] {describe_job(job)}")
+    console.print("[cyan]0.[/cyan] Back")
+    choice = typer.prompt("Select a job to resume", type=int, default=1)
+    if choice < 1 or choice > len(jobs):
+        return
+    if not APOLLO_API_KEY:
+        console.print("[red]APOLLO_API_KEY environment variable not set![/red]")
+        return
+    job = jobs[choice - 1]
+    country = job['params'].get('country')
+    initial_count = count_companies()
+    summary = _run_company_job(lambda on_page: run_extraction_job(job['id'], insert_companies, on_page=on_page), country)
+    console.print(f"[bold green]{ICON_DONE} Job #{job['id']} {summary['status']}: {summary['total_saved']} new companies this run for {country or 'Global'}[/bold green]")
+    console.print(f"[bold green]{ICON_DONE} Total companies in database: {count_companies()} (was {initial_count})[/bold green]")
+
+def _extract_contacts(companies, workers=DEFAULT_CONCURRENCY, force_refresh=False):
+    """
+    Look up decision makers for the companies concurrently with a progress bar, saving
+    contacts to Apollo.db in batches. Returns {company_key: contacts} for successful lookups.
+    Cached Apollo searches are reused unless force_refresh is set.
+    """
+    results = {}
+    with Progress(TextColumn("[progress.description]{task.description}"), BarColumn(), MofNCompleteColumn(), TimeElapsedColumn()) as progress:
+        task = progress.add_task(f"[yellow]{ICON_LOADING} Fetching contacts from Apollo...", total=len({company_key(c) for c in companies}))
+
+        def on_company(event):
+            company = event['company']
+            if event.get('error'):
+                progress.console.print(f"[red]{ICON_WARN} Error querying Apollo for {company['company_name']}: {event['error']}[/red]")
+            else:
+                results[company_key(company)] = event['contacts']
+                progress.console.print(f"[green]{ICON_DONE} {company['company_name']}: {len(event['contacts'])} decision makers[/green]")
+            progress.advance(task)
+
+        summary = extract_decision_makers(companies, insert_contacts, max_workers=max(1, workers),
+                                          force_refresh=force_refresh, on_company=on_company)
+    console.print(f"[bold green]{ICON_DONE} {summary['succeeded']}/{summary['companies']} companies searched, {summary['contacts_found']} contacts found, {summary['contacts_saved']} new contacts saved.[/bold green]")
+    if summary['failed']:
+        console.print(f"[red]{ICON_WARN} {len(summary['failed'])} lookups failed.[/red]")
+    return results
+
+@app.command("decision-makers")
+def country_decision_makers(country: str, workers: int = DEFAULT_CONCURRENCY, include_existing: bool = False,
+                            force_refresh: bool = False):
+    """Headless: find and save decision makers for every stored company in COUNTRY."""
+    init_apollo_db()
+    if not APOLLO_API_KEY:
+        console.print("[red]APOLLO_API_KEY environment variable not set![/red]")
+        raise typer.Exit(1)
+    companies = get_companies_by_country(country)
+    if not include_existing:
+        done = get_company_ids_with_contacts()
+        companies = [c for c in companies if c['id'] not in done]
+    if not companies:
+        console.print(f"[yellow]{ICON_WARN} No companies without contacts found for {country}.[/yellow]")
+        return
+    console.print(f"[bold]Extracting decision makers for {len(companies)} companies in {country}...[/bold]")
+    _extract_contacts(companies, workers, force_refresh=force_refresh)
+
 def buyer_extraction():
     """Interactive buyer extraction: select scope, country, company, then fetch/export contacts. Now with 'Back' options at each step and reduced icons."""
-    from db_apollo import insert_contact, get_contacts_by_company, get_available_countries_asia, get_available_countries_global, get_all_companies
-    from apollo import find_decision_makers_apollo
+    from db_apollo import get_available_countries_asia, get_available_countries_global, get_all_companies
     import csv
     init_apollo_db()
     while True:
@@ -241,45 +272,34 @@ def buyer_extraction():
             console.print(table)
             # Step 4: Company selection (one or more)
             while True:
-                console.print(f"[bold]Select companies to extract contacts for (comma-separated indices, e.g. 1,3,5):[/bold]")
+                console.print(f"[bold]Select companies to extract contacts for (comma-separated indices, e.g. 1,3,5, or A for all):[/bold]")
                 console.print(f"[cyan]0.[/cyan] Back")
-                selection = typer.prompt("Enter indices or 0 to go back")
+                selection = typer.prompt("Enter indices, A or 0 to go back")
                 if selection.strip() == '0':
                     break  # Go back to country selection
-                try:
-                    selected_indices = [int(x.strip())-1 for x in selection.split(',') if x.strip().isdigit()]
-                except Exception:
-                    console.print(f"[red]{ICON_WARN} Invalid input: please enter number(s) separated by commas (e.g. 1,2,3).[/red]")
-                    continue
+                if selection.strip().lower() == 'a':
+                    selected_indices = list(range(len(companies)))
+                else:
+                    try:
+                        selected_indices = [int(x.strip())-1 for x in selection.split(',') if x.strip().isdigit()]
+                    except Exception:
+                        console.print(f"[red]{ICON_WARN} Invalid input: please enter number(s) separated by commas (e.g. 1,2,3).[/red]")
+                        continue
                 selected_companies = [companies[i] for i in selected_indices if 0 <= i < len(companies)]
                 if not selected_companies:
                     console.print(f"[red]{ICON_WARN} No valid companies selected.[/red]")
                     continue
-                # Step 5: For each, fetch contacts, save, export
+                # Step 5: Fetch contacts for all selected companies concurrently (saved in batches), then show/export
+                force_refresh = not typer.confirm("Reuse cached Apollo results for companies searched before?", default=True)
+                results = _extract_contacts(selected_companies, force_refresh=force_refresh)
                 for comp in selected_companies:
-                    company_id = comp['id']
                     company_name = comp['company_name']
-                    company_country = comp.get('country') or ''
-                    company_domain = comp.get('domain')
-                    console.print(f"[bold]Extracting contacts for: {company_name} ({company_country})")
-                    try:
-                        from rich.progress import Progress, SpinnerColumn, TextColumn
-                        with Progress(SpinnerColumn(), TextColumn(f"[progress.description]{ICON_LOADING} Fetching contacts from Apollo..."), transient=True) as progress:
-                            task = progress.add_task(f"[yellow]{ICON_LOADING} Fetching contacts from Apollo...", start=False)
-                            progress.start_task(task)
-                            contacts = find_decision_makers_apollo(company_name, company_country, company_domain)
-                    except Exception as e:
-                        console.print(f"[red]{ICON_WARN} Error querying Apollo for {company_name}: {e}[/red]")
-                        continue
+                    contacts = results.get(company_key(comp))
+                    if contacts is None:
+                        continue  # lookup failed; already reported
                     if not contacts:
                         console.print(f"[yellow]{ICON_WARN} No buyers/decision makers found for {company_name}.[/yellow]")
                         continue
-                    for contact in contacts:
-                        name = contact.get('name')
-                        title = contact.get('title')
-                        email = contact.get('email')
-                        linkedin = contact.get('linkedin')
-                        insert_contact(company_id, company_name, name, title, email, linkedin)
                     # Display contacts in a table
                     contact_table = Table(title=f"Contacts for {company_name}", show_lines=True, title_style="bold green")
                     contact_table.add_column("Name", style="bold")
@@ -318,7 +338,8 @@ def run():
         console.print(f"[cyan]1.[/cyan] Company Extraction")
         console.print(f"[cyan]2.[/cyan] Buyer Extraction")
         console.print(f"[cyan]3.[/cyan] Remove Duplicate Companies {ICON_WARN}")
-        console.print(f"[cyan]4.[/cyan] Exit")
+        console.print("[cyan]4.[/cyan] Resume Company Extraction")
+        console.print("[cyan]5.[/cyan] Exit")
         choice = typer.prompt("Select an option", type=int)
         if choice == 1:
             apollo_company_extraction()
@@ -327,6 +348,8 @@ def run():
         elif choice == 3:
             remove_duplicate_companies()
         elif choice == 4:
+            resume_company_extraction()
+        elif choice == 5:
             console.print(f"[green]{ICON_DONE} Goodbye!")
             break
         else:
@@ -334,36 +357,19 @@ def run():
 
 # --- Duplicate removal logic ---
 def remove_duplicate_companies():
-    """Scan for duplicate companies and remove them, keeping the oldest."""
-    from db_apollo import get_all_companies
-    import sqlite3
-    db_path = os.path.join(os.path.dirname(__file__), '..', 'Apollo.db')
-    companies = get_all_companies()
-    # Find duplicates by (domain) or (company_name+country)
-    seen_domains = {}
-    seen_name_country = {}
-    duplicates = []
-    for comp in companies:
-        key_domain = comp['domain'].lower().strip() if comp['domain'] else None
-        key_name_country = (comp['company_name'].lower().strip(), (comp['country'] or '').lower().strip())
-        if key_domain and key_domain in seen_domains:
-            duplicates.append(comp['id'])
-        elif key_domain:
-            seen_domains[key_domain] = comp['id']
-        elif key_name_country in seen_name_country:
-            duplicates.append(comp['id'])
-        else:
-            seen_name_country[key_name_country] = comp['id']
-    if not duplicates:
+    """Scan for duplicate companies (same domain, or same name and country) and remove them, keeping the oldest."""
+    from dedup import dedup
+    report = dedup('apollo_companies')
+    if not report['duplicates_to_remove']:
         console.print(f"[green]{ICON_DONE} No duplicate companies found in the database![/green]")
         return
-    # Remove duplicates
-    conn = sqlite3.connect(db_path)
-    c = conn.cursor()
-    c.executemany('DELETE FROM companies WHERE id = ?', [(dup_id,) for dup_id in duplicates])
-    conn.commit()
-    conn.close()
-    console.print(f"[yellow]{ICON_WARN} Removed {len(duplicates)} duplicate companies from the database.[/yellow]")
+    console.print(f"[yellow]{ICON_WARN} Found {report['duplicate_groups']} groups of duplicate companies "
+                  f"({report['duplicates_to_remove']} extra records).[/yellow]")
+    if not typer.confirm("Remove them (contacts move to the company that is kept)?", default=True):
+        console.print("[yellow]No companies removed.[/yellow]")
+        return
+    report = dedup('apollo_companies', apply=True)
+    console.print(f"[yellow]{ICON_WARN} Removed {report['duplicates_removed']} duplicate companies from the database.[/yellow]")
 
 if __name__ == "__main__":
     app() 
\ No newline at end of file
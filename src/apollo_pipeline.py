@@ -0,0 +1,313 @@
+import os
+import sys
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, as_completed, FIRST_COMPLETED
+from typing import List, Dict, Optional, Callable
+
+from apollo import apollo_post, find_decision_makers_apollo, reveal_emails_apollo
+from db_apollo import create_extraction_job, get_extraction_job, update_extraction_job
+from db_apollo import get_companies_by_country, get_company_ids_with_contacts, insert_contacts as db_insert_contacts
+from name_normalizer import normalize_company_name
+
+INDUSTRY_TAGS = [
+    "Pharmaceuticals",
+    "Medical Devices",
+    "Healthcare",
+    "Manufacturing",
+    "Medical Supplies"
+]
+
+KEYWORD_TAGS = [
+    "latex gloves",
+    "nitrile gloves",
+    "medical gloves",
+    "surgical gloves",
+    "exam gloves",
+    "biohazard protection"
+]
+
+PER_PAGE = 100
+# Page requests kept in flight; the shared Apollo limiter still caps the real request rate
+DEFAULT_CONCURRENCY = int(os.getenv("APOLLO_PAGE_CONCURRENCY", 4))
+
+class ApolloPageError(Exception):
+    """A company search page came back with a non-200 status."""
+
+def build_company_search_body(page: int, country: Optional[str] = None,
+                              keyword_tags: Optional[List[str]] = None) -> Dict:
+    body = {
+        "page": page,
+        "per_page": PER_PAGE,
+        "industry_tags": INDUSTRY_TAGS,
+        "q_organization_keyword_tags": keyword_tags or KEYWORD_TAGS
+    }
+    if country:
+        body["organization_locations"] = [country]
+    return body
+
+def parse_organization(comp: Dict, country: Optional[str] = None) -> Optional[Dict]:
+    """Map an Apollo organization to a companies row; None if it has no name or domain."""
+    company_name = comp.get("name", "")
+    domain = comp.get("primary_domain")
+    if not company_name or not domain:
+        return None
+    return {
+        'company_name': company_name,
+        'country': comp.get("location_country") or comp.get("country") or country,
+        'domain': domain,
+        'industry': comp.get("industry", ""),
+        'employee_count': comp.get("estimated_num_employees")
+    }
+
+def fetch_company_page(page: int, country: Optional[str] = None, keyword_tags: Optional[List[str]] = None) -> List[Dict]:
+    """
+    Fetch one page of mixed_companies/search. Returns the raw organizations
+    (an empty list means the result set is exhausted).
+    """
+    resp = apollo_post("mixed_companies/search", build_company_search_body(page, country, keyword_tags), timeout=None)
+    if resp.status_code != 200:
+        raise ApolloPageError(f"Apollo API error (status {resp.status_code}): {resp.text}")
+    return resp.json().get("organizations", [])
+
+def extract_companies(country: Optional[str], max_pages: int, insert_companies: Callable[[List[Dict]], int],
+                      concurrency: int = DEFAULT_CONCURRENCY, queue_size: int = 8, keyword_tags: Optional[List[str]] = None,
+                      start_page: int = 1, on_page: Optional[Callable[[Dict], None]] = None,
+                      stop_event: Optional[threading.Event] = None) -> Dict:
+    """
+    Pipelined company extraction. Up to `concurrency` page requests are kept in flight
+    (apollo_post applies the shared Apollo rate limit); fetched pages go through a bounded
+    queue to a single writer thread that calls insert_companies(rows) -> number of new rows.
+    When the writer falls behind, the queue fills and fetching pauses.
+    No new pages are requested once an empty page is seen, a page fails, or stop_event is set.
+
+    on_page (called from the writer thread) receives {'page', 'companies', 'saved', 'total_saved'}
+    plus the running totals 'pages', 'companies_seen' and 'last_page' (the checkpoint).
+    Returns {'pages', 'companies', 'total_saved', 'last_page', 'exhausted', 'error'}: last_page
+    is the highest page such that it and every page before it were written, and exhausted
+    is True if an empty page marked the end of the results.
+    """
+    summary = {'pages': 0, 'companies': 0, 'total_saved': 0, 'last_page': start_page - 1,
+               'exhausted': False, 'error': None}
+    pages = queue.Queue(maxsize=queue_size)
+    written = set()
+    lock = threading.Lock()
+
+    def writer():
+        while True:
+            item = pages.get()
+            if item is None:
+                return
+            page, organizations = item
+            # Whatever goes wrong with a page, keep draining the queue: the fetch loop
+            # blocks on pages.put() once it is full and would never finish
+            try:
+                rows = [row for row in (parse_organization(comp, country) for comp in organizations) if row]
+                saved = insert_companies(rows) if rows else 0
+                with lock:
+                    summary['pages'] += 1
+                    summary['companies'] += len(organizations)
+                    summary['total_saved'] += saved
+                    written.add(page)
+                    while summary['last_page'] + 1 in written:
+                        summary['last_page'] += 1
+                    event = {'page': page, 'companies': len(organizations), 'saved': saved, 'total_saved': summary['total_saved'],
+                             'pages': summary['pages'], 'companies_seen': summary['companies'], 'last_page': summary['last_page']}
+            except Exception as e:
+                with lock:
+                    summary['error'] = summary['error'] or f"Error writing page {page}: {e}"
+                continue
+            if on_page:
+                try:
+                    on_page(event)
+                except Exception as e:
+                    # A broken progress callback must not stall the pipeline
+                    print(f"Progress callback error on page {page}: {e}", file=sys.stderr)
+
+    writer_thread = threading.Thread(target=writer, daemon=True)
+    writer_thread.start()
+    stop_page = start_page + max_pages  # first page not to request
+    next_page = start_page
+    in_flight = {}
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+            while True:
+                while (len(in_flight) < concurrency and next_page < stop_page
+                       and not summary['error'] and not (stop_event and stop_event.is_set())):
+                    in_flight[executor.submit(fetch_company_page, next_page, country, keyword_tags)] = next_page
+                    next_page += 1
+                if not in_flight:
+                    break
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in sorted(done, key=lambda f: in_flight[f]):
+                    page = in_flight.pop(future)
+                    try:
+                        organizations = future.result()
+                    except Exception as e:
+                        with lock:
+                            summary['error'] = summary['error'] or f"Error on page {page}: {e}"
+                        continue
+                    if not organizations:
+                        # End of results: don't request anything past this page
+                        stop_page = min(stop_page, page)
+                        summary['exhausted'] = True
+                        continue
+                    if page < stop_page:
+                        pages.put((page, organizations))
+    finally:
+        pages.put(None)
+        writer_thread.join()
+    return summary
+
+def start_extraction_job(country: Optional[str], max_pages: int, insert_companies: Callable[[List[Dict]], int],
+                         keyword_tags: Optional[List[str]] = None, db_path: Optional[str] = None, **kwargs) -> Dict:
+    """Create a checkpointed job for this query in db_path's extraction_jobs table and run it."""
+    job_id = create_extraction_job({'country': country, 'keyword_tags': keyword_tags}, max_pages, db_path=db_path)
+    return run_extraction_job(job_id, insert_companies, db_path=db_path, **kwargs)
+
+def run_extraction_job(job_id: int, insert_companies: Callable[[List[Dict]], int], db_path: Optional[str] = None,
+                       on_page: Optional[Callable[[Dict], None]] = None, stop_event: Optional[threading.Event] = None,
+                       **kwargs) -> Dict:
+    """
+    Run (or resume) an extraction job from the page after its checkpoint. The checkpoint
+    and counters are saved after every page, so a failed or interrupted run re-fetches
+    at most the pages that were in flight; those re-inserts are deduplicated.
+    Returns the extract_companies summary plus 'job_id' and the final 'status'.
+    """
+    job = get_extraction_job(job_id, db_path=db_path)
+    if job is None:
+        raise ValueError(f"No extraction job {job_id}")
+    base = {'pages': job['pages_done'], 'seen': job['companies_seen'], 'saved': job['companies_saved']}
+    remaining = job['max_pages'] - job['last_page']
+    update_extraction_job(job_id, db_path=db_path, status='running', error=None)
+
+    def checkpoint(event):
+        update_extraction_job(job_id, db_path=db_path, last_page=event['last_page'],
+                              pages_done=base['pages'] + event['pages'],
+                              companies_seen=base['seen'] + event['companies_seen'],
+                              companies_saved=base['saved'] + event['total_saved'])
+        if on_page:
+            on_page(event)
+
+    if remaining > 0:
+        summary = extract_companies(job['params'].get('country'), remaining, insert_companies,
+                                    keyword_tags=job['params'].get('keyword_tags'), start_page=job['last_page'] + 1,
+                                    on_page=checkpoint, stop_event=stop_event, **kwargs)
+    else:
+        summary = {'pages': 0, 'companies': 0, 'total_saved': 0, 'last_page': job['last_page'], 'exhausted': False, 'error': None}
+    if summary['error']:
+        status = 'failed'
+    elif summary['exhausted'] or summary['last_page'] >= job['max_pages']:
+        status = 'completed'
+    else:
+        status = 'paused'
+    update_extraction_job(job_id, db_path=db_path, status=status, error=summary['error'], last_page=summary['last_page'])
+    summary.update(job_id=job_id, status=status)
+    return summary
+
+def describe_job(job: Dict) -> str:
+    """One-line summary of a job for menus and pickers."""
+    country = job['params'].get('country') or 'Global'
+    return (f"#{job['id']} {country}: page {job['last_page']}/{job['max_pages']}, "
+            f"{job['companies_saved']} saved ({job['status']}, {job['updated_at'][:16].replace('T', ' ')})")
+
+
+def company_key(company: Dict) -> tuple:
+    """Lookup identity of a company: the same normalized name, country and domain give the same contacts."""
+    return (normalize_company_name(company.get('company_name')),
+            (company.get('country') or '').strip().lower(),
+            (company.get('domain') or '').strip().lower())
+
+def extract_decision_makers(companies: List[Dict], insert_contacts: Callable[[List[Dict]], int],
+                            max_workers: int = DEFAULT_CONCURRENCY, batch_size: int = 50,
+                            reveal_emails: bool = True, force_refresh: bool = False,
+                            on_company: Optional[Callable[[Dict], None]] = None,
+                            stop_event: Optional[threading.Event] = None) -> Dict:
+    """
+    Find decision makers for many companies (rows with id, company_name, country, domain)
+    concurrently on a bounded thread pool. Every Apollo request goes through apollo_post, so
+    the shared Apollo rate limit applies across all workers and identical requests in flight
+    are sent once; companies listed more than once are looked up once.
+    Contacts are passed to insert_contacts(rows) -> number of new rows in batches of about
+    batch_size as lookups finish. Locked emails are collected across companies and revealed
+    per batch with reveal_emails_apollo (bulk requests, cached reveals are free) just before
+    the batch is saved; with reveal_emails=False they stay locked. Revealed emails are also
+    written into the contact dicts passed to on_company. force_refresh bypasses the Apollo
+    people-search cache (see find_decision_makers_apollo).
+
+    on_company (called from the calling thread) receives {'company', 'contacts', 'completed',
+    'total'} or 'error' instead of 'contacts'. Setting stop_event cancels lookups not yet started.
+    Returns {'companies', 'succeeded', 'failed', 'cancelled', 'contacts_found', 'contacts_saved'}.
+    """
+    groups = {}
+    for company in companies:
+        groups.setdefault(company_key(company), []).append(company)
+    summary = {'companies': len(groups), 'succeeded': 0, 'failed': [], 'cancelled': 0,
+               'contacts_found': 0, 'contacts_saved': 0}
+    if not groups:
+        return summary
+    pending = []  # (company rows, contacts) waiting to be saved
+
+    def flush():
+        if not pending:
+            return
+        contacts = [contact for _, found in pending for contact in found]
+        if reveal_emails:
+            emails = reveal_emails_apollo([c['person_id'] for c in contacts if c.get('person_id')])
+            for contact in contacts:
+                if emails.get(contact.get('person_id')):
+                    contact['email'] = emails[contact['person_id']]
+        for contact in contacts:
+            contact.pop('person_id', None)
+        summary['contacts_saved'] += insert_contacts([
+            dict(contact, company_id=company.get('id'), company_name=company['company_name'])
+            for group, found in pending for company in group for contact in found
+        ])
+        pending.clear()
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        futures = {}
+        for group in groups.values():
+            first = group[0]
+            futures[executor.submit(find_decision_makers_apollo, first['company_name'], first.get('country') or '',
+                                    first.get('domain'), reveal=False, force_refresh=force_refresh)] = group
+        completed = 0
+        for future in as_completed(futures):
+            group = futures[future]
+            if future.cancelled():
+                summary['cancelled'] += 1
+                continue
+            completed += 1
+            event = {'company': group[0], 'completed': completed, 'total': len(groups)}
+            try:
+                contacts = future.result()
+            except Exception as e:
+                summary['failed'].append(dict(group[0], error=str(e)))
+                event['error'] = str(e)
+            else:
+                summary['succeeded'] += 1
+                summary['contacts_found'] += len(contacts)
+                pending.append((group, contacts))
+                if sum(len(found) for _, found in pending) >= batch_size:
+                    flush()
+                event['contacts'] = contacts
+            if on_company:
+                on_company(event)
+            if stop_event and stop_event.is_set():
+                for other in futures:
+                    other.cancel()
+        flush()
+    return summary
+
+def extract_country_decision_makers(country: str, skip_existing: bool = True, db_path: Optional[str] = None,
+                                    **kwargs) -> Dict:
+    """
+    Headless run over every stored company in a country, saving contacts to db_path
+    (Apollo.db by default). Companies that already have contacts are skipped unless
+    skip_existing is False. kwargs go to extract_decision_makers.
+    """
+    companies = get_companies_by_country(country, db_path=db_path)
+    if skip_existing:
+        done = get_company_ids_with_contacts(db_path=db_path)
+        companies = [c for c in companies if c['id'] not in done]
+    return extract_decision_makers(companies, lambda rows: db_insert_contacts(rows, db_path=db_path), **kwargs)
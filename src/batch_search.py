@@ -0,0 +1,103 @@
+import os
+import itertools
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, Dict, Optional, Iterable, Callable
+
+import db
+from deepseek_agent import query_deepseek
+
+PROMPTS_DIR = os.path.join(os.path.dirname(__file__), '..', 'prompts')
+KEYWORD_OPTIONS_PATH = os.path.join(PROMPTS_DIR, 'keyword_options.txt')
+COUNTRY_LIST_PATHS = {
+    'Asia': os.path.join(PROMPTS_DIR, 'asia_countries.txt'),
+    'Global': os.path.join(PROMPTS_DIR, 'global_countries.txt'),
+}
+
+def load_lines(path: str) -> List[str]:
+    with open(path, 'r', encoding='utf-8') as f:
+        return [line.strip() for line in f if line.strip()]
+
+def load_keyword_options() -> List[str]:
+    return load_lines(KEYWORD_OPTIONS_PATH)
+
+def load_scope_countries(scope: str) -> List[str]:
+    return load_lines(COUNTRY_LIST_PATHS[scope])
+
+def build_grid(hs_codes: Iterable[str], keywords: Iterable[str], countries: Iterable[str]) -> List[Dict]:
+    """Full cartesian product of HS codes x keywords x countries as a list of job dicts."""
+    return [
+        {'hs_code': hs_code, 'keyword': keyword, 'country': country}
+        for hs_code, keyword, country in itertools.product(hs_codes, keywords, countries)
+    ]
+
+def build_scope_grid(scope: str, keywords: Optional[List[str]] = None, countries: Optional[List[str]] = None) -> List[Dict]:
+    """
+    Build the search grid from the stored HS codes of a scope ('Asia' or 'Global').
+    Each stored code is paired with its own country; codes saved for 'Global' are paired
+    with every requested country. If countries is given, only those countries are searched.
+    Keywords default to prompts/keyword_options.txt.
+    """
+    rows = db.get_all_asia_hs_codes() if scope == 'Asia' else db.get_all_global_hs_codes()
+    keywords = keywords or load_keyword_options()
+    wanted = {c.lower(): c for c in countries} if countries else None
+    jobs = []
+    seen = set()
+    for row in rows:
+        row_country = (row.get('country') or '').strip()
+        if wanted is None:
+            targets = [row_country]
+        elif row_country.lower() == 'global':
+            targets = list(wanted.values())
+        elif row_country.lower() in wanted:
+            targets = [wanted[row_country.lower()]]
+        else:
+            continue
+        for country in targets:
+            for keyword in keywords:
+                key = (row['hs_code'], keyword.lower(), country.lower())
+                if key in seen:
+                    continue
+                seen.add(key)
+                jobs.append({'hs_code': row['hs_code'], 'keyword': keyword, 'country': country})
+    return jobs
+
+def _search_job(job: Dict, scope: str, exclude_existing: bool, use_cache: bool) -> List[Dict]:
+    existing_names = []
+    if exclude_existing:
+        existing_names = [b['company_name'] for b in db.check_existing_buyer_leads(scope, job['hs_code'], job['keyword'])]
+    output = query_deepseek(job['hs_code'], job['keyword'], job['country'], existing_names, use_cache=use_cache)
+    return db.parse_deepseek_output(output)
+
+def run_batch_search(jobs: List[Dict], scope: str, max_workers: int = 4, exclude_existing: bool = False,
+                     use_cache: bool = True, on_progress: Optional[Callable[[Dict], None]] = None) -> Dict:
+    """
+    Run a list of buyer-search jobs concurrently on a bounded thread pool.
+    DeepSeek calls overlap across workers; parsed companies are bulk-inserted from the
+    calling thread into `results` and the scope's buyer leads table as each job completes.
+    on_progress (if given) is called with a dict per finished job.
+    Returns a summary dict with job/company counts (found and newly saved) and the list of failed jobs.
+    """
+    summary = {'jobs': len(jobs), 'succeeded': 0, 'failed': [], 'companies_found': 0, 'companies_saved': 0}
+    if not jobs:
+        return summary
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(_search_job, job, scope, exclude_existing, use_cache): job for job in jobs}
+        for done, future in enumerate(as_completed(futures), 1):
+            job = futures[future]
+            event = dict(job, completed=done, total=len(jobs))
+            try:
+                companies = future.result()
+            except Exception as e:
+                summary['failed'].append(dict(job, error=str(e)))
+                event['error'] = str(e)
+            else:
+                db.insert_results(job['hs_code'], job['keyword'], job['country'], companies)
+                saved = db.insert_buyer_leads(scope, job['hs_code'], job['keyword'], companies)
+                summary['succeeded'] += 1
+                summary['companies_found'] += len(companies)
+                summary['companies_saved'] += saved['inserted']
+                event['companies'] = len(companies)
+                event['saved'] = saved['inserted']
+            if on_progress:
+                on_progress(event)
+    return summary
@@ -0,0 +1,7 @@
+"""
+Offline benchmarks: local stand-ins for the DeepSeek and Apollo APIs with configurable
+latency, error and 429 rates, and scripted end-to-end scenarios that report throughput,
+p50/p95 latency and database write rates.
+
+Usage (from the project root): python src/benchmarks --help
+"""
@@ -0,0 +1,97 @@
+"""
+Run the offline benchmark scenarios and print throughput, p50/p95 latency and DB write
+rates. With --baseline, exits 1 if any scenario's throughput fell more than --tolerance
+below the saved results (write them with --output). --workdir runs against existing
+databases, e.g. ones made at scale by synthetic_data.py.
+
+Usage: python src/benchmarks [--scenario company_extraction ...] [--output results.json]
+                             [--baseline results.json] [--deepseek-latency 0.5] [--throttle-rate 0.05]
+                             [--workdir /tmp/synthetic]
+"""
+import os
+import sys
+import json
+import argparse
+from typing import Dict, List, Optional
+
+if __package__ in (None, ''):
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.faults import FaultInjector
+from benchmarks.scenarios import SCENARIOS, BenchmarkEnv
+
+COLUMNS = [('scenario', 20), ('units', 7), ('seconds', 9), ('throughput', 11), ('p50_ms', 9), ('p95_ms', 9),
+           ('db_rows', 8), ('db_rows_per_sec', 16), ('failed', 7)]
+
+def print_results(results: List[Dict]):
+    print(''.join(name.ljust(width) for name, width in COLUMNS))
+    for result in results:
+        print(''.join(str(result[name]).ljust(width) for name, width in COLUMNS))
+    for result in results:
+        print(f"{result['scenario']}: {result['throughput']} {result['unit']}/s, HTTP responses {result['http']}")
+
+def regressions(results: List[Dict], baseline: List[Dict], tolerance: float) -> List[str]:
+    """Scenarios whose throughput dropped more than tolerance (a fraction) below the baseline."""
+    previous = {result['scenario']: result for result in baseline}
+    found = []
+    for result in results:
+        before = previous.get(result['scenario'])
+        if before and before['throughput'] and result['throughput'] < before['throughput'] * (1 - tolerance):
+            found.append(f"{result['scenario']}: {result['throughput']} {result['unit']}/s, "
+                         f"baseline {before['throughput']} (-{100 * (1 - result['throughput'] / before['throughput']):.0f}%)")
+    return found
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(description="Offline end-to-end benchmarks against mock DeepSeek and Apollo servers")
+    parser.add_argument('--scenario', action='append', choices=list(SCENARIOS),
+                        help='scenario to run (repeatable; default: all, in order)')
+    parser.add_argument('--searches', type=int, default=48, help='batch_buyer_search: DeepSeek searches')
+    parser.add_argument('--search-workers', type=int, default=8, help='batch_buyer_search: parallel searches')
+    parser.add_argument('--pages', type=int, default=100, help='company_extraction: pages of 100 companies')
+    parser.add_argument('--companies', type=int, default=200, help='contact_extraction: companies to look up')
+    parser.add_argument('--contact-workers', type=int, default=4, help='contact_extraction: concurrent lookups')
+    parser.add_argument('--deepseek-latency', type=float, default=0.05, help='seconds per DeepSeek response')
+    parser.add_argument('--apollo-latency', type=float, default=0.02, help='seconds per Apollo response')
+    parser.add_argument('--jitter', type=float, default=0.0, help='up to this many extra seconds per response')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='fraction of responses that are 500s')
+    parser.add_argument('--throttle-rate', type=float, default=0.0, help='fraction of responses that are 429s')
+    parser.add_argument('--rate', type=float, default=50.0,
+                        help='requests/s allowed per provider; 0 keeps the production rate limits')
+    parser.add_argument('--seed', type=int, default=0, help='seed for injected jitter and failures')
+    parser.add_argument('--workdir', help='directory with the database.db/Apollo.db to use (default: fresh temporary ones)')
+    parser.add_argument('--output', help='write the results as JSON (e.g. to use as a baseline)')
+    parser.add_argument('--baseline', help='JSON results of an earlier run to compare against')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='allowed throughput drop vs the baseline')
+    args = parser.parse_args(argv)
+
+    def faults(latency, seed):
+        return FaultInjector(latency=latency, jitter=args.jitter, error_rate=args.error_rate,
+                             throttle_rate=args.throttle_rate, seed=seed)
+
+    options = {
+        'batch_buyer_search': {'searches': args.searches, 'workers': args.search_workers},
+        'company_extraction': {'pages': args.pages},
+        'contact_extraction': {'companies': args.companies, 'workers': args.contact_workers},
+        'full_export': {},
+    }
+    results = []
+    with BenchmarkEnv(faults(args.deepseek_latency, args.seed), faults(args.apollo_latency, args.seed + 1),
+                      total_companies=max(args.pages, 1) * 100, rate=args.rate or None, workdir=args.workdir) as env:
+        for name in args.scenario or list(SCENARIOS):
+            print(f"Running {name}...", file=sys.stderr, flush=True)
+            results.append(SCENARIOS[name](env, **options[name]))
+    print_results(results)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            found = regressions(results, json.load(f), args.tolerance)
+        for line in found:
+            print(f"REGRESSION {line}")
+        if found:
+            return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,37 @@
+"""
+Latency and failure injection shared by the mock API servers.
+"""
+import random
+import threading
+from typing import Dict, Optional, Tuple
+
+class FaultInjector:
+    """
+    Every response waits latency seconds (plus up to jitter more). Then error_rate of the
+    requests get a 500 and throttle_rate of the requests get a 429 with a Retry-After
+    header of retry_after seconds. Draws come from a seeded generator, so a run is
+    repeatable for a given request order.
+    """
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, error_rate: float = 0.0,
+                 throttle_rate: float = 0.0, retry_after: float = 0.1, seed: int = 0):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def delay(self) -> float:
+        with self._lock:
+            return self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0.0)
+
+    def fault(self) -> Optional[Tuple[int, Dict, Dict]]:
+        """(status, payload, headers) for a request that should fail, or None."""
+        with self._lock:
+            draw = self._random.random()
+        if draw < self.throttle_rate:
+            return 429, {"error": "Too many requests"}, {"Retry-After": f"{self.retry_after:g}"}
+        if draw < self.throttle_rate + self.error_rate:
+            return 500, {"error": "Injected server error"}, {}
+        return None
@@ -0,0 +1,188 @@
+"""
+Local stand-in for the Apollo API, for tests and benchmarks. Answers the endpoints this
+app uses (mixed_companies/search, mixed_people/search, people/match, people/bulk_match)
+with deterministic fake data and counts every request, so callers can check how many
+round-trips and reveals a run cost.
+
+Usage: python src/benchmarks/mock_apollo_server.py --port 8765 [--latency 0.2] [--error-rate 0.01] [--throttle-rate 0.05]
+then run the app with APOLLO_BASE_URL=http://127.0.0.1:8765/api/v1 APOLLO_API_KEY=test
+"""
+import os
+import sys
+import json
+import zlib
+import argparse
+import threading
+import time
+from collections import Counter
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Dict, Optional, Tuple
+
+if __package__ in (None, ''):
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from db_apollo import LOCKED_EMAIL
+from benchmarks.faults import FaultInjector
+
+TITLES = ["Procurement Manager", "Purchasing Director", "Supply Chain Manager", "Import Manager",
+          "Sourcing Director", "Operations Manager", "Marketing Lead"]
+FIRST_NAMES = ["Aisha", "Ben", "Chen", "Diana", "Eko", "Farah", "Gita", "Hiro", "Ivan", "Jin"]
+LAST_NAMES = ["Tan", "Lim", "Wong", "Kumar", "Santos", "Nguyen", "Schmidt", "Rossi", "Kim", "Ali"]
+BULK_MATCH_LIMIT = 10
+
+def _seed(text: str) -> int:
+    return zlib.crc32(text.encode('utf-8'))
+
+def fake_person(person_id: str, company: str = "") -> Dict:
+    """The same person id always gives the same person; every third one has a locked email."""
+    seed = _seed(person_id)
+    first, last = FIRST_NAMES[seed % len(FIRST_NAMES)], LAST_NAMES[(seed // 7) % len(LAST_NAMES)]
+    slug = (company or "example").lower().replace(" ", "")[:20] or "example"
+    return {
+        "id": person_id,
+        "first_name": first,
+        "last_name": last,
+        "title": TITLES[(seed // 11) % len(TITLES)],
+        "email": LOCKED_EMAIL if seed % 3 == 0 else f"{first.lower()}.{last.lower()}@{slug}.com",
+        "linkedin_url": f"https://www.linkedin.com/in/{first.lower()}-{last.lower()}-{seed % 10000}",
+        "organization_name": company,
+    }
+
+def revealed_person(person_id: str) -> Dict:
+    person = fake_person(person_id)
+    person["email"] = f"{person['first_name'].lower()}.{person['last_name'].lower()}.{person_id[-4:]}@revealed.example.com"
+    return person
+
+class MockApolloServer(ThreadingHTTPServer):
+    """
+    total_companies is how many organizations mixed_companies/search pages through before
+    returning empty pages; latency (seconds) is added to every response. faults (a
+    FaultInjector) replaces latency when given and can also fail requests with 500s and 429s.
+    """
+    daemon_threads = True
+
+    def __init__(self, address=("127.0.0.1", 0), total_companies: int = 1000, people_per_company: int = 5,
+                 latency: float = 0.0, faults: Optional[FaultInjector] = None):
+        super().__init__(address, MockApolloHandler)
+        self.total_companies = total_companies
+        self.people_per_company = people_per_company
+        self.faults = faults or FaultInjector(latency=latency)
+        self.requests = Counter()  # endpoint -> answered request count
+        self.reveals = Counter()   # person id -> times revealed (credits spent)
+        self.statuses = Counter()  # HTTP status -> responses sent, injected failures included
+        self.lock = threading.Lock()
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/api/v1"
+
+    def reset_stats(self):
+        with self.lock:
+            self.requests.clear()
+            self.reveals.clear()
+            self.statuses.clear()
+
+    def handle_api(self, path: str, body: Dict) -> Tuple[int, Dict]:
+        with self.lock:
+            self.requests[path] += 1
+        if path == "mixed_companies/search":
+            page, per_page = int(body.get("page", 1)), int(body.get("per_page", 100))
+            location = (body.get("organization_locations") or ["Global"])
+            country = location[0] if isinstance(location, list) else location
+            name = body.get("q_organization_name")
+            if name:
+                return 200, {"organizations": [{"name": name, "website_url": f"https://{_seed(name) % 100000}.example.com"}]}
+            first = (page - 1) * per_page
+            organizations = [{
+                "name": f"{country} Glove Buyer {i}",
+                "primary_domain": f"buyer{i}-{_seed(country) % 1000}.example.com",
+                "location_country": country,
+                "industry": "Medical Devices",
+                "estimated_num_employees": 50 + i % 500,
+            } for i in range(first, min(first + per_page, self.total_companies))]
+            return 200, {"organizations": organizations}
+        if path == "mixed_people/search":
+            company = body.get("q_organization_name") or ""
+            people = [fake_person(f"p{_seed(company) % 1000000:06d}{i:02d}", company)
+                      for i in range(self.people_per_company)]
+            return 200, {"people": people}
+        if path == "people/match":
+            person_id = body.get("person_id") or body.get("id")
+            with self.lock:
+                self.reveals[person_id] += 1
+            return 200, {"person": revealed_person(person_id)}
+        if path == "people/bulk_match":
+            details = body.get("details") or []
+            if len(details) > BULK_MATCH_LIMIT:
+                return 422, {"error": f"At most {BULK_MATCH_LIMIT} details per request"}
+            with self.lock:
+                for detail in details:
+                    self.reveals[detail.get("id")] += 1
+            return 200, {"matches": [revealed_person(d["id"]) if d.get("id") else None for d in details]}
+        return 404, {"error": f"Unknown endpoint {path}"}
+
+class MockApolloHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            body = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            body = {}
+        delay = self.server.faults.delay()
+        if delay:
+            time.sleep(delay)
+        headers = {}
+        fault = self.server.faults.fault()
+        if fault:
+            status, payload, headers = fault
+        else:
+            path = self.path.split("?")[0]
+            prefix = "/api/v1/"
+            status, payload = self.server.handle_api(path[len(prefix):] if path.startswith(prefix) else path.lstrip("/"), body)
+        with self.server.lock:
+            self.server.statuses[status] += 1
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+def start_mock_server(port: int = 0, **kwargs) -> MockApolloServer:
+    """Start a MockApolloServer on a background thread (port 0 picks a free port); call shutdown() when done."""
+    server = MockApolloServer(("127.0.0.1", port), **kwargs)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(description="Local stand-in for the Apollo API")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="up to this many extra seconds per response")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered with a 500")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="fraction of requests answered with a 429")
+    parser.add_argument("--companies", type=int, default=1000, help="organizations returned by company search")
+    args = parser.parse_args(argv)
+    faults = FaultInjector(latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+                           throttle_rate=args.throttle_rate)
+    server = MockApolloServer(("127.0.0.1", args.port), total_companies=args.companies, faults=faults)
+    print(f"Mock Apollo API on {server.base_url} (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"Requests: {dict(server.requests)}, statuses: {dict(server.statuses)}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
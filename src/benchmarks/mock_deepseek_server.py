@@ -0,0 +1,159 @@
+"""
+Local stand-in for the DeepSeek chat-completions API. Buyer-search prompts are answered
+by replaying recorded completions (recordings/deepseek_buyer_search.json) with the
+prompt's country and product filled in; the same prompt always gets the same recording.
+Streaming requests (stream=true) get the completion as server-sent events.
+
+Usage: python src/benchmarks/mock_deepseek_server.py --port 8766 [--latency 2.0]
+then run the app with DEEPSEEK_API_URL=http://127.0.0.1:8766/v1/chat/completions DEEPSEEK_API_KEY=test
+"""
+import os
+import re
+import sys
+import json
+import zlib
+import time
+import argparse
+import threading
+from collections import Counter
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Dict, List, Optional, Tuple
+
+if __package__ in (None, ''):
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.faults import FaultInjector
+
+RECORDINGS_PATH = os.path.join(os.path.dirname(__file__), 'recordings', 'deepseek_buyer_search.json')
+STREAM_CHUNK_SIZE = 200
+
+_COUNTRY_RE = re.compile(r'Country/Region:\s*(.+)')
+_PRODUCT_RE = re.compile(r'Product:\s*(.+)')
+
+def load_recordings(path: str = RECORDINGS_PATH) -> List[str]:
+    with open(path, 'r', encoding='utf-8') as f:
+        return [recording['content'] for recording in json.load(f)['completions']]
+
+class MockDeepSeekServer(ThreadingHTTPServer):
+    """Replays recordings for chat completions; faults adds latency, 500s and 429s."""
+    daemon_threads = True
+
+    def __init__(self, address=("127.0.0.1", 0), recordings: Optional[List[str]] = None,
+                 faults: Optional[FaultInjector] = None):
+        super().__init__(address, MockDeepSeekHandler)
+        self.recordings = recordings or load_recordings()
+        self.faults = faults or FaultInjector()
+        self.requests = 0
+        self.statuses = Counter()  # HTTP status -> responses sent, injected failures included
+        self.lock = threading.Lock()
+
+    @property
+    def api_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/v1/chat/completions"
+
+    def reset_stats(self):
+        with self.lock:
+            self.requests = 0
+            self.statuses.clear()
+
+    def completion(self, body: Dict) -> str:
+        messages = body.get("messages") or [{}]
+        prompt = messages[-1].get("content") or ""
+        country = _COUNTRY_RE.search(prompt)
+        product = _PRODUCT_RE.search(prompt)
+        content = self.recordings[zlib.crc32(prompt.encode('utf-8')) % len(self.recordings)]
+        return (content.replace("{country}", country.group(1).strip() if country else "Global")
+                       .replace("{keyword}", product.group(1).strip() if product else "gloves"))
+
+    def handle_api(self, body: Dict) -> Tuple[int, Dict]:
+        with self.lock:
+            self.requests += 1
+        return 200, {
+            "id": f"mock-{self.requests}",
+            "object": "chat.completion",
+            "model": body.get("model", "deepseek-reasoner"),
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": self.completion(body)},
+                         "finish_reason": "stop"}],
+        }
+
+class MockDeepSeekHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            body = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            body = {}
+        delay = self.server.faults.delay()
+        if delay:
+            time.sleep(delay)
+        headers = {}
+        fault = self.server.faults.fault()
+        if fault:
+            status, payload, headers = fault
+        elif not self.path.split("?")[0].endswith("/chat/completions"):
+            status, payload = 404, {"error": f"Unknown endpoint {self.path}"}
+        else:
+            status, payload = self.server.handle_api(body)
+        with self.server.lock:
+            self.server.statuses[status] += 1
+        if status == 200 and body.get("stream"):
+            data = self._events(payload)
+            content_type = "text/event-stream"
+        else:
+            data = json.dumps(payload).encode("utf-8")
+            content_type = "application/json"
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    @staticmethod
+    def _events(payload: Dict) -> bytes:
+        """The completion as chat.completion.chunk events followed by [DONE]."""
+        content = payload["choices"][0]["message"]["content"]
+        events = []
+        for start in range(0, len(content), STREAM_CHUNK_SIZE):
+            chunk = {"id": payload["id"], "object": "chat.completion.chunk",
+                     "choices": [{"index": 0, "delta": {"content": content[start:start + STREAM_CHUNK_SIZE]}}]}
+            events.append(f"data: {json.dumps(chunk)}\n\n")
+        events.append("data: [DONE]\n\n")
+        return "".join(events).encode("utf-8")
+
+    def log_message(self, format, *args):
+        pass
+
+def start_mock_server(port: int = 0, **kwargs) -> MockDeepSeekServer:
+    """Start a MockDeepSeekServer on a background thread (port 0 picks a free port); call shutdown() when done."""
+    server = MockDeepSeekServer(("127.0.0.1", port), **kwargs)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(description="Local stand-in for the DeepSeek chat-completions API")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="up to this many extra seconds per response")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered with a 500")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="fraction of requests answered with a 429")
+    args = parser.parse_args(argv)
+    faults = FaultInjector(latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+                           throttle_rate=args.throttle_rate)
+    server = MockDeepSeekServer(("127.0.0.1", args.port), faults=faults)
+    print(f"Mock DeepSeek API on {server.api_url} (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"Requests: {server.requests}, statuses: {dict(server.statuses)}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,242 @@
+"""
+Scripted end-to-end scenarios run against the mock DeepSeek and Apollo servers with
+throwaway databases. Each scenario drives the same engine functions as the CLI and
+returns one result dict:
+
+    scenario, units, unit, seconds, throughput (units/s), p50_ms / p95_ms (per-unit
+    latency), db_rows, db_seconds, db_rows_per_sec (time spent in database writes or
+    reads), failed, http (responses by status from the mock servers)
+"""
+import os
+import csv
+import json
+import math
+import time
+import tempfile
+import threading
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional
+
+import db
+import apollo
+import db_apollo
+import batch_search
+import apollo_pipeline
+import rate_limiter
+from benchmarks.faults import FaultInjector
+from benchmarks.mock_deepseek_server import start_mock_server as start_deepseek
+from benchmarks.mock_apollo_server import start_mock_server as start_apollo
+
+HS_CODES = ['401511', '401519', '401590']
+COUNTRIES = ['Malaysia', 'Indonesia', 'Thailand', 'Vietnam', 'Philippines', 'Singapore', 'India', 'Japan']
+
+def percentile(samples: List[float], p: float) -> float:
+    """Nearest-rank percentile (p in 0..100); 0 for no samples."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(p / 100.0 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+class Probe:
+    """Collects call durations (and rows handled) of the functions it wraps, from any thread."""
+    def __init__(self):
+        self.durations = []
+        self.rows = 0
+        self._lock = threading.Lock()
+
+    def record(self, duration: float, rows: int = 0):
+        with self._lock:
+            self.durations.append(duration)
+            self.rows += rows
+
+    def wrap(self, fn: Callable, rows_arg: Optional[int] = None) -> Callable:
+        """fn timed on every call; rows_arg is the index of a positional list argument whose length is counted."""
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self.record(time.perf_counter() - start, len(args[rows_arg]) if rows_arg is not None else 0)
+        return timed
+
+    @property
+    def total(self) -> float:
+        return sum(self.durations)
+
+@contextmanager
+def probed(module, name: str, probe: Probe, rows_arg: Optional[int] = None):
+    """Time module.name while the block runs (the engine looks it up at call time)."""
+    original = getattr(module, name)
+    setattr(module, name, probe.wrap(original, rows_arg))
+    try:
+        yield probe
+    finally:
+        setattr(module, name, original)
+
+class BenchmarkEnv:
+    """
+    Mock servers plus temporary database.db/Apollo.db, wired into the app through the same
+    settings a deployment uses (DEEPSEEK_API_URL, APOLLO_BASE_URL, DB paths). Response
+    caches are disabled so every unit costs real round-trips. rate (requests/s per
+    provider) replaces the production rate limits when given.
+    """
+    def __init__(self, deepseek_faults: FaultInjector, apollo_faults: FaultInjector,
+                 total_companies: int = 10000, rate: Optional[float] = None, workdir: Optional[str] = None):
+        self.deepseek_faults = deepseek_faults
+        self.apollo_faults = apollo_faults
+        self.total_companies = total_companies
+        self.rate = rate
+        self.workdir = workdir
+        self._saved = {}
+
+    def __enter__(self):
+        self._tmp = None if self.workdir else tempfile.TemporaryDirectory()
+        self.dir = self.workdir or self._tmp.name
+        os.makedirs(self.dir, exist_ok=True)
+        self.deepseek = start_deepseek(faults=self.deepseek_faults)
+        self.apollo = start_apollo(total_companies=self.total_companies, faults=self.apollo_faults)
+        env = {
+            'DEEPSEEK_API_KEY': 'benchmark',
+            'DEEPSEEK_API_URL': self.deepseek.api_url,
+            'DEEPSEEK_CACHE_ENABLED': 'false',
+            'APOLLO_CACHE_ENABLED': 'false',
+        }
+        if self.rate:
+            for provider in ('DEEPSEEK', 'APOLLO'):
+                env[f'{provider}_RATE_PER_SEC'] = str(self.rate)
+                env[f'{provider}_BURST'] = str(self.rate)
+        self._saved['env'] = {name: os.environ.get(name) for name in env}
+        os.environ.update(env)
+        self._saved['attrs'] = [(db, 'DB_PATH', db.DB_PATH), (db_apollo, 'APOLLO_DB_PATH', db_apollo.APOLLO_DB_PATH),
+                                (apollo, 'APOLLO_BASE_URL', apollo.APOLLO_BASE_URL),
+                                (apollo, 'APOLLO_API_KEY', apollo.APOLLO_API_KEY)]
+        db.DB_PATH = os.path.join(self.dir, 'database.db')
+        db_apollo.APOLLO_DB_PATH = os.path.join(self.dir, 'Apollo.db')
+        apollo.APOLLO_BASE_URL = self.apollo.base_url
+        apollo.APOLLO_API_KEY = 'benchmark'
+        db.init_db()
+        db_apollo.init_apollo_db()
+        rate_limiter.reset_limiters()
+        return self
+
+    def __exit__(self, *exc):
+        for server in (self.deepseek, self.apollo):
+            server.shutdown()
+            server.server_close()
+        for module, name, value in self._saved['attrs']:
+            setattr(module, name, value)
+        for name, value in self._saved['env'].items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+        rate_limiter.reset_limiters()
+        if self._tmp:
+            self._tmp.cleanup()
+
+    def reset(self):
+        """Zero the servers' counters and start from fresh rate limiters, so scenarios don't affect each other."""
+        self.deepseek.reset_stats()
+        self.apollo.reset_stats()
+        rate_limiter.reset_limiters()
+
+    def http_stats(self) -> Dict:
+        return {'deepseek': dict(self.deepseek.statuses), 'apollo': dict(self.apollo.statuses)}
+
+def _result(env: BenchmarkEnv, name: str, unit: str, units: int, seconds: float, latency: Probe,
+            writes: List[Probe], failed: int = 0) -> Dict:
+    db_seconds = sum(probe.total for probe in writes)
+    db_rows = sum(probe.rows for probe in writes)
+    return {
+        'scenario': name,
+        'units': units,
+        'unit': unit,
+        'seconds': round(seconds, 3),
+        'throughput': round(units / seconds, 2) if seconds else 0.0,
+        'p50_ms': round(percentile(latency.durations, 50) * 1000, 1),
+        'p95_ms': round(percentile(latency.durations, 95) * 1000, 1),
+        'db_rows': db_rows,
+        'db_seconds': round(db_seconds, 3),
+        'db_rows_per_sec': round(db_rows / db_seconds, 1) if db_seconds else 0.0,
+        'failed': failed,
+        'http': env.http_stats(),
+    }
+
+def batch_buyer_search(env: BenchmarkEnv, searches: int = 48, workers: int = 8) -> Dict:
+    """HS code x keyword x country grid through run_batch_search; latency is per search (all parts)."""
+    keywords = batch_search.load_keyword_options()
+    jobs = batch_search.build_grid(HS_CODES, keywords, COUNTRIES)[:searches]
+    env.reset()
+    latency, writes = Probe(), [Probe(), Probe()]
+    with probed(batch_search, '_search_job', latency), \
+            probed(db, 'insert_results', writes[0], rows_arg=3), \
+            probed(db, 'insert_buyer_leads', writes[1], rows_arg=3):
+        start = time.perf_counter()
+        summary = batch_search.run_batch_search(jobs, 'Asia', max_workers=workers, use_cache=False)
+        seconds = time.perf_counter() - start
+    return _result(env, 'batch_buyer_search', 'searches', summary['jobs'], seconds, latency, writes,
+                   failed=len(summary['failed']))
+
+def company_extraction(env: BenchmarkEnv, pages: int = 100, country: str = 'Malaysia') -> Dict:
+    """A checkpointed extraction job of `pages` pages; latency is per page fetch (retries included)."""
+    env.reset()
+    latency, write = Probe(), Probe()
+    with probed(apollo_pipeline, 'fetch_company_page', latency):
+        start = time.perf_counter()
+        summary = apollo_pipeline.start_extraction_job(country, pages, write.wrap(db_apollo.insert_companies, rows_arg=0))
+        seconds = time.perf_counter() - start
+    return _result(env, 'company_extraction', 'pages', summary['pages'], seconds, latency, [write],
+                   failed=1 if summary['error'] else 0)
+
+def contact_extraction(env: BenchmarkEnv, companies: int = 200, workers: int = apollo_pipeline.DEFAULT_CONCURRENCY,
+                       country: str = 'Malaysia') -> Dict:
+    """Decision makers (search, fallback and bulk reveals) for stored companies; latency is per company."""
+    rows = db_apollo.get_companies_by_country(country)
+    if len(rows) < companies:
+        # Not timed: make sure there are enough companies to look up
+        apollo_pipeline.start_extraction_job(country, -(-companies // apollo_pipeline.PER_PAGE), db_apollo.insert_companies)
+        rows = db_apollo.get_companies_by_country(country)
+    rows = rows[:companies]
+    env.reset()
+    latency, write = Probe(), Probe()
+    with probed(apollo_pipeline, 'find_decision_makers_apollo', latency):
+        start = time.perf_counter()
+        summary = apollo_pipeline.extract_decision_makers(rows, write.wrap(db_apollo.insert_contacts, rows_arg=0),
+                                                          max_workers=workers)
+        seconds = time.perf_counter() - start
+    return _result(env, 'contact_extraction', 'companies', summary['companies'], seconds, latency, [write],
+                   failed=len(summary['failed']))
+
+def full_export(env: BenchmarkEnv) -> Dict:
+    """Every results/companies/contacts row read, then written as CSV and JSON; latency is per file written."""
+    env.reset()
+    latency, reads = Probe(), Probe()
+    sources = {'results': db.fetch_all_results, 'companies': db_apollo.get_all_companies,
+               'contacts': db_apollo.get_all_contacts}
+    exported = 0
+    start = time.perf_counter()
+    for table, fetch in sources.items():
+        read_start = time.perf_counter()
+        rows = fetch()
+        reads.record(time.perf_counter() - read_start, len(rows))
+        for fmt in ('csv', 'json'):
+            write_start = time.perf_counter()
+            with open(os.path.join(env.dir, f'{table}.{fmt}'), 'w', encoding='utf-8', newline='') as f:
+                if fmt == 'json':
+                    json.dump(rows, f, ensure_ascii=False, default=str)
+                elif rows:
+                    writer = csv.DictWriter(f, fieldnames=list(rows[0].keys()))
+                    writer.writeheader()
+                    writer.writerows(rows)
+            latency.record(time.perf_counter() - write_start)
+        exported += len(rows)
+    seconds = time.perf_counter() - start
+    return _result(env, 'full_export', 'rows', exported, seconds, latency, [reads])
+
+SCENARIOS = {
+    'batch_buyer_search': batch_buyer_search,
+    'company_extraction': company_extraction,
+    'contact_extraction': contact_extraction,
+    'full_export': full_export,
+}
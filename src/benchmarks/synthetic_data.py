@@ -0,0 +1,453 @@
+"""
+Generate database.db and Apollo.db files of realistic shape at a chosen scale (10k, 100k,
+1M rows per table) for the benchmarks and for profiling queries. Tables are created by
+the app's own init functions (db.init_db, GUI_db.init_deepseek_results_table,
+db_apollo.init_apollo_db), so the schema, indexes and FTS triggers are exactly the real ones.
+
+The data mimics what DeepSeek and Apollo return:
+- countries follow a Zipf-like skew (Malaysia and Indonesia dominate, a long tail after)
+- company names mix Malay, Thai, Vietnamese, Chinese, Japanese, Korean, German, Spanish
+  and English words, partly in native script
+- a share of companies reappear with another legal form ("Maju Jaya Sdn. Bhd." /
+  "MAJU JAYA SDN BHD" / "Maju Jaya Berhad"), within a table and across tables
+- contacts are spread unevenly over companies, with locked and repeated emails
+
+Usage: python src/benchmarks/synthetic_data.py --rows 100000 --out-dir /tmp/synthetic [--seed 1]
+then e.g. python src/benchmarks --workdir /tmp/synthetic --scenario full_export
+"""
+import os
+import re
+import sys
+import time
+import random
+import argparse
+from collections import defaultdict, deque
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List, Optional
+
+if __package__ in (None, ''):
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import db
+import GUI_db
+import db_apollo
+from db_connection import connect
+from name_normalizer import fold, normalize_company_name
+
+BATCH_SIZE = 10000
+DUPLICATE_RATE = 0.15      # share of companies that repeat an earlier one under another legal form
+ZIPF_EXPONENT = 1.1        # country skew: weight of the n-th country is 1 / n ** ZIPF_EXPONENT
+CONTACTS_PER_COMPANY = 1.0
+
+# (country, buyer leads scope, domain suffix, name style), most frequent first
+COUNTRIES = [
+    ('Malaysia', 'Asia', 'com.my', 'malay'),
+    ('Indonesia', 'Asia', 'co.id', 'malay'),
+    ('United States', 'Global', 'com', 'english'),
+    ('Thailand', 'Asia', 'co.th', 'thai'),
+    ('Vietnam', 'Asia', 'com.vn', 'vietnamese'),
+    ('China', 'Asia', 'com.cn', 'chinese'),
+    ('Germany', 'Global', 'de', 'german'),
+    ('Japan', 'Asia', 'co.jp', 'japanese'),
+    ('India', 'Asia', 'in', 'english'),
+    ('Mexico', 'Global', 'com.mx', 'spanish'),
+    ('South Korea', 'Asia', 'co.kr', 'korean'),
+    ('United Kingdom', 'Global', 'co.uk', 'english'),
+    ('Philippines', 'Asia', 'com.ph', 'english'),
+    ('Singapore', 'Asia', 'com.sg', 'english'),
+    ('Spain', 'Global', 'es', 'spanish'),
+    ('Australia', 'Global', 'com.au', 'english'),
+    ('Taiwan', 'Asia', 'com.tw', 'chinese'),
+    ('Colombia', 'Global', 'com.co', 'spanish'),
+    ('Austria', 'Global', 'at', 'german'),
+    ('Canada', 'Global', 'ca', 'english'),
+]
+
+# Words company names are built from; native-script entries make names with no ASCII form
+NAME_PARTS = {
+    'malay': ['Maju', 'Jaya', 'Sinar', 'Cahaya', 'Makmur', 'Sejahtera', 'Bintang', 'Harapan', 'Mega',
+              'Sentosa', 'Abadi', 'Perkasa', 'Gemilang', 'Sarung', 'Tangan', 'Medika', 'Nusantara', 'Mulia'],
+    'thai': ['Siam', 'Thai', 'Charoen', 'Rungruang', 'Sombat', 'Kasem', 'Pattana', 'Medical',
+             'สยาม', 'ไทย', 'รุ่งเรือง', 'เจริญ', 'การแพทย์'],
+    'vietnamese': ['Việt', 'Phú', 'Hưng', 'Thịnh', 'Phát', 'Đông', 'Nam', 'Thành', 'Công', 'Y Tế',
+                   'Bảo Hộ', 'Thương Mại', 'An Khang'],
+    'chinese': ['Hua', 'Sheng', 'Tai', 'Feng', 'Long', 'Xing', 'Medical', 'Trading',
+                '华', '盛', '泰', '丰', '源', '隆', '兴', '达', '医疗'],
+    'japanese': ['Nippon', 'Tokai', 'Sanwa', 'Daiichi', 'Medical', 'Shoji', '日本', '東洋', '山田', '医療', '商事'],
+    'korean': ['Hankook', 'Daehan', 'Samil', 'Medical', 'Trading', '한국', '대한', '삼일', '메디칼'],
+    'german': ['Müller', 'Schäfer', 'Weiß', 'Handschuh', 'Medizin', 'Technik', 'Großhandel', 'Schutz', 'Nord', 'Süd'],
+    'spanish': ['Médica', 'Guantes', 'Distribuidora', 'Suministros', 'Higiene', 'Protección', 'Norteña',
+                'Del Valle', 'Industrial'],
+    'english': ['Global', 'Medical', 'Supply', 'Safety', 'Pacific', 'Premier', 'United', 'Healthcare',
+                'Industrial', 'Glove', 'Solutions', 'Distributors'],
+}
+
+# Syllables of the coined word that makes each company name unique
+SYLLABLES = ['ka', 'ri', 'to', 'ma', 'sen', 'lu', 'no', 'vi', 'da', 'pe', 'ro', 'tu', 'zan', 'mi', 'go', 'ha']
+NATIVE_SYLLABLES = {
+    'thai': ['สุ', 'ขุม', 'วิท', 'กา', 'นา', 'ชัย', 'ศรี', 'พร', 'มง', 'คล'],
+    'chinese': ['华', '盛', '泰', '丰', '源', '隆', '兴', '达', '恒', '通', '宝', '金'],
+    'japanese': ['山', '田', '中', '川', '東', '西', '高', '橋', '松', '本'],
+    'korean': ['한', '대', '삼', '성', '현', '진', '우', '신', '동', '아'],
+}
+
+# Spellings of each style's legal forms; '{}' is the name
+LEGAL_FORMS = {
+    'malay': ['{} Sdn. Bhd.', '{} Sdn Bhd', '{} SDN. BHD.', '{} Berhad', '{} Bhd', 'PT {}', 'PT. {} Tbk', 'CV {}'],
+    'thai': ['{} Co., Ltd.', '{} Co. Ltd', '{} Public Company Limited', '{} Company Limited'],
+    'vietnamese': ['Công ty {}', '{} Co., Ltd', '{} JSC', '{} Joint Stock Company'],
+    'chinese': ['{}有限公司', '{} Co., Ltd.', '{} Co Ltd', '{} Limited'],
+    'japanese': ['株式会社{}', '{} Co., Ltd.', '{} K.K.', '{} Corporation'],
+    'korean': ['(주){}', '{} Co., Ltd.', '{} Corp.', '{} Inc.'],
+    'german': ['{} GmbH', '{} GmbH & Co. KG', '{} AG', '{} mbH'],
+    'spanish': ['{} S.A. de C.V.', '{} SA de CV', '{} S.A.', '{} S.L.'],
+    'english': ['{} Inc.', '{} LLC', '{} Ltd', '{} Limited', '{} Corp.', '{} Pvt. Ltd.', '{} Pte. Ltd.', '{}'],
+}
+
+FIRST_NAMES = {
+    'malay': ['Ahmad', 'Siti', 'Nur', 'Muhammad', 'Aisyah', 'Budi', 'Dewi', 'Farid'],
+    'thai': ['Somchai', 'Suda', 'Anong', 'Kittisak', 'Malee', 'Niran'],
+    'vietnamese': ['Nguyễn Văn', 'Trần Thị', 'Lê Minh', 'Phạm Thu', 'Hoàng Anh'],
+    'chinese': ['Wei', 'Li', 'Ming', 'Xiaoling', 'Jun', 'Hui'],
+    'japanese': ['Hiroshi', 'Yuki', 'Takeshi', 'Keiko', 'Satoshi'],
+    'korean': ['Min-jun', 'Seo-yeon', 'Ji-hoon', 'Ha-eun'],
+    'german': ['Jürgen', 'Anna', 'Stefan', 'Björn', 'Katrin'],
+    'spanish': ['José', 'María', 'Andrés', 'Lucía', 'Sofía'],
+    'english': ['John', 'Sarah', 'David', 'Priya', 'Michael', 'Emily', 'Raj'],
+}
+LAST_NAMES = {
+    'malay': ['Abdullah', 'Rahman', 'Ismail', 'Santoso', 'Wijaya', 'Hassan'],
+    'thai': ['Srisuk', 'Chaiyaporn', 'Wongsawat', 'Boonmee'],
+    'vietnamese': ['Hùng', 'Lan', 'Tuấn', 'Hương'],
+    'chinese': ['Wang', 'Zhang', 'Chen', 'Liu', 'Tan', 'Lim'],
+    'japanese': ['Sato', 'Suzuki', 'Tanaka', 'Watanabe'],
+    'korean': ['Kim', 'Lee', 'Park', 'Choi'],
+    'german': ['Schmidt', 'Müller', 'Weber', 'Fischer'],
+    'spanish': ['García', 'Martínez', 'López', 'Hernández'],
+    'english': ['Smith', 'Johnson', 'Patel', 'Brown', 'Williams', 'Singh'],
+}
+TITLES = ['Procurement Manager', 'Purchasing Director', 'CEO', 'Managing Director', 'Head of Sourcing',
+          'Supply Chain Manager', 'General Manager', 'Owner', 'Buyer', 'Operations Director']
+INDUSTRIES = ['hospital & health care', 'medical devices', 'wholesale', 'food production',
+              'pharmaceuticals', 'industrial automation', 'import and export', 'retail']
+EMPLOYEE_COUNTS = [5, 12, 25, 50, 80, 150, 300, 750, 2000, 10000]
+HS_CODES = ['401511', '401519', '401590', '611610', '392620']
+KEYWORDS = ['nitrile gloves', 'latex gloves', 'vinyl gloves', 'examination gloves', 'surgical gloves',
+            'industrial gloves', 'disposable gloves']
+DESCRIPTIONS = [
+    'Distributor of {keyword} to hospitals and clinics in {country}.',
+    'Importer and wholesaler of {keyword} and other medical consumables.',
+    'Food-processing group buying {keyword} in bulk for its plants in {country}.',
+    'Supplier of personal protective equipment, including {keyword}, to industrial customers.',
+    'Retail pharmacy chain with private-label {keyword}.',
+]
+
+# Which database each table lives in, in the order they are generated
+TABLES = {
+    'deepseek_results': 'database',
+    'results': 'database',
+    'buyer_leads': 'database',
+    'companies': 'apollo',
+    'contacts': 'apollo',
+}
+
+_SLUG_RE = re.compile(r'[^a-z0-9]+')
+
+def ascii_slug(text: str) -> str:
+    """Lowercase ASCII letters/digits of text with accents folded ('' for e.g. Thai or CJK)."""
+    return _SLUG_RE.sub('', fold(text))
+
+class CompanyFactory:
+    """
+    Stream of company dicts (company_name, country, scope, domain, style). With probability
+    duplicate_rate a company is an earlier one from the same country under another legal
+    form (and often the same domain), also across calls, so tables share companies.
+    """
+    def __init__(self, rng: random.Random, duplicate_rate: float = DUPLICATE_RATE, pool_size: int = 2000):
+        self.rng = rng
+        self.duplicate_rate = duplicate_rate
+        self.serial = 0
+        self._pool = defaultdict(lambda: deque(maxlen=pool_size))  # country -> recent (base, domain)
+        weights = [1.0 / (rank + 1) ** ZIPF_EXPONENT for rank in range(len(COUNTRIES))]
+        self._cum_weights = [sum(weights[:i + 1]) for i in range(len(weights))]
+
+    def country(self):
+        return self.rng.choices(COUNTRIES, cum_weights=self._cum_weights)[0]
+
+    def _base_name(self, style: str) -> str:
+        """A coined word unique to this company (from self.serial) plus up to two common words."""
+        rng = self.rng
+        native = style in NATIVE_SYLLABLES and rng.random() < 0.5
+        syllables = NATIVE_SYLLABLES[style] if native else SYLLABLES
+        n, coined = self.serial, []
+        while n or len(coined) < 2:
+            n, digit = divmod(n, len(syllables))
+            coined.append(syllables[digit])
+        words = [''.join(coined).capitalize()] + rng.sample(NAME_PARTS[style], rng.choice((0, 1, 1, 2)))
+        # Thai/CJK names are written without spaces
+        return ('' if native and style != 'korean' else ' ').join(words)
+
+    def company(self) -> Dict:
+        country, scope, tld, style = self.country()
+        pool = self._pool[country]
+        rng = self.rng
+        if pool and rng.random() < self.duplicate_rate:
+            base, domain = rng.choice(pool)
+            if rng.random() < 0.3:
+                domain = None
+        else:
+            self.serial += 1
+            base = self._base_name(style)
+            slug = ascii_slug(base) or f"{style}{self.serial}"
+            domain = f"{slug[:40]}.{tld}" if rng.random() < 0.8 else None
+            pool.append((base, domain))
+        name = rng.choice(LEGAL_FORMS[style]).format(base)
+        if rng.random() < 0.05:
+            name = name.upper()
+        return {'company_name': name, 'country': country, 'scope': scope, 'domain': domain, 'style': style}
+
+def _created_at(rng: random.Random, now: datetime) -> str:
+    return (now - timedelta(seconds=rng.randint(0, 365 * 24 * 3600))).isoformat(sep=' ', timespec='seconds')
+
+def _lead_fields(rng: random.Random, company: Dict) -> Dict:
+    keyword = rng.choice(KEYWORDS)
+    # DeepSeek sometimes returns companies from a neighbouring country
+    company_country = company['country'] if rng.random() < 0.9 else rng.choice(COUNTRIES)[0]
+    return {
+        'hs_code': rng.choice(HS_CODES),
+        'keyword': keyword,
+        'company_name': company['company_name'],
+        'company_country': company_country,
+        'company_website_link': f"https://www.{company['domain']}" if company['domain'] else '',
+        'description': rng.choice(DESCRIPTIONS).format(keyword=keyword, country=company['country']),
+        'normalized_name': normalize_company_name(company['company_name']),
+    }
+
+def deepseek_result_rows(factory: CompanyFactory, count: int, now: datetime) -> Iterator[tuple]:
+    rng = factory.rng
+    for _ in range(count):
+        company = factory.company()
+        lead = _lead_fields(rng, company)
+        yield (lead['hs_code'], lead['keyword'], company['country'], lead['company_name'], lead['company_country'],
+               lead['company_website_link'], lead['description'], 'DeepSeek', _created_at(rng, now),
+               lead['normalized_name'])
+
+def result_rows(factory: CompanyFactory, count: int, now: datetime) -> Iterator[tuple]:
+    rng = factory.rng
+    for _ in range(count):
+        company = factory.company()
+        lead = _lead_fields(rng, company)
+        yield (lead['hs_code'], lead['keyword'], company['country'], lead['company_name'], lead['company_country'],
+               lead['company_website_link'], lead['description'], 'DeepSeek', lead['normalized_name'])
+
+def buyer_lead_rows(factory: CompanyFactory, count: int, now: datetime) -> Iterator[tuple]:
+    """(scope, row) pairs; the scope picks asia_buyer_leads or global_buyer_leads."""
+    rng = factory.rng
+    for _ in range(count):
+        company = factory.company()
+        lead = _lead_fields(rng, company)
+        yield company['scope'], (lead['hs_code'], lead['keyword'], lead['company_name'], lead['company_country'],
+                                 lead['company_website_link'], lead['description'], 'DeepSeek', _created_at(rng, now),
+                                 lead['normalized_name'])
+
+def company_and_contact_rows(factory: CompanyFactory, count: int, now: datetime, first_id: int,
+                             contacts_per_company: float = CONTACTS_PER_COMPANY) -> Iterator[tuple]:
+    """
+    ('company', row) for `count` companies with ids from first_id, each followed by its
+    ('contact', row)s: an exponentially distributed number averaging contacts_per_company,
+    so most companies have a few contacts and some have many.
+    """
+    rng = factory.rng
+    previous = None
+    for offset in range(count):
+        company = factory.company()
+        company_id = first_id + offset
+        name = company['company_name']
+        normalized_name = normalize_company_name(name)
+        created_at = _created_at(rng, now)
+        yield 'company', (company_id, name, company['country'], company['domain'], rng.choice(INDUSTRIES),
+                          rng.choice(EMPLOYEE_COUNTS), 'Apollo', created_at, normalized_name)
+        contacts = int(rng.expovariate(1.0 / contacts_per_company) + 0.5) if contacts_per_company > 0 else 0
+        for _ in range(contacts):
+            if previous and rng.random() < DUPLICATE_RATE / 3:
+                # The same person found again through another search
+                person, title, email, linkedin = previous
+            else:
+                style = company['style']
+                person = f"{rng.choice(FIRST_NAMES[style])} {rng.choice(LAST_NAMES[style])}"
+                title = rng.choice(TITLES)
+                slug = '.'.join(filter(None, (ascii_slug(part) for part in person.split())))
+                roll = rng.random()
+                if company['domain'] and slug and roll < 0.7:
+                    email = f"{slug}{rng.randint(1, 99)}@{company['domain']}"
+                elif roll < 0.9:
+                    email = db_apollo.LOCKED_EMAIL
+                else:
+                    email = ''
+                linkedin = f"http://www.linkedin.com/in/{slug.replace('.', '-') or 'member'}-{rng.randint(1000, 999999)}"
+                previous = (person, title, email, linkedin)
+            yield 'contact', (company_id, name, person, title, email, linkedin, 'Apollo', created_at, normalized_name)
+
+def _rebuild_fts(conn):
+    c = conn.cursor()
+    c.execute("SELECT 1 FROM sqlite_master WHERE name = 'deepseek_results_fts'")
+    if c.fetchone():
+        c.execute("INSERT INTO deepseek_results_fts (deepseek_results_fts) VALUES ('rebuild')")
+
+def _load(conn, statements: Dict[str, str], rows: Iterator) -> Dict[str, int]:
+    """
+    executemany the (key, row) pairs into statements[key] in BATCH_SIZE chunks, one
+    transaction each. Returns the rows inserted per key.
+    """
+    batches = defaultdict(list)
+    counts = defaultdict(int)
+    c = conn.cursor()
+
+    def flush():
+        for key, batch in batches.items():
+            if batch:
+                c.executemany(statements[key], batch)
+                counts[key] += c.rowcount if c.rowcount >= 0 else len(batch)
+                batch.clear()
+        conn.commit()
+
+    for key, row in rows:
+        batches[key].append(row)
+        if len(batches[key]) >= BATCH_SIZE:
+            flush()
+    flush()
+    return dict(counts)
+
+INSERT_DEEPSEEK_RESULT = '''
+    INSERT OR IGNORE INTO deepseek_buyer_search_results
+        (hs_code, keyword, country, company_name, company_country, company_website_link, description, source,
+         created_at, normalized_name)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+INSERT_RESULT = '''
+    INSERT OR IGNORE INTO results (hs_code, keyword, country, company_name, company_country, company_website_link,
+                                   description, source, normalized_name)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+INSERT_BUYER_LEAD = '''
+    INSERT OR IGNORE INTO {table} (hs_code, keyword, company_name, company_country, company_website_link, description,
+                                   source, created_at, normalized_name)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+INSERT_COMPANY = '''
+    INSERT INTO companies (id, company_name, country, domain, industry, employee_count, source, created_at,
+                           normalized_name)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+INSERT_CONTACT = '''
+    INSERT INTO contacts (company_id, company_name, name, title, email, linkedin, source, created_at, normalized_name)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+def generate(out_dir: str, rows: int, seed: int = 0, tables: Optional[List[str]] = None,
+             contacts_per_company: float = CONTACTS_PER_COMPANY,
+             duplicate_rate: float = DUPLICATE_RATE) -> Dict[str, int]:
+    """
+    Create (or add to) out_dir/database.db and out_dir/Apollo.db with `rows` rows in each
+    selected table (all of TABLES by default; contacts scale with contacts_per_company).
+    The same seed gives the same data. Returns the rows inserted per table.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    database_path = os.path.join(out_dir, 'database.db')
+    apollo_path = os.path.join(out_dir, 'Apollo.db')
+    saved = (db.DB_PATH, GUI_db.DB_PATH, db_apollo.APOLLO_DB_PATH, GUI_db._deepseek_table_ready)
+    db.DB_PATH = GUI_db.DB_PATH = database_path
+    db_apollo.APOLLO_DB_PATH = apollo_path
+    try:
+        db.init_db()
+        GUI_db.init_deepseek_results_table()
+        db_apollo.init_apollo_db()
+    finally:
+        db.DB_PATH, GUI_db.DB_PATH, db_apollo.APOLLO_DB_PATH, GUI_db._deepseek_table_ready = saved
+
+    rng = random.Random(seed)
+    factory = CompanyFactory(rng, duplicate_rate)
+    now = datetime(2026, 1, 1)
+    selected = tables or list(TABLES)
+    inserted = {}
+    for table in TABLES:
+        if table not in selected:
+            continue
+        conn = connect(database_path if TABLES[table] == 'database' else apollo_path)
+        try:
+            if table == 'deepseek_results':
+                # The FTS index is filled in one pass afterwards instead of row by row
+                conn.execute('DROP TRIGGER IF EXISTS deepseek_results_fts_ai')
+                counts = _load(conn, {'row': INSERT_DEEPSEEK_RESULT},
+                               (('row', row) for row in deepseek_result_rows(factory, rows, now)))
+                _rebuild_fts(conn)
+                conn.commit()
+                inserted['deepseek_buyer_search_results'] = counts.get('row', 0)
+            elif table == 'results':
+                counts = _load(conn, {'row': INSERT_RESULT}, (('row', row) for row in result_rows(factory, rows, now)))
+                inserted['results'] = counts.get('row', 0)
+            elif table == 'buyer_leads':
+                counts = _load(conn, {'Asia': INSERT_BUYER_LEAD.format(table='asia_buyer_leads'),
+                                      'Global': INSERT_BUYER_LEAD.format(table='global_buyer_leads')},
+                               buyer_lead_rows(factory, rows, now))
+                inserted['asia_buyer_leads'] = counts.get('Asia', 0)
+                inserted['global_buyer_leads'] = counts.get('Global', 0)
+            elif table == 'companies':
+                first_id = (conn.execute('SELECT MAX(id) FROM companies').fetchone()[0] or 0) + 1
+                per_company = contacts_per_company if 'contacts' in selected else 0
+                counts = _load(conn, {'company': INSERT_COMPANY, 'contact': INSERT_CONTACT},
+                               company_and_contact_rows(factory, rows, now, first_id, per_company))
+                inserted['companies'] = counts.get('company', 0)
+                if 'contacts' in selected:
+                    inserted['contacts'] = counts.get('contact', 0)
+        finally:
+            conn.close()
+    if 'deepseek_results' in selected:
+        # Put the per-row FTS trigger back (init recreates it with the exact schema)
+        GUI_db.DB_PATH = database_path
+        try:
+            GUI_db.init_deepseek_results_table()
+        finally:
+            GUI_db.DB_PATH, GUI_db._deepseek_table_ready = saved[1], saved[3]
+    for path in (database_path, apollo_path):
+        conn = connect(path)
+        conn.execute('ANALYZE')
+        conn.commit()
+        conn.close()
+    return inserted
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(description="Generate synthetic database.db/Apollo.db files for scaling tests")
+    parser.add_argument('--rows', type=int, default=10000, help='rows per table (e.g. 10000, 100000, 1000000)')
+    parser.add_argument('--out-dir', required=True, help='directory for database.db and Apollo.db')
+    parser.add_argument('--seed', type=int, default=0, help='same seed, same data')
+    parser.add_argument('--table', action='append', choices=list(TABLES),
+                        help='table to fill (repeatable; default: all). contacts are generated with companies')
+    parser.add_argument('--contacts-per-company', type=float, default=CONTACTS_PER_COMPANY)
+    parser.add_argument('--duplicate-rate', type=float, default=DUPLICATE_RATE,
+                        help='share of companies repeating an earlier one under another legal form')
+    parser.add_argument('--force', action='store_true', help='replace existing databases in --out-dir')
+    args = parser.parse_args(argv)
+
+    tables = args.table
+    if tables and 'contacts' in tables and 'companies' not in tables:
+        tables = tables + ['companies']
+    for name in ('database.db', 'Apollo.db'):
+        path = os.path.join(args.out_dir, name)
+        if os.path.exists(path):
+            if not args.force:
+                print(f"{path} already exists; use --force to replace it")
+                return 1
+            for suffix in ('', '-wal', '-shm'):
+                if os.path.exists(path + suffix):
+                    os.remove(path + suffix)
+    start = time.perf_counter()
+    inserted = generate(args.out_dir, args.rows, seed=args.seed, tables=tables,
+                        contacts_per_company=args.contacts_per_company, duplicate_rate=args.duplicate_rate)
+    for table, count in inserted.items():
+        print(f"{table}: {count} rows")
+    print(f"Done in {time.perf_counter() - start:.1f}s -> {os.path.abspath(args.out_dir)}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
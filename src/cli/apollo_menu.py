@@ -4,7 +4,7 @@ from rich.console import Console
 import csv
 
 # Use the new advanced Apollo extraction logic
-from apollo_extraction import buyer_extraction, apollo_company_extraction, remove_duplicate_companies
+from apollo_extraction import buyer_extraction, apollo_company_extraction, remove_duplicate_companies, resume_company_extraction
 
 console = Console()
 
@@ -15,7 +15,8 @@ def apollo_menu():
         console.print("[cyan]1.[/cyan] Company Extraction")
         console.print("[cyan]2.[/cyan] Buyer Extraction")
         console.print("[cyan]3.[/cyan] Remove Duplicate Companies")
-        console.print("[cyan]4.[/cyan] Back")
+        console.print("[cyan]4.[/cyan] Resume Company Extraction")
+        console.print("[cyan]5.[/cyan] Back")
         choice = typer.prompt("Select an option", type=int)
         if choice == 1:
             apollo_company_extraction()
@@ -24,6 +25,8 @@ def apollo_menu():
         elif choice == 3:
             remove_duplicate_companies()
         elif choice == 4:
+            resume_company_extraction()
+        elif choice == 5:
             break
         else:
             console.print("[red]Invalid option. Please try again.[/red]") 
\ No newline at end of file
@@ -0,0 +1,74 @@
+import typer
+from rich.console import Console
+from rich.table import Table
+from rich.progress import Progress, BarColumn, TextColumn, MofNCompleteColumn, TimeElapsedColumn
+from batch_search import build_scope_grid, load_keyword_options, load_scope_countries, run_batch_search
+
+console = Console()
+
+def _select_many(label, options):
+    """Prompt for 'all' or comma-separated indices. Returns the selected options (empty list to go back)."""
+    console.print(f"[bold]Select {label}:[/bold]")
+    for idx, option in enumerate(options, 1):
+        console.print(f"[cyan]{idx}.[/cyan] {option}")
+    console.print(f"[cyan]A.[/cyan] All {label}")
+    console.print("[cyan]0.[/cyan] Back")
+    selection = typer.prompt("Enter 'A', indices (e.g. 1,3,5) or 0 to go back").strip()
+    if selection == '0':
+        return []
+    if selection.lower() == 'a':
+        return list(options)
+    indices = [int(x.strip()) - 1 for x in selection.split(',') if x.strip().isdigit()]
+    return [options[i] for i in indices if 0 <= i < len(options)]
+
+def batch_search_menu():
+    console.rule("[bold blue]Batch Buyer Search (HS Code x Keyword x Country)")
+    console.print("[bold]Choose search scope:[/bold]")
+    console.print("[cyan]1.[/cyan] Asia")
+    console.print("[cyan]2.[/cyan] Global")
+    console.print("[cyan]3.[/cyan] Back to Main Menu")
+    scope_choice = typer.prompt("Enter number for scope", type=int)
+    if scope_choice == 3:
+        return
+    if scope_choice not in (1, 2):
+        console.print("[red]Invalid scope selection.[/red]")
+        return
+    scope = "Asia" if scope_choice == 1 else "Global"
+    countries = _select_many("countries", load_scope_countries(scope))
+    if not countries:
+        return
+    keywords = _select_many("keywords", load_keyword_options())
+    if not keywords:
+        return
+    jobs = build_scope_grid(scope, keywords, countries)
+    if not jobs:
+        console.print(f"[yellow]No stored {scope} HS codes match the selected countries. Add HS codes first.[/yellow]")
+        return
+    table = Table(title=f"{len(jobs)} searches queued", show_lines=False)
+    table.add_column("HS Code", style="cyan")
+    table.add_column("Keyword", style="bold")
+    table.add_column("Country", style="green")
+    for job in jobs[:20]:
+        table.add_row(job['hs_code'], job['keyword'], job['country'])
+    if len(jobs) > 20:
+        table.add_row("...", f"{len(jobs) - 20} more", "")
+    console.print(table)
+    workers = typer.prompt("Number of parallel searches", type=int, default=4)
+    exclude_existing = typer.confirm("Exclude companies already saved for each HS code/keyword?", default=False)
+    if not typer.confirm(f"Run {len(jobs)} DeepSeek searches now?", default=True):
+        console.print("[yellow]Batch search cancelled.[/yellow]")
+        return
+    with Progress(TextColumn("[progress.description]{task.description}"), BarColumn(), MofNCompleteColumn(), TimeElapsedColumn()) as progress:
+        task = progress.add_task("[yellow]Searching buyers...", total=len(jobs))
+
+        def on_progress(event):
+            if event.get('error'):
+                progress.console.print(f"[red]{event['hs_code']} / {event['keyword']} / {event['country']}: {event['error']}[/red]")
+            else:
+                progress.console.print(f"[green]{event['hs_code']} / {event['keyword']} / {event['country']}: {event['companies']} companies ({event['saved']} new)[/green]")
+            progress.advance(task)
+
+        summary = run_batch_search(jobs, scope, max_workers=max(1, workers), exclude_existing=exclude_existing, on_progress=on_progress)
+    console.print(f"[bold green]Batch complete: {summary['succeeded']}/{summary['jobs']} searches succeeded, {summary['companies_found']} companies parsed, {summary['companies_saved']} new leads saved (duplicates skipped).[/bold green]")
+    if summary['failed']:
+        console.print(f"[red]{len(summary['failed'])} searches failed.[/red]")
@@ -2,6 +2,7 @@ import typer
 from rich.console import Console
 from rich.table import Table
 from db_apollo import get_all_contacts, update_contact, delete_contact, find_duplicate_contacts
+from dedup import dedup
 
 console = Console()
 
@@ -118,6 +119,9 @@ def buyer_list_menu():
                 for b in group:
                     table.add_row(str(b['id']), b.get('company_name',''), b.get('name',''), b.get('title',''), b.get('email',''), b.get('linkedin',''))
                 console.print(table)
+            if typer.confirm(f"Remove duplicates from these {len(dups)} groups, keeping the oldest record of each?", default=False):
+                report = dedup('apollo_contacts', apply=True)
+                console.print(f"[green]Removed {report['duplicates_removed']} duplicate buyer records.[/green]")
         elif crud_choice == 5:
             break
         else:
@@ -0,0 +1,277 @@
+"""
+Non-interactive subcommands for cron jobs and scripts. They call the same engine
+functions as the menus but never prompt: inputs come from options or JSON/CSV/text
+files, progress is written to stdout as one JSON object per line ({"event": ...}) and
+anything the engine prints goes to stderr, and the exit code says how the run went:
+
+    0  everything succeeded
+    1  the run could not start or stopped on an error (bad input, missing API key, ...)
+    2  invalid command line (typer's usage errors)
+    3  the run finished but some searches or lookups failed
+
+Examples:
+    python src/main.py search-buyers --hs-code 401519 --keyword "nitrile gloves" --country-file countries.txt
+    python src/main.py extract-companies --country Malaysia --pages 20
+    python src/main.py extract-contacts --country Malaysia --workers 8
+    python src/main.py export --table contacts --format json --output contacts.json
+"""
+import os
+import csv
+import sys
+import json
+from contextlib import contextmanager, redirect_stdout
+from typing import Dict, List, Optional
+
+import typer
+
+EXIT_OK = 0
+EXIT_ERROR = 1
+EXIT_PARTIAL = 3
+
+EXPORT_TABLES = ('results', 'companies', 'contacts')
+
+_progress_stream = None  # the real stdout while engine_output_to_stderr() is active
+
+def emit(event: str, **fields):
+    """Write one machine-readable progress line to stdout."""
+    print(json.dumps(dict(fields, event=event), ensure_ascii=False, default=str),
+          file=_progress_stream or sys.stdout, flush=True)
+
+@contextmanager
+def engine_output_to_stderr():
+    """Send print() output of the engine (diagnostics, from any thread) to stderr, so stdout stays JSON lines."""
+    global _progress_stream
+    _progress_stream = sys.stdout
+    try:
+        with redirect_stdout(sys.stderr):
+            yield
+    finally:
+        _progress_stream = None
+
+def fail(message: str, code: int = EXIT_ERROR):
+    emit('error', message=message)
+    raise typer.Exit(code)
+
+def finish(summary: Dict, failures: int):
+    emit('summary', **summary)
+    raise typer.Exit(EXIT_PARTIAL if failures else EXIT_OK)
+
+def load_records(path: str) -> List:
+    """
+    Read inputs from a file: .json (a list), .csv (rows as dicts) or anything else as one
+    value per non-empty line.
+    """
+    if not os.path.exists(path):
+        fail(f"Input file not found: {path}")
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        if path.lower().endswith('.json'):
+            data = json.load(f)
+            if not isinstance(data, list):
+                fail(f"{path} must contain a JSON list")
+            return data
+        if path.lower().endswith('.csv'):
+            return list(csv.DictReader(f))
+        return [line.strip() for line in f if line.strip()]
+
+def load_values(path: str, column: str) -> List[str]:
+    """A list of strings from a file; rows that are dicts (CSV/JSON objects) give their `column`."""
+    values = []
+    for record in load_records(path):
+        value = record.get(column) if isinstance(record, dict) else record
+        if value and str(value).strip():
+            values.append(str(value).strip())
+    return values
+
+def search_buyers(
+    hs_code: List[str] = typer.Option(None, "--hs-code", help="HS code to search (repeatable); default: stored HS codes of the scope"),
+    keyword: List[str] = typer.Option(None, "--keyword", help="Product keyword (repeatable); default: prompts/keyword_options.txt"),
+    country: List[str] = typer.Option(None, "--country", help="Country to search (repeatable)"),
+    country_file: Optional[str] = typer.Option(None, help="Countries, one per line, or a CSV/JSON with a 'country' field"),
+    jobs_file: Optional[str] = typer.Option(None, help="CSV/JSON of searches with hs_code, keyword and country fields"),
+    scope: str = typer.Option("Asia", help="Buyer leads table to save to: Asia or Global"),
+    workers: int = typer.Option(4, help="Parallel DeepSeek searches"),
+    exclude_existing: bool = typer.Option(False, help="Ask DeepSeek to skip companies already saved"),
+    no_cache: bool = typer.Option(False, help="Bypass the DeepSeek response cache"),
+):
+    """Run DeepSeek buyer searches for an HS code x keyword x country grid."""
+    from batch_search import build_grid, build_scope_grid, load_keyword_options, run_batch_search
+    scope = scope.capitalize()
+    if scope not in ('Asia', 'Global'):
+        fail("--scope must be Asia or Global")
+    if jobs_file:
+        jobs = [{'hs_code': str(r.get('hs_code', '')).strip(), 'keyword': str(r.get('keyword', '')).strip(),
+                 'country': str(r.get('country', '')).strip()}
+                for r in load_records(jobs_file) if isinstance(r, dict)]
+        jobs = [job for job in jobs if all(job.values())]
+    else:
+        countries = list(country or []) + (load_values(country_file, 'country') if country_file else [])
+        keywords = list(keyword or []) or load_keyword_options()
+        if hs_code:
+            if not countries:
+                fail("--country or --country-file is required with --hs-code")
+            jobs = build_grid(hs_code, keywords, countries)
+        else:
+            jobs = build_scope_grid(scope, keywords, countries or None)
+    if not jobs:
+        fail("No searches to run")
+    emit('start', command='search-buyers', jobs=len(jobs), scope=scope)
+
+    def on_progress(event):
+        emit('progress', **event)
+
+    with engine_output_to_stderr():
+        summary = run_batch_search(jobs, scope, max_workers=max(1, workers), exclude_existing=exclude_existing,
+                                   use_cache=not no_cache, on_progress=on_progress)
+    finish(summary, len(summary['failed']))
+
+def extract_companies(
+    country: Optional[str] = typer.Option(None, help="Country to search; default: global"),
+    pages: int = typer.Option(500, help="Pages of up to 100 companies to fetch"),
+    keyword_tag: List[str] = typer.Option(None, "--keyword-tag", help="Apollo keyword tag (repeatable); default: glove tags"),
+):
+    """Fetch companies from Apollo into Apollo.db as a resumable, checkpointed job."""
+    from apollo import APOLLO_API_KEY
+    from apollo_pipeline import start_extraction_job
+    from db_apollo import init_apollo_db, insert_companies
+    init_apollo_db()
+    if not APOLLO_API_KEY:
+        fail("APOLLO_API_KEY environment variable not set")
+    emit('start', command='extract-companies', country=country, pages=pages)
+    with engine_output_to_stderr():
+        summary = start_extraction_job(country, pages, insert_companies, keyword_tags=list(keyword_tag or []) or None,
+                                       on_page=lambda event: emit('progress', **event))
+    if summary['error']:
+        # The job is checkpointed: `resume --job-id` continues from summary['last_page']
+        emit('error', message=summary['error'], job_id=summary['job_id'], last_page=summary['last_page'])
+        emit('summary', **summary)
+        raise typer.Exit(EXIT_ERROR)
+    finish(summary, 0)
+
+def resume(
+    job_id: Optional[int] = typer.Option(None, help="Extraction job to resume; default: every unfinished job"),
+):
+    """Resume interrupted or failed Apollo company extraction jobs from their checkpoints."""
+    from apollo import APOLLO_API_KEY
+    from apollo_pipeline import run_extraction_job
+    from db_apollo import init_apollo_db, insert_companies, get_resumable_extraction_jobs
+    init_apollo_db()
+    if not APOLLO_API_KEY:
+        fail("APOLLO_API_KEY environment variable not set")
+    job_ids = [job_id] if job_id is not None else [job['id'] for job in get_resumable_extraction_jobs()]
+    emit('start', command='resume', jobs=job_ids)
+    failed = 0
+    for current in job_ids:
+        try:
+            with engine_output_to_stderr():
+                summary = run_extraction_job(current, insert_companies,
+                                             on_page=lambda event: emit('progress', job_id=current, **event))
+        except ValueError as e:
+            emit('error', message=str(e), job_id=current)
+            failed += 1
+            continue
+        if summary['error']:
+            emit('error', message=summary['error'], job_id=current, last_page=summary['last_page'])
+            failed += 1
+        emit('job', **summary)
+    finish({'jobs': len(job_ids), 'failed': failed}, failed)
+
+def extract_contacts(
+    country: Optional[str] = typer.Option(None, help="Look up every stored company in this country"),
+    companies_file: Optional[str] = typer.Option(None, help="CSV/JSON of companies with company_name, country and optional domain"),
+    workers: int = typer.Option(None, help="Concurrent Apollo lookups"),
+    include_existing: bool = typer.Option(False, help="Also look up stored companies that already have contacts"),
+    force_refresh: bool = typer.Option(False, help="Bypass the Apollo people-search cache"),
+    no_reveal: bool = typer.Option(False, help="Keep locked emails locked (saves credits)"),
+):
+    """Find decision makers with Apollo and save them to Apollo.db."""
+    from apollo import APOLLO_API_KEY
+    from apollo_pipeline import extract_decision_makers, DEFAULT_CONCURRENCY
+    from db_apollo import init_apollo_db, insert_contacts, get_companies_by_country, get_company_ids_with_contacts
+    if not country and not companies_file:
+        fail("--country or --companies-file is required")
+    init_apollo_db()
+    if not APOLLO_API_KEY:
+        fail("APOLLO_API_KEY environment variable not set")
+    companies = []
+    if country:
+        companies = get_companies_by_country(country)
+        if not include_existing:
+            done = get_company_ids_with_contacts()
+            companies = [c for c in companies if c['id'] not in done]
+    if companies_file:
+        companies += [r for r in load_records(companies_file) if isinstance(r, dict) and r.get('company_name')]
+    emit('start', command='extract-contacts', companies=len(companies))
+
+    def on_company(event):
+        company = event['company']
+        emit('progress', company=company['company_name'], country=company.get('country'),
+             contacts=len(event.get('contacts') or []), error=event.get('error'),
+             completed=event['completed'], total=event['total'])
+
+    with engine_output_to_stderr():
+        summary = extract_decision_makers(companies, insert_contacts, max_workers=max(1, workers or DEFAULT_CONCURRENCY),
+                                          reveal_emails=not no_reveal, force_refresh=force_refresh, on_company=on_company)
+    finish(summary, len(summary['failed']))
+
+def export(
+    table: str = typer.Option("results", help=f"What to export: {', '.join(EXPORT_TABLES)}"),
+    fmt: str = typer.Option("csv", "--format", help="csv or json"),
+    output: str = typer.Option("-", help="Output file; '-' writes to stdout"),
+):
+    """Export DeepSeek results or Apollo companies/contacts as CSV or JSON."""
+    import db
+    import db_apollo
+    fmt = fmt.lower()
+    if table not in EXPORT_TABLES:
+        fail(f"--table must be one of {', '.join(EXPORT_TABLES)}")
+    if fmt not in ('csv', 'json'):
+        fail("--format must be csv or json")
+    with engine_output_to_stderr():
+        rows = {'results': db.fetch_all_results, 'companies': db_apollo.get_all_companies,
+                'contacts': db_apollo.get_all_contacts}[table]()
+    stream = sys.stdout if output == '-' else open(output, 'w', encoding='utf-8', newline='')
+    try:
+        if fmt == 'json':
+            json.dump(rows, stream, ensure_ascii=False, indent=2, default=str)
+            stream.write('\n')
+        elif rows:
+            writer = csv.DictWriter(stream, fieldnames=list(rows[0].keys()))
+            writer.writeheader()
+            writer.writerows(rows)
+    finally:
+        if stream is not sys.stdout:
+            stream.close()
+    if output != '-':
+        # stdout carries the data itself when writing there, so only report for files
+        emit('summary', table=table, format=fmt, rows=len(rows), output=os.path.abspath(output))
+
+def dedup(
+    table: List[str] = typer.Option(None, "--table", help="Dedup rule (repeatable): results, apollo_companies, apollo_contacts; default: all"),
+    apply: bool = typer.Option(False, help="Delete duplicates instead of only reporting them"),
+    normalized_names: bool = typer.Option(False, help="Group by normalized company name instead of the stored name"),
+):
+    """Report (or with --apply, remove) duplicate rows."""
+    from dedup import DEDUP_RULES, dedup as run_dedup
+    names = list(table or []) or list(DEDUP_RULES)
+    unknown = [name for name in names if name not in DEDUP_RULES]
+    if unknown:
+        fail(f"Unknown dedup table: {', '.join(unknown)}")
+    for name in names:
+        with engine_output_to_stderr():
+            summary = run_dedup(name, apply=apply, normalized_names=normalized_names)
+        emit('progress', rule=name, **summary)
+    finish({'tables': len(names), 'applied': apply, 'normalized_names': normalized_names}, 0)
+
+COMMANDS = {
+    'search-buyers': search_buyers,
+    'extract-companies': extract_companies,
+    'extract-contacts': extract_contacts,
+    'resume': resume,
+    'export': export,
+    'dedup': dedup,
+}
+
+def register_commands(app: typer.Typer):
+    """Add the headless subcommands to the main typer app."""
+    for name, command in COMMANDS.items():
+        app.command(name)(command)
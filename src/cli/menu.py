@@ -8,6 +8,8 @@ from .apollo_menu import apollo_menu
 from .hs_code_menu import hs_code_menu
 from .buyer_list_menu import buyer_list_menu
 from .export_menu import export_menu
+from .batch_search_menu import batch_search_menu
+from db import init_db
 
 console = Console()
 
@@ -17,6 +19,7 @@ MENU_OPTIONS = [
     "Manage HS Codes (CRUD)",
     "Manage Potential Buyer List",
     "Export Results (CSV) [In Progress]",
+    "Batch Buyer Search (HS Code x Keyword x Country)",
     "Exit"
 ]
 
@@ -28,6 +31,7 @@ def main_menu():
     return choice
 
 def run_cli():
+    init_db()  # create tables and apply index migrations
     while True:
         choice = main_menu()
         if choice == 1:
@@ -41,6 +45,8 @@ def run_cli():
         elif choice == 5:
             export_menu()
         elif choice == 6:
+            batch_search_menu()
+        elif choice == 7:
             console.print("[green]Goodbye!")
             break
         else:
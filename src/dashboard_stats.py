@@ -0,0 +1,203 @@
+"""
+Dashboard statistics for database.db without reading whole tables.
+
+dashboard_stats is a small summary table kept current by triggers on the counted tables:
+('rows', table) holds each table's row count and ('country', name) how many AI results
+(by company_country) and contacts (by their company's country) are in each country. The
+dashboard reads a handful of rows from it, so loading it costs the same at 100 rows or
+1M. Recent activity comes from ORDER BY id DESC LIMIT n on the primary keys.
+
+The summary is filled with COUNT/GROUP BY queries when it is first created; rebuild_stats()
+recomputes it the same way, and check_stats() compares it with those queries.
+
+Usage: python src/dashboard_stats.py [--rebuild] [--check]
+"""
+import sys
+import argparse
+from typing import Dict, List, Optional
+
+import GUI_db
+from db_connection import connect
+
+# Dashboard card -> table whose rows it counts
+COUNTED_TABLES = {
+    'ai': 'deepseek_buyer_search_results',
+    'apollo': 'contacts',
+    'hs': 'hs_codes',
+    'companies': 'companies',
+}
+
+# Recent activity: rows shown per list
+RECENT_LIMITS = {'ai': 5, 'contacts': 3, 'hs_codes': 3}
+TOP_COUNTRIES = 10
+
+STATS_TABLE = '''
+    CREATE TABLE IF NOT EXISTS dashboard_stats (
+        metric TEXT NOT NULL,
+        key TEXT NOT NULL,
+        value INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (metric, key)
+    )
+'''
+
+# Countries that are counted ('' and 'Unknown' never are, NULL fails every comparison)
+_COUNTED = "NOT IN ('', 'Unknown')"
+
+def _add(metric: str, key: str, amount: str = '1', where: str = '') -> str:
+    """Trigger statement adding `amount` to (metric, key), creating the row if needed."""
+    return (f"INSERT INTO dashboard_stats (metric, key, value) SELECT '{metric}', {key}, {amount} "
+            f"WHERE {where or 'true'} ON CONFLICT (metric, key) DO UPDATE SET value = value + excluded.value;")
+
+def _subtract(metric: str, key: str, amount: str = '1') -> str:
+    return f"UPDATE dashboard_stats SET value = value - {amount} WHERE metric = '{metric}' AND key = {key};"
+
+def _trigger(name: str, event: str, table: str, *statements: str) -> str:
+    body = '\n    '.join(statements)
+    return f'CREATE TRIGGER IF NOT EXISTS dashboard_stats_{name} AFTER {event} ON {table} BEGIN\n    {body}\nEND'
+
+_CONTACT_COUNTRY = '(SELECT country FROM companies WHERE id = {}.company_id)'
+_CONTACTS_OF = '(SELECT COUNT(*) FROM contacts WHERE company_id = {}.id)'
+
+STATS_TRIGGERS = [
+    _trigger('deepseek_ai', 'INSERT', 'deepseek_buyer_search_results',
+             _add('rows', "'deepseek_buyer_search_results'"),
+             _add('country', 'new.company_country', where=f'new.company_country {_COUNTED}')),
+    _trigger('deepseek_ad', 'DELETE', 'deepseek_buyer_search_results',
+             _subtract('rows', "'deepseek_buyer_search_results'"),
+             _subtract('country', 'old.company_country')),
+    _trigger('deepseek_au', 'UPDATE OF company_country', 'deepseek_buyer_search_results',
+             _subtract('country', 'old.company_country'),
+             _add('country', 'new.company_country', where=f'new.company_country {_COUNTED}')),
+    _trigger('contacts_ai', 'INSERT', 'contacts',
+             _add('rows', "'contacts'"),
+             _add('country', _CONTACT_COUNTRY.format('new'), where=f"{_CONTACT_COUNTRY.format('new')} {_COUNTED}")),
+    _trigger('contacts_ad', 'DELETE', 'contacts',
+             _subtract('rows', "'contacts'"),
+             _subtract('country', _CONTACT_COUNTRY.format('old'))),
+    _trigger('contacts_au', 'UPDATE OF company_id', 'contacts',
+             _subtract('country', _CONTACT_COUNTRY.format('old')),
+             _add('country', _CONTACT_COUNTRY.format('new'), where=f"{_CONTACT_COUNTRY.format('new')} {_COUNTED}")),
+    # Contacts are counted under their company's country, so companies move them around
+    _trigger('companies_ai', 'INSERT', 'companies',
+             _add('rows', "'companies'"),
+             _add('country', 'new.country', _CONTACTS_OF.format('new'),
+                  where=f"new.country {_COUNTED} AND {_CONTACTS_OF.format('new')} > 0")),
+    _trigger('companies_ad', 'DELETE', 'companies',
+             _subtract('rows', "'companies'"),
+             _subtract('country', 'old.country', _CONTACTS_OF.format('old'))),
+    _trigger('companies_au', 'UPDATE OF country', 'companies',
+             _subtract('country', 'old.country', _CONTACTS_OF.format('old')),
+             _add('country', 'new.country', _CONTACTS_OF.format('new'),
+                  where=f"new.country {_COUNTED} AND {_CONTACTS_OF.format('new')} > 0")),
+    _trigger('hs_codes_ai', 'INSERT', 'hs_codes', _add('rows', "'hs_codes'")),
+    _trigger('hs_codes_ad', 'DELETE', 'hs_codes', _subtract('rows', "'hs_codes'")),
+]
+
+# The same numbers straight from the tables, for filling and checking the summary
+COUNTRY_COUNTS_SQL = f'''
+    SELECT country, COUNT(*) AS total FROM (
+        SELECT company_country AS country FROM deepseek_buyer_search_results
+        UNION ALL
+        SELECT co.country FROM contacts ct JOIN companies co ON co.id = ct.company_id
+    )
+    WHERE country {_COUNTED}
+    GROUP BY country
+'''
+
+def init_dashboard_stats(db_path: Optional[str] = None):
+    """
+    Create dashboard_stats and its triggers (the counted tables must already exist, see
+    GUI_db.init_db/init_apollo_db/init_deepseek_results_table) and fill it the first time.
+    """
+    conn = connect(db_path or GUI_db.DB_PATH)
+    c = conn.cursor()
+    c.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'dashboard_stats'")
+    exists = c.fetchone() is not None
+    c.execute(STATS_TABLE)
+    for statement in STATS_TRIGGERS:
+        c.execute(statement)
+    conn.commit()
+    conn.close()
+    if not exists:
+        rebuild_stats(db_path)
+
+def rebuild_stats(db_path: Optional[str] = None):
+    """Recompute every summary row with COUNT/GROUP BY, in one transaction."""
+    conn = connect(db_path or GUI_db.DB_PATH)
+    c = conn.cursor()
+    c.execute('DELETE FROM dashboard_stats')
+    for table in COUNTED_TABLES.values():
+        c.execute(f"INSERT INTO dashboard_stats (metric, key, value) SELECT 'rows', ?, COUNT(*) FROM {table}", (table,))
+    c.execute(f"INSERT INTO dashboard_stats (metric, key, value) SELECT 'country', country, total FROM ({COUNTRY_COUNTS_SQL})")
+    conn.commit()
+    conn.close()
+
+def check_stats(db_path: Optional[str] = None) -> List[str]:
+    """Differences between the summary and a full recount (empty when they agree)."""
+    conn = connect(db_path or GUI_db.DB_PATH)
+    c = conn.cursor()
+    c.execute('SELECT metric, key, value FROM dashboard_stats')
+    stored = {(metric, key): value for metric, key, value in c.fetchall() if value}
+    actual = {}
+    for table in COUNTED_TABLES.values():
+        c.execute(f'SELECT COUNT(*) FROM {table}')
+        count = c.fetchone()[0]
+        if count:
+            actual[('rows', table)] = count
+    c.execute(COUNTRY_COUNTS_SQL)
+    actual.update((('country', country), count) for country, count in c.fetchall())
+    conn.close()
+    return [f"{metric} {key}: stored {stored.get((metric, key), 0)}, actual {actual.get((metric, key), 0)}"
+            for metric, key in sorted(set(stored) | set(actual)) if stored.get((metric, key)) != actual.get((metric, key))]
+
+def get_dashboard_stats(db_path: Optional[str] = None, top_n: int = TOP_COUNTRIES) -> Dict:
+    """
+    Everything the dashboard shows:
+    {'counts': {'ai', 'apollo', 'hs', 'companies'}, 'countries': [(country, count)] (top_n,
+     largest first), 'country_total', 'recent': {'ai', 'contacts', 'hs_codes'} (newest first)}
+    """
+    conn = connect(db_path or GUI_db.DB_PATH)
+    c = conn.cursor()
+    c.execute("SELECT key, value FROM dashboard_stats WHERE metric = 'rows'")
+    rows = dict(c.fetchall())
+    counts = {card: rows.get(table, 0) for card, table in COUNTED_TABLES.items()}
+    c.execute("SELECT key, value FROM dashboard_stats WHERE metric = 'country' AND value > 0 ORDER BY value DESC, key LIMIT ?",
+              (top_n,))
+    countries = c.fetchall()
+    c.execute("SELECT COALESCE(SUM(value), 0) FROM dashboard_stats WHERE metric = 'country' AND value > 0")
+    country_total = c.fetchone()[0]
+    recent = {}
+    c.execute('SELECT keyword, country FROM deepseek_buyer_search_results ORDER BY id DESC LIMIT ?', (RECENT_LIMITS['ai'],))
+    recent['ai'] = [{'keyword': keyword, 'country': country} for keyword, country in c.fetchall()]
+    c.execute('SELECT name, company_name FROM contacts ORDER BY id DESC LIMIT ?', (RECENT_LIMITS['contacts'],))
+    recent['contacts'] = [{'name': name, 'company_name': company_name} for name, company_name in c.fetchall()]
+    c.execute('SELECT hs_code, description FROM hs_codes ORDER BY id DESC LIMIT ?', (RECENT_LIMITS['hs_codes'],))
+    recent['hs_codes'] = [{'hs_code': hs_code, 'description': description} for hs_code, description in c.fetchall()]
+    conn.close()
+    return {'counts': counts, 'countries': countries, 'country_total': country_total, 'recent': recent}
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(description="Maintain the dashboard summary table in database.db")
+    parser.add_argument('--rebuild', action='store_true', help='recompute the summary from the tables')
+    parser.add_argument('--check', action='store_true', help='compare the summary with a full recount')
+    args = parser.parse_args(argv)
+    GUI_db.init_db()
+    GUI_db.init_apollo_db()
+    GUI_db.init_deepseek_results_table()
+    init_dashboard_stats()
+    if args.rebuild:
+        rebuild_stats()
+    if args.check:
+        differences = check_stats()
+        for line in differences:
+            print(line)
+        print(f"{len(differences)} differences")
+        return 1 if differences else 0
+    stats = get_dashboard_stats()
+    print(stats['counts'])
+    for country, count in stats['countries']:
+        print(f"{country:<24} {count}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
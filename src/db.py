@@ -1,15 +1,29 @@
 import os
+import re
 import sqlite3
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Iterable
+
+from db_connection import connect
+from name_normalizer import normalize_company_name, with_normalized_name, add_normalized_name_column
+from query_cache import bump_table_versions
 
 DB_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'database.db'))
 
+# Migrations applied by init_db(); CREATE INDEX IF NOT EXISTS makes them safe to re-run
+RESULTS_INDEXES = [
+    'CREATE INDEX IF NOT EXISTS idx_results_company ON results (company_name, company_country)',
+    'CREATE INDEX IF NOT EXISTS idx_asia_buyer_leads_country ON asia_buyer_leads (company_country)',
+    'CREATE INDEX IF NOT EXISTS idx_global_buyer_leads_country ON global_buyer_leads (company_country)',
+    'CREATE INDEX IF NOT EXISTS idx_asia_hs_codes_created ON asia_hs_codes (created_at)',
+    'CREATE INDEX IF NOT EXISTS idx_global_hs_codes_created ON global_hs_codes (created_at)',
+]
+
 def init_db():
     # Ensure the database directory exists (project root)
     db_dir = os.path.dirname(DB_PATH)
     if db_dir:  # Only create directory if there is one
         os.makedirs(db_dir, exist_ok=True)
-    conn = sqlite3.connect(DB_PATH)
+    conn = connect(DB_PATH)
     c = conn.cursor()
     
     # Create results table
@@ -95,33 +109,96 @@ def init_db():
         )
     ''')
 
+    # Secondary indexes (the UNIQUE constraints already cover hs_code/keyword lookups)
+    for statement in RESULTS_INDEXES:
+        c.execute(statement)
+
+    # Persisted normalized company names for matching and dedup across tables
+    for table in ('results', 'asia_buyer_leads', 'global_buyer_leads'):
+        add_normalized_name_column(conn, table, index_columns=('company_country',))
+
     conn.commit()
     conn.close()
 
-def insert_results(hs_code: str, keyword: str, country: str, companies: List[Dict]):
+COMPANY_COLUMNS = ('company_name', 'company_country', 'company_website_link', 'description')
+
+def bulk_insert_companies(table: str, companies: Iterable[Dict], fixed: Dict, source: str = 'DeepSeek R1',
+                          db_path: Optional[str] = None) -> Dict[str, int]:
+    """
+    Bulk ingest company dicts into `table` with one executemany in a single transaction.
+    `fixed` holds the columns shared by every row (e.g. hs_code, keyword, country).
+    Rows hitting the table's UNIQUE constraint are ignored (INSERT OR IGNORE).
+    normalized_name is filled from company_name.
+    db_path defaults to database.db. Returns {'inserted': n, 'ignored': m}.
+    """
+    columns = list(fixed) + list(COMPANY_COLUMNS) + ['source', 'normalized_name']
+    shared = tuple(fixed.values())
+    rows = [shared + tuple(company.get(col, '') for col in COMPANY_COLUMNS)
+            + (source, normalize_company_name(company.get('company_name'))) for company in companies]
+    if not rows:
+        return {'inserted': 0, 'ignored': 0}
+    conn = connect(db_path or DB_PATH)
+    try:
+        c = conn.cursor()
+        c.executemany(
+            f'INSERT OR IGNORE INTO {table} ({", ".join(columns)}) VALUES ({", ".join("?" * len(columns))})',
+            rows
+        )
+        inserted = c.rowcount
+        conn.commit()
+    finally:
+        conn.close()
+        bump_table_versions(table)
+    return {'inserted': inserted, 'ignored': len(rows) - inserted}
+
+def insert_results(hs_code: str, keyword: str, country: str, companies: Iterable[Dict]) -> Dict[str, int]:
     """
     Insert a list of company dicts into the database. Each dict should have:
     company_name, company_country, company_website_link, description
     """
-    conn = sqlite3.connect(DB_PATH)
-    c = conn.cursor()
-    for company in companies:
-        c.execute('''
-            INSERT OR IGNORE INTO results
-            (hs_code, keyword, country, company_name, company_country, company_website_link, description, source)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (
-            hs_code,
-            keyword,
-            country,
-            company.get('company_name', ''),
-            company.get('company_country', ''),
-            company.get('company_website_link', ''),
-            company.get('description', ''),
-            'DeepSeek R1'
-        ))
-    conn.commit()
-    conn.close()
+    return bulk_insert_companies('results', companies, {'hs_code': hs_code, 'keyword': keyword, 'country': country})
+
+def parse_company_block(block: str) -> Optional[Dict]:
+    """
+    Parse a single numbered company block (with Markdown bold already removed) into a company dict.
+    Returns None if no company name could be found.
+    """
+    if not block.strip():
+        return None
+    company = {}
+    # Company Name: match 'Company Name: Value' or header
+    m = re.search(r'Company Name:?.*?([\w\W]*?)(?:\n|$)', block)
+    if m and m.group(1).strip():
+        company['company_name'] = m.group(1).strip().replace('\n', ' ')
+    else:
+        m = re.match(r'(.+)', block)
+        if m:
+            company['company_name'] = m.group(1).strip().replace('\n', ' ')
+    # Country
+    m = re.search(r'Country:?.*?([\w\W]*?)(?:\n|$)', block)
+    if m and m.group(1).strip():
+        company['company_country'] = m.group(1).strip()
+    # Website: extract only the first valid URL after 'Website:'
+    m = re.search(r'Website:?.*?([\w\W]*?)(?:\n|$)', block)
+    if m and m.group(1).strip():
+        url_match = re.search(r'(https?://[\w\.-]+[\w\d/#?&=\.-]*)', m.group(1))
+        if url_match:
+            company['company_website_link'] = url_match.group(1).strip()
+    # Multi-line Description or Brief Description (prefer Description, fallback to Brief Description)
+    desc_match = re.search(r'Description:?.*?([\w\W]*?)(?=\n- |$)', block, re.DOTALL)
+    if desc_match and desc_match.group(1).strip():
+        description = desc_match.group(1).strip()
+        description = '\n'.join(line.lstrip('-').strip() for line in description.splitlines() if line.strip())
+        company['description'] = description
+    else:
+        desc_match = re.search(r'Brief Description:?.*?([\w\W]*?)(?=\n- |$)', block, re.DOTALL)
+        if desc_match and desc_match.group(1).strip():
+            description = desc_match.group(1).strip()
+            description = '\n'.join(line.lstrip('-').strip() for line in description.splitlines() if line.strip())
+            company['description'] = description
+    if company.get('company_name'):
+        return company
+    return None
 
 def parse_deepseek_output(output: str) -> List[Dict]:
     """
@@ -139,49 +216,52 @@ def parse_deepseek_output(output: str) -> List[Dict]:
     # Split into blocks by numbered list (e.g., 1. **Company Name**...)
     blocks = re.split(r'\n\d+\. ', '\n' + output)
     for block in blocks:
-        if not block.strip():
-            continue
-        company = {}
-        # Company Name: match 'Company Name: Value' or header
-        m = re.search(r'Company Name:?.*?([\w\W]*?)(?:\n|$)', block)
-        if m and m.group(1).strip():
-            company['company_name'] = m.group(1).strip().replace('\n', ' ')
-        else:
-            m = re.match(r'(.+)', block)
-            if m:
-                company['company_name'] = m.group(1).strip().replace('\n', ' ')
-        # Country
-        m = re.search(r'Country:?.*?([\w\W]*?)(?:\n|$)', block)
-        if m and m.group(1).strip():
-            company['company_country'] = m.group(1).strip()
-        # Website: extract only the first valid URL after 'Website:'
-        m = re.search(r'Website:?.*?([\w\W]*?)(?:\n|$)', block)
-        if m and m.group(1).strip():
-            url_match = re.search(r'(https?://[\w\.-]+[\w\d/#?&=\.-]*)', m.group(1))
-            if url_match:
-                company['company_website_link'] = url_match.group(1).strip()
-        # Multi-line Description or Brief Description (prefer Description, fallback to Brief Description)
-        desc_match = re.search(r'Description:?.*?([\w\W]*?)(?=\n- |$)', block, re.DOTALL)
-        if desc_match and desc_match.group(1).strip():
-            description = desc_match.group(1).strip()
-            description = '\n'.join(line.lstrip('-').strip() for line in description.splitlines() if line.strip())
-            company['description'] = description
-        else:
-            desc_match = re.search(r'Brief Description:?.*?([\w\W]*?)(?=\n- |$)', block, re.DOTALL)
-            if desc_match and desc_match.group(1).strip():
-                description = desc_match.group(1).strip()
-                description = '\n'.join(line.lstrip('-').strip() for line in description.splitlines() if line.strip())
-                company['description'] = description
-        if company.get('company_name'):
+        company = parse_company_block(block)
+        if company:
             companies.append(company)
     return companies
 
+class StreamingCompanyParser:
+    """
+    Incremental version of parse_deepseek_output for streamed responses.
+    feed() text chunks as they arrive; each call returns the companies whose numbered
+    block has been closed by the start of the next one. close() returns the final block.
+    Feeding a whole response and closing yields the same companies as parse_deepseek_output.
+    """
+    BLOCK_SPLIT = re.compile(r'\n\d+\. ')
+
+    def __init__(self):
+        self.text = '\n'
+        self.pending_stars = ''
+        self.block_start = 0
+
+    def feed(self, chunk: str) -> List[Dict]:
+        chunk = self.pending_stars + chunk
+        # Hold back a trailing run of '*' so a '**' split across chunks is still removed
+        stripped = chunk.rstrip('*')
+        self.pending_stars = chunk[len(stripped):]
+        self.text += stripped.replace('**', '')
+        companies = []
+        for m in self.BLOCK_SPLIT.finditer(self.text, self.block_start):
+            company = parse_company_block(self.text[self.block_start:m.start()])
+            if company:
+                companies.append(company)
+            self.block_start = m.end()
+        return companies
+
+    def close(self) -> List[Dict]:
+        self.text += self.pending_stars.replace('**', '')
+        self.pending_stars = ''
+        company = parse_company_block(self.text[self.block_start:])
+        self.block_start = len(self.text)
+        return [company] if company else []
+
 def fetch_all_results():
     """
     Fetch all past results from the database, ordered by most recent (id DESC).
     Returns a list of dicts with all columns.
     """
-    conn = sqlite3.connect(DB_PATH)
+    conn = connect(DB_PATH)
     c = conn.cursor()
     c.execute('SELECT id, hs_code, keyword, country, company_name, company_country, company_website_link, description, source FROM results ORDER BY id DESC')
     rows = c.fetchall()
@@ -197,12 +277,13 @@ def update_result(record_id: int, updated_fields: dict) -> bool:
     Returns True if a record was updated, False otherwise.
     """
     allowed_fields = {'hs_code', 'keyword', 'country', 'company_name', 'company_country', 'company_website_link', 'description', 'source'}
-    set_clause = ', '.join([f"{k} = ?" for k in updated_fields if k in allowed_fields])
-    values = [updated_fields[k] for k in updated_fields if k in allowed_fields]
+    updated_fields = with_normalized_name({k: v for k, v in updated_fields.items() if k in allowed_fields})
+    set_clause = ', '.join([f"{k} = ?" for k in updated_fields])
+    values = list(updated_fields.values())
     if not set_clause:
         return False
     values.append(record_id)
-    conn = sqlite3.connect(DB_PATH)
+    conn = connect(DB_PATH)
     c = conn.cursor()
     c.execute(f'UPDATE results SET {set_clause} WHERE id = ?', values)
     conn.commit()
@@ -215,7 +296,7 @@ def delete_result(record_id: int) -> bool:
     Delete a buyer search history record by its ID.
     Returns True if a record was deleted, False otherwise.
     """
-    conn = sqlite3.connect(DB_PATH)
+    conn = connect(DB_PATH)
     c = conn.cursor()
     c.execute('DELETE FROM results WHERE id = ?', (record_id,))
     conn.commit()
@@ -228,7 +309,7 @@ def get_country_hs_codes(country: str) -> List[Dict]:
     Get HS codes for a specific country from the database.
     Returns a list of dicts with 'hs_code' and 'description' keys.
     """
-    conn = sqlite3.connect(DB_PATH)
+    conn = connect(DB_PATH)
     c = conn.cursor()
     c.execute('SELECT hs_code, description FROM country_hs_codes WHERE country = ? ORDER BY created_at DESC', (country,))
     rows = c.fetchall()
@@ -240,7 +321,7 @@ def save_country_hs_code(country: str, hs_code: str, description: str, source: s
     Save a country-specific HS code to the database.
     Returns True if successful, False if duplicate.
     """
-    conn = sqlite3.connect(DB_PATH)
+    conn = connect(DB_PATH)
     c = conn.cursor()
     try:
         c.execute('''
@@ -260,7 +341,7 @@ def update_country_hs_code(country: str, old_hs_code: str, new_hs_code: str, new
     Update an existing country-specific HS code.
     Returns True if successful, False if not found.
     """
-    conn = sqlite3.connect(DB_PATH)
+    conn = connect(DB_PATH)
     c = conn.cursor()
     c.execute('''
         UPDATE country_hs_codes 
@@ -277,7 +358,7 @@ def delete_country_hs_code(country: str, hs_code: str) -> bool:
     Delete a country-specific HS code.
     Returns True if successful, False if not found.
     """
-    conn = sqlite3.connect(DB_PATH)
+    conn = connect(DB_PATH)
     c = conn.cursor()
     c.execute('DELETE FROM country_hs_codes WHERE country = ? AND hs_code = ?', (country, hs_code))
     conn.commit()
@@ -290,7 +371,7 @@ def get_all_country_hs_codes() -> List[Dict]:
     Get all country-specific HS codes from the database.
     Returns a list of dicts with all columns.
     """
-    conn = sqlite3.connect(DB_PATH)
+    conn = connect(DB_PATH)
     c = conn.cursor()
     c.execute('''
         SELECT id, country, hs_code, description, source, created_at 
@@ -307,7 +388,7 @@ def check_existing_buyer_results(hs_code: str, keyword: str, country: str) -> Li
     Check if we already have buyer results for the given HS code, keyword, and country combination.
     Returns a list of existing company results if found, empty list if none.
     """
-    conn = sqlite3.connect(DB_PATH)
+    conn = connect(DB_PATH)
     c = conn.cursor()
     c.execute('''
         SELECT company_name, company_country, company_website_link, description, source 
@@ -322,58 +403,15 @@ def check_existing_buyer_results(hs_code: str, keyword: str, country: str) -> Li
 
 def find_and_remove_duplicates() -> Dict:
     """
-    Find and remove duplicate companies based on company_name and company_country.
+    Remove duplicate results (same company_name and company_country), keeping the oldest.
     Returns a dict with counts of duplicates found and removed.
     """
-    conn = sqlite3.connect(DB_PATH)
-    c = conn.cursor()
-    
-    # Find duplicates based on company_name and company_country
-    c.execute('''
-        SELECT company_name, company_country, COUNT(*) as count
-        FROM results 
-        GROUP BY company_name, company_country 
-        HAVING COUNT(*) > 1
-        ORDER BY count DESC
-    ''')
-    duplicates = c.fetchall()
-    
-    total_duplicates_found = 0
-    total_duplicates_removed = 0
-    
-    for company_name, company_country, count in duplicates:
-        total_duplicates_found += count
-        
-        # Get all records for this company (ordered by id to keep the oldest)
-        c.execute('''
-            SELECT id, company_name, company_country, company_website_link, description, source
-            FROM results 
-            WHERE company_name = ? AND company_country = ?
-            ORDER BY id ASC
-        ''', (company_name, company_country))
-        
-        records = c.fetchall()
-        
-        # Keep the first record (oldest), delete the rest
-        if len(records) > 1:
-            # Delete all but the first record
-            ids_to_delete = [str(record[0]) for record in records[1:]]
-            placeholders = ','.join(['?' for _ in ids_to_delete])
-            
-            c.execute(f'''
-                DELETE FROM results 
-                WHERE id IN ({placeholders})
-            ''', ids_to_delete)
-            
-            total_duplicates_removed += len(records) - 1
-    
-    conn.commit()
-    conn.close()
-    
+    from dedup import dedup
+    report = dedup('results', apply=True, db_path=DB_PATH)
     return {
-        'duplicates_found': total_duplicates_found,
-        'duplicates_removed': total_duplicates_removed,
-        'duplicate_groups': len(duplicates)
+        'duplicates_found': report['duplicates_found'],
+        'duplicates_removed': report['duplicates_removed'],
+        'duplicate_groups': report['duplicate_groups']
     }
 
 def get_duplicate_summary() -> List[Dict]:
@@ -381,31 +419,22 @@ def get_duplicate_summary() -> List[Dict]:
     Get a summary of duplicate companies without removing them.
     Returns a list of dicts with duplicate information.
     """
-    conn = sqlite3.connect(DB_PATH)
-    c = conn.cursor()
-    
-    c.execute('''
-        SELECT company_name, company_country, COUNT(*) as count
-        FROM results 
-        GROUP BY company_name, company_country 
-        HAVING COUNT(*) > 1
-        ORDER BY count DESC
-    ''')
-    duplicates = c.fetchall()
-    conn.close()
-    
-    return [
+    from dedup import find_duplicate_groups
+    groups = find_duplicate_groups('results', db_path=DB_PATH)
+    summary = [
         {
-            'company_name': row[0],
-            'company_country': row[1],
-            'duplicate_count': row[2]
+            'company_name': group[0]['company_name'],
+            'company_country': group[0]['company_country'],
+            'duplicate_count': len(group)
         }
-        for row in duplicates
+        for group in groups
     ]
+    summary.sort(key=lambda row: row['duplicate_count'], reverse=True)
+    return summary
 
 # CRUD for asia_hs_codes
 def get_all_asia_hs_codes():
-    conn = sqlite3.connect(DB_PATH)
+    conn = connect(DB_PATH)
     c = conn.cursor()
     c.execute('SELECT id, hs_code, description, country, source, created_at FROM asia_hs_codes ORDER BY created_at DESC')
     rows = c.fetchall()
@@ -414,7 +443,7 @@ def get_all_asia_hs_codes():
     return [dict(zip(columns, row)) for row in rows]
 
 def save_asia_hs_code(hs_code: str, description: str, country: str, source: str = 'Manual') -> bool:
-    conn = sqlite3.connect(DB_PATH)
+    conn = connect(DB_PATH)
     c = conn.cursor()
     try:
         c.execute('INSERT INTO asia_hs_codes (hs_code, description, country, source) VALUES (?, ?, ?, ?)', (hs_code, description, country, source))
@@ -426,7 +455,7 @@ def save_asia_hs_code(hs_code: str, description: str, country: str, source: str
     return success
 
 def update_asia_hs_code(hs_code_id: int, new_hs_code: str, new_description: str) -> bool:
-    conn = sqlite3.connect(DB_PATH)
+    conn = connect(DB_PATH)
     c = conn.cursor()
     c.execute('UPDATE asia_hs_codes SET hs_code = ?, description = ? WHERE id = ?', (new_hs_code, new_description, hs_code_id))
     conn.commit()
@@ -435,7 +464,7 @@ def update_asia_hs_code(hs_code_id: int, new_hs_code: str, new_description: str)
     return updated
 
 def delete_asia_hs_code(hs_code_id: int) -> bool:
-    conn = sqlite3.connect(DB_PATH)
+    conn = connect(DB_PATH)
     c = conn.cursor()
     c.execute('DELETE FROM asia_hs_codes WHERE id = ?', (hs_code_id,))
     conn.commit()
@@ -445,7 +474,7 @@ def delete_asia_hs_code(hs_code_id: int) -> bool:
 
 # CRUD for global_hs_codes
 def get_all_global_hs_codes():
-    conn = sqlite3.connect(DB_PATH)
+    conn = connect(DB_PATH)
     c = conn.cursor()
     c.execute('SELECT id, hs_code, description, country, source, created_at FROM global_hs_codes ORDER BY created_at DESC')
     rows = c.fetchall()
@@ -454,7 +483,7 @@ def get_all_global_hs_codes():
     return [dict(zip(columns, row)) for row in rows]
 
 def save_global_hs_code(hs_code: str, description: str, country: str, source: str = 'Manual') -> bool:
-    conn = sqlite3.connect(DB_PATH)
+    conn = connect(DB_PATH)
     c = conn.cursor()
     try:
         c.execute('INSERT INTO global_hs_codes (hs_code, description, country, source) VALUES (?, ?, ?, ?)', (hs_code, description, country, source))
@@ -466,7 +495,7 @@ def save_global_hs_code(hs_code: str, description: str, country: str, source: st
     return success
 
 def update_global_hs_code(hs_code_id: int, new_hs_code: str, new_description: str) -> bool:
-    conn = sqlite3.connect(DB_PATH)
+    conn = connect(DB_PATH)
     c = conn.cursor()
     c.execute('UPDATE global_hs_codes SET hs_code = ?, description = ? WHERE id = ?', (new_hs_code, new_description, hs_code_id))
     conn.commit()
@@ -475,7 +504,7 @@ def update_global_hs_code(hs_code_id: int, new_hs_code: str, new_description: st
     return updated
 
 def delete_global_hs_code(hs_code_id: int) -> bool:
-    conn = sqlite3.connect(DB_PATH)
+    conn = connect(DB_PATH)
     c = conn.cursor()
     c.execute('DELETE FROM global_hs_codes WHERE id = ?', (hs_code_id,))
     conn.commit()
@@ -487,7 +516,7 @@ def init_international_hs_codes():
     """
     Create the international_hs_codes table and insert initial codes if not present.
     """
-    conn = sqlite3.connect(DB_PATH)
+    conn = connect(DB_PATH)
     c = conn.cursor()
     c.execute('''
         CREATE TABLE IF NOT EXISTS international_hs_codes (
@@ -517,7 +546,7 @@ def get_all_international_hs_codes():
     """
     Fetch all international HS codes from the static table.
     """
-    conn = sqlite3.connect(DB_PATH)
+    conn = connect(DB_PATH)
     c = conn.cursor()
     c.execute('SELECT hs_code, description FROM international_hs_codes ORDER BY id ASC')
     rows = c.fetchall()
@@ -534,7 +563,7 @@ def check_existing_buyer_leads(scope: str, hs_code: str, keyword: str) -> List[D
         'Global': 'global_buyer_leads',
         'International': 'results',  # Use the main results table for international
     }[scope]
-    conn = sqlite3.connect(DB_PATH)
+    conn = connect(DB_PATH)
     c = conn.cursor()
     
     if scope == 'International':
@@ -559,52 +588,19 @@ def check_existing_buyer_leads(scope: str, hs_code: str, keyword: str) -> List[D
     columns = ['company_name', 'company_country', 'company_website_link', 'description', 'source']
     return [dict(zip(columns, row)) for row in rows]
 
-def insert_buyer_leads(scope: str, hs_code: str, keyword: str, companies: List[Dict]):
+def insert_buyer_leads(scope: str, hs_code: str, keyword: str, companies: Iterable[Dict]) -> Dict[str, int]:
     """
     Insert a list of company dicts into the appropriate buyer leads table.
     Each dict should have: company_name, company_country, company_website_link, description
     """
+    if scope == 'International':
+        # International leads live in the main results table, with 'International' as the country
+        return bulk_insert_companies('results', companies, {'hs_code': hs_code, 'keyword': keyword, 'country': 'International'})
     table = {
         'Asia': 'asia_buyer_leads',
         'Global': 'global_buyer_leads',
-        'International': 'results',  # Use the main results table for international
     }[scope]
-    conn = sqlite3.connect(DB_PATH)
-    c = conn.cursor()
-    for company in companies:
-        if scope == 'International':
-            # For international, we need to include the country column
-            c.execute(f'''
-                INSERT OR IGNORE INTO {table}
-                (hs_code, keyword, country, company_name, company_country, company_website_link, description, source)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                hs_code,
-                keyword,
-                'International',  # Use 'International' as the country for international scope
-                company.get('company_name', ''),
-                company.get('company_country', ''),
-                company.get('company_website_link', ''),
-                company.get('description', ''),
-                'DeepSeek R1'
-            ))
-        else:
-            # For Asia and Global, use the buyer leads tables
-            c.execute(f'''
-                INSERT OR IGNORE INTO {table}
-                (hs_code, keyword, company_name, company_country, company_website_link, description, source)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                hs_code,
-                keyword,
-                company.get('company_name', ''),
-                company.get('company_country', ''),
-                company.get('company_website_link', ''),
-                company.get('description', ''),
-                'DeepSeek R1'
-            ))
-    conn.commit()
-    conn.close()
+    return bulk_insert_companies(table, companies, {'hs_code': hs_code, 'keyword': keyword})
 
 def fetch_all_buyer_leads(scope: str) -> List[Dict]:
     """
@@ -616,7 +612,7 @@ def fetch_all_buyer_leads(scope: str) -> List[Dict]:
         'Global': 'global_buyer_leads',
         'International': 'results',  # Use the main results table for international
     }[scope]
-    conn = sqlite3.connect(DB_PATH)
+    conn = connect(DB_PATH)
     c = conn.cursor()
     
     if scope == 'International':
@@ -633,7 +629,7 @@ def fetch_all_buyer_leads(scope: str) -> List[Dict]:
     return [dict(zip(columns, row)) for row in rows]
 
 def get_all_asia_buyer_leads() -> List[Dict]:
-    conn = sqlite3.connect(DB_PATH)
+    conn = connect(DB_PATH)
     c = conn.cursor()
     c.execute('SELECT id, hs_code, keyword, company_name, company_country, company_website_link, description, source, created_at FROM asia_buyer_leads ORDER BY id DESC')
     rows = c.fetchall()
@@ -642,7 +638,7 @@ def get_all_asia_buyer_leads() -> List[Dict]:
     return [dict(zip(columns, row)) for row in rows]
 
 def get_all_global_buyer_leads() -> List[Dict]:
-    conn = sqlite3.connect(DB_PATH)
+    conn = connect(DB_PATH)
     c = conn.cursor()
     c.execute('SELECT id, hs_code, keyword, company_name, company_country, company_website_link, description, source, created_at FROM global_buyer_leads ORDER BY id DESC')
     rows = c.fetchall()
@@ -654,7 +650,7 @@ def get_asia_buyer_leads_by_country(country: str) -> List[Dict]:
     """
     Get all Asia buyer leads for a specific country.
     """
-    conn = sqlite3.connect(DB_PATH)
+    conn = connect(DB_PATH)
     c = conn.cursor()
     c.execute('''
         SELECT id, hs_code, keyword, company_name, company_country, company_website_link, description, source, created_at 
@@ -671,7 +667,7 @@ def get_global_buyer_leads_by_country(country: str) -> List[Dict]:
     """
     Get all Global buyer leads for a specific country.
     """
-    conn = sqlite3.connect(DB_PATH)
+    conn = connect(DB_PATH)
     c = conn.cursor()
     c.execute('''
         SELECT id, hs_code, keyword, company_name, company_country, company_website_link, description, source, created_at 
@@ -692,7 +688,7 @@ def get_buyer_lead_by_id(scope: str, record_id: int) -> Optional[Dict]:
         'Asia': 'asia_buyer_leads',
         'Global': 'global_buyer_leads',
     }[scope]
-    conn = sqlite3.connect(DB_PATH)
+    conn = connect(DB_PATH)
     c = conn.cursor()
     c.execute(f'''
         SELECT id, hs_code, keyword, company_name, company_country, company_website_link, description, source, created_at 
@@ -710,7 +706,7 @@ def get_available_countries_asia() -> List[str]:
     """
     Get list of countries that have companies in the Asia buyer leads table.
     """
-    conn = sqlite3.connect(DB_PATH)
+    conn = connect(DB_PATH)
     c = conn.cursor()
     c.execute('''
         SELECT DISTINCT company_country 
@@ -726,7 +722,7 @@ def get_available_countries_global() -> List[str]:
     """
     Get list of countries that have companies in the Global buyer leads table.
     """
-    conn = sqlite3.connect(DB_PATH)
+    conn = connect(DB_PATH)
     c = conn.cursor()
     c.execute('''
         SELECT DISTINCT company_country 
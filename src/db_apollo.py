@@ -1,11 +1,62 @@
-import sqlite3
 import os
+import json
 from datetime import datetime
 
+from db_connection import connect
+from name_normalizer import normalize_company_name, with_normalized_name, add_normalized_name_column
+from query_cache import invalidates
+
 APOLLO_DB_PATH = os.path.join(os.path.dirname(__file__), '..', 'Apollo.db')
 
+# Indexes for the companies/contacts lookups: duplicate checks on insert, per-company
+# contacts, the country list, duplicate-contact detection and the paged buyer list. Also applied to the
+# companies/contacts tables GUI_db keeps in database.db.
+COMPANY_CONTACT_INDEXES = [
+    'CREATE INDEX IF NOT EXISTS idx_companies_domain ON companies (domain)',
+    'CREATE INDEX IF NOT EXISTS idx_companies_name_country ON companies (company_name, country)',
+    'CREATE INDEX IF NOT EXISTS idx_companies_country ON companies (country)',
+    'CREATE INDEX IF NOT EXISTS idx_contacts_company_id ON contacts (company_id)',
+    'CREATE INDEX IF NOT EXISTS idx_contacts_email ON contacts (email)',
+    'CREATE INDEX IF NOT EXISTS idx_contacts_name_company ON contacts (name, company_name)',
+    'CREATE INDEX IF NOT EXISTS idx_contacts_company_name ON contacts (company_name)',
+]
+
+# Checkpointed Apollo extraction runs: query parameters, the last page up to which every
+# page has been saved, counters and status (running / paused / failed / completed)
+EXTRACTION_JOBS_TABLE = '''
+    CREATE TABLE IF NOT EXISTS extraction_jobs (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        kind TEXT NOT NULL DEFAULT 'companies',
+        params TEXT NOT NULL,
+        max_pages INTEGER NOT NULL,
+        last_page INTEGER NOT NULL DEFAULT 0,
+        pages_done INTEGER NOT NULL DEFAULT 0,
+        companies_seen INTEGER NOT NULL DEFAULT 0,
+        companies_saved INTEGER NOT NULL DEFAULT 0,
+        status TEXT NOT NULL DEFAULT 'running',
+        error TEXT,
+        created_at TEXT,
+        updated_at TEXT
+    )
+'''
+RESUMABLE_STATUSES = ('running', 'paused', 'failed')
+
+# Email Apollo returns for contacts whose address hasn't been revealed
+LOCKED_EMAIL = 'email_not_unlocked@domain.com'
+
+# Every email reveal we've paid for, keyed by Apollo person id ('' if Apollo had none),
+# so the same person is never revealed twice
+EMAIL_REVEALS_TABLE = '''
+    CREATE TABLE IF NOT EXISTS email_reveals (
+        person_id TEXT PRIMARY KEY,
+        email TEXT NOT NULL DEFAULT '',
+        revealed_at TEXT
+    )
+'''
+_reveals_table_ready = set()
+
 def init_apollo_db():
-    conn = sqlite3.connect(APOLLO_DB_PATH)
+    conn = connect(APOLLO_DB_PATH)
     c = conn.cursor()
     # Companies table
     c.execute('''
@@ -35,12 +86,19 @@ def init_apollo_db():
             FOREIGN KEY(company_id) REFERENCES companies(id)
         )
     ''')
+    for statement in COMPANY_CONTACT_INDEXES:
+        c.execute(statement)
+    add_normalized_name_column(conn, 'companies', index_columns=('country',))
+    add_normalized_name_column(conn, 'contacts')
+    c.execute(EXTRACTION_JOBS_TABLE)
+    c.execute(EMAIL_REVEALS_TABLE)
     conn.commit()
     conn.close()
 
+@invalidates('companies')
 def insert_company(company_name, country, domain, industry, employee_count, source="Apollo"):
     from datetime import datetime
-    conn = sqlite3.connect(APOLLO_DB_PATH)
+    conn = connect(APOLLO_DB_PATH)
     c = conn.cursor()
     created_at = datetime.utcnow().isoformat()
     # Check for existing by domain or (name+country)
@@ -50,16 +108,49 @@ def insert_company(company_name, country, domain, industry, employee_count, sour
         conn.close()
         return row[0], False  # Return existing company id, not new
     c.execute('''
-        INSERT INTO companies (company_name, country, domain, industry, employee_count, source, created_at)
-        VALUES (?, ?, ?, ?, ?, ?, ?)
-    ''', (company_name, country, domain, industry, employee_count, source, created_at))
+        INSERT INTO companies (company_name, country, domain, industry, employee_count, source, created_at, normalized_name)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    ''', (company_name, country, domain, industry, employee_count, source, created_at, normalize_company_name(company_name)))
     company_id = c.lastrowid
     conn.commit()
     conn.close()
     return company_id, True  # Return new company id, is new
 
+@invalidates('companies')
+def insert_companies(companies, source="Apollo", db_path=None):
+    """
+    Bulk version of insert_company for a page of results, in one transaction.
+    Each dict has company_name, country, domain, industry, employee_count. Companies
+    already stored (same domain, or same name+country) or repeated within the batch are
+    skipped. Returns the number of new companies.
+    """
+    conn = connect(db_path or APOLLO_DB_PATH)
+    c = conn.cursor()
+    created_at = datetime.utcnow().isoformat()
+    rows = []
+    seen_domains = set()
+    seen_names = set()
+    for comp in companies:
+        name, country, domain = comp.get('company_name'), comp.get('country'), comp.get('domain')
+        if (domain and domain in seen_domains) or (name, country) in seen_names:
+            continue
+        c.execute("SELECT 1 FROM companies WHERE domain = ? OR (company_name = ? AND country = ?)", (domain, name, country))
+        if c.fetchone():
+            continue
+        seen_domains.add(domain)
+        seen_names.add((name, country))
+        rows.append((name, country, domain, comp.get('industry'), comp.get('employee_count'), source, created_at,
+                     normalize_company_name(name)))
+    c.executemany('''
+        INSERT INTO companies (company_name, country, domain, industry, employee_count, source, created_at, normalized_name)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    ''', rows)
+    conn.commit()
+    conn.close()
+    return len(rows)
+
 def get_all_companies():
-    conn = sqlite3.connect(APOLLO_DB_PATH)
+    conn = connect(APOLLO_DB_PATH)
     c = conn.cursor()
     c.execute('SELECT * FROM companies')
     rows = c.fetchall()
@@ -70,31 +161,94 @@ def get_all_companies():
 
 def count_companies():
     """Count total companies in the database"""
-    conn = sqlite3.connect(APOLLO_DB_PATH)
+    conn = connect(APOLLO_DB_PATH)
     c = conn.cursor()
     c.execute('SELECT COUNT(*) FROM companies')
     count = c.fetchone()[0]
     conn.close()
     return count
 
+def get_companies_by_country(country, db_path=None):
+    """Companies stored for one country ('United States' also matches its USA/US spellings)."""
+    names = [country]
+    if country == 'United States':
+        names += ['USA', 'US', 'U.S.A.', 'U.S.A', 'U.S.', 'United States of America']
+    placeholders = ', '.join('?' * len(names))
+    conn = connect(db_path or APOLLO_DB_PATH)
+    c = conn.cursor()
+    c.execute(f"SELECT * FROM companies WHERE country IN ({placeholders}) ORDER BY id", names)
+    rows = c.fetchall()
+    columns = [desc[0] for desc in c.description]
+    conn.close()
+    return [dict(zip(columns, row)) for row in rows]
+
+def get_company_ids_with_contacts(db_path=None):
+    """Set of company ids that already have at least one contact."""
+    conn = connect(db_path or APOLLO_DB_PATH)
+    c = conn.cursor()
+    c.execute('SELECT DISTINCT company_id FROM contacts WHERE company_id IS NOT NULL')
+    ids = {row[0] for row in c.fetchall()}
+    conn.close()
+    return ids
+
+@invalidates('contacts')
 def insert_contact(company_id, company_name, name, title, email, linkedin, source="Apollo", created_at=None):
     """Insert a contact (buyer/decision maker) for a company. Returns contact id."""
     if created_at is None:
         created_at = datetime.utcnow().isoformat()
-    conn = sqlite3.connect(APOLLO_DB_PATH)
+    conn = connect(APOLLO_DB_PATH)
     c = conn.cursor()
     c.execute('''
-        INSERT INTO contacts (company_id, company_name, name, title, email, linkedin, source, created_at)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-    ''', (company_id, company_name, name, title, email, linkedin, source, created_at))
+        INSERT INTO contacts (company_id, company_name, name, title, email, linkedin, source, created_at, normalized_name)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ''', (company_id, company_name, name, title, email, linkedin, source, created_at, normalize_company_name(company_name)))
     contact_id = c.lastrowid
     conn.commit()
     conn.close()
     return contact_id
 
+@invalidates('contacts')
+def insert_contacts(contacts, source="Apollo", db_path=None):
+    """
+    Bulk version of insert_contact, in one transaction. Each dict has company_id,
+    company_name, name, title, email, linkedin. Contacts already stored for the company
+    (same email, or same name+company_name) or repeated within the batch are skipped.
+    Returns the number of new contacts.
+    """
+    conn = connect(db_path or APOLLO_DB_PATH)
+    c = conn.cursor()
+    created_at = datetime.utcnow().isoformat()
+    rows = []
+    seen = set()
+    for contact in contacts:
+        company_name, name = contact.get('company_name'), contact.get('name')
+        email = contact.get('email') or ''
+        # Apollo's placeholder for a locked email is shared by everyone, so it can't identify a contact
+        keys = {('name', name, company_name)}
+        if email and email != LOCKED_EMAIL:
+            keys.add(('email', email, company_name))
+        if keys & seen:
+            continue
+        if email and email != LOCKED_EMAIL:
+            c.execute('SELECT 1 FROM contacts WHERE (email = ? OR name = ?) AND company_name = ?', (email, name, company_name))
+        else:
+            c.execute('SELECT 1 FROM contacts WHERE name = ? AND company_name = ?', (name, company_name))
+        if c.fetchone():
+            continue
+        seen |= keys
+        rows.append((contact.get('company_id'), company_name, name, contact.get('title'), email,
+                     contact.get('linkedin'), source, created_at, normalize_company_name(company_name)))
+    c.executemany('''
+        INSERT INTO contacts (company_id, company_name, name, title, email, linkedin, source, created_at, normalized_name)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ''', rows)
+    conn.commit()
+    conn.close()
+    return len(rows)
+
 def get_contacts_by_company(company_id):
     """Get all contacts for a given company_id."""
-    conn = sqlite3.connect(APOLLO_DB_PATH)
+    conn = connect(APOLLO_DB_PATH)
     c = conn.cursor()
     c.execute('SELECT * FROM contacts WHERE company_id = ?', (company_id,))
     rows = c.fetchall()
@@ -107,7 +261,7 @@ def get_available_countries_asia():
     asia_countries = set([
         'Malaysia','Indonesia','Thailand','Vietnam','Singapore','Philippines','China','India','Japan','South Korea','Hong Kong','Taiwan','Bangladesh','Pakistan','Sri Lanka','Myanmar','Cambodia','Laos','Nepal','Mongolia','Brunei','Timor-Leste','Maldives','Bhutan'
     ])
-    conn = sqlite3.connect(APOLLO_DB_PATH)
+    conn = connect(APOLLO_DB_PATH)
     c = conn.cursor()
     c.execute('SELECT DISTINCT country FROM companies')
     db_countries = set(row[0].strip() for row in c.fetchall() if row[0])
@@ -119,7 +273,7 @@ def get_available_countries_global():
     global_countries = set([
         'United States','Germany','United Kingdom','France','Italy','Spain','Canada','Australia','Brazil','Mexico','Russia','Turkey','Netherlands','Switzerland','Sweden','Norway','Denmark','Finland','Poland','Austria','Belgium','South Africa','Egypt','Saudi Arabia','UAE','Argentina','Chile','New Zealand','Ireland','Portugal','Greece','Czech Republic','Hungary','Romania','Israel','Ukraine'
     ])
-    conn = sqlite3.connect(APOLLO_DB_PATH)
+    conn = connect(APOLLO_DB_PATH)
     c = conn.cursor()
     c.execute('SELECT DISTINCT country FROM companies')
     db_countries = set(row[0].strip() for row in c.fetchall() if row[0])
@@ -131,7 +285,7 @@ def get_available_countries_global():
 
 def get_all_contacts():
     """Return all contacts (potential buyers) as a list of dicts."""
-    conn = sqlite3.connect(APOLLO_DB_PATH)
+    conn = connect(APOLLO_DB_PATH)
     c = conn.cursor()
     c.execute('SELECT * FROM contacts')
     rows = c.fetchall()
@@ -139,11 +293,13 @@ def get_all_contacts():
     conn.close()
     return [dict(zip(columns, row)) for row in rows]
 
+@invalidates('contacts')
 def update_contact(contact_id, updated_fields):
     """Update a contact by id. updated_fields is a dict of column:value."""
     if not updated_fields:
         return False
-    conn = sqlite3.connect(APOLLO_DB_PATH)
+    updated_fields = with_normalized_name(updated_fields)
+    conn = connect(APOLLO_DB_PATH)
     c = conn.cursor()
     set_clause = ', '.join([f"{k} = ?" for k in updated_fields.keys()])
     values = list(updated_fields.values()) + [contact_id]
@@ -153,9 +309,10 @@ def update_contact(contact_id, updated_fields):
     conn.close()
     return affected > 0
 
+@invalidates('contacts')
 def delete_contact(contact_id):
     """Delete a contact by id."""
-    conn = sqlite3.connect(APOLLO_DB_PATH)
+    conn = connect(APOLLO_DB_PATH)
     c = conn.cursor()
     c.execute('DELETE FROM contacts WHERE id = ?', (contact_id,))
     conn.commit()
@@ -165,25 +322,92 @@ def delete_contact(contact_id):
 
 def find_duplicate_contacts():
     """Find duplicate contacts by email or (name+company_name). Returns a list of lists of duplicate contact dicts."""
-    conn = sqlite3.connect(APOLLO_DB_PATH)
-    c = conn.cursor()
-    # By email
-    c.execute('SELECT email FROM contacts WHERE email IS NOT NULL AND email != "" GROUP BY email HAVING COUNT(*) > 1')
-    dup_emails = [row[0] for row in c.fetchall()]
-    duplicates = []
-    for email in dup_emails:
-        c.execute('SELECT * FROM contacts WHERE email = ?', (email,))
-        rows = c.fetchall()
-        columns = [desc[0] for desc in c.description]
-        duplicates.append([dict(zip(columns, row)) for row in rows])
-    # By (name+company_name)
-    c.execute('SELECT name, company_name FROM contacts WHERE name IS NOT NULL AND company_name IS NOT NULL GROUP BY name, company_name HAVING COUNT(*) > 1')
-    for name, company_name in c.fetchall():
-        c.execute('SELECT * FROM contacts WHERE name = ? AND company_name = ?', (name, company_name))
-        rows = c.fetchall()
-        columns = [desc[0] for desc in c.description]
-        group = [dict(zip(columns, row)) for row in rows]
-        if len(group) > 1 and group not in duplicates:
-            duplicates.append(group)
-    conn.close()
-    return duplicates 
\ No newline at end of file
+    from dedup import find_duplicate_groups
+    return find_duplicate_groups('apollo_contacts', db_path=APOLLO_DB_PATH)
+
+def create_extraction_job(params, max_pages, kind='companies', db_path=None):
+    """Record a new extraction run. params (e.g. country, keyword_tags) is stored as JSON. Returns the job id."""
+    now = datetime.utcnow().isoformat()
+    conn = connect(db_path or APOLLO_DB_PATH)
+    c = conn.cursor()
+    c.execute('''
+        INSERT INTO extraction_jobs (kind, params, max_pages, status, created_at, updated_at)
+        VALUES (?, ?, ?, 'running', ?, ?)
+    ''', (kind, json.dumps(params), max_pages, now, now))
+    job_id = c.lastrowid
+    conn.commit()
+    conn.close()
+    return job_id
+
+def _job_from_row(columns, row):
+    job = dict(zip(columns, row))
+    job['params'] = json.loads(job['params'] or '{}')
+    return job
+
+def get_extraction_job(job_id, db_path=None):
+    conn = connect(db_path or APOLLO_DB_PATH)
+    c = conn.cursor()
+    c.execute('SELECT * FROM extraction_jobs WHERE id = ?', (job_id,))
+    row = c.fetchone()
+    columns = [desc[0] for desc in c.description]
+    conn.close()
+    return _job_from_row(columns, row) if row else None
+
+def get_resumable_extraction_jobs(kind='companies', db_path=None):
+    """Jobs that stopped before finishing (interrupted, paused or failed), newest first."""
+    conn = connect(db_path or APOLLO_DB_PATH)
+    c = conn.cursor()
+    c.execute(
+        f"SELECT * FROM extraction_jobs WHERE kind = ? AND status IN ({', '.join('?' * len(RESUMABLE_STATUSES))}) ORDER BY id DESC",
+        (kind, *RESUMABLE_STATUSES)
+    )
+    rows = c.fetchall()
+    columns = [desc[0] for desc in c.description]
+    conn.close()
+    return [_job_from_row(columns, row) for row in rows]
+
+def update_extraction_job(job_id, db_path=None, **fields):
+    """Update job columns (last_page, counters, status, error); updated_at is set automatically."""
+    fields['updated_at'] = datetime.utcnow().isoformat()
+    set_clause = ', '.join(f"{k} = ?" for k in fields)
+    conn = connect(db_path or APOLLO_DB_PATH)
+    c = conn.cursor()
+    c.execute(f'UPDATE extraction_jobs SET {set_clause} WHERE id = ?', (*fields.values(), job_id))
+    conn.commit()
+    conn.close()
+
+def _reveals_connection(db_path=None):
+    # The reveal cache is also used by the GUI, which never runs init_apollo_db
+    path = db_path or APOLLO_DB_PATH
+    conn = connect(path)
+    if path not in _reveals_table_ready:
+        conn.execute(EMAIL_REVEALS_TABLE)
+        conn.commit()
+        _reveals_table_ready.add(path)
+    return conn
+
+def get_revealed_emails(person_ids, db_path=None):
+    """Cached reveals for the given person ids as {person_id: email}; ids never revealed are absent."""
+    person_ids = list(dict.fromkeys(pid for pid in person_ids if pid))
+    found = {}
+    conn = _reveals_connection(db_path)
+    c = conn.cursor()
+    # Stay well under SQLite's bound-parameter limit
+    for start in range(0, len(person_ids), 500):
+        chunk = person_ids[start:start + 500]
+        placeholders = ', '.join('?' * len(chunk))
+        c.execute(f'SELECT person_id, email FROM email_reveals WHERE person_id IN ({placeholders})', chunk)
+        found.update(c.fetchall())
+    conn.close()
+    return found
+
+def save_revealed_emails(emails, db_path=None):
+    """Store {person_id: email} reveal results (use '' when Apollo returned no email)."""
+    if not emails:
+        return
+    revealed_at = datetime.utcnow().isoformat()
+    conn = _reveals_connection(db_path)
+    conn.executemany('INSERT OR REPLACE INTO email_reveals (person_id, email, revealed_at) VALUES (?, ?, ?)',
+                     [(pid, email or '', revealed_at) for pid, email in emails.items()])
+    conn.commit()
+    conn.close()
@@ -0,0 +1,122 @@
+import os
+import sqlite3
+import threading
+from typing import Dict
+
+# Seconds a writer waits on a locked database before raising "database is locked"
+BUSY_TIMEOUT = 10.0
+
+# Applied to every pooled connection. WAL lets the GUI's reader threads keep reading
+# while a background writer commits; synchronous=NORMAL is durable in WAL mode.
+PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'cache_size': -20000,         # ~20 MB page cache (negative = KiB)
+    'mmap_size': 256 * 1024 * 1024,
+    'temp_store': 'MEMORY',
+    'busy_timeout': int(BUSY_TIMEOUT * 1000),
+}
+
+_local = threading.local()
+_registry: Dict = {}  # (thread ident, path) -> sqlite3.Connection, for close_all() and close_path()
+_registry_lock = threading.Lock()
+_generation = 0  # bumped by close_all() so threads reopen instead of using closed connections
+
+class PooledConnection:
+    """
+    Checkout of the calling thread's pooled connection for one database file.
+    It behaves like a sqlite3.Connection, but close() returns the connection to the pool
+    (rolling back anything left uncommitted by the outermost checkout) instead of closing it.
+    """
+    def __init__(self, conn: sqlite3.Connection, path: str):
+        self._conn = conn
+        self._path = path
+        self._closed = False
+        depths = _local.depths
+        if depths.get(path, 0) == 0 and conn.in_transaction:
+            # Left over from a caller that raised before committing
+            conn.rollback()
+        depths[path] = depths.get(path, 0) + 1
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        depths = _local.depths
+        depths[self._path] = max(0, depths.get(self._path, 1) - 1)
+        if depths[self._path] == 0 and self._conn.in_transaction:
+            self._conn.rollback()
+
+    def __del__(self):
+        try:
+            if not self._closed and getattr(_local, 'depths', None) is not None:
+                self.close()
+        except Exception:
+            pass
+
+    def __enter__(self):
+        self._conn.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return self._conn.__exit__(exc_type, exc, tb)
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+def _open(path: str) -> sqlite3.Connection:
+    conn = sqlite3.connect(path, timeout=BUSY_TIMEOUT, check_same_thread=False)
+    for pragma, value in PRAGMAS.items():
+        conn.execute(f'PRAGMA {pragma} = {value}')
+    return conn
+
+def _prune_dead_threads():
+    alive = {t.ident for t in threading.enumerate()}
+    for key in [k for k in _registry if k[0] not in alive]:
+        try:
+            _registry.pop(key).close()
+        except Exception:
+            pass
+
+def connect(db_path: str) -> PooledConnection:
+    """
+    Return the calling thread's pooled connection to db_path (opened and tuned on first use).
+    Use it exactly like sqlite3.connect(): commit() to persist, close() when done.
+    """
+    path = os.path.abspath(db_path)
+    if getattr(_local, 'generation', None) != _generation:
+        _local.connections = {}
+        _local.depths = {}
+        _local.generation = _generation
+    conn = _local.connections.get(path)
+    if conn is not None and _registry.get((threading.get_ident(), path)) is not conn:
+        conn = None  # closed by close_path()
+    if conn is None:
+        conn = _open(path)
+        _local.connections[path] = conn
+        with _registry_lock:
+            _prune_dead_threads()
+            _registry[(threading.get_ident(), path)] = conn
+    return PooledConnection(conn, path)
+
+def close_all():
+    """Close every pooled connection in every thread (call on application shutdown)."""
+    global _generation
+    with _registry_lock:
+        _generation += 1
+        for conn in _registry.values():
+            try:
+                conn.close()
+            except Exception:
+                pass
+        _registry.clear()
+
+def close_path(db_path: str):
+    """Close the pooled connections to one database file in every thread (e.g. before deleting it)."""
+    path = os.path.abspath(db_path)
+    with _registry_lock:
+        for key in [k for k in _registry if k[1] == path]:
+            try:
+                _registry.pop(key).close()
+            except Exception:
+                pass
@@ -0,0 +1,183 @@
+"""
+Set-based duplicate removal. Each rule gives, per row, one or more dedup keys as SQL
+expressions; a single window-function statement per table finds every group of rows
+sharing a key and the row each group keeps (the oldest, lowest id). A dry run only
+reports the groups; apply deletes the other rows (repointing references to the kept
+row first) in one transaction.
+
+Names are compared as stored (case and surrounding spaces aside for Apollo rows), so
+different legal entities such as "Top Glove Sdn Bhd" and "Top Glove Corporation Bhd"
+are never merged. normalized_names=True (--normalized-names) groups by normalized_name
+instead, to review near-duplicates.
+
+Usage: python src/dedup.py [results|apollo_companies|apollo_contacts ...] [--normalized-names] [--apply]
+"""
+import sys
+import argparse
+from typing import Dict, List, Optional
+
+import db
+import db_apollo
+from db_connection import connect
+from query_cache import bump_table_versions
+
+_COUNTRY = "lower(trim(COALESCE({column}, '')))"
+_NAME = "lower(trim(company_name))"
+_NORMALIZED_NAME = "COALESCE(NULLIF(normalized_name, ''), lower(trim(company_name)))"
+_EMAIL_KEY = (f"CASE WHEN trim(COALESCE(email, '')) NOT IN ('', '{db_apollo.LOCKED_EMAIL}') "
+              "THEN 'e:' || lower(trim(email)) END")
+
+# table -> database ('main' is database.db, 'apollo' is Apollo.db), key expressions (NULL
+# means the row takes no part in that key), the keys used with normalized_names=True, and
+# columns in other tables that reference its ids
+DEDUP_RULES = {
+    'results': {
+        'database': 'main',
+        'table': 'results',
+        # Identical company_name and company_country
+        'keys': ["CASE WHEN company_country IS NOT NULL THEN quote(company_name) || ',' || quote(company_country) END"],
+        'normalized_keys': [f"{_NORMALIZED_NAME} || '|' || {_COUNTRY.format(column='company_country')}"],
+        'references': [],
+    },
+    'apollo_companies': {
+        'database': 'apollo',
+        'table': 'companies',
+        # Same website, or (for companies without one) same name in the same country
+        'keys': [
+            "CASE WHEN trim(COALESCE(domain, '')) != '' THEN 'd:' || lower(trim(domain)) "
+            f"ELSE 'n:' || {_NAME} || '|' || {_COUNTRY.format(column='country')} END",
+        ],
+        'normalized_keys': [
+            "CASE WHEN trim(COALESCE(domain, '')) != '' THEN 'd:' || lower(trim(domain)) "
+            f"ELSE 'n:' || {_NORMALIZED_NAME} || '|' || {_COUNTRY.format(column='country')} END",
+        ],
+        'references': [('contacts', 'company_id')],
+    },
+    'apollo_contacts': {
+        'database': 'apollo',
+        'table': 'contacts',
+        # Same email (ignoring locked placeholders), or same person at the same company
+        'keys': [
+            _EMAIL_KEY,
+            "CASE WHEN trim(COALESCE(name, '')) != '' AND company_name IS NOT NULL "
+            "THEN 'n:' || quote(name) || ',' || quote(company_name) END",
+        ],
+        'normalized_keys': [
+            _EMAIL_KEY,
+            "CASE WHEN trim(COALESCE(name, '')) != '' AND company_name IS NOT NULL "
+            f"THEN 'n:' || lower(trim(name)) || '|' || {_NORMALIZED_NAME} END",
+        ],
+        'references': [],
+    },
+}
+
+def _db_path(rule: Dict) -> str:
+    return db.DB_PATH if rule['database'] == 'main' else db_apollo.APOLLO_DB_PATH
+
+def duplicate_groups_sql(rule: Dict, normalized_names: bool = False) -> str:
+    """One statement listing every row that shares a key with another: id, dedup_key, keep_id."""
+    keys = rule['normalized_keys'] if normalized_names else rule['keys']
+    keyed = ' UNION ALL '.join(f"SELECT id, {key} AS dedup_key FROM {rule['table']}" for key in keys)
+    return f'''
+        SELECT id, dedup_key, keep_id FROM (
+            SELECT id, dedup_key,
+                   FIRST_VALUE(id) OVER (PARTITION BY dedup_key ORDER BY id) AS keep_id,
+                   COUNT(*) OVER (PARTITION BY dedup_key) AS group_size
+            FROM ({keyed})
+            WHERE dedup_key IS NOT NULL
+        )
+        WHERE group_size > 1
+        ORDER BY dedup_key, id
+    '''
+
+def find_duplicate_groups(name: str, db_path: Optional[str] = None, normalized_names: bool = False) -> List[List[Dict]]:
+    """Groups of duplicate rows (full rows as dicts, kept row first) for the rule `name`."""
+    rule = DEDUP_RULES[name]
+    conn = connect(db_path or _db_path(rule))
+    c = conn.cursor()
+    c.execute(f'''
+        SELECT g.dedup_key, t.* FROM ({duplicate_groups_sql(rule, normalized_names)}) g
+        JOIN {rule['table']} t ON t.id = g.id
+        ORDER BY g.dedup_key, t.id
+    ''')
+    columns = [desc[0] for desc in c.description][1:]
+    groups = {}
+    for row in c.fetchall():
+        groups.setdefault(row[0], []).append(dict(zip(columns, row[1:])))
+    conn.close()
+    # A row can be in an email group and a name group with the same members: report those once
+    unique = {}
+    for group in groups.values():
+        unique.setdefault(tuple(row['id'] for row in group), group)
+    return list(unique.values())
+
+def dedup(name: str, apply: bool = False, db_path: Optional[str] = None, normalized_names: bool = False) -> Dict:
+    """
+    Dry run (default) or apply the rule `name` (by normalized_name if normalized_names). Returns {'table', 'duplicate_groups',
+    'duplicates_found' (rows in some group), 'duplicates_to_remove', 'duplicates_removed'
+    (0 on a dry run)}.
+    """
+    rule = DEDUP_RULES[name]
+    table = rule['table']
+    conn = connect(db_path or _db_path(rule))
+    try:
+        c = conn.cursor()
+        # Connections are pooled, so clear temp tables a failed run may have left behind
+        c.execute('DROP TABLE IF EXISTS temp.dedup_groups')
+        c.execute('DROP TABLE IF EXISTS temp.dedup_plan')
+        c.execute(f'CREATE TEMP TABLE dedup_groups AS {duplicate_groups_sql(rule, normalized_names)}')
+        c.execute('SELECT COUNT(DISTINCT dedup_key), COUNT(DISTINCT id) FROM temp.dedup_groups')
+        group_count, found = c.fetchone()
+        # Every row that isn't the one its group keeps; with several keys it follows the oldest keeper
+        c.execute('CREATE TEMP TABLE dedup_plan (id INTEGER PRIMARY KEY, keep_id INTEGER NOT NULL)')
+        c.execute('''
+            INSERT INTO temp.dedup_plan (id, keep_id)
+            SELECT id, MIN(keep_id) FROM temp.dedup_groups WHERE id != keep_id GROUP BY id
+        ''')
+        removable = c.rowcount
+        removed = 0
+        if apply and removable:
+            for ref_table, ref_column in rule['references']:
+                c.execute(f'''
+                    UPDATE {ref_table}
+                    SET {ref_column} = (SELECT keep_id FROM temp.dedup_plan WHERE id = {ref_table}.{ref_column})
+                    WHERE {ref_column} IN (SELECT id FROM temp.dedup_plan)
+                ''')
+            c.execute(f'DELETE FROM {table} WHERE id IN (SELECT id FROM temp.dedup_plan)')
+            removed = c.rowcount
+        c.execute('DROP TABLE temp.dedup_groups')
+        c.execute('DROP TABLE temp.dedup_plan')
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+    if removed:
+        bump_table_versions(table, *(ref_table for ref_table, _ in rule['references']))
+    return {
+        'table': table,
+        'duplicate_groups': group_count,
+        'duplicates_found': found,
+        'duplicates_to_remove': removable,
+        'duplicates_removed': removed,
+    }
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(description="Find (and with --apply, remove) duplicate rows")
+    parser.add_argument('rules', nargs='*', help=f"tables to check: {', '.join(DEDUP_RULES)} (default: all)")
+    parser.add_argument('--normalized-names', action='store_true',
+                        help='group by normalized name (legal forms and punctuation ignored) instead of the stored name')
+    parser.add_argument('--apply', action='store_true', help='delete duplicates instead of only reporting them')
+    args = parser.parse_args(argv)
+    unknown = [name for name in args.rules if name not in DEDUP_RULES]
+    if unknown:
+        parser.error(f"unknown table: {', '.join(unknown)}")
+    for name in args.rules or list(DEDUP_RULES):
+        report = dedup(name, apply=args.apply, normalized_names=args.normalized_names)
+        action = f"removed {report['duplicates_removed']}" if args.apply else f"would remove {report['duplicates_to_remove']}"
+        print(f"{name}: {report['duplicate_groups']} duplicate groups, {report['duplicates_found']} rows, {action}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,10 +1,119 @@
 import os
+import json
+import asyncio
+import threading
+import weakref
 import requests
+from requests.adapters import HTTPAdapter
 from dotenv import load_dotenv
 import re
-from typing import List, Dict
+from typing import List, Dict, Optional, Iterator
+from response_cache import ResponseCache, make_cache_key
+from rate_limiter import call_with_retry, acall_with_retry
+from db import StreamingCompanyParser, parse_deepseek_output
 
 PROMPT_PATH = os.path.join(os.path.dirname(__file__), '..', 'prompts', 'deepseek_prompt.txt')
+ENV_PATH = os.path.join(os.path.dirname(__file__), '..', 'config', '.env')
+DEFAULT_API_URL = 'https://api.deepseek.com/v1/chat/completions'
+
+class DeepSeekClient:
+    """
+    Pooled HTTP client shared by every DeepSeek query in this process.
+    Connections are kept alive and reused across requests (including multi-part
+    continuations), so only the first call to the API pays the TCP+TLS handshake.
+    A requests.Session is safe to share between the GUI worker threads for plain POSTs.
+    """
+    def __init__(self, pool_size: int = 10, keep_alive: bool = True, timeout: Optional[float] = None):
+        self.pool_size = pool_size
+        self.keep_alive = keep_alive
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.session.headers['Connection'] = 'keep-alive' if keep_alive else 'close'
+
+    def post(self, url: str, headers: Dict, json: Dict, stream: bool = False) -> requests.Response:
+        return self.session.post(url, headers=headers, json=json, timeout=self.timeout, stream=stream)
+
+    def close(self):
+        self.session.close()
+
+_client = None
+_client_lock = threading.Lock()
+
+def get_client() -> DeepSeekClient:
+    """
+    Return the shared DeepSeek client, creating it on first use.
+    Pool size, keep-alive and timeout can be set with DEEPSEEK_POOL_SIZE,
+    DEEPSEEK_KEEP_ALIVE and DEEPSEEK_TIMEOUT in config/.env.
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                load_dotenv(ENV_PATH)
+                timeout = os.getenv('DEEPSEEK_TIMEOUT')
+                _client = DeepSeekClient(
+                    pool_size=int(os.getenv('DEEPSEEK_POOL_SIZE', '10')),
+                    keep_alive=os.getenv('DEEPSEEK_KEEP_ALIVE', 'true').lower() not in ('0', 'false', 'no'),
+                    timeout=float(timeout) if timeout else None
+                )
+    return _client
+
+def close_client():
+    """Close the shared client's pooled connections (e.g. on application shutdown)."""
+    global _client
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+            _client = None
+
+_response_cache = None
+_cache_lock = threading.Lock()
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """
+    Return the on-disk cache for buyer queries, or None if disabled with DEEPSEEK_CACHE_ENABLED=false.
+    TTL and size bounds come from DEEPSEEK_CACHE_TTL (seconds), DEEPSEEK_CACHE_MAX_ENTRIES and DEEPSEEK_CACHE_MAX_MB.
+    """
+    global _response_cache
+    load_dotenv(ENV_PATH)
+    if os.getenv('DEEPSEEK_CACHE_ENABLED', 'true').lower() in ('0', 'false', 'no'):
+        return None
+    if _response_cache is None:
+        with _cache_lock:
+            if _response_cache is None:
+                _response_cache = ResponseCache(
+                    ttl=float(os.getenv('DEEPSEEK_CACHE_TTL', str(7 * 24 * 3600))),
+                    max_entries=int(os.getenv('DEEPSEEK_CACHE_MAX_ENTRIES', '5000')),
+                    max_bytes=int(float(os.getenv('DEEPSEEK_CACHE_MAX_MB', '200')) * 1024 * 1024)
+                )
+    return _response_cache
+
+def load_api_config():
+    """Return (api_key, api_url) from config/.env, raising if the API key is missing."""
+    load_dotenv(ENV_PATH)
+    api_key = os.getenv('DEEPSEEK_API_KEY')
+    api_url = os.getenv('DEEPSEEK_API_URL', DEFAULT_API_URL)
+    if not api_key:
+        raise ValueError('DEEPSEEK_API_KEY not found in environment.')
+    return api_key, api_url
+
+def post_chat_completion(api_url: str, headers: Dict, data: Dict) -> str:
+    """
+    Send one chat-completions request through the shared client and return the message content.
+    Requests go through the 'deepseek' rate limiter; 429/5xx responses and connection errors
+    are retried with backoff before raising.
+    """
+    response = call_with_retry(
+        'deepseek',
+        lambda: get_client().post(api_url, headers=headers, json=data),
+        retry_exceptions=(requests.ConnectionError, requests.Timeout)
+    )
+    response.raise_for_status()
+    result = response.json()
+    return result['choices'][0]['message']['content']
 
 def load_prompt_template():
     with open(PROMPT_PATH, 'r', encoding='utf-8') as f:
@@ -18,41 +127,108 @@ def get_next_part_prompt(original_prompt: str, part_number: int) -> str:
     """Generate a follow-up prompt to request the next part of the answer."""
     return f"{original_prompt}\n\nPlease continue with Part {part_number}. Only return the next part of the list, do not repeat previous results."
 
-def query_deepseek(hs_code: str, keyword: str, country: str, existing_companies: List[str] = None) -> str:
-    load_dotenv(os.path.join(os.path.dirname(__file__), '..', 'config', '.env'))
-    api_key = os.getenv('DEEPSEEK_API_KEY')
-    api_url = os.getenv('DEEPSEEK_API_URL', 'https://api.deepseek.com/v1/chat/completions')
-    if not api_key:
-        raise ValueError('DEEPSEEK_API_KEY not found in environment.')
+HS_CODE_PROMPT_PATH = os.path.join(os.path.dirname(__file__), '..', 'prompts', 'hs_code_prompt.txt')
+
+# Fallback prompt if prompts/hs_code_prompt.txt doesn't exist
+HS_CODE_FALLBACK_PROMPT = """
+        I need to find the most relevant HS codes for {product_type} in {country}. 
+        
+        Please provide a list of HS codes that are commonly used for {product_type} in {country}, 
+        along with their descriptions. Focus on the most relevant codes that would be used 
+        for importing or exporting {product_type} to/from {country}.
+        
+        IMPORTANT: Please format your response EXACTLY as follows:
+        
+        1. HS Code: [6-digit code] - Description: [detailed description]
+        2. HS Code: [6-digit code] - Description: [detailed description]
+        3. HS Code: [6-digit code] - Description: [detailed description]
+        
+        Please provide 5-10 most relevant HS codes for {product_type} in {country}.
+        
+        Requirements:
+        - Use exactly 6-digit HS codes
+        - Provide clear, concise descriptions
+        - Focus on codes commonly used in {country}
+        - Include both import and export relevant codes
+        - Do not include any additional formatting, notes, or explanations after the numbered list
+        """
+
+GLOBAL_HS_CODE_PROMPT = """
+    I need to find the most relevant global HS tariff codes for gloves, with PRIORITY on latex and nitrile gloves.
+
+    Please provide a list of HS tariff codes that are commonly used for gloves globally, 
+    along with their descriptions. Focus on the most relevant codes that would be used 
+    for importing or exporting gloves internationally.
+
+    IMPORTANT: Please format your response EXACTLY as follows:
+
+    1. HS Code: [8-10 digit tariff code] - Description: [detailed description]
+    2. HS Code: [8-10 digit tariff code] - Description: [detailed description]
+    3. HS Code: [8-10 digit tariff code] - Description: [detailed description]
+
+    Please provide 5-10 most relevant HS tariff codes for gloves globally.
+
+    PRIORITY ORDER:
+    1. Latex gloves (surgical, examination, medical)
+    2. Nitrile gloves (surgical, examination, industrial)
+    3. Other rubber gloves
+    4. Other glove types (textile, leather, etc.)
+
+    Requirements:
+    - Use full 8-10 digit HS tariff codes (e.g., 4015.12.1000, 4015.19.0000)
+    - Provide clear, concise descriptions
+    - Focus on codes commonly used internationally
+    - Include both import and export relevant codes
+    - Do not include any additional formatting, notes, or explanations after the numbered list
+    """
+
+def build_buyer_prompt(hs_code: str, keyword: str, country: str, existing_companies: List[str] = None) -> str:
+    """Render the buyer-search prompt, appending the exclusion list if existing companies are given."""
     prompt_template = load_prompt_template()
-    
+    prompt = prompt_template.format(hs_code=hs_code, keyword=keyword, country=country)
     # Add existing companies to the prompt if provided
     if existing_companies:
         existing_companies_text = "\n\nIMPORTANT: Please EXCLUDE the following companies that we already have in our database:\n"
         for company in existing_companies:
             existing_companies_text += f"- {company}\n"
         existing_companies_text += "\nPlease provide DIFFERENT companies that are not in this list."
-        prompt = prompt_template.format(hs_code=hs_code, keyword=keyword, country=country) + existing_companies_text
-    else:
-        prompt = prompt_template.format(hs_code=hs_code, keyword=keyword, country=country)
-    headers = {
+        prompt += existing_companies_text
+    return prompt
+
+def build_hs_code_prompt(country: str) -> str:
+    """Render the country HS code prompt from prompts/hs_code_prompt.txt (or the built-in fallback)."""
+    try:
+        with open(HS_CODE_PROMPT_PATH, 'r', encoding='utf-8') as f:
+            prompt_template = f.read()
+    except FileNotFoundError:
+        prompt_template = HS_CODE_FALLBACK_PROMPT
+    return prompt_template.format(country=country)
+
+def build_headers(api_key: str) -> Dict:
+    return {
         'Authorization': f'Bearer {api_key}',
         'Content-Type': 'application/json',
     }
-    data = {
+
+def build_chat_request(prompt: str) -> Dict:
+    return {
         "model": "deepseek-reasoner",
         "messages": [
             {"role": "user", "content": prompt}
         ],
         "temperature": 0.2
     }
+
+def multipart_exchange(prompt: str, data: Dict):
+    """
+    Transport-independent driver for multi-part answers ("Part 1", "Part 2", ...).
+    Yields each request body to send and expects the response content back via send();
+    the joined output is the generator's return value. Shared by the sync and async clients.
+    """
     all_parts = []
     part_number = 1
     while True:
-        response = requests.post(api_url, headers=headers, json=data)
-        response.raise_for_status()
-        result = response.json()
-        content = result['choices'][0]['message']['content']
+        content = yield data
         all_parts.append(content)
         # Check if this part indicates there is a next part
         if re.search(rf'Part\s*{part_number}', content, re.IGNORECASE):
@@ -63,72 +239,119 @@ def query_deepseek(hs_code: str, keyword: str, country: str, existing_companies:
             # Prepare to fetch the next part
             part_number += 1
             next_prompt = get_next_part_prompt(prompt, part_number)
-            data["messages"] = [
+            data = dict(data, messages=[
                 {"role": "user", "content": next_prompt}
-            ]
+            ])
         else:
             break
     return '\n'.join(all_parts)
 
+def run_exchange(exchange, send) -> str:
+    """Run a multipart_exchange with a blocking send(body) -> content function."""
+    body = next(exchange)
+    while True:
+        content = send(body)
+        try:
+            body = exchange.send(content)
+        except StopIteration as stop:
+            return stop.value
+
+def query_deepseek(hs_code: str, keyword: str, country: str, existing_companies: List[str] = None, use_cache: bool = True) -> str:
+    """
+    Query DeepSeek for buyers of the given HS code/keyword in a country.
+    Identical requests (same rendered prompt, exclusion list and model) are answered
+    from the on-disk response cache; pass use_cache=False to force a fresh API call.
+    """
+    api_key, api_url = load_api_config()
+    prompt = build_buyer_prompt(hs_code, keyword, country, existing_companies)
+    headers = build_headers(api_key)
+    data = build_chat_request(prompt)
+    cache = get_response_cache() if use_cache else None
+    cache_key = make_cache_key(api_url, data)
+    if cache:
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return cached
+    output = run_exchange(multipart_exchange(prompt, data), lambda body: post_chat_completion(api_url, headers, body))
+    if cache:
+        cache.set(cache_key, output)
+    return output
+
+def stream_chat_completion(api_url: str, headers: Dict, data: Dict) -> Iterator[str]:
+    """
+    Send a chat-completions request with stream=True and yield content deltas as the
+    server-sent events arrive. Reasoning tokens (reasoning_content) are skipped.
+    """
+    body = dict(data, stream=True)
+    response = call_with_retry(
+        'deepseek',
+        lambda: get_client().post(api_url, headers=headers, json=body, stream=True),
+        retry_exceptions=(requests.ConnectionError, requests.Timeout)
+    )
+    response.raise_for_status()
+    # SSE is always UTF-8; requests would otherwise assume ISO-8859-1 for text/event-stream
+    response.encoding = 'utf-8'
+    try:
+        for line in response.iter_lines(decode_unicode=True):
+            if not line or not line.startswith('data:'):
+                continue  # blank separators and ': keep-alive' comments
+            payload = line[len('data:'):].strip()
+            if payload == '[DONE]':
+                break
+            chunk = json.loads(payload)
+            if not chunk.get('choices'):
+                continue
+            content = chunk['choices'][0].get('delta', {}).get('content')
+            if content:
+                yield content
+    finally:
+        response.close()
+
+def query_deepseek_stream(hs_code: str, keyword: str, country: str, existing_companies: List[str] = None, use_cache: bool = True) -> Iterator[Dict]:
+    """
+    Streaming version of query_deepseek: yields parsed company dicts as soon as each
+    numbered block of the answer is complete, instead of waiting for the whole completion.
+    Multi-part answers are continued automatically; the full output is written to the
+    response cache when the stream finishes (a cache hit yields all companies at once).
+    """
+    api_key, api_url = load_api_config()
+    prompt = build_buyer_prompt(hs_code, keyword, country, existing_companies)
+    headers = build_headers(api_key)
+    data = build_chat_request(prompt)
+    cache = get_response_cache() if use_cache else None
+    cache_key = make_cache_key(api_url, data)
+    if cache:
+        cached = cache.get(cache_key)
+        if cached is not None:
+            yield from parse_deepseek_output(cached)
+            return
+    parser = StreamingCompanyParser()
+    exchange = multipart_exchange(prompt, data)
+    body = next(exchange)
+    while True:
+        parts = []
+        for delta in stream_chat_completion(api_url, headers, body):
+            parts.append(delta)
+            yield from parser.feed(delta)
+        try:
+            body = exchange.send(''.join(parts))
+        except StopIteration as stop:
+            output = stop.value
+            break
+        # Parts are joined with a newline in the final output
+        yield from parser.feed('\n')
+    yield from parser.close()
+    if cache:
+        cache.set(cache_key, output)
+
 def query_deepseek_for_hs_codes(country: str) -> str:
     """
     Query DeepSeek to find country-specific HS codes for gloves.
     Returns the raw response from DeepSeek.
     """
-    load_dotenv(os.path.join(os.path.dirname(__file__), '..', 'config', '.env'))
-    api_key = os.getenv('DEEPSEEK_API_KEY')
-    api_url = os.getenv('DEEPSEEK_API_URL', 'https://api.deepseek.com/v1/chat/completions')
-    if not api_key:
-        raise ValueError('DEEPSEEK_API_KEY not found in environment.')
-    
-    # Load prompt template from file
-    prompt_file = os.path.join(os.path.dirname(__file__), '..', 'prompts', 'hs_code_prompt.txt')
-    try:
-        with open(prompt_file, 'r', encoding='utf-8') as f:
-            prompt_template = f.read()
-    except FileNotFoundError:
-        # Fallback prompt if file doesn't exist
-        prompt_template = """
-        I need to find the most relevant HS codes for {product_type} in {country}. 
-        
-        Please provide a list of HS codes that are commonly used for {product_type} in {country}, 
-        along with their descriptions. Focus on the most relevant codes that would be used 
-        for importing or exporting {product_type} to/from {country}.
-        
-        IMPORTANT: Please format your response EXACTLY as follows:
-        
-        1. HS Code: [6-digit code] - Description: [detailed description]
-        2. HS Code: [6-digit code] - Description: [detailed description]
-        3. HS Code: [6-digit code] - Description: [detailed description]
-        
-        Please provide 5-10 most relevant HS codes for {product_type} in {country}.
-        
-        Requirements:
-        - Use exactly 6-digit HS codes
-        - Provide clear, concise descriptions
-        - Focus on codes commonly used in {country}
-        - Include both import and export relevant codes
-        - Do not include any additional formatting, notes, or explanations after the numbered list
-        """
-    
-    prompt = prompt_template.format(country=country)
-    
-    headers = {
-        'Authorization': f'Bearer {api_key}',
-        'Content-Type': 'application/json',
-    }
-    data = {
-        "model": "deepseek-reasoner",
-        "messages": [
-            {"role": "user", "content": prompt}
-        ],
-        "temperature": 0.2
-    }
-    
-    response = requests.post(api_url, headers=headers, json=data)
-    response.raise_for_status()
-    result = response.json()
-    return result['choices'][0]['message']['content']
+    api_key, api_url = load_api_config()
+    data = build_chat_request(build_hs_code_prompt(country))
+    return post_chat_completion(api_url, build_headers(api_key), data)
 
 def parse_hs_codes_from_deepseek(output: str) -> List[Dict]:
     """
@@ -204,60 +427,117 @@ def parse_hs_codes_from_deepseek(output: str) -> List[Dict]:
     
     return codes
 
+
 def query_deepseek_for_global_hs_codes() -> str:
     """
     Query DeepSeek to find global HS codes for gloves.
     Returns the raw response from DeepSeek.
     """
-    load_dotenv(os.path.join(os.path.dirname(__file__), '..', 'config', '.env'))
-    api_key = os.getenv('DEEPSEEK_API_KEY')
-    api_url = os.getenv('DEEPSEEK_API_URL', 'https://api.deepseek.com/v1/chat/completions')
-    if not api_key:
-        raise ValueError('DEEPSEEK_API_KEY not found in environment.')
-    
-    # Create a prompt for global HS codes
-    prompt = """
-    I need to find the most relevant global HS tariff codes for gloves, with PRIORITY on latex and nitrile gloves.
+    api_key, api_url = load_api_config()
+    data = build_chat_request(GLOBAL_HS_CODE_PROMPT)
+    return post_chat_completion(api_url, build_headers(api_key), data)
 
-    Please provide a list of HS tariff codes that are commonly used for gloves globally, 
-    along with their descriptions. Focus on the most relevant codes that would be used 
-    for importing or exporting gloves internationally.
+# --- Async API ---
+# Non-blocking variants of the query functions for running many requests from one
+# event loop. They share prompt building, caching and the multi-part protocol with the
+# blocking functions above; only the transport (a pooled httpx.AsyncClient) differs.
 
-    IMPORTANT: Please format your response EXACTLY as follows:
+_async_clients = weakref.WeakKeyDictionary()
 
-    1. HS Code: [8-10 digit tariff code] - Description: [detailed description]
-    2. HS Code: [8-10 digit tariff code] - Description: [detailed description]
-    3. HS Code: [8-10 digit tariff code] - Description: [detailed description]
-
-    Please provide 5-10 most relevant HS tariff codes for gloves globally.
+def get_async_client():
+    """
+    Return the pooled httpx.AsyncClient for the running event loop, creating it on first use.
+    Uses the same DEEPSEEK_POOL_SIZE / DEEPSEEK_KEEP_ALIVE / DEEPSEEK_TIMEOUT settings as get_client().
+    """
+    try:
+        import httpx
+    except ImportError:
+        raise ImportError('httpx is required for the async DeepSeek API (pip install httpx).')
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        load_dotenv(ENV_PATH)
+        pool_size = int(os.getenv('DEEPSEEK_POOL_SIZE', '10'))
+        keep_alive = os.getenv('DEEPSEEK_KEEP_ALIVE', 'true').lower() not in ('0', 'false', 'no')
+        timeout = os.getenv('DEEPSEEK_TIMEOUT')
+        client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size if keep_alive else 0),
+            timeout=float(timeout) if timeout else None
+        )
+        _async_clients[loop] = client
+    return client
 
-    PRIORITY ORDER:
-    1. Latex gloves (surgical, examination, medical)
-    2. Nitrile gloves (surgical, examination, industrial)
-    3. Other rubber gloves
-    4. Other glove types (textile, leather, etc.)
+async def aclose_async_client():
+    """Close the async client bound to the running event loop."""
+    client = _async_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
 
-    Requirements:
-    - Use full 8-10 digit HS tariff codes (e.g., 4015.12.1000, 4015.19.0000)
-    - Provide clear, concise descriptions
-    - Focus on codes commonly used internationally
-    - Include both import and export relevant codes
-    - Do not include any additional formatting, notes, or explanations after the numbered list
-    """
-    
-    headers = {
-        'Authorization': f'Bearer {api_key}',
-        'Content-Type': 'application/json',
-    }
-    data = {
-        "model": "deepseek-reasoner",
-        "messages": [
-            {"role": "user", "content": prompt}
-        ],
-        "temperature": 0.2
-    }
-    
-    response = requests.post(api_url, headers=headers, json=data)
+async def apost_chat_completion(api_url: str, headers: Dict, data: Dict) -> str:
+    """Async counterpart of post_chat_completion (same limiter and retry policy)."""
+    import httpx
+    client = get_async_client()
+    response = await acall_with_retry(
+        'deepseek',
+        lambda: client.post(api_url, headers=headers, json=data),
+        retry_exceptions=(httpx.TransportError,)
+    )
     response.raise_for_status()
     result = response.json()
-    return result['choices'][0]['message']['content'] 
\ No newline at end of file
+    return result['choices'][0]['message']['content']
+
+async def arun_exchange(exchange, send) -> str:
+    """Run a multipart_exchange with an async send(body) -> content coroutine function."""
+    body = next(exchange)
+    while True:
+        content = await send(body)
+        try:
+            body = exchange.send(content)
+        except StopIteration as stop:
+            return stop.value
+
+async def aquery_deepseek(hs_code: str, keyword: str, country: str, existing_companies: List[str] = None, use_cache: bool = True) -> str:
+    """Async version of query_deepseek (same caching and multi-part handling)."""
+    api_key, api_url = load_api_config()
+    prompt = build_buyer_prompt(hs_code, keyword, country, existing_companies)
+    headers = build_headers(api_key)
+    data = build_chat_request(prompt)
+    loop = asyncio.get_running_loop()
+    cache = get_response_cache() if use_cache else None
+    cache_key = make_cache_key(api_url, data)
+    if cache:
+        cached = await loop.run_in_executor(None, cache.get, cache_key)
+        if cached is not None:
+            return cached
+    output = await arun_exchange(multipart_exchange(prompt, data), lambda body: apost_chat_completion(api_url, headers, body))
+    if cache:
+        await loop.run_in_executor(None, cache.set, cache_key, output)
+    return output
+
+async def aquery_deepseek_for_hs_codes(country: str) -> str:
+    """Async version of query_deepseek_for_hs_codes."""
+    api_key, api_url = load_api_config()
+    data = build_chat_request(build_hs_code_prompt(country))
+    return await apost_chat_completion(api_url, build_headers(api_key), data)
+
+async def aquery_deepseek_for_global_hs_codes() -> str:
+    """Async version of query_deepseek_for_global_hs_codes."""
+    api_key, api_url = load_api_config()
+    data = build_chat_request(GLOBAL_HS_CODE_PROMPT)
+    return await apost_chat_completion(api_url, build_headers(api_key), data)
+
+async def aquery_deepseek_many(jobs: List[Dict], concurrency: int = 50, use_cache: bool = True) -> List:
+    """
+    Run many buyer queries concurrently from one event loop.
+    Each job is a dict with hs_code, keyword, country and optional existing_companies.
+    At most `concurrency` requests are in flight at once. Returns one entry per job,
+    in order: the raw output string, or the exception raised for that job.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run_job(job):
+        async with semaphore:
+            return await aquery_deepseek(job['hs_code'], job['keyword'], job['country'],
+                                         job.get('existing_companies'), use_cache=use_cache)
+
+    return await asyncio.gather(*(run_job(job) for job in jobs), return_exceptions=True)
\ No newline at end of file
@@ -0,0 +1,317 @@
+"""
+Entity resolution between DeepSeek buyer results (deepseek_buyer_search_results) and
+Apollo companies (companies) in database.db.
+
+Records are only compared with records that share a blocking key (the host of their
+website, or a distinctive normalized-name token), and keys shared by more than
+MAX_BLOCK_SIZE records are skipped, so the work grows roughly linearly with the number
+of records instead of with all pairs. Records whose similarity reaches MATCH_THRESHOLD
+are put in the same company cluster (entity).
+
+company_entities holds one row per record (source, record_id) with its entity_id and
+the attributes used for matching; entity_blocks holds its blocking keys. Both are
+updated incrementally: resolve_new() only processes rows added since the last run, and
+resolves everything again when the stored links were made by an older RESOLUTION_VERSION.
+
+Usage: python src/entity_resolution.py [--rebuild]
+"""
+import re
+import sys
+import difflib
+import argparse
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import GUI_db
+from db_connection import connect
+from name_normalizer import name_key, normalize_company_name
+
+MATCH_THRESHOLD = 0.85
+MAX_BLOCK_SIZE = 100
+# Bump when domains, keys or scores change meaning: stored links are then rebuilt
+RESOLUTION_VERSION = 2
+
+# Source tables: name -> (query for rows after an id, columns: id, name, normalized name, country, domain or website)
+SOURCES = {
+    'deepseek': 'SELECT id, company_name, normalized_name, company_country, company_website_link '
+                'FROM deepseek_buyer_search_results WHERE id > ? ORDER BY id',
+    'apollo': 'SELECT id, company_name, normalized_name, country, domain FROM companies WHERE id > ? ORDER BY id',
+}
+
+# Words too common in this market to say two names are the same company
+STOP_TOKENS = {
+    'the', 'and', 'of', 'glove', 'gloves', 'medical', 'trading', 'industries', 'industry', 'industrial',
+    'international', 'group', 'holdings', 'supplies', 'supply', 'products', 'healthcare', 'health',
+    'technologies', 'technology', 'enterprise', 'enterprises', 'services', 'manufacturing', 'rubber',
+    'latex', 'global', 'solutions', 'distributors', 'distribution', 'import', 'export', 'company',
+    'safety', 'care', 'hospital', 'pharma', 'pharmaceutical', 'pharmaceuticals', 'general', 'world',
+}
+
+ENTITY_TABLES = [
+    '''
+    CREATE TABLE IF NOT EXISTS company_entities (
+        source TEXT NOT NULL,
+        record_id INTEGER NOT NULL,
+        entity_id INTEGER NOT NULL,
+        normalized_name TEXT,
+        domain TEXT,
+        country TEXT,
+        match_score REAL,
+        linked_at TEXT,
+        PRIMARY KEY (source, record_id)
+    )
+    ''',
+    'CREATE INDEX IF NOT EXISTS idx_company_entities_entity ON company_entities (entity_id)',
+    '''
+    CREATE TABLE IF NOT EXISTS entity_blocks (
+        block_key TEXT NOT NULL,
+        source TEXT NOT NULL,
+        record_id INTEGER NOT NULL,
+        PRIMARY KEY (block_key, source, record_id)
+    )
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS entity_resolution_state (
+        source TEXT PRIMARY KEY,  -- or 'version', holding the RESOLUTION_VERSION of the links
+        last_id INTEGER NOT NULL DEFAULT 0
+    )
+    ''',
+]
+
+# Sites (and their subdomains) that host pages of many unrelated companies: a shared
+# website there says nothing about two records being the same company
+SHARED_HOSTS = {
+    'facebook.com', 'fb.com', 'linkedin.com', 'instagram.com', 'twitter.com', 'x.com', 'youtube.com',
+    'tiktok.com', 'wa.me', 'whatsapp.com', 'google.com', 'goo.gl', 'bit.ly', 'blogspot.com',
+    'wordpress.com', 'wixsite.com', 'weebly.com', 'alibaba.com', 'aliexpress.com', '1688.com',
+    'made-in-china.com', 'globalsources.com', 'indiamart.com', 'tradeindia.com', 'tradekey.com',
+    'amazon.com', 'shopee.com', 'lazada.com', 'tokopedia.com', 'yellowpages.com', 'kompass.com',
+    'dnb.com', 'zoominfo.com', 'crunchbase.com', 'bloomberg.com', 'wikipedia.org',
+}
+
+_DOMAIN_RE = re.compile(r'^(?:[a-z]+://)?(?:www\d?\.)?([^/:?#\s]+)')
+
+def domain_core(value: Optional[str]) -> str:
+    """
+    Host of a domain or URL without "www." ("https://www.medisafe.co.id/x" -> "medisafe.co.id");
+    '' when there is none or it is a shared host (SHARED_HOSTS).
+    """
+    if not value:
+        return ''
+    match = _DOMAIN_RE.match(value.strip().lower())
+    host = match.group(1).rstrip('.') if match else ''
+    if '.' not in host:
+        return ''
+    if any(host == shared or host.endswith('.' + shared) for shared in SHARED_HOSTS):
+        return ''
+    return host
+
+def tokens(normalized_name: str) -> List[str]:
+    return [t for t in normalized_name.split() if len(t) >= 3 and t not in STOP_TOKENS]
+
+def blocking_keys(record: Dict) -> List[str]:
+    keys = [f"t:{token}" for token in set(tokens(record['normalized_name']))]
+    if record['domain']:
+        keys.append(f"d:{record['domain']}")
+    if record['normalized_name']:
+        # Exact normalized name, so names made only of common words still meet
+        keys.append(f"n:{record['normalized_name']}")
+    return keys
+
+def similarity(a: Dict, b: Dict) -> float:
+    """0..1 likelihood that two records are the same company; 0 for pairs that can't reach MATCH_THRESHOLD."""
+    factor = 1.0
+    if a['country'] and b['country'] and a['country'] != b['country']:
+        factor *= 0.7
+    if a['domain'] and a['domain'] == b['domain']:
+        return factor
+    name_a, name_b = a['normalized_name'], b['normalized_name']
+    if not name_a or not name_b:
+        return 0.0
+    tokens_a, tokens_b = set(name_a.split()), set(name_b.split())
+    jaccard = len(tokens_a & tokens_b) / len(tokens_a | tokens_b)
+    if a['domain'] and b['domain']:
+        factor *= 0.8  # both have websites and they differ
+    matcher = difflib.SequenceMatcher(None, name_a, name_b)
+    # quick_ratio() is an upper bound on ratio(): skip the full comparison when it can't reach the threshold
+    if factor * (0.5 * jaccard + 0.5 * matcher.quick_ratio()) < MATCH_THRESHOLD:
+        return 0.0
+    return factor * (0.5 * jaccard + 0.5 * matcher.ratio())
+
+def init_entity_tables(db_path: Optional[str] = None):
+    conn = connect(db_path or GUI_db.DB_PATH)
+    for statement in ENTITY_TABLES:
+        conn.execute(statement)
+    conn.commit()
+    conn.close()
+
+def _to_record(source: str, row: Tuple) -> Dict:
+    record_id, name, normalized_name, country, domain = row
+    return {
+        'source': source,
+        'record_id': record_id,
+        'normalized_name': normalized_name or normalize_company_name(name),
+        'country': (country or '').strip().lower(),
+        'domain': domain_core(domain),
+    }
+
+def _candidates(c, keys: List[str]) -> List[Dict]:
+    """Records already resolved that share a blocking key, skipping oversized blocks."""
+    found = {}
+    for key in keys:
+        c.execute('SELECT source, record_id FROM entity_blocks WHERE block_key = ? LIMIT ?', (key, MAX_BLOCK_SIZE + 1))
+        members = c.fetchall()
+        if len(members) > MAX_BLOCK_SIZE:
+            continue
+        for member in members:
+            found[member] = None
+    candidates = []
+    for source, record_id in found:
+        c.execute('SELECT entity_id, normalized_name, domain, country FROM company_entities WHERE source = ? AND record_id = ?',
+                  (source, record_id))
+        row = c.fetchone()
+        if row:
+            candidates.append({'source': source, 'record_id': record_id, 'entity_id': row[0],
+                               'normalized_name': row[1], 'domain': row[2], 'country': row[3]})
+    return candidates
+
+def _resolve_record(c, record: Dict, now: str, summary: Dict):
+    keys = blocking_keys(record)
+    matches = []
+    best = 0.0
+    for candidate in _candidates(c, keys):
+        score = similarity(record, candidate)
+        if score >= MATCH_THRESHOLD:
+            matches.append(candidate['entity_id'])
+            best = max(best, score)
+    if matches:
+        entity_id = min(matches)
+        others = sorted(set(matches) - {entity_id})
+        if others:
+            # The new record bridges clusters: fold them into one
+            placeholders = ', '.join('?' * len(others))
+            c.execute(f"UPDATE company_entities SET entity_id = ? WHERE entity_id IN ({placeholders})", [entity_id] + others)
+            summary['merged'] += len(others)
+        summary['linked'] += 1
+    else:
+        c.execute('SELECT COALESCE(MAX(entity_id), 0) + 1 FROM company_entities')
+        entity_id = c.fetchone()[0]
+        summary['entities'] += 1
+    c.execute('''
+        INSERT OR REPLACE INTO company_entities (source, record_id, entity_id, normalized_name, domain, country, match_score, linked_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    ''', (record['source'], record['record_id'], entity_id, record['normalized_name'], record['domain'],
+          record['country'], best or None, now))
+    c.executemany('INSERT OR IGNORE INTO entity_blocks (block_key, source, record_id) VALUES (?, ?, ?)',
+                  [(key, record['source'], record['record_id']) for key in keys])
+
+def resolve_new(db_path: Optional[str] = None) -> Dict:
+    """
+    Link every record added since the last run (per source, by id) into company clusters,
+    in one transaction. Returns {'records', 'linked', 'entities', 'merged'}: records
+    processed, records joined to an existing cluster, new clusters and clusters merged away.
+    """
+    path = db_path or GUI_db.DB_PATH
+    init_entity_tables(path)
+    summary = {'records': 0, 'linked': 0, 'entities': 0, 'merged': 0}
+    now = datetime.utcnow().isoformat()
+    conn = connect(path)
+    try:
+        c = conn.cursor()
+        c.execute("SELECT last_id FROM entity_resolution_state WHERE source = 'version'")
+        row = c.fetchone()
+        if row is None or row[0] != RESOLUTION_VERSION:
+            # No links yet, or made with other rules: resolve every record again
+            for name in ('company_entities', 'entity_blocks', 'entity_resolution_state'):
+                c.execute(f'DELETE FROM {name}')
+            c.execute("INSERT INTO entity_resolution_state (source, last_id) VALUES ('version', ?)", (RESOLUTION_VERSION,))
+        for source, query in SOURCES.items():
+            c.execute('SELECT last_id FROM entity_resolution_state WHERE source = ?', (source,))
+            row = c.fetchone()
+            last_id = row[0] if row else 0
+            try:
+                c.execute(query, (last_id,))
+            except Exception as e:
+                # Source table not created yet (or not migrated): nothing to resolve from it
+                print(f"Skipping {source} records: {e}")
+                continue
+            records = [_to_record(source, r) for r in c.fetchall()]
+            for record in records:
+                _resolve_record(c, record, now, summary)
+                last_id = record['record_id']
+            summary['records'] += len(records)
+            c.execute('INSERT OR REPLACE INTO entity_resolution_state (source, last_id) VALUES (?, ?)', (source, last_id))
+        conn.commit()
+    finally:
+        conn.close()
+    return summary
+
+def rebuild(db_path: Optional[str] = None) -> Dict:
+    """Drop all links and resolve every record again (after edits or deletes, or a threshold change)."""
+    path = db_path or GUI_db.DB_PATH
+    init_entity_tables(path)
+    conn = connect(path)
+    for name in ('company_entities', 'entity_blocks', 'entity_resolution_state'):
+        conn.execute(f'DELETE FROM {name}')
+    conn.commit()
+    conn.close()
+    return resolve_new(path)
+
+def load_entity_links(db_path: Optional[str] = None) -> Dict[Tuple[str, int], int]:
+    """{(source, record_id): entity_id} for every record, resolving new records first."""
+    path = db_path or GUI_db.DB_PATH
+    resolve_new(path)
+    conn = connect(path)
+    c = conn.cursor()
+    c.execute('SELECT source, record_id, entity_id FROM company_entities')
+    links = {(source, record_id): entity_id for source, record_id, entity_id in c.fetchall()}
+    conn.close()
+    return links
+
+class EntityIndex:
+    """
+    Groups rows from either source by company cluster. Rows that aren't linked (or contacts,
+    which only carry a company) fall back to their company_id, then to their normalized name.
+    """
+    def __init__(self, db_path: Optional[str] = None):
+        self.links = load_entity_links(db_path)
+        conn = connect(db_path or GUI_db.DB_PATH)
+        c = conn.cursor()
+        c.execute('SELECT normalized_name, MIN(entity_id) FROM company_entities GROUP BY normalized_name')
+        self.by_name = dict(c.fetchall())
+        conn.close()
+
+    def key(self, row: Dict, source: Optional[str] = None):
+        """
+        ('entity', id) for resolved companies, ('name', normalized name) otherwise, None for rows
+        without a company. source is 'deepseek', 'apollo', or None for contacts.
+        """
+        entity_id = self.links.get((source, row.get('id'))) if source else self.links.get(('apollo', row.get('company_id')))
+        name = name_key(row)
+        if entity_id is None:
+            entity_id = self.by_name.get(name)
+        if entity_id is not None:
+            return ('entity', entity_id)
+        return ('name', name) if name else None
+
+def get_entity_records(entity_id: int, db_path: Optional[str] = None) -> List[Dict]:
+    """All records linked into one company cluster."""
+    conn = connect(db_path or GUI_db.DB_PATH)
+    c = conn.cursor()
+    c.execute('SELECT * FROM company_entities WHERE entity_id = ?', (entity_id,))
+    rows = c.fetchall()
+    columns = [desc[0] for desc in c.description]
+    conn.close()
+    return [dict(zip(columns, row)) for row in rows]
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(description="Link DeepSeek results and Apollo companies into company clusters")
+    parser.add_argument('--rebuild', action='store_true', help='drop existing links and resolve everything again')
+    args = parser.parse_args(argv)
+    summary = rebuild() if args.rebuild else resolve_new()
+    print(f"{summary['records']} records resolved: {summary['linked']} linked to existing companies, "
+          f"{summary['entities']} new companies, {summary['merged']} clusters merged.")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
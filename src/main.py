@@ -1,7 +1,9 @@
 import typer
 from cli.menu import run_cli
+from cli.commands import register_commands
 
 app = typer.Typer()
+register_commands(app)
 
 @app.command()
 def run():
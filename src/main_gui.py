@@ -3,112 +3,42 @@ from tkinter import ttk, messagebox
 import customtkinter as ctk
 import GUI_db
 import deepseek_agent
-import threading
 import csv
 import os
 from tkinter import filedialog
 import db  # Add this import at the top if not present
-from concurrent.futures import ThreadPoolExecutor
-import queue
 import time
 import db_apollo
+import db_connection
+import dashboard_stats
+from paged_table import PagedTableModel, keyset_cursor, offset_cursor
+from name_normalizer import name_key, normalize_company_name
+from entity_resolution import EntityIndex
+from query_cache import QueryCache, bump_table_versions
+from task_scheduler import TaskScheduler, UI_LANE, API_LANE
 from datetime import datetime, timedelta
 from collections import defaultdict, Counter
 
 ctk.set_appearance_mode("light")
 ctk.set_default_color_theme("blue")
 
-# Global background task manager
-class BackgroundTaskManager:
-    def __init__(self):
-        self.executor = ThreadPoolExecutor(max_workers=4)
-        self.task_queue = queue.Queue()
-        self.running = True
-        
-        # Start background worker thread
-        self.worker_thread = threading.Thread(target=self._worker, daemon=True)
-        self.worker_thread.start()
-    
-    def _worker(self):
-        """Background worker that processes tasks"""
-        while self.running:
-            try:
-                task = self.task_queue.get(timeout=1)
-                if task is None:  # Shutdown signal
-                    break
-                
-                func, args, kwargs, callback, error_callback = task
-                try:
-                    result = func(*args, **kwargs)
-                    if callback:
-                        callback(result)
-                except Exception as e:
-                    if error_callback:
-                        error_callback(e)
-                    else:
-                        print(f"Background task error: {e}")
-                finally:
-                    self.task_queue.task_done()
-            except queue.Empty:
-                continue
-    
-    def submit_task(self, func, callback=None, error_callback=None, *args, **kwargs):
-        """Submit a task to run in background"""
-        self.task_queue.put((func, args, kwargs, callback, error_callback))
-    
-    def shutdown(self):
-        """Shutdown the task manager"""
-        self.running = False
-        self.task_queue.put(None)
-        self.executor.shutdown(wait=True)
+# Global background task scheduler: page reads run in the 'ui' lane ahead of API jobs,
+# callbacks are delivered on the Tk thread once MainApp attaches it
+task_manager = TaskScheduler(max_workers=4)
+call_in_ui = task_manager.call_in_ui
 
-# Global task manager instance
-task_manager = BackgroundTaskManager()
+# Streamed AI search results are saved every STREAM_FLUSH_ROWS companies or STREAM_FLUSH_SECONDS seconds
+STREAM_FLUSH_ROWS = 10
+STREAM_FLUSH_SECONDS = 5.0
 
-# Simple caching system
-class Cache:
-    def __init__(self):
-        self.cache = {}
-        self.cache_timestamps = {}
-        self.cache_duration = 300  # 5 minutes
-    
-    def get(self, key):
-        if key in self.cache:
-            if time.time() - self.cache_timestamps.get(key, 0) < self.cache_duration:
-                return self.cache[key]
-            else:
-                # Cache expired, remove it
-                del self.cache[key]
-                if key in self.cache_timestamps:
-                    del self.cache_timestamps[key]
-        return None
-    
-    def set(self, key, value):
-        self.cache[key] = value
-        self.cache_timestamps[key] = time.time()
-    
-    def clear(self):
-        self.cache.clear()
-        self.cache_timestamps.clear()
-    
-    def invalidate(self, pattern=None):
-        """Invalidate cache entries matching a pattern"""
-        if pattern is None:
-            self.clear()
-        else:
-            keys_to_remove = [key for key in self.cache.keys() if pattern in key]
-            for key in keys_to_remove:
-                del self.cache[key]
-                if key in self.cache_timestamps:
-                    del self.cache_timestamps[key]
-
-# Global cache instance
-cache = Cache()
+# Query results reused across pages; entries go stale when a write bumps their tables' versions
+cache = QueryCache(max_entries=256, max_bytes=64 * 1024 * 1024, ttl=300)
 
 # Database operation wrappers for background execution
-def run_in_background(func, callback=None, error_callback=None, *args, **kwargs):
-    """Helper function to run database operations in background"""
-    task_manager.submit_task(func, callback, error_callback, *args, **kwargs)
+def run_in_background(func, callback=None, error_callback=None, *args, lane=UI_LANE, key=None, pass_token=False, **kwargs):
+    """Run func on the task scheduler; callbacks run on the Tk thread. Returns the task (task.cancel() stops it)"""
+    return task_manager.submit(func, *args, lane=lane, key=key, callback=callback, error_callback=error_callback,
+                               pass_token=pass_token, **kwargs)
 
 NAV_LABELS = [
     "HS Code",
@@ -203,72 +133,29 @@ class DashboardContent(ctk.CTkFrame):
 
         
     def load_dashboard_data(self):
-        """Load dashboard data directly without background tasks"""
-        try:
-            print("Starting dashboard data load...")
-            import GUI_db
-            
-            # Initialize database tables first
+        """Load the dashboard stats in the background and show them when ready"""
+        def load_stats():
             GUI_db.init_db()
             GUI_db.init_apollo_db()
             GUI_db.init_deepseek_results_table()
-            
-            print("Database tables initialized")
-            
-            # Get all data with error handling for each
-            try:
-                ai_results = GUI_db.get_all_deepseek_results()
-                print(f"AI results loaded: {len(ai_results)}")
-            except Exception as e:
-                print(f"Error loading AI results: {e}")
-                ai_results = []
-            
-            try:
-                apollo_contacts = GUI_db.get_all_contacts()
-                print(f"Apollo contacts loaded: {len(apollo_contacts)}")
-            except Exception as e:
-                print(f"Error loading Apollo contacts: {e}")
-                apollo_contacts = []
-            
-            try:
-                hs_codes = GUI_db.get_all_hs_codes()
-                print(f"HS codes loaded: {len(hs_codes)}")
-            except Exception as e:
-                print(f"Error loading HS codes: {e}")
-                hs_codes = []
-            
-            try:
-                companies = GUI_db.get_all_companies()
-                print(f"Companies loaded: {len(companies)}")
-            except Exception as e:
-                print(f"Error loading companies: {e}")
-                companies = []
-            
-            print("All data loaded successfully")
-            
-            data = {
-                'counts': {
-                    'ai': len(ai_results),
-                    'apollo': len(apollo_contacts),
-                    'hs': len(hs_codes),
-                    'companies': len(companies)
-                },
-                'activity': self._generate_simple_activity(ai_results, apollo_contacts, hs_codes),
-                'chart': self._generate_country_chart(ai_results, apollo_contacts)
+            dashboard_stats.init_dashboard_stats()
+            stats = dashboard_stats.get_dashboard_stats()
+            return {
+                'counts': stats['counts'],
+                'activity': self._generate_simple_activity(stats),
+                'chart': self._generate_country_chart(stats),
             }
-            
-            self._update_dashboard_ui(data)
-            
-        except Exception as e:
+
+        def on_error(e):
             print(f"Error loading dashboard data: {e}")
-            import traceback
-            traceback.print_exc()
             # Show error state
             self._update_dashboard_ui({
                 'counts': {'ai': 0, 'apollo': 0, 'hs': 0, 'companies': 0},
                 'activity': f"Error loading dashboard data: {e}",
                 'chart': "Error loading chart data"
             })
+
+        run_in_background(load_stats, self._update_dashboard_ui, on_error, key='dashboard_stats')
         
     def _update_dashboard_ui(self, data):
         """Update dashboard UI with loaded data"""
@@ -286,83 +173,51 @@ class DashboardContent(ctk.CTkFrame):
         self.activity_text.delete("1.0", "end")
         self.activity_text.insert("1.0", data['activity'])
     
-    def _generate_simple_activity(self, ai_results, contacts, hs_codes):
+    def _generate_simple_activity(self, stats):
         """Generate simple activity summary"""
         activity = "Recent Activity Summary:\n\n"
+        counts = stats['counts']
+        recent = stats['recent']
         
         # Show recent AI results
-        if ai_results:
-            recent_ai = ai_results[-5:]  # Last 5
-            activity += f"🤖 Recent AI Searches ({len(ai_results)} total):\n"
-            for result in recent_ai:
+        if recent['ai']:
+            activity += f"🤖 Recent AI Searches ({counts['ai']} total):\n"
+            for result in recent['ai']:
                 activity += f"  • {result.get('keyword', '')} in {result.get('country', '')}\n"
             activity += "\n"
         
         # Show recent contacts
-        if contacts:
-            recent_contacts = contacts[-3:]  # Last 3
-            activity += f"👥 Recent Contacts ({len(contacts)} total):\n"
-            for contact in recent_contacts:
+        if recent['contacts']:
+            activity += f"👥 Recent Contacts ({counts['apollo']} total):\n"
+            for contact in recent['contacts']:
                 activity += f"  • {contact.get('name', '')} - {contact.get('company_name', '')}\n"
             activity += "\n"
         
         # Show recent HS codes
-        if hs_codes:
-            recent_hs = hs_codes[-3:]  # Last 3
-            activity += f"🏷️ Recent HS Codes ({len(hs_codes)} total):\n"
-            for hs_code in recent_hs:
+        if recent['hs_codes']:
+            activity += f"🏷️ Recent HS Codes ({counts['hs']} total):\n"
+            for hs_code in recent['hs_codes']:
                 activity += f"  • {hs_code.get('hs_code', '')} - {hs_code.get('description', '')}\n"
         
-        if not ai_results and not contacts and not hs_codes:
+        if not recent['ai'] and not recent['contacts'] and not recent['hs_codes']:
             activity += "No recent activity found."
         
         return activity
     
-    def _generate_country_chart(self, ai_results, contacts):
-        """Generate country distribution chart"""
-        from collections import Counter
-        import GUI_db
-        
-        # Collect all countries from AI results and contacts
-        all_countries = []
-        
-        # From AI results
-        for result in ai_results:
-            country = result.get('company_country', 'Unknown')
-            if country and country != 'Unknown':
-                all_countries.append(country)
-        
-        # From contacts - get country from companies table
-        try:
-            companies = GUI_db.get_all_companies()
-            company_countries = {company['id']: company.get('country', 'Unknown') for company in companies}
-            
-            for contact in contacts:
-                company_id = contact.get('company_id')
-                if company_id and company_id in company_countries:
-                    country = company_countries[company_id]
-                    if country and country != 'Unknown':
-                        all_countries.append(country)
-        except Exception as e:
-            print(f"Error getting company countries: {e}")
-        
-        if not all_countries:
+    def _generate_country_chart(self, stats):
+        """Generate country distribution chart (AI results by company country, contacts by their company's country)"""
+        sorted_countries = stats['countries']
+        if not sorted_countries:
             return "No country data available"
         
-        # Count countries
-        country_counts = Counter(all_countries)
-        
         # Generate chart
         chart = "🌍 Company Distribution by Country\n"
         chart += "=" * 40 + "\n\n"
         
-        total = len(all_countries)
-        max_count = max(country_counts.values()) if country_counts else 1
+        total = stats['country_total']
+        max_count = sorted_countries[0][1]
         
-        # Sort by count (descending)
-        sorted_countries = sorted(country_counts.items(), key=lambda x: x[1], reverse=True)
-        
-        for i, (country, count) in enumerate(sorted_countries[:10], 1):  # Show top 10
+        for i, (country, count) in enumerate(sorted_countries, 1):  # Top 10, largest first
             percentage = round((count / total) * 100, 1)
             bar_length = int((count / max_count) * 30)  # Scale bar to max 30 characters
             bar = "█" * bar_length + "░" * (30 - bar_length)
@@ -371,7 +226,7 @@ class DashboardContent(ctk.CTkFrame):
             chart += f"    {bar}\n\n"
         
         chart += f"\n📊 Total Companies: {total}"
-        chart += f"\n🏆 Top Country: {sorted_countries[0][0] if sorted_countries else 'N/A'}"
+        chart += f"\n🏆 Top Country: {sorted_countries[0][0]}"
         
         return chart
         
@@ -566,20 +421,15 @@ class BuyerSearchPage(ctk.CTkFrame):
 
     def load_countries(self):
         """Load available countries from database that have HS codes"""
-        # Check cache first
-        cached_countries = cache.get("buyer_search_countries")
-        if cached_countries:
-            self.country_list = cached_countries
-            return
-        try:
+        def load():
             hs_codes = GUI_db.get_all_hs_codes()
             countries_with_hs_codes = set()
             for code in hs_codes:
                 if code.get('country'):
                     countries_with_hs_codes.add(code['country'])
-            countries = ["Select Country"] + sorted(list(countries_with_hs_codes))
-            self.country_list = countries
-            cache.set("buyer_search_countries", countries)
+            return ["Select Country"] + sorted(list(countries_with_hs_codes))
+        try:
+            self.country_list = cache.get_or_load("buyer_search_countries", load, tables=('hs_codes',))
         except Exception as e:
             print(f"Error loading countries: {e}")
             self.country_list = ["Select Country"]
@@ -588,7 +438,7 @@ class BuyerSearchPage(ctk.CTkFrame):
         """Update countries list on main thread"""
         self.country_list = countries
         # Cache the result
-        cache.set("buyer_search_countries", countries)
+        cache.set("buyer_search_countries", countries, tables=('hs_codes',))
         print(f"[QUICK DEBUG] Updated countries UI: {len(countries)} countries")
     
     def _set_default_countries(self):
@@ -661,12 +511,10 @@ class BuyerSearchPage(ctk.CTkFrame):
                 return None
         
         def on_hs_codes_loaded(hs_options):
-            # Schedule UI update on main thread
-            self.after(0, lambda: self._handle_hs_codes_loaded(hs_options, loading_dialog, country))
+            self._handle_hs_codes_loaded(hs_options, loading_dialog, country)
         
         def on_error(error):
-            # Schedule UI update on main thread
-            self.after(0, lambda: self._handle_hs_codes_error(error, loading_dialog, country))
+            self._handle_hs_codes_error(error, loading_dialog, country)
         
         # Run in background
         run_in_background(load_hs_codes_task, on_hs_codes_loaded, on_error)
@@ -727,9 +575,7 @@ class BuyerSearchPage(ctk.CTkFrame):
 
     def refresh_buyer_search_data(self):
         """Refresh BuyerSearchPage data after new HS codes are added"""
-        # Invalidate cache
-        cache.invalidate("buyer_search_countries")
-        cache.invalidate("hs_codes")
+        # The cached country list went stale when the HS code write bumped the hs_codes version
         self.load_countries()
     
     def refresh_ai_buyer_results_page(self):
@@ -780,44 +626,41 @@ class BuyerSearchPage(ctk.CTkFrame):
         self.search_btn.configure(state="disabled")
         self.progress_bar.pack(pady=8)
         self.progress_bar.start()
+        self.search_results = []
+        self.populate_table([])
+        self.results_info_label.configure(text="Searching...")
         
-        def run_ai_search():
+        def run_ai_search(token):
             try:
                 import deepseek_agent
-                import db
                 
                 print(f"[DEBUG] Starting DeepSeek search with parameters:")
                 print(f"[DEBUG] HS Code: {hs_code}")
                 print(f"[DEBUG] Keyword: {final_keyword}")
                 print(f"[DEBUG] Country: {country}")
                 
-                # Query DeepSeek for buyers
-                print("[DEBUG] Calling deepseek_agent.query_deepseek...")
-                result = deepseek_agent.query_deepseek(hs_code, final_keyword, country, [])
-                print(f"[DEBUG] DeepSeek raw result received: {len(str(result))} characters")
-                print(f"[DEBUG] First 500 chars of result: {str(result)[:500]}...")
-                
-                # Parse results
-                print("[DEBUG] Parsing DeepSeek output...")
-                companies = db.parse_deepseek_output(result)
-                print(f"[DEBUG] Parsed {len(companies) if companies else 0} companies from result")
-                
-                # Debug: Show what fields each company has
-                if companies:
-                    print("[DEBUG] Sample company data:")
-                    for i, company in enumerate(companies[:3]):  # Show first 3 companies
-                        print(f"[DEBUG] Company {i+1}:")
-                        print(f"[DEBUG]   Name: {company.get('company_name', 'MISSING')}")
-                        print(f"[DEBUG]   Country: {company.get('company_country', 'MISSING')}")
-                        print(f"[DEBUG]   Website: {company.get('company_website_link', 'MISSING')}")
-                        print(f"[DEBUG]   Description: {company.get('description', 'MISSING')[:100]}...")
-                
-                # Save to database
-                if companies:
-                    print("[DEBUG] Saving companies to database...")
-                    # Use the new deepseek_buyer_search_results table
-                    saved_count = GUI_db.insert_deepseek_results(hs_code, final_keyword, country, companies)
-                    print(f"[DEBUG] Saved {saved_count} companies to deepseek_buyer_search_results table")
+                # Stream buyers from DeepSeek: each company is shown as soon as its block of
+                # the answer is complete, and saved with bulk inserts of the latest few companies
+                print("[DEBUG] Calling deepseek_agent.query_deepseek_stream...")
+                companies = []
+                unsaved = []
+                last_flush = time.monotonic()
+                try:
+                    for company in deepseek_agent.query_deepseek_stream(hs_code, final_keyword, country, []):
+                        companies.append(company)
+                        unsaved.append(company)
+                        call_in_ui(self.append_result, company)
+                        if len(unsaved) >= STREAM_FLUSH_ROWS or time.monotonic() - last_flush >= STREAM_FLUSH_SECONDS:
+                            GUI_db.insert_deepseek_results(hs_code, final_keyword, country, unsaved)
+                            unsaved = []
+                            last_flush = time.monotonic()
+                        if token.cancelled:
+                            # App closing: keep what was received, skip the rest of the answer
+                            break
+                finally:
+                    if unsaved:
+                        GUI_db.insert_deepseek_results(hs_code, final_keyword, country, unsaved)
+                print(f"[DEBUG] Streamed and saved {len(companies)} companies to deepseek_buyer_search_results table")
                 
                 def on_complete():
                     self.search_btn.configure(state="normal")
@@ -841,7 +684,7 @@ class BuyerSearchPage(ctk.CTkFrame):
                     
                     messagebox.showinfo("Search Complete", f"Found and saved {len(companies)} potential buyers to the database.")
                 
-                self.after(0, on_complete)
+                call_in_ui(on_complete)
                 
             except Exception as search_error:
                 print(f"[DEBUG] Error during AI search: {search_error}")
@@ -854,9 +697,22 @@ class BuyerSearchPage(ctk.CTkFrame):
                     self.progress_bar.stop()
                     self.progress_bar.pack_forget()
                     messagebox.showerror("Search Error", f"Error during AI search: {str(error)}")
-                self.after(0, on_error)
-        
-        threading.Thread(target=run_ai_search, daemon=True).start()
+                call_in_ui(on_error)
+        
+        run_in_background(run_ai_search, lane=API_LANE, pass_token=True)
+
+    def append_result(self, company):
+        """Append one streamed company to the results table"""
+        self.search_results.append(company)
+        self.table.insert("", "end", values=(
+            str(len(self.search_results)),
+            company.get('company_name', ''),
+            company.get('company_country', ''),
+            self.country_var.get(),
+            company.get('company_website_link', ''),
+            company.get('description', '')
+        ))
+        self.results_info_label.configure(text=f"Found {len(self.search_results)} potential buyers so far...")
 
     def populate_table(self, data):
         """Populate the results table"""
@@ -915,9 +771,19 @@ class BuyerSearchPage(ctk.CTkFrame):
             messagebox.showerror("Export Error", f"Error exporting results: {e}")
 
 
+# Tables the cached DeepSeek result pages are read from
+DEEPSEEK_TABLES = ('deepseek_buyer_search_results',)
+
 class DeepSeekBuyerResultsPage(ctk.CTkFrame):
+    # Treeview column -> database column for SQL sorting
+    SORT_COLUMNS = {"search_country": "country", "website": "company_website_link"}
+
     def __init__(self, master):
         super().__init__(master, fg_color="#F5F7FA")
+        self.page_size = 100
+        self.sort_column = "id"
+        self.sort_descending = False
+        self.model = None
         self._build_ui()
         self.load_countries()
         self.populate_table()
@@ -951,7 +817,7 @@ class DeepSeekBuyerResultsPage(ctk.CTkFrame):
         select_country_btn = ctk.CTkButton(country_frame, text="Select", fg_color="#4CAF50", hover_color="#388E3C", text_color="#FFFFFF", font=("Poppins", 12, "bold"), width=60, height=32, command=self.open_country_selector)
         select_country_btn.pack(side="left", padx=(8, 0))
         
-        refresh_btn = ctk.CTkButton(filter_frame, text="Refresh", fg_color="#4CAF50", hover_color="#388E3C", text_color="#FFFFFF", font=("Poppins", 15), corner_radius=8, width=100, command=self.populate_table)
+        refresh_btn = ctk.CTkButton(filter_frame, text="Refresh", fg_color="#4CAF50", hover_color="#388E3C", text_color="#FFFFFF", font=("Poppins", 15), corner_radius=8, width=100, command=self.refresh)
         refresh_btn.pack(side="left", padx=(0, 8))
         
         clear_btn = ctk.CTkButton(filter_frame, text="Clear Search", fg_color="#B0BEC5", hover_color="#90A4AE", text_color="#FFFFFF", font=("Poppins", 15), corner_radius=8, width=120, command=self.clear_search)
@@ -988,6 +854,16 @@ class DeepSeekBuyerResultsPage(ctk.CTkFrame):
         self.table.pack(fill="both", expand=True, padx=8, pady=8)
         self._add_table_sorting()
 
+        # Pagination controls (only one page of rows is loaded into the table at a time)
+        self.pagination_frame = ctk.CTkFrame(self, fg_color="#F5F7FA")
+        self.pagination_frame.pack(fill="x", padx=32, pady=(8, 0))
+        self.prev_btn = ctk.CTkButton(self.pagination_frame, text="Previous", command=self.prev_page, width=80)
+        self.next_btn = ctk.CTkButton(self.pagination_frame, text="Next", command=self.next_page, width=80)
+        self.page_label = ctk.CTkLabel(self.pagination_frame, text="")
+        self.prev_btn.pack(side="left")
+        self.page_label.pack(side="left", padx=8)
+        self.next_btn.pack(side="left")
+
         # Action buttons below table
         action_frame = ctk.CTkFrame(self, fg_color="#F5F7FA")
         action_frame.pack(fill="x", padx=32, pady=(8, 24))
@@ -1001,28 +877,40 @@ class DeepSeekBuyerResultsPage(ctk.CTkFrame):
         delete_btn = ctk.CTkButton(action_frame, text="Delete Selected", fg_color="#F44336", hover_color="#D32F2F", text_color="#FFFFFF", font=("Poppins", 15), corner_radius=8, width=140, command=self.delete_selected)
         delete_btn.pack(side="right", padx=(0, 12))
 
+    def refresh(self):
+        """Re-read from the database, including rows saved by other processes (e.g. CLI batch searches)"""
+        bump_table_versions(*DEEPSEEK_TABLES)
+        self.populate_table()
+
     def populate_table(self):
-        """Populate the table with DeepSeek results, sorted by ID ascending by default"""
+        """Show the first page of DeepSeek results for the current search, country filter and sort"""
         try:
             search_term = self.search_var.get().strip()
             selected_country = self.country_var.get().strip()
-            # Get all results first
+            company_country = selected_country if selected_country and selected_country != "All" else None
             if search_term:
-                results = GUI_db.get_deepseek_results_by_search(search_term)
+                # Full-text search pages through matches in relevance order
+                self.model = PagedTableModel(
+                    lambda offset, limit: cache.get_or_load(
+                        ('deepseek_search', search_term, company_country, offset, limit),
+                        lambda: GUI_db.search_deepseek_results(search_term, limit=limit, offset=offset or 0, company_country=company_country),
+                        tables=DEEPSEEK_TABLES),
+                    next_cursor=offset_cursor, page_size=self.page_size)
             else:
-                results = GUI_db.get_all_deepseek_results()
-            # Filter by country if not "All"
-            if selected_country and selected_country != "All":
-                filtered_results = []
-                for result in results:
-                    if result.get('company_country', '').strip() == selected_country:
-                        filtered_results.append(result)
-                results = filtered_results
-            # Sort by id ascending
-            results = sorted(results, key=lambda x: x.get('id', 0))
-            
-            # Update UI directly on main thread
-            self._update_table_ui(results)
+                # Browsing pages by (sort column, id) keyset, sorted and filtered in SQL
+                sort_column, descending = self.sort_column, self.sort_descending
+                self.model = PagedTableModel(
+                    lambda after, limit: cache.get_or_load(
+                        ('deepseek_page', company_country, sort_column, descending, after, limit),
+                        lambda: GUI_db.get_deepseek_results_page(company_country, sort_column, descending, after, limit),
+                        tables=DEEPSEEK_TABLES),
+                    next_cursor=keyset_cursor(sort_column),
+                    count=lambda: cache.get_or_load(('deepseek_count', company_country),
+                                                    lambda: GUI_db.count_deepseek_results(company_country),
+                                                    tables=DEEPSEEK_TABLES),
+                    page_size=self.page_size)
+            self.model.reset()
+            self._show_page()
             # Also refresh country list to include any new countries
             self.refresh_country_list()
             
@@ -1030,27 +918,54 @@ class DeepSeekBuyerResultsPage(ctk.CTkFrame):
             print(f"Error loading DeepSeek results: {error}")
             self._clear_table_ui()
 
+    def _show_page(self):
+        self._update_table_ui(self.model.rows)
+        self.page_label.configure(text=self.model.label())
+        self.prev_btn.configure(state="normal" if self.model.has_prev else "disabled")
+        self.next_btn.configure(state="normal" if self.model.has_next else "disabled")
+
+    def next_page(self):
+        if self.model:
+            self.model.next_page()
+            self._show_page()
+
+    def prev_page(self):
+        if self.model:
+            self.model.prev_page()
+            self._show_page()
+
+    def reload_page(self):
+        """Re-read the current page after an edit or delete"""
+        if self.model is None:
+            self.populate_table()
+            return
+        self.model.reload()
+        self._show_page()
+
     def _add_table_sorting(self):
-        """Enable sorting by clicking column headers"""
+        """Enable sorting by clicking column headers (only columns the SQL can sort by)"""
         for col in self.table['columns']:
-            self.table.heading(col, command=lambda c=col: self._sort_by_column(c, False))
+            if self.SORT_COLUMNS.get(col, col) in GUI_db.DEEPSEEK_SORT_COLUMNS:
+                self.table.heading(col, command=lambda c=col: self._sort_by_column(c))
 
-    def _sort_by_column(self, col, descending):
-        data = [(self.table.set(child, col), child) for child in self.table.get_children('')]
-        # Try to convert to int for id column
-        if col == 'id':
-            def sort_key(item):
-                try:
-                    return int(item[0]) if str(item[0]).isdigit() else 0
-                except (ValueError, AttributeError):
-                    return 0
-            data.sort(key=sort_key, reverse=descending)
+    def _sort_by_column(self, col):
+        """Sort by a column in SQL (click again to reverse)"""
+        column = self.SORT_COLUMNS.get(col, col)
+        if column not in GUI_db.DEEPSEEK_SORT_COLUMNS:
+            return
+        self.sort_descending = column == self.sort_column and not self.sort_descending
+        self.sort_column = column
+        if self.search_var.get().strip():
+            # Search results are ranked by relevance; only reorder the rows on screen
+            data = [(self.table.set(child, col), child) for child in self.table.get_children('')]
+            if col == 'id':
+                data.sort(key=lambda item: int(item[0]) if str(item[0]).isdigit() else 0, reverse=self.sort_descending)
+            else:
+                data.sort(reverse=self.sort_descending)
+            for index, (val, child) in enumerate(data):
+                self.table.move(child, '', index)
         else:
-            data.sort(reverse=descending)
-        for index, (val, child) in enumerate(data):
-            self.table.move(child, '', index)
-        # Reverse sort next time
-        self.table.heading(col, command=lambda: self._sort_by_column(col, not descending))
+            self.populate_table()
 
     def refresh_country_list(self):
         """Refresh the country list from database"""
@@ -1095,13 +1010,8 @@ class DeepSeekBuyerResultsPage(ctk.CTkFrame):
     def load_countries(self):
         """Load available countries from database that have DeepSeek results"""
         try:
-            results = GUI_db.get_all_deepseek_results()
-            countries_with_results = set()
-            for result in results:
-                if result.get('company_country'):
-                    countries_with_results.add(result['company_country'])
-            countries = ["All"] + sorted(list(countries_with_results))
-            self.country_list = countries
+            self.country_list = ["All"] + cache.get_or_load("deepseek_countries", GUI_db.get_deepseek_result_countries,
+                                                            tables=DEEPSEEK_TABLES)
         except Exception as e:
             print(f"Error loading DeepSeek countries: {e}")
             self.country_list = ["All"]
@@ -1196,7 +1106,7 @@ class DeepSeekBuyerResultsPage(ctk.CTkFrame):
             
             if GUI_db.update_deepseek_result(record['id'], updated_fields):
                 dialog.destroy()
-                self.populate_table()
+                self.reload_page()
                 messagebox.showinfo("Success", "Record updated successfully.")
             else:
                 messagebox.showerror("Error", "Failed to update record.")
@@ -1214,7 +1124,7 @@ class DeepSeekBuyerResultsPage(ctk.CTkFrame):
         record_id = int(selected[0])
         if messagebox.askyesno("Delete Record", "Are you sure you want to delete this record?"):
             if GUI_db.delete_deepseek_result(record_id):
-                self.populate_table()
+                self.reload_page()
                 messagebox.showinfo("Success", "Record deleted successfully.")
             else:
                 messagebox.showerror("Error", "Failed to delete record.")
@@ -1373,54 +1283,31 @@ class ExportPage(ctk.CTkFrame):
         self.status_label.pack(pady=4)
 
     def load_data_counts(self):
-        """Load and display data counts for each source"""
-        try:
-            # AI Buyer Results count
-            ai_count = len(GUI_db.get_all_deepseek_results())
-            
-            # Apollo Buyer List count
-            apollo_count = len(GUI_db.get_all_contacts())
-            
-            # HS Codes count
-            hs_count = len(GUI_db.get_all_hs_codes())
-            
-            # Companies count
-            company_count = len(GUI_db.get_all_companies())
-            
-            # Get unique countries for filter
-            countries = set()
-            for result in GUI_db.get_all_deepseek_results():
-                if result.get('company_country'):
-                    countries.add(result['company_country'])
-            for contact in GUI_db.get_all_contacts():
-                if contact.get('company_name'):
-                    # Extract country from company name or use a default
-                    countries.add("Unknown")
-            for hs_code in GUI_db.get_all_hs_codes():
-                if hs_code.get('country'):
-                    countries.add(hs_code['country'])
-            
-            counts = {
-                'ai_count': ai_count,
-                'apollo_count': apollo_count,
-                'hs_count': hs_count,
-                'company_count': company_count,
-                'countries': sorted(list(countries))
+        """Load and display data counts for each source (from the dashboard stats, in the background)"""
+        def load_counts():
+            GUI_db.init_db()
+            GUI_db.init_apollo_db()
+            GUI_db.init_deepseek_results_table()
+            dashboard_stats.init_dashboard_stats()
+            counts = dashboard_stats.get_dashboard_stats()['counts']
+            return {
+                'ai_count': counts['ai'],
+                'apollo_count': counts['apollo'],
+                'hs_count': counts['hs'],
+                'company_count': counts['companies'],
             }
-            
-            # Update UI directly on main thread
-            self._update_counts_ui(counts)
-            
-        except Exception as error:
+
+        def on_error(error):
             print(f"Error loading data counts: {error}")
             self._update_counts_ui({
                 'ai_count': 0,
                 'apollo_count': 0,
                 'hs_count': 0,
                 'company_count': 0,
-                'countries': ["All"]
             })
 
+        run_in_background(load_counts, self._update_counts_ui, on_error, key='export_counts')
+
     def _update_counts_ui(self, counts):
         """Update the count labels on main thread"""
         self.ai_count_label.configure(text=str(counts['ai_count']))
@@ -1462,6 +1349,43 @@ class ExportPage(ctk.CTkFrame):
             messagebox.showwarning("No Data Selected", "Please use one of the quick export templates.")
             return
         
+        # Read the options and ask for the file here: Tk variables and dialogs belong to the UI thread
+        selected_country = self.country_var.get()
+        date_filter = self.date_var.get()
+        export_format = self.format_var.get()
+        include_headers = self.headers_var.get()
+        sources = {'ai': self.ai_var.get(), 'apollo': self.apollo_var.get(), 'hs': self.hs_var.get(),
+                   'company': self.company_var.get()}
+        
+        # Calculate date range
+        end_date = datetime.now()
+        if date_filter == "Last 7 Days":
+            start_date = end_date - timedelta(days=7)
+        elif date_filter == "Last 30 Days":
+            start_date = end_date - timedelta(days=30)
+        elif date_filter == "Last 90 Days":
+            start_date = end_date - timedelta(days=90)
+        else:
+            start_date = None
+        
+        # Generate filename
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        if export_format == "CSV":
+            filename = f"buyer_intelligence_export_{timestamp}.csv"
+        else:
+            filename = f"buyer_intelligence_export_{timestamp}.xlsx"
+        
+        # Get file path
+        file_path = filedialog.asksaveasfilename(
+            defaultextension=f".{export_format.lower()}",
+            filetypes=[(f"{export_format} files", f"*.{export_format.lower()}"), ("All files", "*.*")],
+            title="Save Export File",
+            initialfile=filename
+        )
+        
+        if not file_path:
+            return
+        
         # Show progress bar
         self.progress_bar.pack(pady=8)
         self.progress_bar.set(0)
@@ -1469,44 +1393,6 @@ class ExportPage(ctk.CTkFrame):
         
         def run_export():
             try:
-                import csv
-                from datetime import datetime, timedelta
-                
-                # Get filter values
-                selected_country = self.country_var.get()
-                date_filter = self.date_var.get()
-                export_format = self.format_var.get()
-                include_headers = self.headers_var.get()
-                
-                # Calculate date range
-                end_date = datetime.now()
-                if date_filter == "Last 7 Days":
-                    start_date = end_date - timedelta(days=7)
-                elif date_filter == "Last 30 Days":
-                    start_date = end_date - timedelta(days=30)
-                elif date_filter == "Last 90 Days":
-                    start_date = end_date - timedelta(days=90)
-                else:
-                    start_date = None
-                
-                # Generate filename
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                if export_format == "CSV":
-                    filename = f"buyer_intelligence_export_{timestamp}.csv"
-                else:
-                    filename = f"buyer_intelligence_export_{timestamp}.xlsx"
-                
-                # Get file path
-                file_path = filedialog.asksaveasfilename(
-                    defaultextension=f".{export_format.lower()}",
-                    filetypes=[(f"{export_format} files", f"*.{export_format.lower()}"), ("All files", "*.*")],
-                    title="Save Export File",
-                    initialfile=filename
-                )
-                
-                if not file_path:
-                    return
-                
                 # Collect and enrich data based on selections
                 all_data = {}
                 
@@ -1516,9 +1402,9 @@ class ExportPage(ctk.CTkFrame):
                 company_data = []
                 hs_data = []
                 
-                if self.ai_var.get():
-                    self.after(0, lambda: self.status_label.configure(text="Loading AI Buyer Results..."))
-                    self.after(0, lambda: self.progress_bar.set(0.1))
+                if sources['ai']:
+                    call_in_ui(lambda: self.status_label.configure(text="Loading AI Buyer Results..."))
+                    call_in_ui(lambda: self.progress_bar.set(0.1))
                     
                     ai_data = GUI_db.get_all_deepseek_results()
                     if selected_country != "All":
@@ -1526,9 +1412,9 @@ class ExportPage(ctk.CTkFrame):
                     if start_date:
                         ai_data = [r for r in ai_data if self._parse_date(r.get('created_at', '')) >= start_date]
                 
-                if self.apollo_var.get():
-                    self.after(0, lambda: self.status_label.configure(text="Loading Apollo Buyer List..."))
-                    self.after(0, lambda: self.progress_bar.set(0.2))
+                if sources['apollo']:
+                    call_in_ui(lambda: self.status_label.configure(text="Loading Apollo Buyer List..."))
+                    call_in_ui(lambda: self.progress_bar.set(0.2))
                     
                     apollo_data = GUI_db.get_all_contacts()
                     if selected_country != "All":
@@ -1536,9 +1422,9 @@ class ExportPage(ctk.CTkFrame):
                     if start_date:
                         apollo_data = [c for c in apollo_data if self._parse_date(c.get('created_at', '')) >= start_date]
                 
-                if self.hs_var.get():
-                    self.after(0, lambda: self.status_label.configure(text="Loading HS Codes..."))
-                    self.after(0, lambda: self.progress_bar.set(0.3))
+                if sources['hs']:
+                    call_in_ui(lambda: self.status_label.configure(text="Loading HS Codes..."))
+                    call_in_ui(lambda: self.progress_bar.set(0.3))
                     
                     hs_data = GUI_db.get_all_hs_codes()
                     if selected_country != "All":
@@ -1546,9 +1432,9 @@ class ExportPage(ctk.CTkFrame):
                     if start_date:
                         hs_data = [h for h in hs_data if self._parse_date(h.get('created_at', '')) >= start_date]
                 
-                if self.company_var.get():
-                    self.after(0, lambda: self.status_label.configure(text="Loading Companies..."))
-                    self.after(0, lambda: self.progress_bar.set(0.4))
+                if sources['company']:
+                    call_in_ui(lambda: self.status_label.configure(text="Loading Companies..."))
+                    call_in_ui(lambda: self.progress_bar.set(0.4))
                     
                     company_data = GUI_db.get_all_companies()
                     if selected_country != "All":
@@ -1557,40 +1443,40 @@ class ExportPage(ctk.CTkFrame):
                         company_data = [c for c in company_data if self._parse_date(c.get('created_at', '')) >= start_date]
                 
                 # Export raw data tables
-                self.after(0, lambda: self.status_label.configure(text="Preparing export..."))
-                self.after(0, lambda: self.progress_bar.set(0.5))
+                call_in_ui(lambda: self.status_label.configure(text="Preparing export..."))
+                call_in_ui(lambda: self.progress_bar.set(0.5))
                 
                 # Export selected tables
-                if self.ai_var.get():
+                if sources['ai']:
                     all_data['AI Buyer Results'] = ai_data
-                if self.apollo_var.get():
+                if sources['apollo']:
                     all_data['Apollo Buyer List'] = apollo_data
-                if self.hs_var.get():
+                if sources['hs']:
                     all_data['HS Codes'] = hs_data
-                if self.company_var.get():
+                if sources['company']:
                     all_data['Companies'] = company_data
                 
                 # Export based on format
-                self.after(0, lambda: self.status_label.configure(text="Exporting data..."))
-                self.after(0, lambda: self.progress_bar.set(0.9))
+                call_in_ui(lambda: self.status_label.configure(text="Exporting data..."))
+                call_in_ui(lambda: self.progress_bar.set(0.9))
                 
                 if export_format == "CSV":
                     self._export_to_csv(file_path, all_data, include_headers)
                 else:
                     self._export_to_excel(file_path, all_data, include_headers)
                 
-                self.after(0, lambda: self.progress_bar.set(1.0))
-                self.after(0, lambda: self.status_label.configure(text="Export completed successfully!"))
-                self.after(0, lambda: messagebox.showinfo("Export Complete", f"Data exported successfully to:\n{file_path}"))
+                call_in_ui(lambda: self.progress_bar.set(1.0))
+                call_in_ui(lambda: self.status_label.configure(text="Export completed successfully!"))
+                call_in_ui(lambda: messagebox.showinfo("Export Complete", f"Data exported successfully to:\n{file_path}"))
                 
             except Exception as e:
-                self.after(0, lambda: self.status_label.configure(text=f"Export failed: {str(e)}"))
-                self.after(0, lambda: messagebox.showerror("Export Error", f"Error during export: {str(e)}"))
+                call_in_ui(lambda e=e: self.status_label.configure(text=f"Export failed: {str(e)}"))
+                call_in_ui(lambda e=e: messagebox.showerror("Export Error", f"Error during export: {str(e)}"))
             finally:
-                self.after(0, lambda: self.progress_bar.pack_forget())
-                self.after(0, lambda: self.status_label.configure(text=""))
+                call_in_ui(lambda: self.progress_bar.pack_forget())
+                call_in_ui(lambda: self.status_label.configure(text=""))
         
-        threading.Thread(target=run_export, daemon=True).start()
+        run_in_background(run_export, lane=API_LANE)
 
     def _parse_date(self, date_str):
         """Parse date string to datetime object"""
@@ -1616,8 +1502,9 @@ class ExportPage(ctk.CTkFrame):
         """Create an enhanced sales report with contact information and company insights"""
         sales_report = []
         
-        # Create company lookup
-        company_lookup = {c['company_name'].lower(): c for c in company_data if c.get('company_name')}
+        # Create company lookup (by resolved company, so "PT Acme" matches "Acme Tbk")
+        entities = EntityIndex()
+        company_lookup = {entities.key(c, 'apollo'): c for c in company_data if c.get('company_name')}
         
         # Create HS code lookup
         hs_lookup = {h['hs_code']: h['description'] for h in hs_data if h.get('hs_code')}
@@ -1625,20 +1512,20 @@ class ExportPage(ctk.CTkFrame):
         # Group contacts by company
         contacts_by_company = defaultdict(list)
         for contact in apollo_data:
-            company_name = contact.get('company_name', '').lower()
-            if company_name:
-                contacts_by_company[company_name].append(contact)
+            company_key = entities.key(contact)
+            if company_key:
+                contacts_by_company[company_key].append(contact)
         
         # Create sales report entries
         for ai_company in ai_data:
             company_name = ai_company.get('company_name', '')
-            company_name_lower = company_name.lower()
+            company_key = entities.key(ai_company, 'deepseek')
             
             # Get company info
-            company_info = company_lookup.get(company_name_lower, {})
+            company_info = company_lookup.get(company_key, {})
             
             # Get contacts for this company
-            contacts = contacts_by_company.get(company_name_lower, [])
+            contacts = contacts_by_company.get(company_key, [])
             
             # Get HS code description
             hs_code = ai_company.get('hs_code', '')
@@ -1712,22 +1599,26 @@ class ExportPage(ctk.CTkFrame):
         """Create a lead scoring report with prioritization"""
         lead_scoring = []
         
-        # Create company lookup
-        company_lookup = {c['company_name'].lower(): c for c in company_data if c.get('company_name')}
+        # Create company and AI result lookups (by resolved company; first AI result wins)
+        entities = EntityIndex()
+        company_lookup = {entities.key(c, 'apollo'): c for c in company_data if c.get('company_name')}
+        ai_lookup = {}
+        for c in ai_data:
+            ai_lookup.setdefault(entities.key(c, 'deepseek'), c)
         
         # Group contacts by company
         contacts_by_company = defaultdict(list)
         for contact in apollo_data:
-            company_name = contact.get('company_name', '').lower()
-            if company_name:
-                contacts_by_company[company_name].append(contact)
+            company_key = entities.key(contact)
+            if company_key:
+                contacts_by_company[company_key].append(contact)
         
         # Score each company
-        for company_name, contacts in contacts_by_company.items():
-            company_info = company_lookup.get(company_name, {})
+        for company_key, contacts in contacts_by_company.items():
+            company_info = company_lookup.get(company_key, {})
             
             # Find AI data for this company
-            ai_company = next((c for c in ai_data if c.get('company_name', '').lower() == company_name), {})
+            ai_company = ai_lookup.get(company_key, {})
             
             # Calculate lead score
             lead_score = self._calculate_lead_score(company_info, contacts, ai_company)
@@ -1741,7 +1632,7 @@ class ExportPage(ctk.CTkFrame):
                 priority = "Low"
             
             entry = {
-                'Company Name': contacts[0].get('company_name', '') if contacts else company_name,
+                'Company Name': contacts[0].get('company_name', '') if contacts else company_info.get('company_name', ''),
                 'Lead Score': lead_score,
                 'Priority': priority,
                 'Contact Count': len(contacts),
@@ -1770,35 +1661,33 @@ class ExportPage(ctk.CTkFrame):
         """Create a company intelligence report with comprehensive insights"""
         company_intelligence = []
         
-        # Create contact counts
-        contact_counts = Counter()
+        # Group contacts and AI interests by resolved company
+        entities = EntityIndex()
+        contacts_by_company = defaultdict(list)
         for contact in apollo_data:
-            company_name = contact.get('company_name', '').lower()
-            if company_name:
-                contact_counts[company_name] += 1
+            company_key = entities.key(contact)
+            if company_key:
+                contacts_by_company[company_key].append(contact)
         
-        # Create AI interest counts
-        ai_interest_counts = Counter()
+        ai_by_company = defaultdict(list)
         for company in ai_data:
-            company_name = company.get('company_name', '').lower()
-            if company_name:
-                ai_interest_counts[company_name] += 1
+            company_key = entities.key(company, 'deepseek')
+            if company_key:
+                ai_by_company[company_key].append(company)
         
         for company in company_data:
             company_name = company.get('company_name', '')
-            company_name_lower = company_name.lower()
-            
-            # Get contact count
-            contact_count = contact_counts.get(company_name_lower, 0)
-            
-            # Get AI interest count
-            ai_interest_count = ai_interest_counts.get(company_name_lower, 0)
+            company_key = entities.key(company, 'apollo')
             
             # Get contacts for this company
-            contacts = [c for c in apollo_data if c.get('company_name', '').lower() == company_name_lower]
+            contacts = contacts_by_company.get(company_key, [])
             
             # Get AI interests for this company
-            ai_interests = [c for c in ai_data if c.get('company_name', '').lower() == company_name_lower]
+            ai_interests = ai_by_company.get(company_key, [])
+            
+            # Get contact and AI interest counts
+            contact_count = len(contacts)
+            ai_interest_count = len(ai_interests)
             
             entry = {
                 'Company Name': company_name,
@@ -1870,12 +1759,11 @@ class ExportPage(ctk.CTkFrame):
 
     def _calculate_avg_company_size(self, companies, company_data):
         """Calculate average company size for a group of companies"""
-        company_lookup = {c['company_name'].lower(): c for c in company_data if c.get('company_name')}
+        company_lookup = {name_key(c): c for c in company_data if c.get('company_name')}
         
         sizes = []
         for company in companies:
-            company_name = company.get('company_name', '').lower()
-            company_info = company_lookup.get(company_name, {})
+            company_info = company_lookup.get(name_key(company), {})
             employee_count = company_info.get('employee_count', 0)
             if employee_count:
                 sizes.append(employee_count)
@@ -2228,48 +2116,48 @@ class HSCodePage(ctk.CTkFrame):
             dialog.update()
             
             def run_deepseek():
-                try:
-                    raw_response = deepseek_agent.query_deepseek_for_hs_codes(country)
-                    parsed_codes = deepseek_agent.parse_hs_codes_from_deepseek(raw_response)
-                except Exception as e:
-                    def on_error():
-                        progress_bar.stop()
-                        progress_bar.pack_forget()
-                        progress_label.configure(text="")
-                        messagebox.showerror("DeepSeek Error", f"Error calling DeepSeek: {str(e)}")
-                    dialog.after(0, on_error)
+                raw_response = deepseek_agent.query_deepseek_for_hs_codes(country)
+                return deepseek_agent.parse_hs_codes_from_deepseek(raw_response)
+            
+            def on_error(e):
+                progress_bar.stop()
+                progress_bar.pack_forget()
+                progress_label.configure(text="")
+                messagebox.showerror("DeepSeek Error", f"Error calling DeepSeek: {str(e)}")
+            
+            def on_done(parsed_codes):
+                progress_bar.stop()
+                progress_bar.pack_forget()
+                if not parsed_codes:
+                    progress_label.configure(text="")
+                    messagebox.showinfo("DeepSeek Results", "No results found from DeepSeek.")
                     return
-                def on_done():
-                    progress_bar.stop()
-                    progress_bar.pack_forget()
-                    if not parsed_codes:
-                        progress_label.configure(text="")
-                        messagebox.showinfo("DeepSeek Results", "No results found from DeepSeek.")
-                        return
-                    
-                    # Create and show the selection dialog
-                    selection_dialog = DeepSeekSelectionDialog(dialog, parsed_codes, country)
-                    dialog.wait_window(selection_dialog)  # Wait for user to close the dialog
-                    
-                    # Get the selected codes after dialog is closed
-                    selected_codes = getattr(selection_dialog, 'selected_codes', [])
+                
+                # Create and show the selection dialog
+                selection_dialog = DeepSeekSelectionDialog(dialog, parsed_codes, country)
+                dialog.wait_window(selection_dialog)  # Wait for user to close the dialog
+                
+                # Get the selected codes after dialog is closed
+                selected_codes = getattr(selection_dialog, 'selected_codes', [])
+                
+                if selected_codes:
+                    saved_count = 0
+                    for code in selected_codes:
+                        if GUI_db.save_hs_code(code['hs_code'], code['description'], country, source='DeepSeek'):
+                            saved_count += 1
+                    messagebox.showinfo("Saved", f"Saved {saved_count} HS codes to the database.")
+                    dialog.destroy()
+                    self.populate_table()
                     
-                    if selected_codes:
-                        saved_count = 0
-                        for code in selected_codes:
-                            if GUI_db.save_hs_code(code['hs_code'], code['description'], country, source='DeepSeek'):
-                                saved_count += 1
-                        messagebox.showinfo("Saved", f"Saved {saved_count} HS codes to the database.")
-                        dialog.destroy()
-                        self.populate_table()
-                        
-                        # Refresh other pages that depend on HS codes
-                        self.refresh_other_pages()
-                    else:
-                        progress_label.configure(text="")
-                        messagebox.showinfo("DeepSeek Results", "No HS codes were saved.")
-                dialog.after(0, on_done)
-            threading.Thread(target=run_deepseek, daemon=True).start()
+                    # Refresh other pages that depend on HS codes
+                    self.refresh_other_pages()
+                else:
+                    progress_label.configure(text="")
+                    messagebox.showinfo("DeepSeek Results", "No HS codes were saved.")
+            
+            task = run_in_background(run_deepseek, on_done, on_error, lane=API_LANE)
+            # Closing the dialog drops the result instead of updating destroyed widgets
+            dialog.bind("<Destroy>", lambda event: task.cancel() if event.widget is dialog else None, add="+")
         
         ctk.CTkButton(button_frame, text="Search with DeepSeek", fg_color="#4DA6FF", text_color="#121A26", font=("Poppins", 14, "bold"), command=on_deepseek_search).pack(side="left", padx=(0, 8))
         ctk.CTkButton(button_frame, text="Save", fg_color="#0078D4", text_color="#FFFFFF", font=("Poppins", 14, "bold"), command=on_manual_save).pack(side="left", padx=(0, 8))
@@ -2338,12 +2226,6 @@ class HSCodePage(ctk.CTkFrame):
     def refresh_other_pages(self):
         """Refresh other pages that depend on HS codes"""
         try:
-            # Invalidate cache
-            cache.invalidate("buyer_search_countries")
-            cache.invalidate("hs_codes")
-            cache.invalidate("apollo_countries")
-            cache.invalidate("apollo_companies")
-            
             # Find the main app instance to access other pages
             main_app = self.winfo_toplevel()
             if hasattr(main_app, 'pages'):
@@ -2512,9 +2394,13 @@ class ApolloPage(ctk.CTkFrame):
                 self.select_btn.configure(state="disabled")
         self.country_var.trace_add('write', on_country_change)
 
-        # Search button (row 2)
+        # Force refresh (row 2): bypass cached Apollo searches for this company
+        self.force_refresh_var = tk.BooleanVar(value=False)
+        ctk.CTkCheckBox(param_frame, text="Force refresh (ignore cached Apollo results)", variable=self.force_refresh_var, font=("Poppins", 13)).grid(row=2, column=0, columnspan=2, sticky="w", pady=(12,0))
+
+        # Search button (row 3)
         self.search_btn = ctk.CTkButton(param_frame, text="Search Decision Makers", fg_color="#0078D4", hover_color="#005A9E", text_color="#FFFFFF", font=("Poppins", 15, "bold"), corner_radius=8, command=self.do_search)
-        self.search_btn.grid(row=2, column=0, columnspan=2, sticky="e", pady=(12,0))
+        self.search_btn.grid(row=3, column=0, columnspan=2, sticky="e", pady=(12,0))
         
         # Results Card
         results_card = ctk.CTkFrame(self, fg_color="#FFFFFF", corner_radius=16)
@@ -2575,9 +2461,8 @@ class ApolloPage(ctk.CTkFrame):
     def update_company_completer(self, *args):
         """Update the company completer based on selected country"""
         try:
-            from GUI_db import get_all_companies
             selected_country = self.country_var.get().strip()
-            companies = get_all_companies()
+            companies = self._companies()
             company_names = ["Type or select a company..."]
             for company in companies:
                 if selected_country == "Select Country" or not selected_country or company.get('country', '').strip() == selected_country:
@@ -2589,10 +2474,14 @@ class ApolloPage(ctk.CTkFrame):
         except Exception as e:
             print(f"Error updating company completer: {e}")
 
+    def _companies(self):
+        """All companies, cached until a company is added"""
+        return cache.get_or_load("apollo_companies", GUI_db.get_all_companies, tables=('companies',))
+
     def load_countries(self):
         """Load available countries from database that have companies"""
         try:
-            companies = GUI_db.get_all_companies()
+            companies = self._companies()
             countries_with_companies = set()
             for company in companies:
                 if company.get('country'):
@@ -2644,6 +2533,8 @@ class ApolloPage(ctk.CTkFrame):
             messagebox.showwarning("Missing Country", "Please select a country.")
             return
         
+        force_refresh = self.force_refresh_var.get()
+        
         # Start worker thread
         self.search_btn.configure(state="disabled")
         self.progress_bar.pack(pady=8)
@@ -2654,7 +2545,7 @@ class ApolloPage(ctk.CTkFrame):
                 from apollo import find_decision_makers_apollo
                 from GUI_db import insert_contact, get_all_companies, insert_company
                 
-                results = find_decision_makers_apollo(company_name, country)
+                results = find_decision_makers_apollo(company_name, country, force_refresh=force_refresh)
                 
                 # Save results to database if any found
                 if results:
@@ -2662,7 +2553,7 @@ class ApolloPage(ctk.CTkFrame):
                     companies = get_all_companies()
                     company_id = None
                     for company in companies:
-                        if company.get('company_name', '').lower() == company_name.lower():
+                        if name_key(company) == normalize_company_name(company_name):
                             company_id = company.get('id')
                             break
                     
@@ -2711,17 +2602,17 @@ class ApolloPage(ctk.CTkFrame):
                     
                     messagebox.showinfo("Search Complete", f"Found and saved {len(results)} decision makers to the database.")
                 
-                self.after(0, on_complete)
+                call_in_ui(on_complete)
                 
             except Exception as e:
-                def on_error():
+                def on_error(e=e):
                     self.search_btn.configure(state="normal")
                     self.progress_bar.stop()
                     self.progress_bar.pack_forget()
                     messagebox.showerror("Search Error", f"Error during search: {str(e)}")
-                self.after(0, on_error)
+                call_in_ui(on_error)
         
-        threading.Thread(target=run_apollo_search, daemon=True).start()
+        run_in_background(run_apollo_search, lane=API_LANE)
 
     def populate_table(self, data):
         """Populate the results table"""
@@ -2794,7 +2685,7 @@ class ApolloPage(ctk.CTkFrame):
             seen = {}
             duplicates = []
             for company in companies:
-                key = (company.get('company_name', '').strip().lower(), company.get('country', '').strip().lower())
+                key = (name_key(company), (company.get('country') or '').strip().lower())
                 if key in seen:
                     duplicates.append(company)
                 else:
@@ -2859,6 +2750,23 @@ class ApolloSearchDialog(ctk.CTkToplevel):
         ], font=("Poppins", 14))
         depth_combo.pack(side="right", fill="x", expand=True, padx=(8, 0))
         
+        # Unfinished extractions (failed or interrupted) can continue from their last saved page
+        self.resumable_jobs = {}
+        try:
+            from apollo_pipeline import describe_job
+            for job in db_apollo.get_resumable_extraction_jobs(db_path=GUI_db.DB_PATH):
+                self.resumable_jobs[describe_job(job)] = job['id']
+        except Exception as e:
+            print(f"Error loading unfinished extractions: {e}")
+        if self.resumable_jobs:
+            resume_frame = ctk.CTkFrame(self, fg_color="#F5F7FA")
+            resume_frame.pack(fill="x", padx=24, pady=8)
+            ctk.CTkLabel(resume_frame, text="Unfinished Searches", font=("Poppins", 16, "bold"), text_color="#0078D4").pack(anchor="w", padx=16, pady=(12, 4))
+            job_labels = list(self.resumable_jobs)
+            self.resume_var = tk.StringVar(value=job_labels[0])
+            ctk.CTkComboBox(resume_frame, variable=self.resume_var, values=job_labels, font=("Poppins", 12)).pack(side="left", fill="x", expand=True, padx=(16, 8), pady=(0, 12))
+            ctk.CTkButton(resume_frame, text="Resume", fg_color="#4CAF50", hover_color="#388E3C", text_color="#FFFFFF", font=("Poppins", 12, "bold"), width=80, command=self.resume_search).pack(side="right", padx=(0, 16), pady=(0, 12))
+        
         # Progress bar
         self.progress_bar = ctk.CTkProgressBar(self, orientation="horizontal", mode="indeterminate", width=320)
         self.progress_bar.pack(pady=16)
@@ -2913,100 +2821,72 @@ class ApolloSearchDialog(ctk.CTkToplevel):
         }
         max_pages = depth_map.get(depth_text, 10)
         
+        def run(insert_companies, stop_event):
+            from apollo_pipeline import start_extraction_job
+            # Several pages in flight at once, with a separate bulk DB writer stage; progress
+            # is checkpointed in extraction_jobs so a failed search can be resumed
+            return start_extraction_job(country, max_pages, insert_companies, keyword_tags=[
+                "latex gloves", "nitrile gloves", "medical gloves",
+                 "exam gloves", "biohazard protection", "disposable gloves"
+            ], db_path=GUI_db.DB_PATH, stop_event=stop_event)
+        self._run_extraction(run)
+
+    def resume_search(self):
+        """Continue the selected unfinished search from its last saved page"""
+        job_id = self.resumable_jobs.get(self.resume_var.get())
+        if job_id is None:
+            return
+        
+        def run(insert_companies, stop_event):
+            from apollo_pipeline import run_extraction_job
+            return run_extraction_job(job_id, insert_companies, db_path=GUI_db.DB_PATH, stop_event=stop_event)
+        self._run_extraction(run)
+
+    def _run_extraction(self, run):
+        """Run an extraction job in the background and report the result; closing the dialog pauses it"""
         self.progress_bar.pack(pady=16)
         self.progress_bar.start()
         
-        def run_search():
+        def run_search(token):
+            from apollo import APOLLO_API_KEY
+            from GUI_db import insert_companies
+            
+            if not APOLLO_API_KEY:
+                raise Exception("APOLLO_API_KEY environment variable not set!")
+            
+            # The token stops the job after the pages in flight; it stays resumable
+            summary = run(insert_companies, token)
+            if summary['error'] and not summary['pages']:
+                raise Exception(f"{summary['error']}\n\nThe search can be resumed later.")
+            return summary
+        
+        def on_complete(summary):
+            total_saved = summary['total_saved']
+            stopped_early = (f"\n\nStopped early at page {summary['last_page']}: {summary['error']}\n"
+                             f"Reopen this dialog to resume." if summary['error'] else "")
+            self.progress_bar.stop()
+            self.progress_bar.pack_forget()
+            messagebox.showinfo("Search Complete", f"Found and saved {total_saved} new companies to the database.{stopped_early}")
+            
+            # Refresh the parent Apollo page after successful search
             try:
-                from apollo import APOLLO_API_KEY
-                import requests
-                from GUI_db import insert_company, count_companies
-                
-                if not APOLLO_API_KEY:
-                    raise Exception("APOLLO_API_KEY environment variable not set!")
-                
-                headers = {
-                    "Cache-Control": "no-cache", 
-                    "Content-Type": "application/json", 
-                    "x-api-key": APOLLO_API_KEY
-                }
-                
-                initial_count = count_companies()
-                total_saved = 0
-                
-                for page in range(1, max_pages + 1):
-                    body = {
-                        "page": page,
-                        "per_page": 100,
-                        "industry_tags": [
-                            "Pharmaceuticals", "Medical Devices", "Healthcare",
-                            "Manufacturing", "Medical Supplies"
-                        ],
-                        "q_organization_keyword_tags": [
-                            "latex gloves", "nitrile gloves", "medical gloves",
-                             "exam gloves", "biohazard protection", "disposable gloves"
-                        ]
-                    }
-                    
-                    if country:
-                        body["organization_locations"] = [country]
-                    
-                    resp = requests.post(
-                        "https://api.apollo.io/v1/mixed_companies/search",
-                        headers=headers,
-                        json=body
-                    )
-                    
-                    if resp.status_code != 200:
-                        raise Exception(f"Apollo API error (status {resp.status_code}): {resp.text}")
-                    
-                    data = resp.json()
-                    companies = data.get("organizations", [])
-                    
-                    if not companies:
-                        break
-                    
-                    for comp in companies:
-                        company_name = comp.get("name", "")
-                        country_val = comp.get("location_country") or comp.get("country") or country
-                        domain = comp.get("primary_domain")
-                        industry = comp.get("industry", "")
-                        employee_count = comp.get("estimated_num_employees")
-                        
-                        if not company_name or not domain:
-                            continue
-                        
-                        cid, is_new = insert_company(company_name, country_val, domain, industry, employee_count)
-                        if is_new:
-                            total_saved += 1
-                
-                def on_complete():
-                    self.progress_bar.stop()
-                    self.progress_bar.pack_forget()
-                    messagebox.showinfo("Search Complete", f"Found and saved {total_saved} new companies to the database.")
-                    
-                    # Refresh the parent Apollo page after successful search
-                    try:
-                        parent = self.master
-                        while parent and not hasattr(parent, 'refresh_apollo_data'):
-                            parent = parent.master
-                        if parent and hasattr(parent, 'refresh_apollo_data'):
-                            parent.refresh_apollo_data()
-                    except Exception:
-                        pass  # Ignore if refresh fails
-                    
-                    self.destroy()
-                
-                self.after(0, on_complete)
-                
-            except Exception as e:
-                def on_error():
-                    self.progress_bar.stop()
-                    self.progress_bar.pack_forget()
-                    messagebox.showerror("Search Error", f"Error during search: {str(e)}")
-                self.after(0, on_error)
+                parent = self.master
+                while parent and not hasattr(parent, 'refresh_apollo_data'):
+                    parent = parent.master
+                if parent and hasattr(parent, 'refresh_apollo_data'):
+                    parent.refresh_apollo_data()
+            except Exception:
+                pass  # Ignore if refresh fails
+            
+            self.destroy()
+        
+        def on_error(e):
+            self.progress_bar.stop()
+            self.progress_bar.pack_forget()
+            messagebox.showerror("Search Error", f"Error during search: {str(e)}")
         
-        threading.Thread(target=run_search, daemon=True).start()
+        task = run_in_background(run_search, on_complete, on_error, lane=API_LANE, pass_token=True)
+        self.bind("<Destroy>", lambda event: task.cancel() if event.widget is self else None, add="+")
 
 
 class CountrySelectorDialog(ctk.CTkToplevel):
@@ -3361,6 +3241,8 @@ class KeywordSelectorDialog(ctk.CTkToplevel):
 class MainApp(ctk.CTk):
     def __init__(self):
         super().__init__()
+        # Background task callbacks run on this (the Tk) thread from now on
+        task_manager.attach_tk(self)
         self.title("Glove Buyer App")
         # Launch in fullscreen more reliably
         self.after(10, self.maximize_window)
@@ -3426,15 +3308,20 @@ class MainApp(ctk.CTk):
     
     def on_closing(self):
         """Handle app shutdown"""
+        # Running searches/extractions are cancelled and stop at their next checkpoint
         task_manager.shutdown()
+        deepseek_agent.close_client()
+        db_connection.close_all()
         self.quit()
 
 class ApolloBuyerListPage(ctk.CTkFrame):
     def __init__(self, master):
         super().__init__(master, fg_color="#F5F7FA")
         self.selected_company = None
-        self.current_page = 0
         self.items_per_page = 50
+        self.sort_column = "id"
+        self.sort_descending = False
+        self.model = None
         self._build_ui()
         self.populate_table()
 
@@ -3489,6 +3376,8 @@ class ApolloBuyerListPage(ctk.CTkFrame):
         self.table.column("source", width=100, anchor="center")
         self.table.column("created_at", width=140, anchor="center")
         self.table.pack(fill="both", expand=True, padx=8, pady=8)
+        for col in self.table['columns']:
+            self.table.heading(col, command=lambda c=col: self._sort_by_column(c))
         # Pagination controls
         self.pagination_frame = ctk.CTkFrame(self, fg_color="#F5F7FA")
         self.pagination_frame.pack(fill="x", padx=32, pady=(0, 8))
@@ -3510,50 +3399,39 @@ class ApolloBuyerListPage(ctk.CTkFrame):
 
     def open_company_selector(self):
         import GUI_db
-        companies = sorted(set(c['company_name'] for c in GUI_db.get_all_contacts() if c.get('company_name')))
+        companies = GUI_db.get_contact_company_names()
         dialog = CompanySelectorDialog(self, companies)
         self.wait_window(dialog)
         selected_company = dialog.get_selected()
         if selected_company:
             self.company_filter_var.set(selected_company)
-            self.current_page = 0
             self.populate_table()
 
     def clear_all_filters(self):
         """Clear both search term and company filter"""
         self.search_var.set("")
         self.company_filter_var.set("All")
-        self.current_page = 0
         self.populate_table()
 
     def populate_table(self):
-        """Populate the table with Apollo contacts, filtered and paginated"""
+        """Show the first page of Apollo contacts; filtering, sorting and paging happen in SQL"""
         import GUI_db
-        search_term = self.search_var.get().strip().lower()
+        search_term = self.search_var.get().strip()
         company_filter = self.company_filter_var.get()
-        results = GUI_db.get_all_contacts()
-        # Filter by company
-        if company_filter and company_filter != "All":
-            results = [c for c in results if c.get('company_name', '') == company_filter]
-        # Filter by search
-        if search_term:
-            filtered = []
-            for entry in results:
-                if (search_term in str(entry.get('name', '')).lower() or
-                    search_term in str(entry.get('company_name', '')).lower() or
-                    search_term in str(entry.get('email', '')).lower()):
-                    filtered.append(entry)
-            results = filtered
-        # Sort by id ascending
-        results = sorted(results, key=lambda x: x.get('id', 0))
-        # Pagination
-        total_pages = max(1, (len(results) - 1) // self.items_per_page + 1)
-        start = self.current_page * self.items_per_page
-        end = start + self.items_per_page
-        page_results = results[start:end]
+        company_name = company_filter if company_filter and company_filter != "All" else None
+        sort_column, descending = self.sort_column, self.sort_descending
+        self.model = PagedTableModel(
+            lambda after, limit: GUI_db.get_contacts_page(search_term, company_name, sort_column, descending, after, limit),
+            next_cursor=keyset_cursor(sort_column),
+            count=lambda: GUI_db.count_contacts(search_term, company_name),
+            page_size=self.items_per_page)
+        self.model.reset()
+        self._show_page()
+
+    def _show_page(self):
         for row in self.table.get_children():
             self.table.delete(row)
-        for entry in page_results:
+        for entry in self.model.rows:
             self.table.insert("", "end", iid=entry['id'], values=(
                 entry.get('id', ''),
                 entry.get('name', ''),
@@ -3564,26 +3442,37 @@ class ApolloBuyerListPage(ctk.CTkFrame):
                 entry.get('source', ''),
                 entry.get('created_at', '')
             ))
-        self.page_label.configure(text=f"Page {self.current_page + 1} of {total_pages}")
-        self.prev_btn.configure(state="normal" if self.current_page > 0 else "disabled")
-        self.next_btn.configure(state="normal" if (self.current_page + 1) * self.items_per_page < len(results) else "disabled")
+        self.page_label.configure(text=self.model.label())
+        self.prev_btn.configure(state="normal" if self.model.has_prev else "disabled")
+        self.next_btn.configure(state="normal" if self.model.has_next else "disabled")
 
-    def next_page(self):
-        self.current_page += 1
+    def reload_page(self):
+        """Re-read the current page after an edit or delete"""
+        if self.model is None:
+            self.populate_table()
+            return
+        self.model.reload()
+        self._show_page()
+
+    def _sort_by_column(self, col):
+        """Sort by a column in SQL (click again to reverse)"""
+        self.sort_descending = col == self.sort_column and not self.sort_descending
+        self.sort_column = col
         self.populate_table()
 
+    def next_page(self):
+        self.model.next_page()
+        self._show_page()
+
     def prev_page(self):
-        if self.current_page > 0:
-            self.current_page -= 1
-            self.populate_table()
+        self.model.prev_page()
+        self._show_page()
 
     def on_search_change(self, *args):
-        self.current_page = 0
         self.populate_table()
 
     def clear_search(self):
         self.search_var.set("")
-        self.current_page = 0
         self.populate_table()
 
     def edit_selected(self):
@@ -3593,7 +3482,7 @@ class ApolloBuyerListPage(ctk.CTkFrame):
             return
         contact_id = int(selected[0])
         import GUI_db
-        record = next((c for c in GUI_db.get_all_contacts() if c['id'] == contact_id), None)
+        record = GUI_db.get_contact_by_id(contact_id)
         if not record:
             messagebox.showerror("Not Found", "Selected contact not found.")
             return
@@ -3646,7 +3535,7 @@ class ApolloBuyerListPage(ctk.CTkFrame):
                 return
             if GUI_db.update_contact(contact_id, updated_fields):
                 dialog.destroy()
-                self.populate_table()
+                self.reload_page()
                 messagebox.showinfo("Success", "Contact updated successfully.")
             else:
                 messagebox.showerror("Error", "Failed to update contact.")
@@ -3661,7 +3550,7 @@ class ApolloBuyerListPage(ctk.CTkFrame):
         contact_id = int(selected[0])
         if messagebox.askyesno("Delete Contact", "Are you sure you want to delete this contact?"):
             if GUI_db.delete_contact(contact_id):
-                self.populate_table()
+                self.reload_page()
                 messagebox.showinfo("Success", "Contact deleted successfully.")
             else:
                 messagebox.showerror("Error", "Failed to delete contact.")
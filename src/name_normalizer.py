@@ -0,0 +1,80 @@
+"""
+Company-name normalization shared by dedup, matching and the persisted normalized_name
+columns. Every pattern is compiled once at import.
+
+normalize_company_name("PT. Sarung Tangan Indonesia Tbk") == "sarung tangan indonesia"
+normalize_company_name("Top Glove Sdn. Bhd.") == "top glove"
+normalize_company_name("Müller & Söhne GmbH") == "muller and sohne"
+"""
+import re
+import unicodedata
+from functools import lru_cache
+from typing import Dict, Optional
+
+# Legal forms written without punctuation, as they look after _PUNCT_RE has run
+# ("Sdn. Bhd." -> "sdn bhd", "A/S" -> "a s", "Sp. z o.o." -> "sp z o o")
+LEGAL_SUFFIXES = [
+    "sdn bhd", "bhd", "berhad", "pte ltd", "pvt ltd", "private limited", "public company limited",
+    "co ltd", "ltd", "limited", "inc", "incorporated", "llc", "llp", "lp", "co", "company", "corp",
+    "corporation", "plc", "gmbh", "gmbh co kg", "mbh", "sa", "s a", "sa de cv", "s a de c v", "ag",
+    "bv", "b v", "oy", "oyj", "sarl", "sas", "srl", "spa", "s p a", "kg", "kft", "ab", "as", "a s",
+    "nv", "n v", "aps", "sp z o o", "spolka z ograniczona odpowiedzialnoscia", "jsc", "pjsc", "tbk",
+    "k k", "kk", "cv",
+]
+# Indonesian/other forms that come first ("PT Maju Jaya", "CV Sinar")
+LEGAL_PREFIXES = ["pt", "cv", "ud", "pd"]
+
+def _alternation(forms) -> str:
+    # Longest first so "sdn bhd" wins over "bhd"
+    return "|".join(re.escape(form).replace(r"\ ", r"\s+") for form in sorted(set(forms), key=len, reverse=True))
+
+_PUNCT_RE = re.compile(r"[^\w\s]+|_")
+_SPACE_RE = re.compile(r"\s+")
+_SUFFIX_RE = re.compile(r"(?:\s+(?:%s))+$" % _alternation(LEGAL_SUFFIXES))
+_PREFIX_RE = re.compile(r"^(?:(?:%s)\s+)+" % _alternation(LEGAL_PREFIXES))
+
+def fold(text: str) -> str:
+    """Casefold and strip accents ("Société" -> "societe")."""
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch)).casefold()
+
+@lru_cache(maxsize=65536)
+def normalize_company_name(name: Optional[str]) -> str:
+    """
+    Comparison key for a company name: accents folded, lowercased, '&' read as 'and',
+    punctuation dropped and legal forms (Sdn Bhd, PT, GmbH, ...) removed from both ends.
+    A name made only of legal forms is kept rather than reduced to ''.
+    """
+    if not name:
+        return ""
+    text = fold(name).replace("&", " and ")
+    text = _SPACE_RE.sub(" ", _PUNCT_RE.sub(" ", text)).strip()
+    stripped = _PREFIX_RE.sub("", _SUFFIX_RE.sub("", " " + text).strip() + " ").strip()
+    return stripped or text
+
+def name_key(row: Dict, column: str = "company_name") -> str:
+    """A row's stored normalized_name, or the name normalized on the fly for rows that predate it."""
+    return row.get("normalized_name") or normalize_company_name(row.get(column))
+
+def with_normalized_name(fields: Dict, column: str = "company_name") -> Dict:
+    """Copy of an update dict with normalized_name added when the name column is being changed."""
+    if column in fields:
+        return dict(fields, normalized_name=normalize_company_name(fields[column]))
+    return fields
+
+def add_normalized_name_column(conn, table: str, column: str = "company_name", index_columns=()):
+    """
+    Migration: add normalized_name to `table` if it is missing, fill it for rows that don't
+    have it yet and index it (together with index_columns, e.g. ('country',)).
+    """
+    c = conn.cursor()
+    c.execute(f"PRAGMA table_info({table})")
+    if "normalized_name" not in [row[1] for row in c.fetchall()]:
+        c.execute(f"ALTER TABLE {table} ADD COLUMN normalized_name TEXT")
+    c.execute(f"SELECT id, {column} FROM {table} WHERE normalized_name IS NULL")
+    rows = c.fetchall()
+    if rows:
+        c.executemany(f"UPDATE {table} SET normalized_name = ? WHERE id = ?",
+                      [(normalize_company_name(name), row_id) for row_id, name in rows])
+    c.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_normalized_name ON {table} "
+              f"({', '.join(('normalized_name',) + tuple(index_columns))})")
@@ -0,0 +1,91 @@
+from typing import Callable, Dict, List, Optional, Any
+
+def keyset_cursor(sort_column: str) -> Callable[[Any, List[Dict]], tuple]:
+    """Cursor for GUI_db keyset page queries: the (sort value, id) of the last row shown (the value may be None)."""
+    def next_cursor(cursor, rows):
+        last = rows[-1]
+        return (last.get(sort_column), last['id'])
+    return next_cursor
+
+def offset_cursor(cursor, rows) -> int:
+    """Cursor for LIMIT/OFFSET queries (e.g. ranked full-text search): rows seen so far."""
+    return (cursor or 0) + len(rows)
+
+class PagedTableModel:
+    """
+    Window over a large result set for a ttk.Treeview: only the visible page is fetched
+    from SQLite and inserted into the widget, however many rows match.
+
+    fetch(cursor, limit) returns up to `limit` rows starting after `cursor` (None for the
+    first page); next_cursor(cursor, rows) derives the cursor for the following page.
+    Cursors of visited pages are kept so Previous is a single query as well.
+    count() (optional) returns the total number of matching rows for the page label.
+    """
+    def __init__(self, fetch: Callable, next_cursor: Callable = offset_cursor,
+                 count: Optional[Callable[[], int]] = None, page_size: int = 100):
+        self.fetch = fetch
+        self.next_cursor = next_cursor
+        self.count = count
+        self.page_size = page_size
+        self.cursors = [None]
+        self.rows: List[Dict] = []
+        self.has_next = False
+        self._total = None
+
+    @property
+    def page_index(self) -> int:
+        return len(self.cursors) - 1
+
+    @property
+    def has_prev(self) -> bool:
+        return self.page_index > 0
+
+    @property
+    def total(self) -> Optional[int]:
+        if self._total is None and self.count is not None:
+            self._total = self.count()
+        return self._total
+
+    @property
+    def page_count(self) -> Optional[int]:
+        if self.total is None:
+            return None
+        return max(1, (self.total - 1) // self.page_size + 1)
+
+    def _load(self) -> List[Dict]:
+        # One extra row tells us whether a next page exists without a COUNT
+        rows = self.fetch(self.cursors[-1], self.page_size + 1)
+        self.has_next = len(rows) > self.page_size
+        self.rows = rows[:self.page_size]
+        return self.rows
+
+    def reset(self) -> List[Dict]:
+        """Load the first page (after a filter or sort change)."""
+        self.cursors = [None]
+        self._total = None
+        return self._load()
+
+    def reload(self) -> List[Dict]:
+        """Re-read the current page (after an edit or delete)."""
+        self._total = None
+        rows = self._load()
+        if not rows and self.has_prev:
+            return self.prev_page()
+        return rows
+
+    def next_page(self) -> List[Dict]:
+        if self.has_next and self.rows:
+            self.cursors.append(self.next_cursor(self.cursors[-1], self.rows))
+            self._load()
+        return self.rows
+
+    def prev_page(self) -> List[Dict]:
+        if self.has_prev:
+            self.cursors.pop()
+            self._load()
+        return self.rows
+
+    def label(self) -> str:
+        if self.page_count is None:
+            return f"Page {self.page_index + 1}"
+        return f"Page {self.page_index + 1} of {self.page_count} ({self.total} rows)"
@@ -0,0 +1,157 @@
+"""
+In-memory cache for query results shown by the GUI, shared by the UI thread and the
+background workers.
+
+Entries are dropped least-recently-used first once the cache holds more than max_entries
+entries or max_bytes (estimated) of values, and expire after their own TTL. An entry
+records the version of every table it was read from; the write functions in GUI_db,
+db_apollo, db and dedup bump those versions (bump_table_versions / @invalidates), so a
+result read before a write is never served after it.
+
+    rows = cache.get_or_load(('deepseek_page', country, after), lambda: GUI_db.get_deepseek_results_page(...),
+                             tables=('deepseek_buyer_search_results',))
+"""
+import sys
+import time
+import functools
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional
+
+DEFAULT_TTL = object()  # use the cache's ttl
+_versions: Dict[str, int] = {}
+_versions_lock = threading.Lock()
+
+def table_version(table: str) -> int:
+    return _versions.get(table, 0)
+
+def bump_table_versions(*tables: str):
+    """Mark tables as changed: cached results read from them become stale."""
+    with _versions_lock:
+        for table in tables:
+            _versions[table] = _versions.get(table, 0) + 1
+
+def invalidates(*tables: str) -> Callable:
+    """Decorator for write functions: bump the tables' versions after every call (even a failed one)."""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                bump_table_versions(*tables)
+        return wrapper
+    return decorator
+
+def estimate_size(value: Any, _depth: int = 0) -> int:
+    """Rough size in bytes of a query result (lists/tuples of dicts or tuples of scalars)."""
+    size = sys.getsizeof(value)
+    if _depth > 3:
+        return size
+    if isinstance(value, dict):
+        size += sum(estimate_size(k, _depth + 1) + estimate_size(v, _depth + 1) for k, v in value.items())
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        size += sum(estimate_size(item, _depth + 1) for item in value)
+    return size
+
+class QueryCache:
+    """
+    Thread-safe LRU cache with per-entry TTL and table-version invalidation.
+    ttl is the default lifetime in seconds (None: until evicted or invalidated).
+    """
+    def __init__(self, max_entries: int = 256, max_bytes: Optional[int] = 64 * 1024 * 1024,
+                 ttl: Optional[float] = 300):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries = OrderedDict()  # key -> (value, size, expires_at, {table: version})
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._counters = {'hits': 0, 'misses': 0, 'stale': 0, 'expired': 0, 'evictions': 0}
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """The cached value, or default if missing, expired or read from a table changed since."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._counters['misses'] += 1
+                return default
+            value, size, expires_at, versions = entry
+            if expires_at is not None and time.monotonic() >= expires_at:
+                reason = 'expired'
+            elif any(table_version(table) != version for table, version in versions.items()):
+                reason = 'stale'
+            else:
+                self._entries.move_to_end(key)
+                self._counters['hits'] += 1
+                return value
+            self._remove(key)
+            self._counters[reason] += 1
+            self._counters['misses'] += 1
+            return default
+
+    def set(self, key: Hashable, value: Any, tables: Iterable[str] = (), ttl: Any = DEFAULT_TTL,
+            versions: Optional[Dict[str, int]] = None):
+        """
+        Store value, read from `tables`. ttl overrides the default (None: no expiry).
+        versions are the table versions from before the read (see get_or_load); by default
+        the current ones.
+        """
+        ttl = self.ttl if ttl is DEFAULT_TTL else ttl
+        if versions is None:
+            versions = {table: table_version(table) for table in tables}
+        size = estimate_size(value) if self.max_bytes else 0
+        if self.max_bytes and size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            expires_at = time.monotonic() + ttl if ttl is not None else None
+            self._entries[key] = (value, size, expires_at, versions)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or (self.max_bytes and self._bytes > self.max_bytes):
+                self._remove(next(iter(self._entries)))
+                self._counters['evictions'] += 1
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any], tables: Iterable[str] = (),
+                    ttl: Any = DEFAULT_TTL) -> Any:
+        """
+        Cached value for key, or loader() stored under it. Table versions are taken before
+        loading, so a write that lands during the load leaves the entry stale, not wrong.
+        """
+        missing = object()
+        value = self.get(key, missing)
+        if value is not missing:
+            return value
+        versions = {table: table_version(table) for table in tables}
+        value = loader()
+        self.set(key, value, ttl=ttl, versions=versions)
+        return value
+
+    def _remove(self, key: Hashable):
+        entry = self._entries.pop(key)
+        self._bytes -= entry[1]
+
+    def invalidate(self, key: Hashable) -> bool:
+        """Remove a single entry. Returns True if it existed."""
+        with self._lock:
+            if key not in self._entries:
+                return False
+            self._remove(key)
+            return True
+
+    def clear(self):
+        """Remove every entry and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            for name in self._counters:
+                self._counters[name] = 0
+
+    def stats(self) -> Dict:
+        """Hits, misses (stale and expired ones included), evictions, entries and estimated bytes."""
+        with self._lock:
+            stats = dict(self._counters, entries=len(self._entries), bytes=self._bytes)
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = stats['hits'] / lookups if lookups else 0.0
+        return stats
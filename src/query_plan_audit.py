@@ -0,0 +1,222 @@
+"""
+Query plan audit: runs EXPLAIN QUERY PLAN over every SQL statement in db.py, GUI_db.py
+and db_apollo.py against a scratch copy of the schema (built by the real init functions,
+so the index migrations are included) and flags full table scans. The keyset page
+queries of GUI_db.get_deepseek_results_page are audited too, and flagged if they need a
+temporary B-tree to sort.
+
+Usage: python src/query_plan_audit.py
+Exits with status 1 if a filtered query (one with a WHERE clause) needs a full scan or a
+page query sorts in a temporary B-tree.
+"""
+import ast
+import os
+import re
+import sys
+import sqlite3
+import tempfile
+import itertools
+from typing import List, Dict, Optional
+
+import db
+import GUI_db
+import db_apollo
+import db_connection
+import entity_resolution
+import dashboard_stats
+
+SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+AUDITED_MODULES = {
+    'db.py': 'database.db',
+    'GUI_db.py': 'database.db',
+    'db_apollo.py': 'Apollo.db',
+    'entity_resolution.py': 'database.db',
+    'dashboard_stats.py': 'database.db',
+}
+
+# Values substituted for f-string fields so dynamic table names, SET clauses and
+# IN-lists still produce auditable statements
+FSTRING_EXPANSIONS = {
+    'table': ['asia_buyer_leads', 'global_buyer_leads', 'results'],
+    'set_clause': ['description = ?'],
+    'placeholders': ['?, ?'],
+}
+
+# Statements assembled at runtime (not literals in an execute() call)
+DYNAMIC_QUERIES = {
+    'GUI_db.py': [
+        # get_deepseek_results() with each filter combination it can build
+        'SELECT * FROM deepseek_buyer_search_results WHERE 1=1 ORDER BY created_at DESC',
+        'SELECT * FROM deepseek_buyer_search_results WHERE 1=1 AND hs_code = ? ORDER BY created_at DESC',
+        'SELECT * FROM deepseek_buyer_search_results WHERE 1=1 AND keyword = ? ORDER BY created_at DESC',
+        'SELECT * FROM deepseek_buyer_search_results WHERE 1=1 AND country = ? ORDER BY created_at DESC',
+        'SELECT * FROM deepseek_buyer_search_results WHERE 1=1 AND hs_code = ? AND keyword = ? AND country = ? ORDER BY created_at DESC',
+        # search_deepseek_results()
+        'SELECT r.id, r.company_name FROM deepseek_results_fts JOIN deepseek_buyer_search_results r ON r.id = deepseek_results_fts.rowid '
+        'WHERE deepseek_results_fts MATCH ? ORDER BY bm25(deepseek_results_fts, 10.0, 1.0, 5.0, 5.0)',
+    ],
+}
+
+# Filtered scans that no B-tree index can serve, with the reason they are accepted
+ACCEPTED_SCANS = {
+    ('db.py', 'get_asia_buyer_leads_by_country'): "substring match (LIKE '%country%')",
+    ('db.py', 'get_global_buyer_leads_by_country'): "substring match (LIKE '%country%')",
+    ('GUI_db.py', 'get_deepseek_results_by_search'): "LIKE fallback for search_deepseek_results when FTS5 is unavailable",
+}
+
+# "SCAN t", "SCAN TABLE t" (older SQLite) and "SCAN t USING [COVERING] INDEX i" all visit
+# every row; "SCAN t VIRTUAL TABLE INDEX n:M.." is an FTS5 MATCH lookup and is not a scan
+SCAN_RE = re.compile(r'^SCAN (?:TABLE )?(\w+)\b(?!.*VIRTUAL TABLE INDEX)')
+TEMP_SORT = 'USE TEMP B-TREE FOR ORDER BY'
+AUDITED_VERBS = ('SELECT', 'UPDATE', 'DELETE', 'WITH')
+
+def _render_fstring(node: ast.JoinedStr) -> List[str]:
+    """Expand an f-string into one SQL string per combination of FSTRING_EXPANSIONS values."""
+    parts = []
+    for value in node.values:
+        if isinstance(value, ast.Constant):
+            parts.append([value.value])
+        else:
+            name = ast.unparse(value.value)
+            parts.append(FSTRING_EXPANSIONS.get(name, [None]))
+    queries = []
+    for combo in itertools.product(*parts):
+        if None not in combo:
+            queries.append(''.join(combo))
+    return queries
+
+def extract_queries(path: str) -> List[Dict]:
+    """Return [{'function', 'line', 'sql'}] for every literal SQL passed to execute()/executemany()."""
+    with open(path, 'r', encoding='utf-8') as f:
+        tree = ast.parse(f.read(), filename=path)
+    found = []
+    for func in ast.walk(tree):
+        if not isinstance(func, ast.FunctionDef):
+            continue
+        for node in ast.walk(func):
+            if not (isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute)
+                    and node.func.attr in ('execute', 'executemany') and node.args):
+                continue
+            arg = node.args[0]
+            if isinstance(arg, ast.Constant) and isinstance(arg.value, str):
+                sqls = [arg.value]
+            elif isinstance(arg, ast.JoinedStr):
+                sqls = _render_fstring(arg)
+            else:
+                continue
+            for sql in sqls:
+                found.append({'function': func.name, 'line': node.lineno, 'sql': ' '.join(sql.split()),
+                              'expanded': isinstance(arg, ast.JoinedStr)})
+    return found
+
+def page_queries() -> List[Dict]:
+    """The queries get_deepseek_results_page can run: every sort column, direction, filter and cursor kind."""
+    found = []
+    for column in sorted(GUI_db.DEEPSEEK_SORT_COLUMNS):
+        nullable = column not in GUI_db.DEEPSEEK_NOT_NULL_COLUMNS
+        cursors = [None, ('v', 1)] + ([(None, 1)] if nullable else [])
+        for where, descending, after in itertools.product([[], ['company_country = ?']], [False, True], cursors):
+            for sql, _ in GUI_db.keyset_page_queries('deepseek_buyer_search_results', where, ['x'] * len(where),
+                                                     column, descending, after, nullable):
+                found.append({'function': f'(page: {column})', 'line': 0, 'sql': sql, 'ordered': True})
+    return found
+
+def build_scratch_databases(directory: str) -> Dict[str, str]:
+    """Create empty copies of database.db and Apollo.db with the current schema and indexes."""
+    paths = {'database.db': os.path.join(directory, 'database.db'), 'Apollo.db': os.path.join(directory, 'Apollo.db')}
+    saved = (db.DB_PATH, GUI_db.DB_PATH, db_apollo.APOLLO_DB_PATH)
+    db.DB_PATH = GUI_db.DB_PATH = paths['database.db']
+    db_apollo.APOLLO_DB_PATH = paths['Apollo.db']
+    try:
+        db.init_db()
+        GUI_db.init_db()
+        GUI_db.init_apollo_db()
+        GUI_db.init_deepseek_results_table()
+        db_apollo.init_apollo_db()
+        entity_resolution.init_entity_tables(paths['database.db'])
+        dashboard_stats.init_dashboard_stats(paths['database.db'])
+    finally:
+        db.DB_PATH, GUI_db.DB_PATH, db_apollo.APOLLO_DB_PATH = saved
+    return paths
+
+def is_filtered(sql: str) -> bool:
+    """True if the statement has a real WHERE clause (get_deepseek_results' bare 'WHERE 1=1' doesn't count)."""
+    sql = sql.upper().replace('WHERE 1=1 AND ', 'WHERE ').replace(' WHERE 1=1', '')
+    return ' WHERE ' in sql
+
+def explain(conn: sqlite3.Connection, sql: str) -> List[str]:
+    rows = conn.execute(f'EXPLAIN QUERY PLAN {sql}', (None,) * sql.count('?')).fetchall()
+    return [row[-1] for row in rows]
+
+def audit(directory: Optional[str] = None) -> List[Dict]:
+    """
+    Audit every query. Each finding has module, function, line, sql, plan, scans
+    (tables read in full), filtered (query has a WHERE clause), accepted (reason a scan is
+    expected, if any), sorts (a page query sorts in a temporary B-tree) and error (e.g.
+    missing table). f-string expansions that don't fit the
+    schema (a column another branch's table doesn't have) are dropped.
+    """
+    with tempfile.TemporaryDirectory() as scratch:
+        paths = build_scratch_databases(directory or scratch)
+        findings = []
+        for module, database in AUDITED_MODULES.items():
+            queries = extract_queries(os.path.join(SRC_DIR, module))
+            queries += [{'function': '(dynamic)', 'line': 0, 'sql': sql} for sql in DYNAMIC_QUERIES.get(module, [])]
+            if module == 'GUI_db.py':
+                queries += page_queries()
+            conn = sqlite3.connect(paths[database])
+            for query in queries:
+                if not query['sql'].lstrip().upper().startswith(AUDITED_VERBS):
+                    continue
+                finding = dict(query, module=module, plan=[], scans=[], sorts=False, error=None,
+                               filtered=is_filtered(query['sql']),
+                               accepted=ACCEPTED_SCANS.get((module, query['function'])))
+                try:
+                    finding['plan'] = explain(conn, query['sql'])
+                except sqlite3.Error as e:
+                    if query.get('expanded'):
+                        continue
+                    finding['error'] = str(e)
+                for step in finding['plan']:
+                    match = SCAN_RE.match(step)
+                    if match and not match.group(1).startswith('sqlite_'):
+                        finding['scans'].append(match.group(1))
+                    if query.get('ordered') and step.startswith(TEMP_SORT):
+                        finding['sorts'] = True
+                findings.append(finding)
+            conn.close()
+        # Only the scratch files: the caller's own pooled connections stay open
+        for path in paths.values():
+            db_connection.close_path(path)
+    return findings
+
+def main() -> int:
+    findings = audit()
+    flagged = 0
+    for f in findings:
+        location = f"{f['module']}:{f['line']} {f['function']}()"
+        if f['error']:
+            print(f"[SKIP] {location}: {f['error']}")
+        elif f['sorts']:
+            flagged += 1
+            print(f"[SORT] {location}: ORDER BY needs a temporary B-tree")
+            print(f"       {f['sql']}")
+            for step in f['plan']:
+                print(f"       -> {step}")
+        elif f['scans'] and f['filtered'] and f['accepted']:
+            print(f"[ok]   {location}: full scan of {', '.join(f['scans'])} accepted, {f['accepted']}")
+        elif f['scans'] and f['filtered']:
+            flagged += 1
+            print(f"[SCAN] {location}: full scan of {', '.join(f['scans'])}")
+            print(f"       {f['sql']}")
+            for step in f['plan']:
+                print(f"       -> {step}")
+        elif f['scans']:
+            print(f"[ok]   {location}: unfiltered read of {', '.join(f['scans'])}")
+        else:
+            print(f"[ok]   {location}: {'; '.join(f['plan'])}")
+    print(f"\n{len(findings)} queries audited, {flagged} queries need a full scan or a sort.")
+    return 1 if flagged else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,278 @@
+import os
+import time
+import random
+import asyncio
+import threading
+from email.utils import parsedate_to_datetime
+from typing import Optional, Callable, Dict
+
+# HTTP statuses that mean "try again later" rather than "this request is wrong"
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header (delta-seconds or HTTP-date) into seconds to wait."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+class TokenBucket:
+    """Classic token bucket: `rate` tokens per second, holding at most `capacity` tokens."""
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def try_take(self) -> float:
+        """Take one token if available. Returns 0 on success, otherwise the seconds until one is."""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0.0
+            return (1 - self.tokens) / self.rate
+
+    def set_rate(self, rate: float):
+        with self._lock:
+            self._refill(time.monotonic())
+            self.rate = rate
+
+class AdaptiveLimiter:
+    """
+    Per-provider limiter combining a token bucket (request rate) with a concurrency ceiling.
+    On throttling (429/503) the ceiling and rate are halved and every caller pauses until the
+    provider's Retry-After has passed; after a run of successes they grow back towards the
+    configured maximum (additive increase, multiplicative decrease).
+    """
+    def __init__(self, name: str, rate: float, burst: float, max_concurrency: int,
+                 min_concurrency: int = 1, increase_after: int = 20):
+        self.name = name
+        self.max_rate = rate
+        self.max_concurrency = max_concurrency
+        self.min_concurrency = min_concurrency
+        self.increase_after = increase_after
+        self.concurrency = max_concurrency
+        self.bucket = TokenBucket(rate, burst)
+        self.in_flight = 0
+        self.paused_until = 0.0
+        self.successes = 0
+        self.throttled = 0
+        self._lock = threading.Lock()
+
+    def try_acquire(self) -> float:
+        """Try to start a request. Returns 0 if a slot was taken, otherwise a suggested wait in seconds."""
+        with self._lock:
+            now = time.monotonic()
+            if now < self.paused_until:
+                return self.paused_until - now
+            if self.in_flight >= self.concurrency:
+                return 0.05
+            wait = self.bucket.try_take()
+            if wait:
+                return wait
+            self.in_flight += 1
+            return 0.0
+
+    def acquire(self):
+        while True:
+            wait = self.try_acquire()
+            if not wait:
+                return
+            time.sleep(wait)
+
+    async def aacquire(self):
+        while True:
+            wait = self.try_acquire()
+            if not wait:
+                return
+            await asyncio.sleep(wait)
+
+    def release(self):
+        with self._lock:
+            self.in_flight = max(0, self.in_flight - 1)
+
+    def on_success(self):
+        with self._lock:
+            self.successes += 1
+            if self.successes >= self.increase_after:
+                self.successes = 0
+                if self.concurrency < self.max_concurrency:
+                    self.concurrency += 1
+                if self.bucket.rate < self.max_rate:
+                    self.bucket.set_rate(min(self.max_rate, self.bucket.rate * 1.25))
+
+    def on_throttle(self, retry_after: Optional[float] = None):
+        with self._lock:
+            self.throttled += 1
+            self.successes = 0
+            self.concurrency = max(self.min_concurrency, self.concurrency // 2)
+            self.bucket.set_rate(max(self.max_rate / 16, self.bucket.rate / 2))
+            if retry_after:
+                self.paused_until = max(self.paused_until, time.monotonic() + retry_after)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                'provider': self.name,
+                'rate': self.bucket.rate,
+                'concurrency': self.concurrency,
+                'in_flight': self.in_flight,
+                'throttled': self.throttled
+            }
+
+class RetryPolicy:
+    """Jittered exponential backoff ("full jitter"), capped at max_delay, honoring Retry-After."""
+    def __init__(self, max_retries: int = 5, base_delay: float = 1.0, max_delay: float = 60.0):
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        if retry_after is not None:
+            return min(retry_after, self.max_delay)
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+# Default limits per provider; override with <PROVIDER>_RATE_PER_SEC, <PROVIDER>_BURST,
+# <PROVIDER>_MAX_CONCURRENCY and <PROVIDER>_MAX_RETRIES environment variables.
+PROVIDER_DEFAULTS = {
+    'deepseek': {'rate': 2.0, 'burst': 10, 'max_concurrency': 16, 'max_retries': 5},
+    'apollo': {'rate': 1.0, 'burst': 5, 'max_concurrency': 4, 'max_retries': 5},
+}
+
+_limiters = {}
+_policies = {}
+_registry_lock = threading.Lock()
+
+def get_limiter(provider: str) -> AdaptiveLimiter:
+    """Return the process-wide limiter for a provider ('deepseek', 'apollo', ...)."""
+    with _registry_lock:
+        if provider not in _limiters:
+            defaults = PROVIDER_DEFAULTS.get(provider, PROVIDER_DEFAULTS['apollo'])
+            prefix = provider.upper()
+            _limiters[provider] = AdaptiveLimiter(
+                provider,
+                rate=float(os.getenv(f'{prefix}_RATE_PER_SEC', defaults['rate'])),
+                burst=float(os.getenv(f'{prefix}_BURST', defaults['burst'])),
+                max_concurrency=int(os.getenv(f'{prefix}_MAX_CONCURRENCY', defaults['max_concurrency']))
+            )
+            _policies[provider] = RetryPolicy(max_retries=int(os.getenv(f'{prefix}_MAX_RETRIES', defaults['max_retries'])))
+        return _limiters[provider]
+
+def reset_limiters():
+    """Forget every provider's limiter and retry policy; the next request recreates them from the environment."""
+    with _registry_lock:
+        _limiters.clear()
+        _policies.clear()
+
+def get_retry_policy(provider: str) -> RetryPolicy:
+    get_limiter(provider)
+    return _policies[provider]
+
+def _is_throttle(status: int) -> bool:
+    return status in (429, 503)
+
+def call_with_retry(provider: str, send: Callable, retry_exceptions=(OSError,), retry_statuses=RETRYABLE_STATUSES):
+    """
+    Call send() (which performs one HTTP request and returns a response with
+    status_code/headers) under the provider's limiter, retrying retry_statuses (429/5xx)
+    and retry_exceptions (transient network errors) with jittered exponential backoff.
+    Returns the last response; the caller decides whether to raise_for_status().
+    """
+    limiter = get_limiter(provider)
+    policy = get_retry_policy(provider)
+    attempt = 0
+    while True:
+        limiter.acquire()
+        try:
+            response = send()
+        except retry_exceptions:
+            if attempt >= policy.max_retries:
+                raise
+            time.sleep(policy.delay(attempt))
+            attempt += 1
+            continue
+        finally:
+            limiter.release()
+        if response.status_code not in RETRYABLE_STATUSES:
+            limiter.on_success()
+            return response
+        retry_after = parse_retry_after(response.headers.get('Retry-After'))
+        if _is_throttle(response.status_code):
+            limiter.on_throttle(retry_after)
+        if attempt >= policy.max_retries or response.status_code not in retry_statuses:
+            return response
+        time.sleep(policy.delay(attempt, retry_after))
+        attempt += 1
+
+async def acall_with_retry(provider: str, send: Callable, retry_exceptions=(OSError,), retry_statuses=RETRYABLE_STATUSES):
+    """Async counterpart of call_with_retry; send is a coroutine function."""
+    limiter = get_limiter(provider)
+    policy = get_retry_policy(provider)
+    attempt = 0
+    while True:
+        await limiter.aacquire()
+        try:
+            response = await send()
+        except retry_exceptions:
+            if attempt >= policy.max_retries:
+                raise
+            await asyncio.sleep(policy.delay(attempt))
+            attempt += 1
+            continue
+        finally:
+            limiter.release()
+        if response.status_code not in RETRYABLE_STATUSES:
+            limiter.on_success()
+            return response
+        retry_after = parse_retry_after(response.headers.get('Retry-After'))
+        if _is_throttle(response.status_code):
+            limiter.on_throttle(retry_after)
+        if attempt >= policy.max_retries or response.status_code not in retry_statuses:
+            return response
+        await asyncio.sleep(policy.delay(attempt, retry_after))
+        attempt += 1
+
+class SingleFlight:
+    """
+    Collapse concurrent calls that share a key into one: the first caller runs fn() and
+    every caller that arrives while it is in flight waits for and shares its result (or
+    exception). Nothing is cached once the call has finished.
+    """
+    def __init__(self):
+        self._calls: Dict = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, fn: Callable):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = {'done': threading.Event(), 'result': None, 'error': None}
+        if not leader:
+            call['done'].wait()
+        else:
+            try:
+                call['result'] = fn()
+            except BaseException as e:
+                call['error'] = e
+            finally:
+                with self._lock:
+                    self._calls.pop(key, None)
+                call['done'].set()
+        if call['error'] is not None:
+            raise call['error']
+        return call['result']
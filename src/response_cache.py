@@ -0,0 +1,143 @@
+import os
+import json
+import time
+import hashlib
+import threading
+from typing import Optional, Dict
+
+from db_connection import connect
+
+CACHE_DB_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'deepseek_cache.db'))
+
+def make_cache_key(*parts) -> str:
+    """
+    Build a content-addressed cache key from any JSON-serialisable parts
+    (e.g. the API URL and the fully rendered request body).
+    """
+    payload = json.dumps(parts, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+class ResponseCache:
+    """
+    On-disk SQLite cache of API responses with a TTL and size-bounded LRU eviction.
+    Entries older than `ttl` seconds are treated as misses; when the cache grows past
+    `max_entries` rows or `max_bytes` of stored text, the least recently used entries are dropped.
+    """
+    def __init__(self, db_path: str = CACHE_DB_PATH, table: str = 'response_cache',
+                 ttl: float = 7 * 24 * 3600, max_entries: int = 5000, max_bytes: int = 200 * 1024 * 1024):
+        self.db_path = db_path
+        self.table = table
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._init_table()
+
+    def _init_table(self):
+        conn = connect(self.db_path)
+        c = conn.cursor()
+        c.execute(f'''
+            CREATE TABLE IF NOT EXISTS {self.table} (
+                cache_key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL,
+                hit_count INTEGER DEFAULT 0
+            )
+        ''')
+        c.execute(f'CREATE INDEX IF NOT EXISTS idx_{self.table}_last_access ON {self.table}(last_access)')
+        conn.commit()
+        conn.close()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached value for key, or None on a miss or expired entry."""
+        now = time.time()
+        conn = connect(self.db_path)
+        c = conn.cursor()
+        c.execute(f'SELECT value, created_at FROM {self.table} WHERE cache_key = ?', (key,))
+        row = c.fetchone()
+        if row and (self.ttl is None or now - row[1] < self.ttl):
+            c.execute(f'UPDATE {self.table} SET last_access = ?, hit_count = hit_count + 1 WHERE cache_key = ?', (now, key))
+            conn.commit()
+            conn.close()
+            with self._lock:
+                self.hits += 1
+            return row[0]
+        if row:
+            # Expired entry
+            c.execute(f'DELETE FROM {self.table} WHERE cache_key = ?', (key,))
+            conn.commit()
+        conn.close()
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def set(self, key: str, value: str):
+        """Store value under key and evict least recently used entries if over the size bounds."""
+        now = time.time()
+        conn = connect(self.db_path)
+        c = conn.cursor()
+        c.execute(f'''
+            INSERT OR REPLACE INTO {self.table} (cache_key, value, size, created_at, last_access, hit_count)
+            VALUES (?, ?, ?, ?, ?, 0)
+        ''', (key, value, len(value.encode('utf-8')), now, now))
+        self._evict(c)
+        conn.commit()
+        conn.close()
+
+    def _evict(self, c):
+        c.execute(f'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM {self.table}')
+        count, total_size = c.fetchone()
+        if count <= self.max_entries and total_size <= self.max_bytes:
+            return
+        c.execute(f'SELECT cache_key, size FROM {self.table} ORDER BY last_access ASC')
+        to_delete = []
+        for cache_key, size in c.fetchall():
+            if count <= self.max_entries and total_size <= self.max_bytes:
+                break
+            to_delete.append((cache_key,))
+            count -= 1
+            total_size -= size
+        c.executemany(f'DELETE FROM {self.table} WHERE cache_key = ?', to_delete)
+
+    def invalidate(self, key: str) -> bool:
+        """Remove a single entry. Returns True if it existed."""
+        conn = connect(self.db_path)
+        c = conn.cursor()
+        c.execute(f'DELETE FROM {self.table} WHERE cache_key = ?', (key,))
+        conn.commit()
+        deleted = c.rowcount > 0
+        conn.close()
+        return deleted
+
+    def clear(self):
+        """Remove every entry and reset the hit/miss counters."""
+        conn = connect(self.db_path)
+        c = conn.cursor()
+        c.execute(f'DELETE FROM {self.table}')
+        conn.commit()
+        conn.close()
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict:
+        """Return hit/miss counters for this process plus the current entry count and size."""
+        conn = connect(self.db_path)
+        c = conn.cursor()
+        c.execute(f'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM {self.table}')
+        entries, size_bytes = c.fetchone()
+        conn.close()
+        with self._lock:
+            hits, misses = self.hits, self.misses
+        lookups = hits + misses
+        return {
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': hits / lookups if lookups else 0.0,
+            'entries': entries,
+            'size_bytes': size_bytes
+        }
@@ -0,0 +1,251 @@
+"""
+Background tasks for the GUI: a thread pool with priority lanes, cancellation tokens,
+deduplication of waiting tasks, and callbacks delivered on the Tk thread.
+
+Lanes (LANES): waiting 'ui' tasks (the database reads behind a page) always start before
+waiting 'api' tasks (DeepSeek/Apollo searches, exports), and 'api' tasks hold at most
+LANES['api']['max_running'] workers at once, so a page never waits behind long API jobs.
+A task submitted with a key while a task with the same key is still waiting is not
+queued again: the waiting task gets the new callbacks too.
+
+callback(result) / error_callback(error) and functions given to call_in_ui() run on the
+thread that called attach_tk(), which drains a queue with widget.after (Tk widgets must
+not be touched from the workers). Until attach_tk() is called (scripts, tests) they run
+on the worker. Callbacks of a cancelled task are never called.
+
+    task = scheduler.submit(search, hs_code, lane=API_LANE, pass_token=True, callback=show)
+    task.cancel()  # search(hs_code, token=...) should check token.cancelled and stop
+"""
+import queue
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Hashable, Optional
+
+UI_LANE = 'ui'
+API_LANE = 'api'
+
+# Lane -> start order (lower first) and how many workers its tasks may hold (None: all)
+LANES = {
+    UI_LANE: {'priority': 0, 'max_running': None},
+    API_LANE: {'priority': 1, 'max_running': 2},
+}
+MAX_WORKERS = 4
+UI_POLL_MS = 20
+
+PENDING, RUNNING, DONE, FAILED, CANCELLED = 'pending', 'running', 'done', 'failed', 'cancelled'
+
+class TaskCancelled(Exception):
+    """Raised by CancellationToken.raise_if_cancelled(); ends the task as cancelled."""
+
+class CancellationToken(threading.Event):
+    """
+    Set when the task is cancelled. Being an Event, it can be passed wherever a stop_event
+    is expected (e.g. apollo_pipeline.run_extraction_job).
+    """
+    def cancel(self):
+        self.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self.is_set()
+
+    def raise_if_cancelled(self):
+        if self.is_set():
+            raise TaskCancelled()
+
+class Task:
+    """A submitted function call; state is one of pending/running/done/failed/cancelled."""
+    def __init__(self, func: Callable, args: tuple, kwargs: dict, lane: str, key: Optional[Hashable],
+                 pass_token: bool):
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.lane = lane
+        self.key = key
+        self.pass_token = pass_token
+        self.token = CancellationToken()
+        self.state = PENDING
+        self.callbacks = []
+        self.error_callbacks = []
+
+    def cancel(self):
+        """Cancel the task: a waiting task never starts, a running one sees token.cancelled."""
+        self.token.cancel()
+
+    @property
+    def cancelled(self) -> bool:
+        return self.token.cancelled
+
+class TaskScheduler:
+    def __init__(self, max_workers: int = MAX_WORKERS, lanes: Optional[Dict[str, Dict]] = None):
+        self.max_workers = max_workers
+        self.lanes = lanes or LANES
+        self._order = sorted(self.lanes, key=lambda lane: self.lanes[lane]['priority'])
+        self._pending = {lane: deque() for lane in self.lanes}
+        self._running = {lane: 0 for lane in self.lanes}
+        self._by_key = {}  # key -> waiting Task
+        self._active = set()  # running Tasks, cancelled on shutdown
+        self._counters = {'done': 0, 'failed': 0, 'cancelled': 0, 'deduplicated': 0}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='task')
+        self._ui_queue = queue.SimpleQueue()
+        self._widget = None
+        self._poll_ms = UI_POLL_MS
+        self._closed = False
+
+    def submit(self, func: Callable, *args, lane: str = UI_LANE, key: Optional[Hashable] = None,
+               callback: Optional[Callable[[Any], None]] = None,
+               error_callback: Optional[Callable[[Exception], None]] = None,
+               pass_token: bool = False, **kwargs) -> Task:
+        """
+        Run func(*args, **kwargs) on the pool (with token=CancellationToken added to kwargs
+        if pass_token). Returns the Task, or the waiting task with the same key.
+        """
+        if lane not in self.lanes:
+            raise ValueError(f"Unknown lane {lane!r}")
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("TaskScheduler is shut down")
+            task = self._by_key.get(key) if key is not None else None
+            if task is not None and task.state == PENDING and not task.cancelled:
+                self._counters['deduplicated'] += 1
+            else:
+                task = Task(func, args, kwargs, lane, key, pass_token)
+                self._pending[lane].append(task)
+                if key is not None:
+                    self._by_key[key] = task
+            if callback:
+                task.callbacks.append(callback)
+            if error_callback:
+                task.error_callbacks.append(error_callback)
+        self._dispatch()
+        return task
+
+    def _next_task(self) -> Optional[Task]:
+        """The waiting task to start next (called with the lock held)."""
+        for lane in self._order:
+            waiting = self._pending[lane]
+            while waiting and waiting[0].cancelled:
+                self._finish_pending(waiting.popleft())
+            limit = self.lanes[lane]['max_running']
+            if waiting and (limit is None or self._running[lane] < limit):
+                task = waiting.popleft()
+                if self._by_key.get(task.key) is task:
+                    del self._by_key[task.key]
+                return task
+        return None
+
+    def _finish_pending(self, task: Task):
+        task.state = CANCELLED
+        self._counters['cancelled'] += 1
+        if self._by_key.get(task.key) is task:
+            del self._by_key[task.key]
+
+    def _dispatch(self):
+        with self._lock:
+            while not self._closed and sum(self._running.values()) < self.max_workers:
+                task = self._next_task()
+                if task is None:
+                    break
+                task.state = RUNNING
+                self._running[task.lane] += 1
+                self._active.add(task)
+                self._executor.submit(self._run, task)
+
+    def _run(self, task: Task):
+        callbacks, outcome = [], None
+        try:
+            task.token.raise_if_cancelled()
+            kwargs = dict(task.kwargs, token=task.token) if task.pass_token else task.kwargs
+            outcome = task.func(*task.args, **kwargs)
+            task.token.raise_if_cancelled()
+            task.state = DONE
+            callbacks = task.callbacks
+        except TaskCancelled:
+            task.state = CANCELLED
+        except Exception as e:
+            if task.cancelled:
+                task.state = CANCELLED
+            else:
+                task.state = FAILED
+                outcome = e
+                callbacks = task.error_callbacks
+                if not callbacks:
+                    print(f"Background task error: {e}")
+        finally:
+            with self._lock:
+                self._running[task.lane] -= 1
+                self._active.discard(task)
+                self._counters[task.state] += 1
+            self._dispatch()
+        for fn in callbacks:
+            self.call_in_ui(self._deliver, task, fn, outcome)
+
+    @staticmethod
+    def _deliver(task: Task, fn: Callable, outcome: Any):
+        if not task.cancelled:
+            fn(outcome)
+
+    def call_in_ui(self, fn: Callable, *args):
+        """Run fn(*args) on the Tk thread (at once if no widget is attached, never after shutdown)."""
+        if self._closed:
+            return
+        if self._widget is None:
+            fn(*args)
+        else:
+            self._ui_queue.put((fn, args))
+
+    def run_ui_callbacks(self) -> int:
+        """Run every queued UI callback on the calling thread; returns how many ran."""
+        ran = 0
+        while True:
+            try:
+                fn, args = self._ui_queue.get_nowait()
+            except queue.Empty:
+                return ran
+            ran += 1
+            try:
+                fn(*args)
+            except Exception as e:
+                print(f"Background task callback error: {e}")
+
+    def attach_tk(self, widget, poll_ms: int = UI_POLL_MS):
+        """Deliver callbacks on widget's (the Tk main loop's) thread from now on."""
+        self._widget = widget
+        self._poll_ms = poll_ms
+        widget.after(poll_ms, self._poll)
+
+    def _poll(self):
+        # Reschedule first: a callback may open a modal dialog (wait_window) and keep the
+        # main loop busy in a nested event loop, which has to go on delivering callbacks
+        widget = self._widget
+        if widget is None:
+            return
+        try:
+            widget.after(self._poll_ms, self._poll)
+        except Exception:
+            # Widget destroyed: nothing left to deliver to
+            self._widget = None
+            return
+        self.run_ui_callbacks()
+
+    def stats(self) -> Dict:
+        """Waiting and running tasks per lane, and how many tasks ended each way."""
+        with self._lock:
+            return dict(self._counters, pending={lane: len(tasks) for lane, tasks in self._pending.items()},
+                        running=dict(self._running))
+
+    def shutdown(self, wait: bool = False):
+        """Cancel every waiting and running task and stop the pool; queued UI callbacks are dropped."""
+        with self._lock:
+            self._closed = True
+            for lane, waiting in self._pending.items():
+                while waiting:
+                    task = waiting.popleft()
+                    task.cancel()
+                    self._finish_pending(task)
+            for task in self._active:
+                task.cancel()
+        self._widget = None
+        self._executor.shutdown(wait=wait)
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Test that the company extraction writer survives a malformed page (the run ends with
+the error recorded instead of blocking on the full page queue), and that a checkpointed
+job stopped or failed partway resumes without skipping or double-counting pages
+"""
+
+import sys
+import os
+import threading
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+import pytest
+
+pytest.importorskip("requests")
+pytest.importorskip("dotenv")
+
+import apollo_pipeline
+import db_apollo
+from benchmarks.faults import FaultInjector
+from benchmarks.scenarios import BenchmarkEnv
+
+def test_bad_page_sets_error_and_run_finishes(monkeypatch):
+    def fetch(page, country=None, keyword_tags=None):
+        if page == 1:
+            return ["not an organization"]  # parse_organization raises on a non-dict
+        return [{"name": f"Company {page}", "primary_domain": f"company{page}.com"}]
+
+    monkeypatch.setattr(apollo_pipeline, "fetch_company_page", fetch)
+    inserted, result = [], {}
+    run = threading.Thread(target=lambda: result.update(apollo_pipeline.extract_companies(
+        "Malaysia", 20, lambda rows: inserted.extend(rows) or len(rows), concurrency=4, queue_size=1)), daemon=True)
+    run.start()
+    run.join(10)
+    assert not run.is_alive(), "extract_companies blocked after the writer failed"
+    assert result['error'] and "page 1" in result['error']
+    assert result['last_page'] == 0  # page 1 was never written, so the checkpoint can't pass it
+    assert inserted
+
+def test_job_resumes_from_checkpoint(monkeypatch):
+    monkeypatch.setenv("APOLLO_MAX_RETRIES", "0")
+    with BenchmarkEnv(FaultInjector(), FaultInjector(), total_companies=1000, rate=1000) as env:
+        written = []
+        stop = threading.Event()
+
+        def on_page(event):
+            written.append(event['page'])
+            if len(written) == 2:
+                stop.set()
+
+        # Stopped after two pages (a page already in flight may still be written)
+        summary = apollo_pipeline.start_extraction_job("Malaysia", 6, db_apollo.insert_companies, concurrency=1,
+                                                       on_page=on_page, stop_event=stop)
+        job_id = summary['job_id']
+        job = db_apollo.get_extraction_job(job_id)
+        assert summary['status'] == job['status'] == 'paused'
+        assert 2 <= job['last_page'] < 6 and job['pages_done'] == job['last_page']
+
+        # Every request fails: the job is marked failed and its checkpoint stays put
+        env.apollo_faults.error_rate = 1.0
+        summary = apollo_pipeline.run_extraction_job(job_id, db_apollo.insert_companies, on_page=on_page)
+        failed = db_apollo.get_extraction_job(job_id)
+        assert summary['status'] == failed['status'] == 'failed' and failed['error']
+        assert (failed['last_page'], failed['pages_done'], failed['companies_saved']) == \
+            (job['last_page'], job['pages_done'], job['companies_saved'])
+
+        env.apollo_faults.error_rate = 0.0
+        summary = apollo_pipeline.run_extraction_job(job_id, db_apollo.insert_companies, on_page=on_page)
+        done = db_apollo.get_extraction_job(job_id)
+        assert summary['status'] == done['status'] == 'completed' and done['error'] is None
+        assert sorted(written) == [1, 2, 3, 4, 5, 6]
+        assert (done['last_page'], done['pages_done'], done['companies_seen'], done['companies_saved']) == (6, 6, 600, 600)
+        assert db_apollo.count_companies() == 600
+
+        # Nothing left to fetch: running a completed job again changes nothing
+        assert apollo_pipeline.run_extraction_job(job_id, db_apollo.insert_companies)['pages'] == 0
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-v"]))
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Test batched Apollo email reveals and the people-search cache against the local mock Apollo server
+"""
+
+import sys
+import os
+import tempfile
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+import pytest
+
+pytest.importorskip("requests")
+
+import apollo
+import db_apollo
+import rate_limiter
+from benchmarks.mock_apollo_server import start_mock_server
+from response_cache import ResponseCache
+
+@pytest.fixture
+def mock_apollo(monkeypatch):
+    server = start_mock_server()
+    monkeypatch.setattr(apollo, "APOLLO_BASE_URL", server.base_url)
+    monkeypatch.setattr(apollo, "APOLLO_API_KEY", "test")
+    with tempfile.TemporaryDirectory() as tmp:
+        monkeypatch.setattr(db_apollo, "APOLLO_DB_PATH", os.path.join(tmp, "Apollo.db"))
+        cache_path = os.path.join(tmp, "cache.db")
+        monkeypatch.setattr(apollo, "_people_cache", ResponseCache(db_path=cache_path, table="apollo_people_cache"))
+        monkeypatch.setattr(apollo, "_domain_cache", ResponseCache(db_path=cache_path, table="apollo_resolved_domains"))
+        yield server
+    server.shutdown()
+    server.server_close()
+
+def test_bulk_reveal_batches_and_caches(mock_apollo):
+    person_ids = [f"person{i:03d}" for i in range(25)]
+    emails = apollo.reveal_emails_apollo(person_ids)
+    assert set(emails) == set(person_ids)
+    assert all(email.endswith("@revealed.example.com") for email in emails.values())
+    # 25 people -> 3 bulk requests of at most 10
+    assert mock_apollo.requests["people/bulk_match"] == 3
+
+    # Every reveal is cached: asking again (or one by one) costs nothing
+    assert apollo.reveal_emails_apollo(person_ids + ["person000"]) == emails
+    assert apollo.reveal_email_apollo("person007") == emails["person007"]
+    assert mock_apollo.requests["people/bulk_match"] == 3
+    assert mock_apollo.requests["people/match"] == 0
+    assert max(mock_apollo.reveals.values()) == 1
+
+def test_decision_makers_reveal_locked_emails(mock_apollo):
+    contacts = apollo.find_decision_makers_apollo("Acme Gloves Sdn Bhd", "Malaysia", "acme.com.my")
+    assert contacts
+    assert all(contact["email"] != db_apollo.LOCKED_EMAIL for contact in contacts)
+    assert mock_apollo.requests["people/match"] == 0
+    assert mock_apollo.requests["people/bulk_match"] <= 1
+
+def test_people_search_cache_and_resolved_domain(mock_apollo):
+    # No people by name alone: the company-search fallback resolves a domain and searches again
+    mock_apollo.people_per_company = 0
+    assert apollo.find_decision_makers_apollo("Nobody Gloves Ltd", "Vietnam") == []
+    assert mock_apollo.requests["mixed_companies/search"] == 1
+    assert mock_apollo.requests["mixed_people/search"] == 2
+
+    # Same company again (legal suffix aside): answered from the cache
+    assert apollo.find_decision_makers_apollo("Nobody Gloves", "Vietnam") == []
+    assert mock_apollo.requests["mixed_people/search"] == 2
+
+    # With the people cache gone, the remembered domain goes straight to one filtered search
+    mock_apollo.people_per_company = 5
+    apollo._people_cache.clear()
+    assert apollo.find_decision_makers_apollo("Nobody Gloves", "Vietnam")
+    assert mock_apollo.requests["mixed_people/search"] == 3
+    assert mock_apollo.requests["mixed_companies/search"] == 1
+
+    # Force refresh always searches again
+    apollo.find_decision_makers_apollo("Nobody Gloves", "Vietnam", force_refresh=True)
+    assert mock_apollo.requests["mixed_people/search"] == 4
+
+def test_reveals_only_retry_throttling(mock_apollo, monkeypatch):
+    monkeypatch.setenv("APOLLO_MAX_RETRIES", "2")
+    monkeypatch.setenv("APOLLO_RATE_PER_SEC", "1000")
+    monkeypatch.setenv("APOLLO_BURST", "1000")
+    rate_limiter.reset_limiters()
+    rate_limiter.get_retry_policy("apollo").base_delay = 0.01
+    try:
+        # A 500 on a reveal may already have been charged: it is not sent again
+        mock_apollo.faults.error_rate = 1.0
+        assert apollo.reveal_emails_apollo(["person001"]) == {}
+        assert apollo.reveal_email_apollo("person002") == ""
+        assert mock_apollo.statuses[500] == 2
+        # Searches spend no credits and keep retrying 5xx
+        apollo.apollo_post("mixed_people/search", {"q_organization_name": "Acme"})
+        assert mock_apollo.statuses[500] == 5
+
+        # A 429 was never processed, so reveals still retry it
+        mock_apollo.faults.error_rate = 0.0
+        mock_apollo.faults.throttle_rate = 1.0
+        mock_apollo.faults.retry_after = 0.01
+        assert apollo.reveal_emails_apollo(["person003"]) == {}
+        assert mock_apollo.statuses[429] == 3
+    finally:
+        rate_limiter.reset_limiters()
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-v"]))
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Test the async DeepSeek API against the mock DeepSeek server: aquery_deepseek_many keeps
+`concurrency` requests in flight, returns results in job order (errors included), and
+each event loop gets its own pooled client
+"""
+
+import sys
+import os
+import time
+import asyncio
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+import pytest
+
+pytest.importorskip("requests")
+pytest.importorskip("dotenv")
+pytest.importorskip("httpx")
+
+import deepseek_agent
+from benchmarks.faults import FaultInjector
+from benchmarks.scenarios import BenchmarkEnv
+
+COUNTRIES = ["Malaysia", "Vietnam", "Thailand", "Indonesia", "Philippines", "Singapore", "India", "Japan"]
+
+def run_many(jobs, concurrency):
+    async def main():
+        try:
+            return await deepseek_agent.aquery_deepseek_many(jobs, concurrency=concurrency, use_cache=False)
+        finally:
+            await deepseek_agent.aclose_async_client()
+    start = time.monotonic()
+    results = asyncio.run(main())
+    return results, time.monotonic() - start
+
+def test_many_runs_concurrently_in_job_order(monkeypatch):
+    monkeypatch.setenv("DEEPSEEK_MAX_RETRIES", "0")
+    with BenchmarkEnv(FaultInjector(latency=0.3), FaultInjector(), rate=1000) as env:
+        jobs = [{'hs_code': '401519', 'keyword': 'nitrile gloves', 'country': country} for country in COUNTRIES]
+        results, elapsed = run_many(jobs, concurrency=4)
+        assert env.deepseek.requests == len(jobs)
+        # The mock fills each recording in with the prompt's country
+        assert all(isinstance(output, str) and country in output for output, country in zip(results, COUNTRIES))
+        # Two waves of four requests, not eight in a row
+        assert 0.6 <= elapsed < 0.3 * len(jobs) * 0.75
+
+        _, serial = run_many(jobs[:3], concurrency=1)
+        assert serial >= 0.9
+
+        # A failed job comes back as its exception, in its own slot
+        env.deepseek_faults.latency = 0.0
+        env.deepseek_faults.error_rate = 1.0
+        results, _ = run_many(jobs[:2], concurrency=2)
+        assert all(isinstance(result, Exception) for result in results)
+
+def test_async_client_per_event_loop():
+    async def clients():
+        try:
+            return deepseek_agent.get_async_client(), deepseek_agent.get_async_client()
+        finally:
+            await deepseek_agent.aclose_async_client()
+    first, again = asyncio.run(clients())
+    second, _ = asyncio.run(clients())
+    assert first is again
+    assert first is not second
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-v"]))
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Test the batch buyer search: the scope grid pairs each stored HS code with its own
+country (Global codes with every requested country) for each keyword, and a run with
+failing searches still saves the rest and reports the failures in its summary
+"""
+
+import sys
+import os
+import tempfile
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+import pytest
+
+pytest.importorskip("requests")
+pytest.importorskip("dotenv")
+
+import db
+import db_connection
+import batch_search
+
+@pytest.fixture
+def scope_db(monkeypatch):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "database.db")
+        monkeypatch.setattr(db, "DB_PATH", path)
+        db.init_db()
+        db.save_asia_hs_code("401519", "Nitrile gloves", "Malaysia")
+        db.save_asia_hs_code("401519", "Nitrile gloves", "Vietnam")
+        db.save_asia_hs_code("401511", "Surgical gloves", "Thailand")
+        db.save_asia_hs_code("392620", "Plastic gloves", "Global")
+        yield path
+        db_connection.close_path(path)
+
+def grid(jobs):
+    return sorted((job['hs_code'], job['keyword'], job['country']) for job in jobs)
+
+def test_scope_grid_pairs_codes_keywords_and_countries(scope_db):
+    keywords = ["nitrile gloves", "glove distributor"]
+    # No country filter: every code with its own country ("Global" included as stored)
+    assert grid(batch_search.build_scope_grid('Asia', keywords)) == sorted(
+        (code, keyword, country)
+        for code, country in [("401519", "Malaysia"), ("401519", "Vietnam"), ("401511", "Thailand"), ("392620", "Global")]
+        for keyword in keywords)
+
+    # With a filter: matching codes keep the requested spelling, Global codes go to every requested country
+    jobs = batch_search.build_scope_grid('Asia', keywords, ["malaysia", "Indonesia"])
+    assert grid(jobs) == sorted(
+        (code, keyword, country)
+        for code, country in [("401519", "malaysia"), ("392620", "malaysia"), ("392620", "Indonesia")]
+        for keyword in keywords)
+
+    # Repeated keywords (any case) don't queue the same search twice
+    assert len(batch_search.build_scope_grid('Asia', ["Nitrile Gloves", "nitrile gloves"], ["Vietnam"])) == 2
+    # A country with no codes of its own still gets the Global codes
+    assert grid(batch_search.build_scope_grid('Asia', keywords, ["Japan"])) == sorted(
+        ("392620", keyword, "Japan") for keyword in keywords)
+    assert batch_search.build_scope_grid('Global', keywords, ["Japan"]) == []
+
+def test_partial_failure_summary(scope_db, monkeypatch):
+    def query(hs_code, keyword, country, existing_names, use_cache=True):
+        if country == 'Vietnam':
+            raise RuntimeError("DeepSeek API error 503")
+        return (f"1. **{country} Medical Supply**\n- Country: {country}\n- Website: https://{country.lower()}med.com\n"
+                f"- Description: Buys {keyword}\n"
+                f"2. **{hs_code} Trading**\n- Country: {country}\n- Description: Importer")
+
+    monkeypatch.setattr(batch_search, "query_deepseek", query)
+    jobs = batch_search.build_scope_grid('Asia', ["nitrile gloves"], ["Malaysia", "Vietnam", "Thailand"])
+    events = []
+    summary = batch_search.run_batch_search(jobs, 'Asia', max_workers=3, use_cache=False, on_progress=events.append)
+
+    assert (summary['jobs'], summary['succeeded']) == (len(jobs), len(jobs) - 2)
+    assert sorted((job['hs_code'], job['country']) for job in summary['failed']) == [("392620", "Vietnam"), ("401519", "Vietnam")]
+    assert all("503" in job['error'] for job in summary['failed'])
+    assert summary['companies_found'] == 2 * summary['succeeded']
+    # Leads are unique per code, keyword and name: "392620 Trading" from Thailand repeats Malaysia's
+    assert summary['companies_saved'] == len(db.fetch_all_buyer_leads('Asia')) == 7
+    assert len(db.fetch_all_results()) == summary['companies_found']
+    assert sorted(event['completed'] for event in events) == list(range(1, len(jobs) + 1))
+    assert sum(1 for event in events if event.get('error')) == 2
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-v"]))
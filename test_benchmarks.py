@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Smoke test for the offline benchmark scenarios against the mock DeepSeek and Apollo servers
+"""
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+import pytest
+
+pytest.importorskip("requests")
+
+from benchmarks.faults import FaultInjector
+from benchmarks.scenarios import BenchmarkEnv, SCENARIOS, percentile
+
+def test_percentile():
+    samples = [0.1 * i for i in range(1, 21)]
+    assert percentile(samples, 50) == pytest.approx(1.0)
+    assert percentile(samples, 95) == pytest.approx(1.9)
+    assert percentile([], 95) == 0.0
+
+def test_scenarios_run_offline():
+    with BenchmarkEnv(FaultInjector(), FaultInjector(throttle_rate=0.2, retry_after=0.01, seed=3),
+                      total_companies=300, rate=100) as env:
+        search = SCENARIOS['batch_buyer_search'](env, searches=3, workers=3)
+        assert (search['units'], search['failed']) == (3, 0)
+        assert search['db_rows'] > 0
+
+        pages = SCENARIOS['company_extraction'](env, pages=3)
+        assert (pages['units'], pages['failed'], pages['db_rows']) == (3, 0, 300)
+        # Injected 429s were retried, not counted as failures
+        assert env.apollo.statuses[200] == 3
+
+        contacts = SCENARIOS['contact_extraction'](env, companies=5, workers=2)
+        assert (contacts['units'], contacts['failed']) == (5, 0)
+
+        export = SCENARIOS['full_export'](env)
+        assert export['units'] == export['db_rows'] > 300
+        assert export['p95_ms'] >= export['p50_ms']
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-v"]))
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Test the headless CLI commands against the mock Apollo server: stdout carries only JSON
+lines (engine diagnostics go to stderr) and the exit codes are 0/1/3
+"""
+
+import sys
+import os
+import json
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+import pytest
+
+pytest.importorskip("requests")
+typer = pytest.importorskip("typer")
+from typer.testing import CliRunner
+
+from benchmarks.faults import FaultInjector
+from benchmarks.scenarios import BenchmarkEnv
+from cli.commands import register_commands, EXIT_OK, EXIT_ERROR, EXIT_PARTIAL
+
+def run(*args):
+    app = typer.Typer()
+    register_commands(app)
+    try:
+        runner = CliRunner(mix_stderr=False)
+    except TypeError:
+        runner = CliRunner()  # Click 8.2+ keeps stderr apart by default
+    result = runner.invoke(app, list(args))
+    events = [json.loads(line) for line in result.stdout.splitlines()]
+    return result, events
+
+def test_commands_write_json_lines_and_exit_codes(monkeypatch, tmp_path):
+    monkeypatch.setenv("APOLLO_MAX_RETRIES", "0")
+    companies = tmp_path / "companies.json"
+    companies.write_text(json.dumps([{"company_name": "Acme Gloves", "country": "Malaysia"},
+                                     {"company_name": "Zenith Healthcare", "country": "Vietnam"}]))
+    with BenchmarkEnv(FaultInjector(), FaultInjector(), total_companies=300, rate=100) as env:
+        result, events = run("extract-companies", "--country", "Malaysia", "--pages", "2")
+        assert result.exit_code == EXIT_OK
+        assert [event["event"] for event in events] == ["start", "progress", "progress", "summary"]
+
+        result, events = run("extract-contacts")
+        assert result.exit_code == EXIT_ERROR
+        assert events[-1]["event"] == "error"
+
+        # Every Apollo request fails: the engine's error messages must not reach stdout
+        env.apollo_faults.error_rate = 1.0
+        result, events = run("extract-contacts", "--companies-file", str(companies), "--workers", "2")
+        assert result.exit_code == EXIT_PARTIAL
+        assert events[0]["event"] == "start" and events[-1]["event"] == "summary"
+        assert events[-1]["failed"]
+        assert "Error contacting Apollo.io" in result.stderr
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-v"]))
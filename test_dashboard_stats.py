@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Test that the trigger-maintained dashboard summary matches a full recount
+"""
+
+import sys
+import os
+import sqlite3
+import tempfile
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+import GUI_db
+import dashboard_stats
+
+def test_triggers_keep_summary_exact(monkeypatch):
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "database.db")
+        monkeypatch.setattr(GUI_db, "DB_PATH", db_path)
+        GUI_db.init_db()
+        GUI_db.init_apollo_db()
+        GUI_db.init_deepseek_results_table()
+        conn = sqlite3.connect(db_path)
+        # Rows from before the summary existed are counted when it is created
+        conn.execute("INSERT INTO deepseek_buyer_search_results (hs_code, keyword, country, company_name, company_country) "
+                     "VALUES ('401519', 'nitrile gloves', 'Malaysia', 'Old Co', 'Malaysia')")
+        conn.commit()
+        dashboard_stats.init_dashboard_stats(db_path)
+
+        conn.executemany("INSERT INTO deepseek_buyer_search_results (hs_code, keyword, country, company_name, company_country) "
+                         "VALUES ('401519', 'nitrile gloves', 'Malaysia', ?, ?)",
+                         [("A", "Malaysia"), ("B", "Thailand"), ("C", "Unknown"), ("D", None)])
+        conn.execute("INSERT INTO companies (id, company_name, country) VALUES (1, 'Top Glove', 'Malaysia'), (2, 'Siam', 'Thailand')")
+        conn.executemany("INSERT INTO contacts (company_id, name) VALUES (?, ?)", [(1, "x"), (1, "y"), (2, "z"), (3, "orphan")])
+        conn.commit()
+        stats = dashboard_stats.get_dashboard_stats(db_path)
+        assert stats['counts'] == {'ai': 5, 'apollo': 4, 'hs': 0, 'companies': 2}
+        assert stats['countries'] == [('Malaysia', 4), ('Thailand', 2)]
+        assert stats['recent']['contacts'][0]['name'] == "orphan"
+
+        conn.execute("UPDATE companies SET country = 'Vietnam' WHERE id = 2")
+        conn.execute("UPDATE contacts SET company_id = 2 WHERE name = 'x'")
+        conn.execute("DELETE FROM companies WHERE id = 1")
+        conn.execute("UPDATE deepseek_buyer_search_results SET company_country = 'Vietnam' WHERE company_name = 'B'")
+        conn.execute("DELETE FROM deepseek_buyer_search_results WHERE company_name = 'Old Co'")
+        conn.commit()
+        conn.close()
+        assert dashboard_stats.check_stats(db_path) == []
+        assert dashboard_stats.get_dashboard_stats(db_path)['countries'] == [('Vietnam', 3), ('Malaysia', 1)]
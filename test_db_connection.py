@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Test the pooled SQLite connections: nested checkouts share the outer transaction,
+uncommitted work is rolled back when the outermost checkout closes, each thread has its
+own connection, and threads reconnect after close_all()
+"""
+
+import sys
+import os
+import sqlite3
+import tempfile
+import threading
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+import pytest
+
+import db_connection
+from db_connection import connect
+
+@pytest.fixture
+def db_path():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "pool.db")
+        conn = connect(path)
+        conn.execute("CREATE TABLE t (x INTEGER)")
+        conn.commit()
+        conn.close()
+        yield path
+        db_connection.close_path(path)
+
+def count(path):
+    conn = sqlite3.connect(path)
+    try:
+        return conn.execute("SELECT COUNT(*) FROM t").fetchone()[0]
+    finally:
+        conn.close()
+
+def test_nested_checkout_keeps_outer_transaction(db_path):
+    outer = connect(db_path)
+    outer.execute("INSERT INTO t VALUES (1)")
+    inner = connect(db_path)  # e.g. a helper called while the caller's write is open
+    assert inner.execute("SELECT COUNT(*) FROM t").fetchone()[0] == 1
+    inner.close()
+    assert outer.in_transaction
+    outer.commit()
+    outer.close()
+    assert count(db_path) == 1
+
+def test_outermost_close_rolls_back_uncommitted_work(db_path):
+    conn = connect(db_path)
+    conn.execute("INSERT INTO t VALUES (1)")
+    conn.close()
+    conn.close()  # closing twice is harmless
+    assert count(db_path) == 0
+    # The next checkout starts clean on the same pooled connection
+    conn = connect(db_path)
+    assert not conn.in_transaction
+    conn.close()
+
+def test_each_thread_has_its_own_connection(db_path):
+    main = connect(db_path)
+    seen = {}
+
+    def worker(name):
+        conn = connect(db_path)
+        seen[name] = (conn._conn, connect(db_path)._conn)
+        conn.close()
+
+    threads = [threading.Thread(target=worker, args=(name,)) for name in ('a', 'b')]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    # Reused within a thread, never shared between threads
+    assert seen['a'][0] is seen['a'][1] and seen['b'][0] is seen['b'][1]
+    assert len({id(main._conn), id(seen['a'][0]), id(seen['b'][0])}) == 3
+    main.close()
+
+def test_threads_reconnect_after_close_all(db_path):
+    conn = connect(db_path)
+    before = conn._conn
+    conn.close()
+    ready, closed, results = threading.Event(), threading.Event(), []
+
+    def worker():
+        connect(db_path).close()
+        ready.set()
+        closed.wait(5)
+        conn = connect(db_path)
+        conn.execute("INSERT INTO t VALUES (2)")
+        conn.commit()
+        conn.close()
+        results.append('ok')
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+    assert ready.wait(5)
+    db_connection.close_all()
+    closed.set()
+    thread.join(5)
+    assert results == ['ok']
+    with pytest.raises(sqlite3.ProgrammingError):
+        before.execute("SELECT 1")
+    conn = connect(db_path)
+    assert conn._conn is not before
+    assert conn.execute("SELECT COUNT(*) FROM t").fetchone()[0] == 1
+    conn.close()
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-v"]))
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Test set-based duplicate removal: dry run, apply, and contacts following the kept company
+"""
+
+import sys
+import os
+import sqlite3
+import tempfile
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+import db
+import db_apollo
+from dedup import dedup, find_duplicate_groups
+
+def test_dedup_companies_and_contacts(monkeypatch):
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "Apollo.db")
+        monkeypatch.setattr(db_apollo, "APOLLO_DB_PATH", db_path)
+        db_apollo.init_apollo_db()
+        db_apollo.insert_company('Acme Gloves Sdn Bhd', 'Malaysia', 'acme.com', 'Medical', 100)
+        db_apollo.insert_company('Zeta Medical', 'Vietnam', None, 'Medical', 50)
+        conn = sqlite3.connect(db_path)
+        # Rows that slipped past the insert-time checks
+        conn.executemany("INSERT INTO companies (company_name, domain, country, normalized_name) VALUES (?, ?, ?, ?)",
+                         [('ACME GLOVES', 'ACME.com', 'Malaysia', 'acme gloves'),
+                          ('Zeta Medical Ltd', None, 'vietnam', 'zeta medical'),
+                          ('Zeta Medical', None, 'Thailand', 'zeta medical')])
+        conn.executemany("INSERT INTO contacts (company_id, company_name, name, email, normalized_name) VALUES (?, ?, ?, ?, ?)",
+                         [(3, 'ACME GLOVES', 'Ann Tan', 'ann@acme.com', 'acme gloves'),
+                          (1, 'Acme Gloves Sdn Bhd', 'Ann Tan', 'ANN@acme.com', 'acme gloves'),
+                          (1, 'Acme Gloves Sdn Bhd', 'Ben Lim', db_apollo.LOCKED_EMAIL, 'acme gloves'),
+                          (2, 'Zeta Medical', 'Chen Wong', db_apollo.LOCKED_EMAIL, 'zeta medical')])
+        conn.commit()
+
+        # Dry run changes nothing; "Zeta Medical Ltd" only matches by normalized name
+        report = dedup('apollo_companies')
+        assert (report['duplicate_groups'], report['duplicates_to_remove'], report['duplicates_removed']) == (1, 1, 0)
+        assert [[row['id'] for row in group] for group in find_duplicate_groups('apollo_companies')] == [[1, 3]]
+        assert [[row['id'] for row in group]
+                for group in find_duplicate_groups('apollo_companies', normalized_names=True)] == [[1, 3], [2, 4]]
+
+        assert dedup('apollo_companies', apply=True)['duplicates_removed'] == 1
+        assert [row[0] for row in conn.execute("SELECT id FROM companies ORDER BY id")] == [1, 2, 4, 5]
+        # Contacts of a removed company now point at the one kept
+        assert conn.execute("SELECT company_id FROM contacts WHERE id = 1").fetchone()[0] == 1
+
+        # Same email (case aside) is a duplicate; locked placeholder emails are not
+        assert [[row['id'] for row in group] for group in db_apollo.find_duplicate_contacts()] == [[1, 2]]
+        assert dedup('apollo_contacts', apply=True)['duplicates_removed'] == 1
+        assert dedup('apollo_contacts')['duplicate_groups'] == 0
+        conn.close()
+
+def test_results_dedup_needs_identical_name_and_country(monkeypatch):
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "database.db")
+        monkeypatch.setattr(db, "DB_PATH", db_path)
+        db.init_db()
+        conn = sqlite3.connect(db_path)
+        conn.executemany("INSERT INTO results (hs_code, keyword, company_name, company_country, normalized_name) "
+                         "VALUES ('401519', ?, ?, ?, 'top glove')",
+                         [('a', 'Top Glove Sdn Bhd', 'Malaysia'), ('b', 'Top Glove Sdn Bhd', 'Malaysia'),
+                          ('c', 'Top Glove Corporation Bhd', 'Malaysia'), ('d', 'Top Glove Sdn Bhd', 'malaysia')])
+        conn.commit()
+        assert dedup('results', normalized_names=True)['duplicates_to_remove'] == 3
+        assert db.get_duplicate_summary() == [{'company_name': 'Top Glove Sdn Bhd', 'company_country': 'Malaysia',
+                                               'duplicate_count': 2}]
+        assert db.find_and_remove_duplicates()['duplicates_removed'] == 1
+        assert conn.execute("SELECT COUNT(*) FROM results").fetchone()[0] == 3
+        conn.close()
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, "-v"]))
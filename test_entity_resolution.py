@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Test that DeepSeek results and Apollo companies are linked into company clusters incrementally
+"""
+
+import sys
+import os
+import sqlite3
+import tempfile
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+import GUI_db
+import entity_resolution
+
+def test_resolve_links_across_sources(monkeypatch):
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "database.db")
+        monkeypatch.setattr(GUI_db, "DB_PATH", db_path)
+        GUI_db.init_apollo_db()
+        GUI_db.init_deepseek_results_table()
+        conn = sqlite3.connect(db_path)
+        conn.executemany(
+            "INSERT INTO deepseek_buyer_search_results (hs_code, keyword, country, company_name, company_country, company_website_link) "
+            "VALUES ('4015', 'gloves', 'Indonesia', ?, ?, ?)",
+            [("PT Medisafe Technologies", "Indonesia", None),
+             ("Sinar Medical Supplies", "Indonesia", "https://www.sinarmed.co.id/about"),
+             ("Medisafe Technologies", "Vietnam", None)])
+        conn.execute("INSERT INTO companies (company_name, country, domain) VALUES ('Medisafe Technologies Tbk', 'Indonesia', NULL)")
+        conn.commit()
+
+        assert entity_resolution.resolve_new(db_path)['records'] == 4
+        links = entity_resolution.load_entity_links(db_path)
+        assert links[("deepseek", 1)] == links[("apollo", 1)]
+        # Same name in another country is a different company
+        assert links[("deepseek", 3)] != links[("deepseek", 1)]
+
+        # Only new rows are processed; a shared website links despite a different name
+        conn.execute("INSERT INTO companies (company_name, country, domain) VALUES ('CV Sinar Jaya', 'Indonesia', 'sinarmed.co.id')")
+        conn.commit()
+        assert entity_resolution.resolve_new(db_path) == {'records': 1, 'linked': 1, 'entities': 0, 'merged': 0}
+        links = entity_resolution.load_entity_links(db_path)
+        assert links[("apollo", 2)] == links[("deepseek", 2)]
+
+        entities = entity_resolution.EntityIndex(db_path)
+        contact = {"company_id": 1, "company_name": "Medisafe"}
+        assert entities.key(contact) == entities.key({"id": 1}, "deepseek")
+        conn.close()
+
+def test_domains_only_match_on_the_same_own_host():
+    assert entity_resolution.domain_core("https://www.medisafe.co.id/about") == "medisafe.co.id"
+    assert entity_resolution.domain_core("shop.abc.com") == "shop.abc.com"
+    assert entity_resolution.domain_core("abc.com") == "abc.com"
+    for shared in ("https://www.facebook.com/acme", "https://facebook.com/zenith", "linkedin.com/company/acme",
+                   "https://my.linkedin.com/company/acme", "https://acme.en.alibaba.com", "sites.google.com/view/acme"):
+        assert entity_resolution.domain_core(shared) == ""
+
+    def record(name, country, website):
+        return {"normalized_name": name, "country": country, "domain": entity_resolution.domain_core(website)}
+
+    acme = record("acme gloves", "malaysia", "https://www.facebook.com/acme")
+    zenith = record("zenith healthcare", "vietnam", "https://facebook.com/zenith")
+    assert entity_resolution.similarity(acme, zenith) < entity_resolution.MATCH_THRESHOLD
+    assert not any(key.startswith("d:") for key in entity_resolution.blocking_keys(acme))
+
+    # The same website in another country is still penalised
+    local = record("acme gloves", "malaysia", "acme.com")
+    assert entity_resolution.similarity(local, record("acme", "malaysia", "https://www.acme.com")) == 1.0
+    assert entity_resolution.similarity(local, record("acme", "vietnam", "https://www.acme.com")) < entity_resolution.MATCH_THRESHOLD
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, "-v"]))
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Test the FTS5 search over DeepSeek results: the triggers keep the index in step with
+inserts, updates and deletes, words match as prefixes, and name matches rank first
+"""
+
+import sys
+import os
+import tempfile
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+import pytest
+
+import GUI_db
+
+def names(results):
+    return [row['company_name'] for row in results]
+
+def test_search_follows_inserts_updates_and_deletes(monkeypatch):
+    with tempfile.TemporaryDirectory() as tmp:
+        monkeypatch.setattr(GUI_db, "DB_PATH", os.path.join(tmp, "database.db"))
+        GUI_db.init_deepseek_results_table()
+        if not GUI_db._fts_available:
+            pytest.skip("SQLite built without FTS5")
+        GUI_db.insert_deepseek_results("401519", "examination gloves", "Malaysia", [
+            {'company_name': 'Care Supplies', 'company_country': 'Malaysia',
+             'description': 'Buys nitrile and latex gloves for clinics'},
+            {'company_name': 'Nitrile Direct', 'company_country': 'Malaysia', 'description': 'Distributor'},
+            {'company_name': 'Medika Trading', 'company_country': 'Vietnam', 'description': 'Hospital tenders'},
+        ])
+
+        # Prefixes match, and a name match outranks a description match
+        results = GUI_db.search_deepseek_results("nitr")
+        assert names(results) == ['Nitrile Direct', 'Care Supplies']
+        assert list(results[0]) == GUI_db.DEEPSEEK_RESULT_COLUMNS
+        assert names(GUI_db.search_deepseek_results("medi hosp")) == ['Medika Trading']
+        assert names(GUI_db.search_deepseek_results("glov", company_country='Vietnam')) == ['Medika Trading']
+        assert len(GUI_db.search_deepseek_results("glov", limit=2, offset=2)) == 1
+
+        medika = GUI_db.search_deepseek_results("medika")[0]
+        assert GUI_db.update_deepseek_result(medika['id'], {'company_name': 'Saigon Gloves', 'description': 'Importer'})
+        assert GUI_db.search_deepseek_results("medika") == []
+        assert GUI_db.search_deepseek_results("hospital") == []
+        assert names(GUI_db.search_deepseek_results("saigon")) == ['Saigon Gloves']
+
+        nitrile = GUI_db.search_deepseek_results("direct")[0]
+        assert GUI_db.delete_deepseek_result(nitrile['id'])
+        assert names(GUI_db.search_deepseek_results("nitr")) == ['Care Supplies']
+        assert GUI_db.search_deepseek_results("direct") == []
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-v"]))
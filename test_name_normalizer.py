@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Test the company-name normalizer used for dedup and the normalized_name columns
+"""
+
+import sys
+import os
+import tempfile
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+import db_apollo
+from name_normalizer import normalize_company_name
+
+def test_normalize_company_name():
+    """Legal forms, punctuation, case and accents don't change the key"""
+
+    test_cases = [
+        ("Top Glove Sdn. Bhd.", "top glove"),
+        ("TOP GLOVE SDN BHD", "top glove"),
+        ("PT. Sarung Tangan Indonesia Tbk", "sarung tangan indonesia"),
+        ("CV Sinar Jaya", "sinar jaya"),
+        ("Müller & Söhne GmbH", "muller and sohne"),
+        ("ABC Co., Ltd.", "abc"),
+        ("Novo Nordisk A/S", "novo nordisk"),
+        ("Sri Trang Gloves (Thailand) Public Company Limited", "sri trang gloves thailand"),
+        ("Kimberly-Clark Corp.", "kimberly clark"),
+        # Legal-form words inside the name are kept
+        ("Ltd Commerce Co Holdings", "ltd commerce co holdings"),
+        # A name that is only a legal form is kept as is
+        ("Co Ltd", "co ltd"),
+        ("", ""),
+        (None, ""),
+    ]
+
+    for company_name, expected in test_cases:
+        assert normalize_company_name(company_name) == expected, company_name
+
+def test_inserts_keep_legal_entities_apart(monkeypatch):
+    """The normalized name is only a lookup key: inserts still match on the exact name"""
+    with tempfile.TemporaryDirectory() as tmp:
+        monkeypatch.setattr(db_apollo, "APOLLO_DB_PATH", os.path.join(tmp, "Apollo.db"))
+        db_apollo.init_apollo_db()
+        first, _ = db_apollo.insert_company("Top Glove Sdn Bhd", "Malaysia", None, "Medical", 100)
+        second, is_new = db_apollo.insert_company("Top Glove Corporation Bhd", "Malaysia", None, "Medical", 100)
+        assert is_new and second != first
+        assert db_apollo.insert_company("Top Glove Sdn Bhd", "Malaysia", None, "Medical", 100) == (first, False)
+        assert db_apollo.insert_companies([{"company_name": "Top Glove Holdings", "country": "Malaysia"},
+                                           {"company_name": "Top Glove Sdn Bhd", "country": "Malaysia"}]) == 1
+        assert db_apollo.insert_contacts([{"company_id": first, "company_name": "Top Glove Sdn Bhd", "name": "Ann Tan"},
+                                          {"company_id": second, "company_name": "Top Glove Corporation Bhd", "name": "Ann Tan"}]) == 2
+        assert {c["normalized_name"] for c in db_apollo.get_all_companies()} == {"top glove", "top glove holdings"}
+
+if __name__ == "__main__":
+    test_normalize_company_name()
+    print("All normalizer cases passed")
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Test keyset paging of DeepSeek results through PagedTableModel: every row is shown once,
+in (sort value, id) order, across ties and NULLs, and Previous returns the same pages
+"""
+
+import sys
+import os
+import sqlite3
+import tempfile
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+import pytest
+
+import GUI_db
+from paged_table import PagedTableModel, keyset_cursor
+
+def expected_order(rows, column, descending):
+    # SQLite puts NULLs first ascending and last descending; id breaks ties the same way
+    ordered = sorted(rows, key=lambda r: (r[column] is not None, r[column] or '', r['id']))
+    return [r['id'] for r in (reversed(ordered) if descending else ordered)]
+
+@pytest.mark.parametrize("column", ["company_website_link", "company_name", "id"])
+@pytest.mark.parametrize("descending", [False, True])
+@pytest.mark.parametrize("company_country", [None, "Malaysia"])
+def test_pages_cover_ties_and_nulls(monkeypatch, column, descending, company_country):
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "database.db")
+        monkeypatch.setattr(GUI_db, "DB_PATH", db_path)
+        GUI_db.init_deepseek_results_table()
+        conn = sqlite3.connect(db_path)
+        # Websites repeat (ties) and a third are NULL, so pages start and end inside both runs
+        conn.executemany("INSERT INTO deepseek_buyer_search_results "
+                         "(hs_code, keyword, country, company_name, company_country, company_website_link) "
+                         "VALUES ('401519', ?, 'Malaysia', ?, ?, ?)",
+                         [(f"gloves {i}", f"Co {i % 7}", "Malaysia" if i % 4 else "Thailand",
+                           None if i % 3 == 0 else f"site{i % 5}.com") for i in range(40)])
+        conn.commit()
+        conn.row_factory = sqlite3.Row
+        where = " WHERE company_country = ?" if company_country else ""
+        rows = [dict(r) for r in conn.execute(f"SELECT * FROM deepseek_buyer_search_results{where}",
+                                              [company_country] if company_country else [])]
+        conn.close()
+
+        model = PagedTableModel(
+            lambda cursor, limit: GUI_db.get_deepseek_results_page(company_country, column, descending, cursor, limit),
+            keyset_cursor(column), page_size=6)
+        pages = [[r['id'] for r in model.reset()]]
+        while model.has_next:
+            pages.append([r['id'] for r in model.next_page()])
+        assert [i for page in pages for i in page] == expected_order(rows, column, descending)
+        assert all(len(page) == 6 for page in pages[:-1])
+
+        for index in range(len(pages) - 2, -1, -1):
+            assert [r['id'] for r in model.prev_page()] == pages[index]
+        assert not model.has_prev
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-v"]))
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Test the GUI query cache: LRU bounds, TTL, and invalidation by table writes
+"""
+
+import sys
+import os
+import time
+import tempfile
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+import GUI_db
+from query_cache import QueryCache
+
+def test_lru_and_ttl():
+    cache = QueryCache(max_entries=2, max_bytes=None, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # "b" is now least recently used
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+    cache.set("short", 4, ttl=0.01)
+    time.sleep(0.02)
+    assert cache.get("short") is None
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['expired'], stats['evictions']) == (2, 2, 1, 2)
+
+    bounded = QueryCache(max_entries=100, max_bytes=2000)
+    for i in range(20):
+        bounded.set(i, ["x" * 100])
+    assert 0 < bounded.stats()['bytes'] <= 2000
+    assert bounded.get(19) is not None and bounded.get(0) is None
+
+def test_writes_make_entries_stale(monkeypatch):
+    with tempfile.TemporaryDirectory() as tmp:
+        monkeypatch.setattr(GUI_db, "DB_PATH", os.path.join(tmp, "database.db"))
+        GUI_db.init_db()
+        cache = QueryCache()
+        loads = []
+
+        def load():
+            loads.append(1)
+            return GUI_db.get_all_hs_codes()
+
+        assert cache.get_or_load("hs", load, tables=('hs_codes',)) == []
+        assert cache.get_or_load("hs", load, tables=('hs_codes',)) == []
+        assert len(loads) == 1
+        GUI_db.save_hs_code("401519", "Nitrile gloves", "Malaysia")
+        assert len(cache.get_or_load("hs", load, tables=('hs_codes',))) == 1
+        assert len(loads) == 2
+        assert cache.stats()['stale'] == 1
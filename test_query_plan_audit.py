@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+"""
+Test the query plan audit: no query needs a full scan or a sort, and running it leaves
+the caller's pooled connections open
+"""
+
+import sys
+import os
+import tempfile
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+import pytest
+
+import db_connection
+import query_plan_audit
+
+def test_audit_is_clean_and_keeps_other_connections():
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = db_connection.connect(os.path.join(tmp, "app.db"))
+        conn.execute("CREATE TABLE t (x)")
+        findings = query_plan_audit.audit()
+        conn.execute("INSERT INTO t VALUES (1)")  # raises if the audit closed it
+        conn.commit()
+        conn.close()
+        db_connection.close_path(os.path.join(tmp, "app.db"))
+    assert findings
+    assert not [f for f in findings if f['sorts'] or (f['scans'] and f['filtered'] and not f['accepted'])]
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-v"]))
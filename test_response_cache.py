@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Test the on-disk API response cache: TTL expiry, LRU eviction by entry count and size,
+and stable cache keys
+"""
+
+import sys
+import os
+import tempfile
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+import pytest
+
+import db_connection
+import response_cache
+from response_cache import ResponseCache, make_cache_key
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def time(self):
+        return self.now
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(response_cache, "time", fake)  # stands in for the time module
+    return fake
+
+@pytest.fixture
+def cache_path():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "cache.db")
+        yield path
+        db_connection.close_path(path)
+
+def test_ttl_expiry(clock, cache_path):
+    cache = ResponseCache(db_path=cache_path, ttl=60)
+    cache.set("k", "value")
+    clock.now += 59
+    assert cache.get("k") == "value"
+    clock.now += 2  # reading doesn't extend the TTL
+    assert cache.get("k") is None
+    assert cache.stats()['entries'] == 0  # expired entries are dropped on read
+    assert (cache.stats()['hits'], cache.stats()['misses']) == (1, 1)
+
+def test_lru_eviction_by_entries_and_bytes(clock, cache_path):
+    cache = ResponseCache(db_path=cache_path, table="by_entries", max_entries=2)
+    for key in ("a", "b"):
+        cache.set(key, key)
+        clock.now += 1
+    assert cache.get("a") == "a"  # "b" is now least recently used
+    clock.now += 1
+    cache.set("c", "c")
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == ("a", "c")
+
+    by_size = ResponseCache(db_path=cache_path, table="by_size", max_bytes=10)
+    by_size.set("x", "1234")
+    clock.now += 1
+    by_size.set("y", "1234")
+    clock.now += 1
+    by_size.set("z", "ünï")  # 5 bytes in UTF-8: 13 > 10, so the oldest goes
+    assert by_size.get("x") is None
+    assert by_size.stats()['size_bytes'] == 9
+
+def test_cache_keys_are_stable():
+    body = {"model": "deepseek-chat", "messages": [{"role": "user", "content": "Nitrile glove buyers"}], "temperature": 0}
+    reordered = {"temperature": 0, "messages": [{"content": "Nitrile glove buyers", "role": "user"}], "model": "deepseek-chat"}
+    key = make_cache_key("https://api.example.com/chat", body)
+    assert key == make_cache_key("https://api.example.com/chat", reordered)
+    assert len(key) == 64 and key == key.lower()
+    assert key != make_cache_key("https://api.example.com/chat", dict(body, temperature=0.7))
+    assert key != make_cache_key(body, "https://api.example.com/chat")
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-v"]))
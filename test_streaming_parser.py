@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Test that StreamingCompanyParser, fed a recorded DeepSeek completion in chunks of any
+size, finds the same companies as parse_deepseek_output on the full text
+"""
+
+import sys
+import os
+import json
+import random
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+import pytest
+
+from db import StreamingCompanyParser, parse_deepseek_output
+
+RECORDINGS = os.path.join(os.path.dirname(__file__), 'src', 'benchmarks', 'recordings', 'deepseek_buyer_search.json')
+
+def load_completions():
+    with open(RECORDINGS, 'r', encoding='utf-8') as f:
+        completions = json.load(f)['completions']
+    return [c['content'].format(country="Malaysia", keyword="nitrile gloves") for c in completions]
+
+def chunked(text, sizes):
+    pos = 0
+    for size in sizes:
+        if pos >= len(text):
+            return
+        yield text[pos:pos + size]
+        pos += size
+    if pos < len(text):
+        yield text[pos:]
+
+@pytest.mark.parametrize("text", load_completions())
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 64, None])
+def test_chunked_feed_matches_full_parse(text, chunk_size):
+    rng = random.Random(chunk_size or 0)
+    sizes = ([chunk_size] * len(text)) if chunk_size else [rng.randint(1, 40) for _ in range(len(text))]
+    parser = StreamingCompanyParser()
+    companies = []
+    for chunk in chunked(text, sizes):
+        companies += parser.feed(chunk)
+    companies += parser.close()
+    expected = parse_deepseek_output(text)
+    assert expected
+    assert companies == expected
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-v"]))
@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""
+Test the synthetic database generator used for scaling tests
+"""
+
+import sys
+import os
+import sqlite3
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from benchmarks.synthetic_data import generate
+from name_normalizer import normalize_company_name
+
+def test_generate_small_databases(tmp_path):
+    inserted = generate(str(tmp_path), 500, seed=7)
+    assert inserted['companies'] == 500
+    assert inserted['deepseek_buyer_search_results'] > 450
+
+    conn = sqlite3.connect(str(tmp_path / 'database.db'))
+    rows = conn.execute('SELECT company_name, normalized_name, country FROM deepseek_buyer_search_results').fetchall()
+    assert all(normalized == normalize_company_name(name) for name, normalized, _ in rows)
+    # Skewed countries, and companies repeated under another legal form
+    counts = dict(conn.execute('SELECT country, COUNT(*) FROM deepseek_buyer_search_results GROUP BY country').fetchall())
+    assert counts['Malaysia'] > counts.get('Canada', 0) * 5
+    assert len({normalized for _, normalized, _ in rows}) < len({name for name, _, _ in rows})
+    # The FTS index was rebuilt and its insert trigger put back
+    assert conn.execute("SELECT COUNT(*) FROM deepseek_results_fts WHERE deepseek_results_fts MATCH 'gloves'").fetchone()[0] > 0
+    assert conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'deepseek_results_fts_ai'").fetchone()
+    conn.close()
+
+    conn = sqlite3.connect(str(tmp_path / 'Apollo.db'))
+    orphans = conn.execute('SELECT COUNT(*) FROM contacts WHERE company_id NOT IN (SELECT id FROM companies)').fetchone()[0]
+    assert orphans == 0
+    conn.close()
+
+    # Same seed, same data
+    again = tmp_path / 'again'
+    assert generate(str(again), 500, seed=7) == inserted
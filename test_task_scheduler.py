@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Test the GUI task scheduler: lane priority and limits, deduplication, cancellation,
+and callbacks delivered on the attached (Tk) thread
+"""
+
+import sys
+import os
+import time
+import threading
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from task_scheduler import TaskScheduler, UI_LANE, API_LANE, DONE, CANCELLED
+
+class FakeWidget:
+    """Stands in for the Tk root: after() only records the poll, the test drains the queue itself."""
+    def __init__(self):
+        self.scheduled = []
+
+    def after(self, ms, fn):
+        self.scheduled.append(fn)
+
+def test_ui_lane_runs_before_waiting_api_tasks():
+    scheduler = TaskScheduler(max_workers=1)
+    gate = threading.Event()
+    order = []
+    scheduler.submit(gate.wait, 5, lane=API_LANE)
+    tasks = [scheduler.submit(order.append, 'api', lane=API_LANE),
+             scheduler.submit(order.append, 'ui', lane=UI_LANE)]
+    gate.set()
+    deadline = time.monotonic() + 5
+    while len(order) < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    scheduler.shutdown(wait=True)
+    assert order == ['ui', 'api']
+    assert [task.state for task in tasks] == [DONE, DONE]
+
+def test_api_lane_limit_leaves_workers_for_ui():
+    scheduler = TaskScheduler(max_workers=3)
+    gate = threading.Event()
+    for _ in range(3):
+        scheduler.submit(gate.wait, 5, lane=API_LANE)
+    assert scheduler.stats()['running'] == {UI_LANE: 0, API_LANE: 2}
+    ran = threading.Event()
+    scheduler.submit(ran.set, lane=UI_LANE)
+    assert ran.wait(5)  # not stuck behind the API jobs
+    gate.set()
+    scheduler.shutdown(wait=True)
+
+def test_dedup_and_cancellation():
+    scheduler = TaskScheduler(max_workers=1)
+    gate = threading.Event()
+    calls, results = [], []
+    running = scheduler.submit(lambda token: gate.wait(5) and token.cancelled, pass_token=True,
+                               callback=results.append)
+    first = scheduler.submit(calls.append, 'load', key='counts', callback=results.append)
+    second = scheduler.submit(calls.append, 'load', key='counts', callback=results.append)
+    assert first is second
+    dropped = scheduler.submit(calls.append, 'dropped')
+    dropped.cancel()
+    running.cancel()
+    gate.set()
+    deadline = time.monotonic() + 5
+    while len(results) < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    scheduler.shutdown(wait=True)
+    assert calls == ['load']
+    assert results == [None, None]  # both callers of the deduplicated task; none for the cancelled one
+    assert (running.state, dropped.state) == (CANCELLED, CANCELLED)
+
+def test_callbacks_run_on_attached_thread():
+    scheduler = TaskScheduler(max_workers=2)
+    widget = FakeWidget()
+    scheduler.attach_tk(widget)
+    threads, errors = [], []
+    done = threading.Event()
+    scheduler.submit(lambda: 42, callback=lambda result: (threads.append(threading.current_thread()), done.set()))
+    scheduler.submit(lambda: 1 / 0, error_callback=lambda e: errors.append(type(e).__name__))
+    deadline = time.monotonic() + 5
+    while (not done.is_set() or not errors) and time.monotonic() < deadline:
+        scheduler.run_ui_callbacks()
+        time.sleep(0.01)
+    assert threads == [threading.current_thread()]
+    assert errors == ['ZeroDivisionError']
+    widget.scheduled[0]()  # the poll reschedules itself
+    assert len(widget.scheduled) == 2
+    scheduler.shutdown(wait=True)